@@ -0,0 +1,76 @@
+"""Run a command of an entry point against the mock of Vuforia, in a new
+process.
+
+This is run by the start-up benchmarks, with the name of the entry point,
+the path to an image to query with and the path to write a VuMark
+instance to. The entry point is imported before the mock, so that its
+import times are not changed by the modules which the mock imports.
+"""
+
+import importlib
+import sys
+
+_ENTRY_POINTS = {
+    "vws": ("vws_cli", "vws_group"),
+    "vuforia-cloud-reco": ("vws_cli.query", "vuforia_cloud_reco"),
+    "vumark": ("vws_cli.vumark", "generate_vumark"),
+}
+
+
+def main() -> None:
+    """Run one command of the given entry point against the mock."""
+    prog_name, image_file_path, output_file_path = sys.argv[1:]
+    module_name, function_name = _ENTRY_POINTS[prog_name]
+    module = importlib.import_module(name=module_name)
+    entry_point = getattr(module, function_name)
+
+    # These are imported after the entry point, as described above.
+    from mock_vws import MockVWS  # noqa: PLC0415
+    from mock_vws.database import (  # noqa: PLC0415
+        CloudDatabase,
+        VuMarkDatabase,
+    )
+    from mock_vws.target import VuMarkTarget  # noqa: PLC0415
+
+    cloud_database = CloudDatabase()
+    vumark_target = VuMarkTarget(name="vumark-target")
+    vumark_database = VuMarkDatabase(vumark_targets={vumark_target})
+    args_by_prog_name = {
+        "vws": [
+            "list-targets",
+            "--server-access-key",
+            cloud_database.server_access_key,
+            "--server-secret-key",
+            cloud_database.server_secret_key,
+        ],
+        "vuforia-cloud-reco": [
+            image_file_path,
+            "--client-access-key",
+            cloud_database.client_access_key,
+            "--client-secret-key",
+            cloud_database.client_secret_key,
+        ],
+        "vumark": [
+            "--target-id",
+            vumark_target.target_id,
+            "--instance-id",
+            "12345",
+            "--output",
+            output_file_path,
+            "--server-access-key",
+            vumark_database.server_access_key,
+            "--server-secret-key",
+            vumark_database.server_secret_key,
+        ],
+    }
+    with MockVWS() as mock:
+        mock.add_cloud_database(cloud_database=cloud_database)
+        mock.add_vumark_database(vumark_database=vumark_database)
+        entry_point.main(
+            args=args_by_prog_name[prog_name],
+            prog_name=prog_name,
+        )
+
+
+if __name__ == "__main__":
+    main()
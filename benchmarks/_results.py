@@ -0,0 +1,127 @@
+"""Results of benchmark runs, which are written to JSON files so that runs
+can be compared.
+
+The format of results files has a version, which is changed whenever the
+format changes, so that results files which cannot be compared are not
+read.
+"""
+
+import dataclasses
+import datetime
+import json
+import os
+import platform
+import sys
+from enum import Enum, unique
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+RESULTS_FORMAT_VERSION = 1
+
+
+@unique
+class MetricKind(Enum):
+    """Kinds of measurement, which show whether more is better."""
+
+    # A time taken, including CPU time.
+    LATENCY = "latency"
+    THROUGHPUT = "throughput"
+    MEMORY = "memory"
+
+    @property
+    def higher_is_better(self) -> bool:
+        """Whether a higher measurement is an improvement."""
+        return self is MetricKind.THROUGHPUT
+
+
+@dataclasses.dataclass(frozen=True)
+class Metric:
+    """A measurement from each repetition of a benchmark."""
+
+    kind: MetricKind
+    unit: str
+    samples: tuple[float, ...]
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchmarkRun:
+    """The metrics of each benchmark in a run, by benchmark ID, and where
+    they were measured.
+    """
+
+    created_at: datetime.datetime
+    environment: dict[str, str]
+    benchmarks: dict[str, dict[str, Metric]]
+
+
+def current_environment() -> dict[str, str]:
+    """Get a description of where benchmarks are run, which can explain
+    differences between runs.
+    """
+    try:
+        vws_cli_version = version(distribution_name="vws-cli")
+    except PackageNotFoundError:
+        vws_cli_version = "unknown"
+    return {
+        "vws_cli_version": vws_cli_version,
+        "python_version": sys.version,
+        "python_implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": str(object=os.cpu_count()),
+    }
+
+
+def write_results(*, run: BenchmarkRun, results_file_path: Path) -> None:
+    """Write the results of a benchmark run to a file."""
+    data = {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "created_at": run.created_at.isoformat(),
+        "environment": run.environment,
+        "benchmarks": {
+            benchmark_id: {
+                metric_name: {
+                    "kind": metric.kind.value,
+                    "unit": metric.unit,
+                    "samples": list(metric.samples),
+                }
+                for metric_name, metric in metrics.items()
+            }
+            for benchmark_id, metrics in sorted(run.benchmarks.items())
+        },
+    }
+    results_file_path.write_text(data=json.dumps(obj=data, indent=2) + "\n")
+
+
+def read_results(*, results_file_path: Path) -> BenchmarkRun:
+    """Read the results of a benchmark run from a file.
+
+    Raises:
+        ValueError: The file is not a results file of the current format.
+    """
+    data = json.loads(s=results_file_path.read_text())
+    format_version = data.get("format_version")
+    if format_version != RESULTS_FORMAT_VERSION:
+        message = (
+            f"{results_file_path} has results format version "
+            f"{format_version}, but only version {RESULTS_FORMAT_VERSION} "
+            "can be read."
+        )
+        raise ValueError(message)
+    return BenchmarkRun(
+        created_at=datetime.datetime.fromisoformat(data["created_at"]),
+        environment=data["environment"],
+        benchmarks={
+            benchmark_id: {
+                metric_name: Metric(
+                    kind=MetricKind(metric["kind"]),
+                    unit=metric["unit"],
+                    samples=tuple(
+                        float(sample) for sample in metric["samples"]
+                    ),
+                )
+                for metric_name, metric in metrics.items()
+            }
+            for benchmark_id, metrics in data["benchmarks"].items()
+        },
+    )
@@ -0,0 +1,371 @@
+"""Compare the results of two benchmark runs, and show regressions.
+
+Run this with ``python -m benchmarks.compare BASE_RESULTS RESULTS``.
+
+For each metric of each benchmark in both runs, the median and the
+interquartile range of the repetitions are shown, with the change in the
+median. A change is significant if a two-sided Mann-Whitney U test, which
+does not assume that measurements are normally distributed, gives a
+p-value below the significance level. Metrics with a single measurement
+in either run, such as peak memory, are compared by the change in the
+median alone. So are metrics with too few repetitions for any p-value to
+be below the significance level, with a warning.
+
+A change for the worse is a regression if it is significant and larger
+than the threshold. The exit code is 1 if there is a regression.
+"""
+
+import dataclasses
+import functools
+import statistics
+import sys
+from enum import Enum, unique
+from pathlib import Path
+
+import click
+import yaml
+
+from benchmarks._results import BenchmarkRun, Metric, read_results
+
+
+@unique
+class Verdict(Enum):
+    """How a metric changed between runs."""
+
+    REGRESSION = "regression"
+    IMPROVEMENT = "improvement"
+    UNCHANGED = "unchanged"
+
+
+@dataclasses.dataclass(frozen=True)
+class MetricComparison:
+    """A comparison of a metric of a benchmark between two runs.
+
+    The p-value is ``None`` if either run has a single measurement. A
+    change can be significant only if the repetitions of the runs can give
+    a p-value below the significance level.
+    """
+
+    benchmark_id: str
+    metric_name: str
+    base_metric: Metric
+    metric: Metric
+    relative_change: float
+    p_value: float | None
+    can_be_significant: bool
+    verdict: Verdict
+
+
+def _interquartile_range(*, samples: tuple[float, ...]) -> float:
+    """Get the interquartile range of measurements."""
+    if len(samples) < 2:  # noqa: PLR2004
+        return 0.0
+    lower_quartile, _, upper_quartile = statistics.quantiles(
+        data=samples,
+        n=4,
+        method="inclusive",
+    )
+    return upper_quartile - lower_quartile
+
+
+@functools.cache
+def _u_statistic_counts(
+    *,
+    first_size: int,
+    second_size: int,
+) -> tuple[int, ...]:
+    """Get the number of orderings of two groups of measurements of the
+    given sizes which give each value of the Mann-Whitney U statistic.
+    """
+    if first_size == 0 or second_size == 0:
+        return (1,)
+    # The greatest measurement is either in the first group, in which case
+    # it is greater than every measurement in the second group, or it is in
+    # the second group.
+    first_greatest = _u_statistic_counts(
+        first_size=first_size - 1,
+        second_size=second_size,
+    )
+    second_greatest = _u_statistic_counts(
+        first_size=first_size,
+        second_size=second_size - 1,
+    )
+    counts = [0] * (first_size * second_size + 1)
+    for u_statistic, count in enumerate(iterable=first_greatest):
+        counts[u_statistic + second_size] += count
+    for u_statistic, count in enumerate(iterable=second_greatest):
+        counts[u_statistic] += count
+    return tuple(counts)
+
+
+def _smallest_p_value(*, first_size: int, second_size: int) -> float:
+    """Get the smallest two-sided p-value which a Mann-Whitney U test of two
+    groups of measurements of the given sizes can give.
+
+    This is given when every measurement in one group is greater than every
+    measurement in the other.
+    """
+    counts = _u_statistic_counts(
+        first_size=first_size,
+        second_size=second_size,
+    )
+    return min(1.0, 2 * counts[0] / sum(counts))
+
+
+def _mann_whitney_p_value(
+    *,
+    first_samples: tuple[float, ...],
+    second_samples: tuple[float, ...],
+) -> float:
+    """Get the two-sided p-value of a Mann-Whitney U test of whether two
+    groups of measurements come from the same distribution.
+
+    The exact distribution of the U statistic is used, which assumes that
+    there are no ties. Tied measurements count as half greater.
+    """
+    u_statistic = sum(
+        1.0 if first_sample > second_sample else 0.5
+        for first_sample in first_samples
+        for second_sample in second_samples
+        if first_sample >= second_sample
+    )
+    max_u_statistic = len(first_samples) * len(second_samples)
+    extreme_u_statistic = min(u_statistic, max_u_statistic - u_statistic)
+    counts = _u_statistic_counts(
+        first_size=len(first_samples),
+        second_size=len(second_samples),
+    )
+    extreme_orderings = sum(counts[: int(extreme_u_statistic) + 1])
+    return min(1.0, 2 * extreme_orderings / sum(counts))
+
+
+def compare_metric(
+    *,
+    benchmark_id: str,
+    metric_name: str,
+    base_metric: Metric,
+    metric: Metric,
+    threshold: float,
+    significance_level: float,
+) -> MetricComparison:
+    """Compare a metric of a benchmark between two runs."""
+    base_median = statistics.median(base_metric.samples)
+    median = statistics.median(metric.samples)
+    relative_change = (
+        (median - base_median) / base_median if base_median else 0.0
+    )
+    repetitions = min(len(base_metric.samples), len(metric.samples))
+    if repetitions < 2:  # noqa: PLR2004
+        p_value = None
+        can_be_significant = True
+    else:
+        p_value = _mann_whitney_p_value(
+            first_samples=metric.samples,
+            second_samples=base_metric.samples,
+        )
+        can_be_significant = (
+            _smallest_p_value(
+                first_size=len(metric.samples),
+                second_size=len(base_metric.samples),
+            )
+            < significance_level
+        )
+    # With too few repetitions for a change to be significant, changes are
+    # judged by the threshold alone, as with a single measurement.
+    is_significant = (
+        p_value is None
+        or not can_be_significant
+        or p_value < significance_level
+    )
+    improvement = (
+        relative_change if metric.kind.higher_is_better else -relative_change
+    )
+    if is_significant and improvement < -threshold:
+        verdict = Verdict.REGRESSION
+    elif is_significant and improvement > threshold:
+        verdict = Verdict.IMPROVEMENT
+    else:
+        verdict = Verdict.UNCHANGED
+    return MetricComparison(
+        benchmark_id=benchmark_id,
+        metric_name=metric_name,
+        base_metric=base_metric,
+        metric=metric,
+        relative_change=relative_change,
+        p_value=p_value,
+        can_be_significant=can_be_significant,
+        verdict=verdict,
+    )
+
+
+def compare_runs(
+    *,
+    base_run: BenchmarkRun,
+    run: BenchmarkRun,
+    threshold: float,
+    significance_level: float,
+) -> list[MetricComparison]:
+    """Compare each metric of each benchmark which is in both runs."""
+    return [
+        compare_metric(
+            benchmark_id=benchmark_id,
+            metric_name=metric_name,
+            base_metric=base_metrics[metric_name],
+            metric=metric,
+            threshold=threshold,
+            significance_level=significance_level,
+        )
+        for benchmark_id, base_metrics in sorted(base_run.benchmarks.items())
+        for metric_name, metric in run.benchmarks.get(
+            benchmark_id,
+            {},
+        ).items()
+        if metric_name in base_metrics
+    ]
+
+
+def _metric_summary(*, metric: Metric) -> dict[str, object]:
+    """Get a summary of the measurements of a metric."""
+    return {
+        "median": statistics.median(metric.samples),
+        "interquartile_range": _interquartile_range(samples=metric.samples),
+        "repetitions": len(metric.samples),
+    }
+
+
+def _comparison_yaml(*, comparisons: list[MetricComparison]) -> str:
+    """Get a YAML representation of comparisons."""
+    data = [
+        {
+            "benchmark": comparison.benchmark_id,
+            "metric": comparison.metric_name,
+            "kind": comparison.metric.kind.value,
+            "unit": comparison.metric.unit,
+            "base": _metric_summary(metric=comparison.base_metric),
+            "new": _metric_summary(metric=comparison.metric),
+            "relative_change": round(comparison.relative_change, 4),
+            "p_value": (
+                None
+                if comparison.p_value is None
+                else round(comparison.p_value, 4)
+            ),
+            "verdict": comparison.verdict.value,
+        }
+        for comparison in comparisons
+    ]
+    return yaml.dump(data=data, sort_keys=False)
+
+
+def _comparable_environment(
+    *,
+    environment: dict[str, str],
+) -> dict[str, str]:
+    """Get the parts of an environment which should be the same for runs to
+    be compared fairly.
+
+    The version of the VWS CLI is expected to differ.
+    """
+    return {
+        key: value
+        for key, value in environment.items()
+        if key != "vws_cli_version"
+    }
+
+
+@click.command(name="compare")
+@click.argument(
+    "base_results_file_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.argument(
+    "results_file_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--threshold",
+    type=click.FloatRange(min=0),
+    default=0.1,
+    show_default=True,
+    help=(
+        "The smallest relative change in a median, for the worse, which is "
+        "a regression."
+    ),
+)
+@click.option(
+    "--significance-level",
+    type=click.FloatRange(min=0, max=1, min_open=True),
+    default=0.05,
+    show_default=True,
+    help="The p-value below which a change is significant.",
+)
+@click.option(
+    "--show-all/--show-changes",
+    default=False,
+    show_default=True,
+    help="Show unchanged metrics as well as regressions and improvements.",
+)
+def compare(
+    *,
+    base_results_file_path: Path,
+    results_file_path: Path,
+    threshold: float,
+    significance_level: float,
+    show_all: bool,
+) -> None:
+    """Compare benchmark results with base results, and show the metrics
+    which changed.
+    """
+    try:
+        base_run = read_results(results_file_path=base_results_file_path)
+        run = read_results(results_file_path=results_file_path)
+    except ValueError as exc:
+        raise click.UsageError(message=str(object=exc)) from exc
+
+    comparisons = compare_runs(
+        base_run=base_run,
+        run=run,
+        threshold=threshold,
+        significance_level=significance_level,
+    )
+    shown_comparisons = [
+        comparison
+        for comparison in comparisons
+        if show_all or comparison.verdict is not Verdict.UNCHANGED
+    ]
+    click.echo(
+        message=_comparison_yaml(comparisons=shown_comparisons),
+        nl=False,
+    )
+    if _comparable_environment(
+        environment=base_run.environment,
+    ) != _comparable_environment(environment=run.environment):
+        click.echo(
+            message=(
+                "Warning: The runs were made in different environments, "
+                "which may explain changes."
+            ),
+            err=True,
+        )
+    insignificant_comparisons = [
+        comparison
+        for comparison in comparisons
+        if not comparison.can_be_significant
+    ]
+    if insignificant_comparisons:
+        click.echo(
+            message=(
+                f"Warning: {len(insignificant_comparisons)} metrics have too "
+                "few repetitions for a change to be significant at the "
+                f"significance level {significance_level:g}, so they are "
+                "compared by the threshold alone."
+            ),
+            err=True,
+        )
+    if any(
+        comparison.verdict is Verdict.REGRESSION for comparison in comparisons
+    ):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    compare()
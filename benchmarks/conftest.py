@@ -0,0 +1,153 @@
+"""``pytest`` fixtures for benchmarks."""
+
+import datetime
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from benchmarks._results import (
+    BenchmarkRun,
+    Metric,
+    current_environment,
+    read_results,
+    write_results,
+)
+from benchmarks.compare import Verdict, compare_metric
+
+_RESULTS_FILE_OPTION = "--benchmark-results"
+_BASELINE_FILE_OPTION = "--benchmark-baseline"
+
+# A benchmark fails if a metric is worse than in the baseline by more than
+# this relative change, and the change is significant at this level.
+_BASELINE_THRESHOLD = 0.1
+_BASELINE_SIGNIFICANCE_LEVEL = 0.05
+
+_METRICS_KEY = pytest.StashKey[dict[str, dict[str, Metric]]]()
+_BASELINE_KEY = pytest.StashKey[BenchmarkRun | None]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add options for where to write benchmark results, and for results
+    to compare with.
+    """
+    parser.addoption(
+        _RESULTS_FILE_OPTION,
+        type=Path,
+        default=None,
+        help=(
+            "Write the metrics of each benchmark to this JSON file, which "
+            "can be compared with another with python -m benchmarks.compare."
+        ),
+    )
+    parser.addoption(
+        _BASELINE_FILE_OPTION,
+        type=Path,
+        default=None,
+        help=(
+            "Fail each benchmark with a metric which is significantly worse "
+            "than in this JSON results file, written with "
+            f"{_RESULTS_FILE_OPTION} on the same machine."
+        ),
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Start collecting the metrics of each benchmark, and read the
+    baseline results if they are given.
+    """
+    config.stash[_METRICS_KEY] = {}
+    baseline_file_path: Path | None = config.getoption(
+        name=_BASELINE_FILE_OPTION,
+    )
+    if baseline_file_path is None:
+        config.stash[_BASELINE_KEY] = None
+        return
+    try:
+        config.stash[_BASELINE_KEY] = read_results(
+            results_file_path=baseline_file_path,
+        )
+    except (OSError, ValueError) as exc:
+        raise pytest.UsageError(str(object=exc)) from exc
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    """Write the metrics of each benchmark, if a results file is given."""
+    results_file_path: Path | None = session.config.getoption(
+        name=_RESULTS_FILE_OPTION,
+    )
+    if results_file_path is None:
+        return
+    run = BenchmarkRun(
+        created_at=datetime.datetime.now(tz=datetime.UTC),
+        environment=current_environment(),
+        benchmarks=session.config.stash[_METRICS_KEY],
+    )
+    write_results(run=run, results_file_path=results_file_path)
+
+
+@pytest.fixture(name="benchmark_metrics")
+def fixture_benchmark_metrics(
+    *,
+    request: pytest.FixtureRequest,
+) -> Iterator[dict[str, Metric]]:
+    """Give a mapping to which a benchmark adds its metrics, by name.
+
+    The metrics are written to the results file, if one is given, and the
+    benchmark fails if any is a regression from the baseline, if one is
+    given.
+    """
+    metrics: dict[str, Metric] = {}
+    yield metrics
+    if not metrics:
+        return
+    benchmark_id = request.node.nodeid
+    request.config.stash[_METRICS_KEY][benchmark_id] = metrics
+
+    baseline = request.config.stash[_BASELINE_KEY]
+    if baseline is None:
+        return
+    base_metrics = baseline.benchmarks.get(benchmark_id, {})
+    regressions = [
+        comparison
+        for comparison in (
+            compare_metric(
+                benchmark_id=benchmark_id,
+                metric_name=metric_name,
+                base_metric=base_metrics[metric_name],
+                metric=metric,
+                threshold=_BASELINE_THRESHOLD,
+                significance_level=_BASELINE_SIGNIFICANCE_LEVEL,
+            )
+            for metric_name, metric in metrics.items()
+            if metric_name in base_metrics
+        )
+        if comparison.verdict is Verdict.REGRESSION
+    ]
+    if regressions:
+        pytest.fail(
+            reason="Regressions from the baseline: "
+            + ", ".join(
+                f"{comparison.metric_name} ({comparison.relative_change:+.1%})"
+                for comparison in regressions
+            ),
+        )
+
+
+@pytest.fixture(name="local_storage", autouse=True)
+def fixture_local_storage(
+    *,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Keep the files which the VWS CLI keeps between runs out of the user's
+    application directory.
+    """
+    for envvar, file_name in (
+        ("VWS_CLI_MODEL_TARGET_REGISTRY", "model-target-datasets.sqlite3"),
+        ("VWS_CLI_MODEL_TARGET_CACHE_DIRECTORY", "model-target-dataset-cache"),
+        ("VWS_CLI_RECO_COUNTS_HISTORY", "reco-counts-history.sqlite3"),
+        ("VWS_CLI_TARGET_RECORD_CACHE", "target-record-cache.sqlite3"),
+        ("VWS_CLI_RATE_LIMIT_FILE", "rate-limits.sqlite3"),
+    ):
+        monkeypatch.setenv(name=envvar, value=str(object=tmp_path / file_name))
@@ -0,0 +1,643 @@
+"""Benchmarks for each command, against the mock of Vuforia.
+
+Each command is run several times at each data size, and the median wall
+clock time, the median CPU time and the peak traced memory are recorded as
+properties of the test, which are written to a JUnit XML file with
+``--junitxml``.
+
+The mock runs in the same process as the command, so CPU time and memory
+include the mock's share of each request.
+"""
+
+import io
+import json
+import shutil
+import statistics
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import click
+import pytest
+from click.testing import CliRunner
+from mock_vws import MockVWS
+from mock_vws.database import CloudDatabase, VuMarkDatabase
+from mock_vws.target import VuMarkTarget
+from vws import VWS
+
+from benchmarks._results import Metric, MetricKind
+from vws_cli import vws_group
+from vws_cli.query import vuforia_cloud_reco
+from vws_cli.vumark import generate_vumark
+
+_REPETITIONS = 5
+
+# The median time allowed for any command against the mock. This is
+# generous so that the benchmarks are not flaky on slow machines, while
+# still catching a command which waits needlessly or scales badly.
+_BUDGET_SECONDS = 10.0
+
+# The credentials which ``vws-python-mock`` accepts for the Model Target
+# Web API.
+_MODEL_TARGET_CREDENTIAL_ARGS = [
+    "--client-id",
+    "client-id",
+    "--client-secret",
+    "client-secret",
+]
+
+_CAD_DATA_URL = "https://example.com/model.zip"
+
+# The mock generates datasets immediately, so the shortest allowed wait
+# between requests for their status is used.
+_SECONDS_BETWEEN_REQUESTS = "0.05"
+
+_parametrize_num_targets = pytest.mark.parametrize(
+    argnames="num_targets",
+    argvalues=[1, 10, 100],
+)
+
+_parametrize_num_datasets = pytest.mark.parametrize(
+    argnames="num_datasets",
+    argvalues=[1, 10],
+)
+
+
+def _benchmark(
+    *,
+    cli: click.Command,
+    make_args: Callable[[], list[str]],
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Run a command several times, and record its wall clock time, CPU
+    time and peak traced memory.
+
+    The arguments are made before each run, outside of the measurements,
+    so that a run can have a target or a dataset of its own.
+    """
+    runner = CliRunner()
+
+    def run(*, args: list[str]) -> None:
+        """Run the command, and check that it succeeded."""
+        result = runner.invoke(
+            cli=cli,
+            args=args,
+            catch_exceptions=False,
+            color=True,
+        )
+        assert result.exit_code == 0, result.output
+
+    durations: list[float] = []
+    cpu_durations: list[float] = []
+    for _ in range(_REPETITIONS):
+        args = make_args()
+        start = time.perf_counter()
+        cpu_start = time.process_time()
+        run(args=args)
+        cpu_durations.append(time.process_time() - cpu_start)
+        durations.append(time.perf_counter() - start)
+
+    # Tracing allocations slows everything down, so memory is measured in
+    # a separate run.
+    args = make_args()
+    tracemalloc.start()
+    try:
+        run(args=args)
+        _, peak_traced_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median_seconds = statistics.median(durations)
+    record_property("repetitions", _REPETITIONS)
+    record_property("median_seconds", median_seconds)
+    record_property("median_cpu_seconds", statistics.median(cpu_durations))
+    record_property("peak_traced_bytes", peak_traced_bytes)
+    benchmark_metrics["wall_time"] = Metric(
+        kind=MetricKind.LATENCY,
+        unit="seconds",
+        samples=tuple(durations),
+    )
+    benchmark_metrics["cpu_time"] = Metric(
+        kind=MetricKind.LATENCY,
+        unit="seconds",
+        samples=tuple(cpu_durations),
+    )
+    benchmark_metrics["peak_traced_memory"] = Metric(
+        kind=MetricKind.MEMORY,
+        unit="bytes",
+        samples=(float(peak_traced_bytes),),
+    )
+    assert median_seconds < _BUDGET_SECONDS
+
+
+def _add_target(*, vws_client: VWS, image: io.BytesIO) -> str:
+    """Add a target which is processed immediately, and give its ID."""
+    return vws_client.add_target(
+        name=uuid.uuid4().hex,
+        width=1.5,
+        image=image,
+        active_flag=True,
+        application_metadata=None,
+    )
+
+
+@pytest.fixture(name="database")
+def fixture_database() -> Iterator[CloudDatabase]:
+    """Yield a mock ``CloudDatabase`` which processes targets
+    immediately.
+    """
+    database = CloudDatabase()
+    with MockVWS(processing_time_seconds=0) as mock:
+        mock.add_cloud_database(cloud_database=database)
+        yield database
+
+
+@pytest.fixture(name="vws_client")
+def fixture_vws_client(*, database: CloudDatabase) -> VWS:
+    """Return a VWS client which connects to the mock database."""
+    return VWS(
+        server_access_key=database.server_access_key,
+        server_secret_key=database.server_secret_key,
+    )
+
+
+@pytest.fixture(name="server_credential_args")
+def fixture_server_credential_args(*, database: CloudDatabase) -> list[str]:
+    """Return the arguments which give the server credentials of the mock
+    database.
+    """
+    return [
+        "--server-access-key",
+        database.server_access_key,
+        "--server-secret-key",
+        database.server_secret_key,
+    ]
+
+
+@pytest.fixture(name="target_ids")
+def fixture_target_ids(
+    *,
+    vws_client: VWS,
+    high_quality_image: io.BytesIO,
+    num_targets: int,
+) -> list[str]:
+    """Add ``num_targets`` targets to the database, and give their IDs."""
+    return [
+        _add_target(vws_client=vws_client, image=high_quality_image)
+        for _ in range(num_targets)
+    ]
+
+
+@pytest.fixture(name="image_file_path")
+def fixture_image_file_path(
+    *,
+    high_quality_image: io.BytesIO,
+    tmp_path: Path,
+) -> Path:
+    """Write an image which can be used for a target, and give its path."""
+    image_file_path = tmp_path / "image.png"
+    image_file_path.write_bytes(data=high_quality_image.getvalue())
+    return image_file_path
+
+
+@pytest.fixture(name="model_target_mock")
+def fixture_model_target_mock() -> Iterator[MockVWS]:
+    """Yield a mock which generates Model Target datasets immediately."""
+    with MockVWS(processing_time_seconds=0) as mock:
+        yield mock
+
+
+def _create_dataset(*, name: str) -> str:
+    """Create a dataset from one model, and give the dataset UUID."""
+    result = CliRunner().invoke(
+        cli=vws_group,
+        args=[
+            "create-model-target-dataset",
+            "--name",
+            name,
+            "--target-sdk",
+            "10.29",
+            "--model-name",
+            "my-model",
+            "--cad-data-url",
+            _CAD_DATA_URL,
+            *_MODEL_TARGET_CREDENTIAL_ARGS,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0, result.output
+    return result.stdout.strip()
+
+
+@_parametrize_num_targets
+@pytest.mark.parametrize(
+    argnames="command_name",
+    argvalues=[
+        "list-targets",
+        "get-database-summary-report",
+        "export-target-records",
+    ],
+)
+@pytest.mark.usefixtures("target_ids")
+def test_database_command(
+    *,
+    command_name: str,
+    server_credential_args: list[str],
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Commands about the whole database are quick for databases of each
+    size.
+    """
+    _benchmark(
+        cli=vws_group,
+        make_args=lambda: [command_name, *server_credential_args],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@_parametrize_num_targets
+@pytest.mark.parametrize(
+    argnames="command_name",
+    argvalues=[
+        "get-target-record",
+        "get-target-summary-report",
+        "get-duplicate-targets",
+        "wait-for-target-processed",
+    ],
+)
+def test_target_command(
+    *,
+    command_name: str,
+    target_ids: list[str],
+    server_credential_args: list[str],
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Commands about one target are quick for databases of each size.
+
+    Every target has the same image, so each is a duplicate of every other
+    target.
+    """
+    extra_args = (
+        ["--seconds-between-requests", _SECONDS_BETWEEN_REQUESTS]
+        if command_name == "wait-for-target-processed"
+        else []
+    )
+    _benchmark(
+        cli=vws_group,
+        make_args=lambda: [
+            command_name,
+            "--target-id",
+            target_ids[0],
+            *server_credential_args,
+            *extra_args,
+        ],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@_parametrize_num_targets
+@pytest.mark.usefixtures("target_ids")
+def test_add_target(
+    *,
+    image_file_path: Path,
+    server_credential_args: list[str],
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Targets are added quickly to databases of each size."""
+    _benchmark(
+        cli=vws_group,
+        make_args=lambda: [
+            "add-target",
+            "--name",
+            uuid.uuid4().hex,
+            "--width",
+            "1.5",
+            "--image",
+            str(object=image_file_path),
+            *server_credential_args,
+        ],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@_parametrize_num_targets
+def test_update_target(
+    *,
+    target_ids: list[str],
+    image_file_path: Path,
+    server_credential_args: list[str],
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Targets are updated quickly in databases of each size."""
+    _benchmark(
+        cli=vws_group,
+        make_args=lambda: [
+            "update-target",
+            "--target-id",
+            target_ids[0],
+            "--name",
+            uuid.uuid4().hex,
+            "--image",
+            str(object=image_file_path),
+            *server_credential_args,
+        ],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@_parametrize_num_targets
+@pytest.mark.usefixtures("target_ids")
+def test_delete_target(
+    *,
+    vws_client: VWS,
+    high_quality_image: io.BytesIO,
+    server_credential_args: list[str],
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Targets are deleted quickly from databases of each size.
+
+    A target is added for each run, so that there is always one to delete.
+    """
+    _benchmark(
+        cli=vws_group,
+        make_args=lambda: [
+            "delete-target",
+            "--target-id",
+            _add_target(vws_client=vws_client, image=high_quality_image),
+            *server_credential_args,
+        ],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@_parametrize_num_targets
+@pytest.mark.usefixtures("target_ids")
+def test_query(
+    *,
+    database: CloudDatabase,
+    image_file_path: Path,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Images are queried quickly against databases of each size."""
+    _benchmark(
+        cli=vuforia_cloud_reco,
+        make_args=lambda: [
+            str(object=image_file_path),
+            "--client-access-key",
+            database.client_access_key,
+            "--client-secret-key",
+            database.client_secret_key,
+            "--max-num-results",
+            "50",
+        ],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@pytest.mark.parametrize(
+    argnames="format_name",
+    argvalues=["png", "svg", "pdf"],
+)
+def test_vumark(
+    *,
+    format_name: str,
+    tmp_path: Path,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """VuMark instances are generated quickly in each format."""
+    vumark_target = VuMarkTarget(name="vumark-target")
+    vumark_database = VuMarkDatabase(vumark_targets={vumark_target})
+    output_file_path = tmp_path / f"output.{format_name}"
+    with MockVWS() as mock:
+        mock.add_vumark_database(vumark_database=vumark_database)
+        _benchmark(
+            cli=generate_vumark,
+            make_args=lambda: [
+                "--target-id",
+                vumark_target.target_id,
+                "--instance-id",
+                "12345",
+                "--format",
+                format_name,
+                "--output",
+                str(object=output_file_path),
+                "--server-access-key",
+                vumark_database.server_access_key,
+                "--server-secret-key",
+                vumark_database.server_secret_key,
+            ],
+            record_property=record_property,
+            benchmark_metrics=benchmark_metrics,
+        )
+
+
+@_parametrize_num_datasets
+@pytest.mark.usefixtures("model_target_mock")
+def test_generate_model_target_datasets(
+    *,
+    num_datasets: int,
+    tmp_path: Path,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Many datasets are created, waited for and downloaded quickly."""
+    datasets_file_path = tmp_path / "datasets.json"
+    datasets_file_path.write_text(
+        data=json.dumps(
+            obj=[
+                {
+                    "name": f"dataset-{index}",
+                    "targetSdk": "10.29",
+                    "models": [
+                        {"name": "my-model", "cadDataUrl": _CAD_DATA_URL},
+                    ],
+                }
+                for index in range(num_datasets)
+            ],
+        ),
+    )
+    output_directory_path = tmp_path / "output"
+
+    def make_args() -> list[str]:
+        """Give an empty output directory for each run."""
+        shutil.rmtree(path=output_directory_path, ignore_errors=True)
+        output_directory_path.mkdir()
+        return [
+            "generate-model-target-datasets",
+            "--datasets-file",
+            str(object=datasets_file_path),
+            "--output-directory",
+            str(object=output_directory_path),
+            "--seconds-between-requests",
+            _SECONDS_BETWEEN_REQUESTS,
+            *_MODEL_TARGET_CREDENTIAL_ARGS,
+        ]
+
+    _benchmark(
+        cli=vws_group,
+        make_args=make_args,
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_create_model_target_dataset(
+    *,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Datasets are created quickly."""
+    _benchmark(
+        cli=vws_group,
+        make_args=lambda: [
+            "create-model-target-dataset",
+            "--name",
+            uuid.uuid4().hex,
+            "--target-sdk",
+            "10.29",
+            "--model-name",
+            "my-model",
+            "--cad-data-url",
+            _CAD_DATA_URL,
+            *_MODEL_TARGET_CREDENTIAL_ARGS,
+        ],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@pytest.mark.parametrize(
+    argnames="command_name",
+    argvalues=[
+        "get-model-target-dataset-status",
+        "wait-for-model-target-dataset-generated",
+    ],
+)
+@pytest.mark.usefixtures("model_target_mock")
+def test_model_target_dataset_command(
+    *,
+    command_name: str,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Commands about one dataset are quick."""
+    dataset_uuid = _create_dataset(name="my-dataset")
+    extra_args = (
+        ["--seconds-between-requests", _SECONDS_BETWEEN_REQUESTS]
+        if command_name == "wait-for-model-target-dataset-generated"
+        else []
+    )
+    _benchmark(
+        cli=vws_group,
+        make_args=lambda: [
+            command_name,
+            "--dataset-uuid",
+            dataset_uuid,
+            *_MODEL_TARGET_CREDENTIAL_ARGS,
+            *extra_args,
+        ],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_download_model_target_dataset(
+    *,
+    tmp_path: Path,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Datasets are downloaded quickly.
+
+    The cache is emptied before each run, so that the dataset is
+    downloaded each time.
+    """
+    dataset_uuid = _create_dataset(name="my-dataset")
+    cache_directory = tmp_path / "cache"
+
+    def make_args() -> list[str]:
+        """Empty the cache of downloaded datasets."""
+        shutil.rmtree(path=cache_directory, ignore_errors=True)
+        return [
+            "download-model-target-dataset",
+            "--dataset-uuid",
+            dataset_uuid,
+            "--output",
+            str(object=tmp_path / "dataset.zip"),
+            "--cache-directory",
+            str(object=cache_directory),
+            *_MODEL_TARGET_CREDENTIAL_ARGS,
+        ]
+
+    _benchmark(
+        cli=vws_group,
+        make_args=make_args,
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_delete_model_target_dataset(
+    *,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Datasets are deleted quickly.
+
+    A dataset is created for each run, so that there is always one to
+    delete.
+    """
+    _benchmark(
+        cli=vws_group,
+        make_args=lambda: [
+            "delete-model-target-dataset",
+            "--dataset-uuid",
+            _create_dataset(name=uuid.uuid4().hex),
+            *_MODEL_TARGET_CREDENTIAL_ARGS,
+        ],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+
+
+@_parametrize_num_datasets
+@pytest.mark.usefixtures("model_target_mock")
+def test_list_model_target_datasets(
+    *,
+    num_datasets: int,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """The local registry of datasets is listed quickly at each size."""
+    for index in range(num_datasets):
+        _create_dataset(name=f"dataset-{index}")
+    _benchmark(
+        cli=vws_group,
+        make_args=lambda: [
+            "list-model-target-datasets",
+            "--client-id",
+            "client-id",
+        ],
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
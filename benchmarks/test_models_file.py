@@ -0,0 +1,106 @@
+"""Benchmarks for reading models files."""
+
+import json
+import statistics
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from click.testing import CliRunner
+
+from benchmarks._results import Metric, MetricKind
+from vws_cli import vws_group
+
+_NUM_VIEWS = 10_000
+
+_REPETITIONS = 5
+
+# The median time allowed to validate a models file with ``_NUM_VIEWS``
+# views. This is generous so that the benchmark is not flaky on slow
+# machines, while still catching validation which scales badly.
+_BUDGET_SECONDS = 2.0
+
+# The exit code which ``click`` uses for a usage error.
+_USAGE_ERROR_EXIT_CODE = 2
+
+
+def _view_json(*, index: int) -> dict[str, Any]:
+    """Return a guide view for a synthetic models file."""
+    return {
+        "name": f"view-{index}",
+        "guideViewPosition": {
+            "rotation": [0, 0, 0, 1],
+            "translation": [0.0, 0.0, -1.5],
+        },
+        "states": ["open", "closed"],
+    }
+
+
+def test_validate_many_views(
+    *,
+    tmp_path: Path,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """A models file with many views for a State-Based Model Target is
+    validated quickly.
+
+    The last view is invalid, so that the whole file is validated and no
+    request is made to Vuforia.
+    """
+    views = [_view_json(index=index) for index in range(_NUM_VIEWS)]
+    views[-1]["guideViewPosition"]["rotation"] = "0 0 0 1"
+    models_file_path = tmp_path / "models.json"
+    models_file_path.write_text(
+        data=json.dumps(
+            obj={
+                "models": [
+                    {
+                        "name": "my-model",
+                        "cadDataUrl": "https://example.com/model.zip",
+                        "views": views,
+                    },
+                ],
+            },
+        ),
+    )
+
+    runner = CliRunner()
+    durations: list[float] = []
+    for _ in range(_REPETITIONS):
+        start = time.perf_counter()
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                "create-model-target-dataset",
+                "--name",
+                "my-dataset",
+                "--target-sdk",
+                "10.29",
+                "--models-file",
+                str(object=models_file_path),
+                "--client-id",
+                "client-id",
+                "--client-secret",
+                "client-secret",
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+        durations.append(time.perf_counter() - start)
+        assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+        expected_message = (
+            f"/models(0)/views({_NUM_VIEWS - 1})/guideViewPosition/rotation "
+            "must be an array of numbers."
+        )
+        assert expected_message in result.stderr
+
+    median_seconds = statistics.median(durations)
+    record_property("median_seconds", median_seconds)
+    benchmark_metrics["wall_time"] = Metric(
+        kind=MetricKind.LATENCY,
+        unit="seconds",
+        samples=tuple(durations),
+    )
+    assert median_seconds < _BUDGET_SECONDS
@@ -0,0 +1,175 @@
+"""Benchmarks for getting recognition counts reports.
+
+The mock does not count recognitions, so it gives reports with only a
+header. Here it gives a synthetic report instead, so that large reports go
+through the same requests, polling and download as real reports.
+"""
+
+import statistics
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from mock_vws import MockVWS
+from mock_vws.database import CloudDatabase
+from mock_vws.reco_counts import RecoCountsReport
+
+from benchmarks._results import Metric, MetricKind
+from vws_cli import vws_group
+
+_REPETITIONS = 5
+
+# The fewest report rows to process per second. This is generous so that
+# the benchmark is not flaky on slow machines, while still catching
+# processing which scales badly.
+_MINIMUM_ROWS_PER_SECOND = 50_000
+
+# The mock holds the whole report in memory, and copies it once while
+# serving it. Streaming output needs little memory beyond that, whereas
+# holding the parsed rows needs several times the size of the report.
+_REPORT_COPIES_BUDGET = 3
+_PEAK_MEMORY_OVERHEAD_BUDGET_BYTES = 32 * 1024 * 1024
+
+
+def _synthetic_report(*, num_rows: int) -> bytes:
+    """Return a recognition counts report with ``num_rows`` targets.
+
+    Target IDs have the same form as Vuforia target IDs, and some targets
+    have not been recognized.
+    """
+    rows = (
+        f"{index:032x},{index % 97}\r\n".encode() for index in range(num_rows)
+    )
+    return b"target_id,reco_count\r\n" + b"".join(rows)
+
+
+@pytest.fixture(name="database")
+def fixture_database() -> Iterator[CloudDatabase]:
+    """Yield a mock ``CloudDatabase`` which generates reports immediately."""
+    database = CloudDatabase()
+    with MockVWS(processing_time_seconds=0) as mock:
+        mock.add_cloud_database(cloud_database=database)
+        yield database
+
+
+@pytest.mark.parametrize(
+    argnames="num_rows",
+    argvalues=[
+        pytest.param(10_000, id="10k"),
+        pytest.param(100_000, id="100k"),
+        pytest.param(1_000_000, id="1m"),
+    ],
+)
+@pytest.mark.parametrize(
+    argnames="extra_args",
+    argvalues=[
+        # The report is written as it is downloaded, without being parsed.
+        pytest.param([], id="download-and-write"),
+        # Each row is parsed and written again.
+        pytest.param(["--format", "ndjson"], id="parse-and-write"),
+        pytest.param(["--summary"], id="summary"),
+    ],
+)
+def test_reco_counts_report(
+    *,
+    database: CloudDatabase,
+    num_rows: int,
+    extra_args: list[str],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Large reports are downloaded, written and summarized quickly, and
+    streaming output does not hold the parsed report in memory.
+    """
+    report = _synthetic_report(num_rows=num_rows)
+
+    def csv_content(_: RecoCountsReport) -> bytes:
+        """Give the synthetic report."""
+        return report
+
+    monkeypatch.setattr(
+        target=RecoCountsReport,
+        name="csv_content",
+        value=property(fget=csv_content),
+    )
+    output_file_path = tmp_path / "report"
+    args = [
+        "get-database-reco-counts-report",
+        "--server-access-key",
+        database.server_access_key,
+        "--server-secret-key",
+        database.server_secret_key,
+        "--database-id",
+        database.database_id,
+        "--seconds-between-requests",
+        "0.05",
+        "--output",
+        str(object=output_file_path),
+        *extra_args,
+    ]
+    runner = CliRunner()
+
+    def get_report() -> None:
+        """Get the report, and check that it was written."""
+        output_file_path.unlink(missing_ok=True)
+        result = runner.invoke(
+            cli=vws_group,
+            args=args,
+            catch_exceptions=False,
+            color=True,
+        )
+        assert result.exit_code == 0, result.output
+        assert output_file_path.stat().st_size
+
+    durations: list[float] = []
+    for _ in range(_REPETITIONS):
+        start = time.perf_counter()
+        get_report()
+        durations.append(time.perf_counter() - start)
+
+    # Tracing allocations slows everything down, so memory is measured in
+    # a separate run.
+    tracemalloc.start()
+    try:
+        get_report()
+        _, peak_traced_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    median_seconds = statistics.median(durations)
+    rows_per_second = num_rows / median_seconds
+    record_property("median_seconds", median_seconds)
+    record_property("rows_per_second", rows_per_second)
+    record_property("megabytes_per_second", len(report) / median_seconds / 1e6)
+    record_property("peak_traced_bytes", peak_traced_bytes)
+    benchmark_metrics["wall_time"] = Metric(
+        kind=MetricKind.LATENCY,
+        unit="seconds",
+        samples=tuple(durations),
+    )
+    benchmark_metrics["rows_per_second"] = Metric(
+        kind=MetricKind.THROUGHPUT,
+        unit="rows per second",
+        samples=tuple(num_rows / duration for duration in durations),
+    )
+    benchmark_metrics["peak_traced_memory"] = Metric(
+        kind=MetricKind.MEMORY,
+        unit="bytes",
+        samples=(float(peak_traced_bytes),),
+    )
+
+    assert rows_per_second > _MINIMUM_ROWS_PER_SECOND
+    # The IDs of recognized targets are kept for a summary, to find the
+    # targets which were not recognized, so its memory grows with the
+    # report.
+    if "--summary" not in extra_args:
+        memory_budget_bytes = (
+            len(report) * _REPORT_COPIES_BUDGET
+            + _PEAK_MEMORY_OVERHEAD_BUDGET_BYTES
+        )
+        assert peak_traced_bytes < memory_budget_bytes
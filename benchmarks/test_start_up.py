@@ -0,0 +1,276 @@
+"""Benchmarks for the start-up time of each entry point.
+
+Pipelines run ``vws``, ``vuforia-cloud-reco`` and ``vumark`` as
+short-lived processes, so each is run here as a new process.
+
+A cold start is a run with an empty bytecode cache, so that every module
+is compiled before it is run. The operating system's file cache is not
+emptied, so this is quicker than the first run after installing. Warm
+starts use the bytecode cache written by the first cold start.
+
+The time taken to import each module is given by ``python -X importtime``.
+Optional dependencies which are slow to import must not be imported at
+start-up. Times are checked against budgets here, and against earlier
+results with ``--benchmark-baseline``.
+"""
+
+import dataclasses
+import io
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+from benchmarks._results import Metric, MetricKind
+
+_REPETITIONS = 5
+
+# The median time allowed for a warm start which shows help or the
+# version. These leave room for slow machines, so smaller slowdowns are
+# caught by comparing with a baseline from the same machine.
+_WARM_START_BUDGET_SECONDS = 2.5
+_COLD_START_BUDGET_SECONDS = 5.0
+
+# The median time allowed to import an entry point on a warm start, as
+# measured by ``python -X importtime``, which adds to the time taken.
+_IMPORT_BUDGET_SECONDS = 2.5
+
+# Packages which are imported only by the commands which need them, as
+# they are slow to import.
+_DEFERRED_PACKAGES = frozenset({"pyarrow"})
+
+# The median time allowed for a warm start which runs a command against
+# the mock. This includes starting the mock, which imports many modules.
+_MOCK_COMMAND_BUDGET_SECONDS = 10.0
+
+# The time taken to import this many of the slowest modules to import, not
+# including the modules which they import, is recorded.
+_SLOWEST_IMPORTS = 20
+
+_ENTRY_POINTS = [
+    pytest.param("vws", "vws_cli", "vws_group", id="vws"),
+    pytest.param(
+        "vuforia-cloud-reco",
+        "vws_cli.query",
+        "vuforia_cloud_reco",
+        id="vuforia-cloud-reco",
+    ),
+    pytest.param("vumark", "vws_cli.vumark", "generate_vumark", id="vumark"),
+]
+
+
+@dataclasses.dataclass(frozen=True)
+class _ImportTime:
+    """The time taken to import a module, as given by ``python -X
+    importtime``.
+
+    The cumulative time includes the time taken to import the modules which
+    the module imports.
+    """
+
+    module_name: str
+    self_microseconds: int
+    cumulative_microseconds: int
+    imported_by_another_module: bool
+
+
+def _import_times(*, stderr: str) -> list[_ImportTime]:
+    """Get the time taken to import each module from the output of
+    ``python -X importtime``.
+    """
+    import_times: list[_ImportTime] = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time, cumulative, imported_package = line.split(sep="|")
+        # The header has no numbers.
+        if not cumulative.strip().isdigit():
+            continue
+        import_times.append(
+            _ImportTime(
+                module_name=imported_package.strip(),
+                self_microseconds=int(self_time.removeprefix("import time:")),
+                cumulative_microseconds=int(cumulative),
+                # Modules imported by other modules are indented further.
+                imported_by_another_module=imported_package.startswith("   "),
+            ),
+        )
+    return import_times
+
+
+def _import_seconds(*, import_times: list[_ImportTime]) -> float:
+    """Get the time taken to import the VWS CLI."""
+    microseconds = sum(
+        import_time.cumulative_microseconds
+        for import_time in import_times
+        if not import_time.imported_by_another_module
+        and import_time.module_name.split(sep=".")[0] == "vws_cli"
+    )
+    return microseconds / 1e6
+
+
+def _benchmark_start(
+    *,
+    args: list[str],
+    tmp_path: Path,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> float:
+    """Run a process several times from a cold start and several times from
+    a warm start, record how long each took and how long imports took, and
+    give the median time of a warm start.
+    """
+
+    def run(*, pycache_prefix: Path) -> tuple[float, list[_ImportTime]]:
+        """Run the process with the given bytecode cache, and give how long
+        it took and the import times.
+        """
+        env = {**os.environ, "PYTHONPYCACHEPREFIX": str(object=pycache_prefix)}
+        start = time.perf_counter()
+        # The arguments are fixed by the benchmarks in this module, and are
+        # run with the interpreter which runs the benchmarks.
+        result = subprocess.run(  # noqa: S603
+            args=[sys.executable, "-X", "importtime", *args],
+            capture_output=True,
+            check=False,
+            env=env,
+            text=True,
+        )
+        duration = time.perf_counter() - start
+        assert result.returncode == 0, result.stderr
+        return duration, _import_times(stderr=result.stderr)
+
+    cold_durations: list[float] = []
+    for repetition in range(_REPETITIONS):
+        pycache_prefix = tmp_path / f"pycache-{repetition}"
+        cold_duration, _ = run(pycache_prefix=pycache_prefix)
+        cold_durations.append(cold_duration)
+
+    durations: list[float] = []
+    import_durations: list[float] = []
+    import_times: list[_ImportTime] = []
+    for _ in range(_REPETITIONS):
+        duration, import_times = run(pycache_prefix=tmp_path / "pycache-0")
+        durations.append(duration)
+        import_durations.append(_import_seconds(import_times=import_times))
+
+    deferred_imports = sorted(
+        {
+            import_time.module_name.split(sep=".")[0]
+            for import_time in import_times
+        }
+        & _DEFERRED_PACKAGES,
+    )
+    assert not deferred_imports
+
+    median_cold_start_seconds = statistics.median(cold_durations)
+    median_seconds = statistics.median(durations)
+    median_import_seconds = statistics.median(import_durations)
+    slowest_imports = sorted(
+        import_times,
+        key=lambda import_time: import_time.self_microseconds,
+        reverse=True,
+    )[:_SLOWEST_IMPORTS]
+    record_property("repetitions", _REPETITIONS)
+    record_property("median_cold_start_seconds", median_cold_start_seconds)
+    record_property("median_warm_start_seconds", median_seconds)
+    record_property("median_import_seconds", median_import_seconds)
+    record_property(
+        "slowest_imports_self_microseconds",
+        json.dumps(
+            obj={
+                import_time.module_name: import_time.self_microseconds
+                for import_time in slowest_imports
+            },
+        ),
+    )
+    benchmark_metrics["cold_start_time"] = Metric(
+        kind=MetricKind.LATENCY,
+        unit="seconds",
+        samples=tuple(cold_durations),
+    )
+    benchmark_metrics["warm_start_time"] = Metric(
+        kind=MetricKind.LATENCY,
+        unit="seconds",
+        samples=tuple(durations),
+    )
+    benchmark_metrics["import_time"] = Metric(
+        kind=MetricKind.LATENCY,
+        unit="seconds",
+        samples=tuple(import_durations),
+    )
+    assert median_cold_start_seconds < _COLD_START_BUDGET_SECONDS
+    assert median_import_seconds < _IMPORT_BUDGET_SECONDS
+    return median_seconds
+
+
+@pytest.mark.parametrize(
+    argnames=("prog_name", "module_name", "function_name"),
+    argvalues=_ENTRY_POINTS,
+)
+@pytest.mark.parametrize(argnames="option", argvalues=["--help", "--version"])
+def test_start_up(
+    *,
+    prog_name: str,
+    module_name: str,
+    function_name: str,
+    option: str,
+    tmp_path: Path,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Each entry point starts quickly to show help or the version.
+
+    The entry point is run as its console script runs it.
+    """
+    code = (
+        "import sys\n"
+        f"from {module_name} import {function_name}\n"
+        f"sys.exit({function_name}(prog_name={prog_name!r}))\n"
+    )
+    median_seconds = _benchmark_start(
+        args=["-c", code, option],
+        tmp_path=tmp_path,
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+    assert median_seconds < _WARM_START_BUDGET_SECONDS
+
+
+@pytest.mark.parametrize(
+    argnames="prog_name",
+    argvalues=["vws", "vuforia-cloud-reco", "vumark"],
+)
+def test_mock_command_start_up(
+    *,
+    prog_name: str,
+    high_quality_image: io.BytesIO,
+    tmp_path: Path,
+    record_property: Callable[[str, object], None],
+    benchmark_metrics: dict[str, Metric],
+) -> None:
+    """Each entry point starts quickly to run a command against the mock.
+
+    The command is run by ``_mock_command.py``, which imports the entry
+    point itself.
+    """
+    image_file_path = tmp_path / "image.png"
+    image_file_path.write_bytes(data=high_quality_image.getvalue())
+    median_seconds = _benchmark_start(
+        args=[
+            str(object=Path(__file__).parent / "_mock_command.py"),
+            prog_name,
+            str(object=image_file_path),
+            str(object=tmp_path / "vumark.png"),
+        ],
+        tmp_path=tmp_path,
+        record_property=record_property,
+        benchmark_metrics=benchmark_metrics,
+    )
+    assert median_seconds < _MOCK_COMMAND_BUDGET_SECONDS
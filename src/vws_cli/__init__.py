@@ -1,5 +1,11 @@
 """A CLI for Vuforia Web Services."""
 
+# isort: off
+# This is imported first so that the time taken by the imports which follow
+# it can be shown with ``--timings``.
+import vws_cli._import_time  # noqa: F401
+# isort: on
+
 from importlib.metadata import PackageNotFoundError, version
 
 import click
@@ -7,23 +13,40 @@ from beartype import beartype
 
 from vws_cli.commands import (
     add_target,
+    compare_reco_counts,
     delete_target,
+    export_target_records,
+    fetch_reco_counts_report,
     get_database_reco_counts_report,
     get_database_summary_report,
     get_duplicate_targets,
+    get_reco_counts_history,
     get_target_record,
     get_target_summary_report,
     list_targets,
+    update_reco_counts_history,
     update_target,
     wait_for_target_processed,
 )
 from vws_cli.model_target import (
     create_model_target_dataset,
     delete_model_target_dataset,
+    delete_model_target_datasets,
     download_model_target_dataset,
+    download_model_target_datasets,
+    generate_model_target_datasets,
     get_model_target_dataset_status,
+    list_model_target_datasets,
+    refresh_model_target_datasets,
     wait_for_model_target_dataset_generated,
 )
+from vws_cli.options.api_call_ledger import job_tag_option, ledger_file_option
+from vws_cli.options.memory import trace_memory_option
+from vws_cli.options.metrics import metrics_file_option
+from vws_cli.options.profiling import profile_option
+from vws_cli.options.timings import timings_option
+from vws_cli.options.tracing import trace_file_option
+from vws_cli.usage import usage
 
 _CONTEXT_SETTINGS = {"help_option_names": ["-h", "--help"]}
 
@@ -42,23 +65,41 @@ except PackageNotFoundError:  # pragma: no cover
 #
 # Click uses ``pkg_resources`` to determine the version if it is not given.
 @click.version_option(version=__version__)
+@timings_option
+@trace_file_option
+@metrics_file_option
+@profile_option
+@trace_memory_option
+@ledger_file_option
+@job_tag_option
 @beartype
 def vws_group() -> None:
     """Manage a Vuforia Web Services cloud database."""
 
 
 vws_group.add_command(cmd=add_target)
+vws_group.add_command(cmd=compare_reco_counts)
 vws_group.add_command(cmd=create_model_target_dataset)
 vws_group.add_command(cmd=delete_model_target_dataset)
+vws_group.add_command(cmd=delete_model_target_datasets)
 vws_group.add_command(cmd=delete_target)
 vws_group.add_command(cmd=download_model_target_dataset)
+vws_group.add_command(cmd=download_model_target_datasets)
+vws_group.add_command(cmd=export_target_records)
+vws_group.add_command(cmd=fetch_reco_counts_report)
+vws_group.add_command(cmd=generate_model_target_datasets)
 vws_group.add_command(cmd=get_database_reco_counts_report)
 vws_group.add_command(cmd=get_database_summary_report)
 vws_group.add_command(cmd=get_duplicate_targets)
 vws_group.add_command(cmd=get_model_target_dataset_status)
+vws_group.add_command(cmd=get_reco_counts_history)
 vws_group.add_command(cmd=get_target_record)
 vws_group.add_command(cmd=get_target_summary_report)
+vws_group.add_command(cmd=list_model_target_datasets)
 vws_group.add_command(cmd=list_targets)
+vws_group.add_command(cmd=refresh_model_target_datasets)
+vws_group.add_command(cmd=update_reco_counts_history)
 vws_group.add_command(cmd=update_target)
+vws_group.add_command(cmd=usage)
 vws_group.add_command(cmd=wait_for_model_target_dataset_generated)
 vws_group.add_command(cmd=wait_for_target_processed)
@@ -0,0 +1,255 @@
+"""A local ledger of the HTTP requests made to Vuforia, for accounting for
+request quotas.
+
+Vuforia request quotas are per database per month. A record is added to
+the ledger for each attempt at a request, with a fingerprint of the
+credential which it was made with, so that the requests made for each
+database, by each command and by each tagged job can be counted. The
+ledger is a SQLite database, so that processes can add to it at the same
+time.
+"""
+
+import dataclasses
+import datetime
+import hashlib
+import sqlite3
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+import click
+from beartype import beartype
+
+from vws_cli._local_storage import connect_to_sqlite, sqlite_connection
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS api_calls (
+    requested_at REAL NOT NULL,
+    credential_fingerprint TEXT NOT NULL,
+    job_tag TEXT,
+    command TEXT NOT NULL,
+    method TEXT NOT NULL,
+    endpoint TEXT NOT NULL,
+    status TEXT NOT NULL,
+    quota_error INTEGER NOT NULL,
+    latency_seconds REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS api_calls_by_time ON api_calls (requested_at);
+"""
+
+_LEDGER_FILE_PATH_META_KEY = "vws_cli.api_call_ledger_file_path"
+_JOB_TAG_META_KEY = "vws_cli.job_tag"
+
+# Credential fingerprints are this many hexadecimal digits of a hash of the
+# credential.
+_FINGERPRINT_LENGTH = 12
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class ApiCall:
+    """An attempt at an HTTP request to Vuforia.
+
+    The status is the status code of the response, or the name of the
+    exception raised if there was no response.
+    """
+
+    requested_at: datetime.datetime
+    credential_fingerprint: str
+    job_tag: str | None
+    command: str
+    method: str
+    endpoint: str
+    status: str
+    quota_error: bool
+    latency_seconds: float
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class ApiCallUsage:
+    """The HTTP requests made on a day (UTC) with a credential, by a command
+    in a tagged job, to an endpoint.
+
+    Errors are requests which were not given a successful response.
+    """
+
+    day: datetime.date
+    credential_fingerprint: str
+    job_tag: str | None
+    command: str
+    endpoint: str
+    requests: int
+    errors: int
+    quota_errors: int
+    mean_latency_seconds: float
+
+
+@beartype
+def credential_fingerprint(*, credential: str) -> str:
+    """Get a fingerprint of a credential, which identifies it without
+    revealing it.
+    """
+    credential_hash = hashlib.sha256(credential.encode()).hexdigest()
+    return credential_hash[:_FINGERPRINT_LENGTH]
+
+
+@beartype
+class ApiCallLedger:
+    """A connection to a ledger, which adds records from any thread.
+
+    The connection is opened when the first record is added, so that no file
+    is created by commands which make no requests.
+    """
+
+    def __init__(self, *, ledger_file_path: Path) -> None:
+        """Add records to the ledger at the given path."""
+        self._ledger_file_path = ledger_file_path
+        self._lock = threading.Lock()
+        self._connection: sqlite3.Connection | None = None
+
+    def record(self, *, api_call: ApiCall) -> None:
+        """Add a record of an HTTP request to the ledger."""
+        with self._lock:
+            if self._connection is None:
+                self._connection = connect_to_sqlite(
+                    database_path=self._ledger_file_path,
+                    schema=_SCHEMA,
+                )
+            with self._connection:
+                self._connection.execute(
+                    "INSERT INTO api_calls VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        api_call.requested_at.timestamp(),
+                        api_call.credential_fingerprint,
+                        api_call.job_tag,
+                        api_call.command,
+                        api_call.method,
+                        api_call.endpoint,
+                        api_call.status,
+                        api_call.quota_error,
+                        api_call.latency_seconds,
+                    ),
+                )
+
+    def close(self) -> None:
+        """Close the connection to the ledger, if it is open."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+@beartype
+def get_api_call_usage(
+    *,
+    ledger_file_path: Path,
+    since: datetime.date | None,
+) -> Sequence[ApiCallUsage]:
+    """Get the HTTP requests in the ledger, counted by day, credential, job
+    tag, command and endpoint, from the given day (UTC) onwards.
+    """
+    since_timestamp = (
+        0.0
+        if since is None
+        else datetime.datetime.combine(
+            date=since,
+            time=datetime.time(),
+            tzinfo=datetime.UTC,
+        ).timestamp()
+    )
+    with sqlite_connection(
+        database_path=ledger_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        rows = connection.execute(
+            "SELECT date(requested_at, 'unixepoch') AS day, "
+            "credential_fingerprint, job_tag, command, endpoint, "
+            "count(*), "
+            "sum(status NOT GLOB '2[0-9][0-9]'), "
+            "sum(quota_error), "
+            "avg(latency_seconds) "
+            "FROM api_calls WHERE requested_at >= ? "
+            "GROUP BY day, credential_fingerprint, job_tag, command, "
+            "endpoint "
+            "ORDER BY day, credential_fingerprint, job_tag, command, "
+            "endpoint",
+            (since_timestamp,),
+        ).fetchall()
+    return [
+        ApiCallUsage(
+            day=datetime.date.fromisoformat(day),
+            credential_fingerprint=fingerprint,
+            job_tag=job_tag,
+            command=command,
+            endpoint=endpoint,
+            requests=requests,
+            errors=errors,
+            quota_errors=quota_errors,
+            mean_latency_seconds=mean_latency_seconds,
+        )
+        for (
+            day,
+            fingerprint,
+            job_tag,
+            command,
+            endpoint,
+            requests,
+            errors,
+            quota_errors,
+            mean_latency_seconds,
+        ) in rows
+    ]
+
+
+@beartype
+def start_api_call_ledger(
+    *,
+    ctx: click.Context,
+    ledger_file_path: Path,
+) -> None:
+    """Add a record to the given ledger for each HTTP request which the
+    command of the given context makes.
+    """
+    ctx.meta[_LEDGER_FILE_PATH_META_KEY] = ledger_file_path
+
+
+@beartype
+def set_job_tag(*, ctx: click.Context, job_tag: str) -> None:
+    """Tag the records of the HTTP requests which the command of the given
+    context makes.
+    """
+    ctx.meta[_JOB_TAG_META_KEY] = job_tag
+
+
+@beartype
+def current_api_call_ledger_file_path() -> Path | None:
+    """Get the path to the ledger of the current command, if it has one."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return None
+    ledger_file_path = ctx.meta.get(_LEDGER_FILE_PATH_META_KEY)
+    if isinstance(ledger_file_path, Path):
+        return ledger_file_path
+    return None
+
+
+@beartype
+def current_job_tag() -> str | None:
+    """Get the job tag of the current command, if it has one."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return None
+    job_tag = ctx.meta.get(_JOB_TAG_META_KEY)
+    if isinstance(job_tag, str):
+        return job_tag
+    return None
+
+
+@beartype
+def current_command_name() -> str:
+    """Get the name of the current command, as it was run."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return ""
+    return ctx.command_path
@@ -0,0 +1,165 @@
+"""A content-addressed cache of downloaded Model Target datasets.
+
+Vuforia never changes a dataset once it has been generated, so a dataset
+which has been downloaded once can be served from disk from then on.
+"""
+
+import dataclasses
+import hashlib
+import uuid
+from pathlib import Path
+
+from beartype import beartype
+from vws.model_target_datasets import ModelTargetDatasetType
+
+from vws_cli._local_storage import sqlite_connection
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    base_vws_url TEXT NOT NULL,
+    dataset_type TEXT NOT NULL,
+    dataset_uuid TEXT NOT NULL,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used INTEGER NOT NULL,
+    PRIMARY KEY (base_vws_url, dataset_type, dataset_uuid)
+);
+"""
+
+# ``last_used`` is a counter rather than a time, so that the order of uses is
+# known even when the clock is too coarse to tell them apart.
+_NEXT_USE = "(SELECT COALESCE(MAX(last_used), 0) + 1 FROM entries)"
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class DatasetCache:
+    """A cache of dataset zip files, keyed by base URL, dataset type and
+    dataset UUID.
+
+    The zip files are stored by their SHA-256 checksums, and are checked
+    against those checksums when they are read. When the files take up more
+    than ``max_size_bytes``, the least recently used files are removed.
+    """
+
+    directory_path: Path
+    max_size_bytes: int
+
+    @property
+    def _index_path(self) -> Path:
+        """The path to the index of cached datasets."""
+        return self.directory_path / "index.sqlite3"
+
+    def _blob_path(self, *, sha256: str) -> Path:
+        """The path to a cached file with the given checksum."""
+        return self.directory_path / "blobs" / sha256
+
+    def get(
+        self,
+        *,
+        base_vws_url: str,
+        dataset_type: ModelTargetDatasetType,
+        dataset_uuid: str,
+    ) -> bytes | None:
+        """Get a cached dataset, or ``None`` if the dataset is not cached.
+
+        A cached file which does not match its checksum is removed.
+        """
+        if not self._index_path.exists():
+            return None
+
+        key = (base_vws_url, dataset_type.value, dataset_uuid)
+        with sqlite_connection(
+            database_path=self._index_path,
+            schema=_SCHEMA,
+        ) as connection:
+            row = connection.execute(
+                "SELECT sha256 FROM entries WHERE base_vws_url = ? "
+                "AND dataset_type = ? AND dataset_uuid = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+
+            (sha256,) = row
+            try:
+                dataset = self._blob_path(sha256=sha256).read_bytes()
+            except FileNotFoundError:
+                dataset = None
+
+            if dataset is None or hashlib.sha256(dataset).hexdigest() != (
+                sha256
+            ):
+                connection.execute(
+                    "DELETE FROM entries WHERE sha256 = ?",
+                    (sha256,),
+                )
+                self._blob_path(sha256=sha256).unlink(missing_ok=True)
+                return None
+
+            connection.execute(
+                f"UPDATE entries SET last_used = {_NEXT_USE} "  # noqa: S608
+                "WHERE base_vws_url = ? AND dataset_type = ? "
+                "AND dataset_uuid = ?",
+                key,
+            )
+        return dataset
+
+    def add(
+        self,
+        *,
+        base_vws_url: str,
+        dataset_type: ModelTargetDatasetType,
+        dataset_uuid: str,
+        dataset: bytes,
+    ) -> None:
+        """Add a dataset to the cache, and then remove the least recently
+        used datasets until the cache fits in its maximum size.
+        """
+        sha256 = hashlib.sha256(dataset).hexdigest()
+        blob_path = self._blob_path(sha256=sha256)
+        if not blob_path.exists():
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so that other processes never
+            # read a partly written file.
+            temporary_path = blob_path.with_name(
+                name=f".{sha256}.{uuid.uuid4().hex}",
+            )
+            try:
+                temporary_path.write_bytes(data=dataset)
+                temporary_path.replace(target=blob_path)
+            finally:
+                temporary_path.unlink(missing_ok=True)
+
+        with sqlite_connection(
+            database_path=self._index_path,
+            schema=_SCHEMA,
+        ) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO entries "  # noqa: S608
+                f"VALUES (?, ?, ?, ?, ?, {_NEXT_USE})",
+                (
+                    base_vws_url,
+                    dataset_type.value,
+                    dataset_uuid,
+                    sha256,
+                    len(dataset),
+                ),
+            )
+
+            # Several datasets may share one file, so sizes are counted once
+            # per file.
+            files = connection.execute(
+                "SELECT sha256, size FROM entries GROUP BY sha256 "
+                "ORDER BY MAX(last_used) DESC",
+            ).fetchall()
+            total_size = 0
+            for file_sha256, size in files:
+                total_size += size
+                if total_size <= self.max_size_bytes:
+                    continue
+                connection.execute(
+                    "DELETE FROM entries WHERE sha256 = ?",
+                    (file_sha256,),
+                )
+                self._blob_path(sha256=file_sha256).unlink(missing_ok=True)
@@ -0,0 +1,9 @@
+"""The time at which the VWS CLI started to be imported.
+
+This module is imported before any other, including third party modules, so
+that ``--timings`` can show how long the imports took.
+"""
+
+import time
+
+IMPORT_STARTED_AT = time.perf_counter()
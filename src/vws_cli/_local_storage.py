@@ -0,0 +1,85 @@
+"""Files which the VWS CLI keeps on the local machine between runs."""
+
+import contextlib
+import sqlite3
+import uuid
+from collections.abc import Generator
+from pathlib import Path
+
+import click
+from beartype import beartype
+
+_APP_NAME = "vws-cli"
+
+# The number of seconds to wait for another process to finish writing to a
+# SQLite database.
+_SQLITE_TIMEOUT_SECONDS = 30
+
+
+@beartype
+def default_path(*, file_name: str) -> Path:
+    """Get the default path to a file in the application directory."""
+    return Path(click.get_app_dir(app_name=_APP_NAME)) / file_name
+
+
+@beartype
+def connect_to_sqlite(
+    *,
+    database_path: Path,
+    schema: str,
+) -> sqlite3.Connection:
+    """Connect to a SQLite database, creating any missing tables.
+
+    The connection can be used from any thread, but not by two threads at
+    once.
+    """
+    database_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(
+        database=database_path,
+        timeout=_SQLITE_TIMEOUT_SECONDS,
+        check_same_thread=False,
+    )
+    try:
+        connection.executescript(schema)
+    except sqlite3.Error:
+        connection.close()
+        raise
+    return connection
+
+
+@beartype
+@contextlib.contextmanager
+def sqlite_connection(
+    *,
+    database_path: Path,
+    schema: str,
+) -> Generator[sqlite3.Connection]:
+    """Connect to a SQLite database, creating any missing tables.
+
+    Changes are committed if the context exits without an error, and rolled
+    back otherwise.
+    """
+    connection = connect_to_sqlite(database_path=database_path, schema=schema)
+    try:
+        with connection:
+            yield connection
+    finally:
+        connection.close()
+
+
+@beartype
+@contextlib.contextmanager
+def partial_file_path(*, output_file_path: Path) -> Generator[Path]:
+    """Give a path to write output to, which is moved to the given path only
+    if the context exits without an error.
+
+    This means that a file is written in full or not at all.
+    """
+    path = output_file_path.with_name(
+        name=f".{output_file_path.name}.{uuid.uuid4().hex}.part",
+    )
+    try:
+        yield path
+        path.replace(target=output_file_path)
+    finally:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,155 @@
+"""Memory allocations of commands, which are shown with ``--trace-memory``.
+
+Allocations are traced with ``tracemalloc``. ``tracemalloc`` gives the
+peak size of traced memory, but not where that memory was allocated, so
+while a command runs the traced memory is sampled, and a snapshot is taken
+whenever more is in use than at any earlier sample. The allocation sites
+are shown from that snapshot.
+"""
+
+import dataclasses
+import threading
+import tracemalloc
+
+import yaml
+from beartype import beartype
+
+# Traced memory is sampled this often.
+_SAMPLE_INTERVAL_SECONDS = 0.05
+
+# This many allocation sites are shown.
+_TOP_ALLOCATION_SITES = 10
+
+# Allocations made by tracing itself, and by importing modules, are not
+# shown.
+_SNAPSHOT_FILTERS = tuple(
+    tracemalloc.Filter(inclusive=False, filename_pattern=filename_pattern)
+    for filename_pattern in (
+        tracemalloc.__file__,
+        "<frozen importlib.*>",
+        "<unknown>",
+    )
+)
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class AllocationSite:
+    """Memory allocated at a line of source code."""
+
+    filename: str
+    line_number: int
+    size_bytes: int
+    count: int
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class MemoryReport:
+    """The memory allocated by a command.
+
+    The allocation sites are those of the memory in use at the sample with
+    the most memory in use, which is at most ``peak_bytes``.
+    """
+
+    peak_bytes: int
+    sampled_peak_bytes: int
+    allocation_sites: list[AllocationSite]
+
+
+@beartype
+class MemoryTracer:
+    """A tracer of the memory which a command allocates."""
+
+    def __init__(self, *, interval_seconds: float) -> None:
+        """Create a tracer which has not started."""
+        self._interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self._sampled_peak_bytes = 0
+        self._peak_snapshot: tracemalloc.Snapshot | None = None
+        # Memory may already be traced, for example with
+        # ``PYTHONTRACEMALLOC``, and then tracing is not stopped.
+        self._started_tracing = False
+        self._thread = threading.Thread(
+            target=self._run,
+            name="memory-sampler",
+            daemon=True,
+        )
+
+    def _sample(self) -> None:
+        """Take a snapshot if more memory is in use than at any earlier
+        sample.
+        """
+        current_bytes, _ = tracemalloc.get_traced_memory()
+        if current_bytes > self._sampled_peak_bytes:
+            self._sampled_peak_bytes = current_bytes
+            self._peak_snapshot = tracemalloc.take_snapshot()
+
+    def _run(self) -> None:
+        """Sample traced memory at each interval until stopped."""
+        while not self._stopped.wait(timeout=self._interval_seconds):
+            self._sample()
+
+    def start(self) -> None:
+        """Start tracing memory allocations."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._thread.start()
+
+    def stop(self) -> MemoryReport:
+        """Stop tracing memory allocations, and report on them."""
+        self._stopped.set()
+        self._thread.join()
+        self._sample()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            tracemalloc.stop()
+        allocation_sites: list[AllocationSite] = []
+        if self._peak_snapshot is not None:
+            statistics = self._peak_snapshot.filter_traces(
+                filters=_SNAPSHOT_FILTERS,
+            ).statistics(key_type="lineno")
+            for statistic in statistics[:_TOP_ALLOCATION_SITES]:
+                frame = statistic.traceback[0]
+                allocation_sites.append(
+                    AllocationSite(
+                        filename=frame.filename,
+                        line_number=frame.lineno,
+                        size_bytes=statistic.size,
+                        count=statistic.count,
+                    ),
+                )
+        return MemoryReport(
+            peak_bytes=peak_bytes,
+            sampled_peak_bytes=self._sampled_peak_bytes,
+            allocation_sites=allocation_sites,
+        )
+
+
+@beartype
+def memory_yaml(*, report: MemoryReport) -> str:
+    """Get a YAML representation of the memory allocated by a command."""
+    data = {
+        "peak_bytes": report.peak_bytes,
+        "sampled_peak_bytes": report.sampled_peak_bytes,
+        "top_allocation_sites": [
+            {
+                "location": (
+                    f"{allocation_site.filename}:{allocation_site.line_number}"
+                ),
+                "size_bytes": allocation_site.size_bytes,
+                "count": allocation_site.count,
+            }
+            for allocation_site in report.allocation_sites
+        ],
+    }
+    return yaml.dump(data={"memory": data}, sort_keys=False)
+
+
+@beartype
+def start_memory_tracing() -> MemoryTracer:
+    """Start tracing the memory which the running command allocates."""
+    memory_tracer = MemoryTracer(interval_seconds=_SAMPLE_INTERVAL_SECONDS)
+    memory_tracer.start()
+    return memory_tracer
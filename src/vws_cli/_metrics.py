@@ -0,0 +1,432 @@
+"""Counters and histograms of the requests and operations of a command,
+which are written with ``--metrics-file``.
+
+Metrics are written in the Prometheus text format, so that they can be
+collected by the textfile collector of the Prometheus node exporter. Like
+spans, metrics are recorded from every thread, so the metrics of a command
+are kept for the whole process. Nothing is recorded unless
+``--metrics-file`` is given.
+"""
+
+import contextlib
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+import click
+from beartype import beartype
+
+# The upper bounds of the buckets of the request duration histogram.
+_REQUEST_DURATION_BUCKETS_SECONDS = (
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    math.inf,
+)
+
+# Target IDs and dataset UUIDs in request paths are replaced, so that there
+# is one endpoint for all targets.
+_ID_PATTERN = re.compile(
+    pattern=r"[0-9a-f]{32}|[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}",
+    flags=re.IGNORECASE,
+)
+_ID_PLACEHOLDER = ":id"
+
+_REQUESTS = "vws_cli_requests_total"
+_SENT_BYTES = "vws_cli_request_sent_bytes_total"
+_RECEIVED_BYTES = "vws_cli_response_received_bytes_total"
+_RETRIES = "vws_cli_request_retries_total"
+_QUOTA_ERRORS = "vws_cli_quota_errors_total"
+_OPERATIONS = "vws_cli_operations_total"
+_REQUEST_DURATION = "vws_cli_request_duration_seconds"
+_COMMAND_RUNNING = "vws_cli_command_running"
+_COMMAND_DURATION = "vws_cli_command_duration_seconds"
+
+_COUNTER_HELP = {
+    _REQUESTS: "HTTP requests made to Vuforia, by endpoint and status.",
+    _SENT_BYTES: "Bytes sent in the bodies of HTTP requests.",
+    _RECEIVED_BYTES: "Bytes received in the bodies of HTTP responses.",
+    _RETRIES: "HTTP requests which were tried again.",
+    _QUOTA_ERRORS: (
+        "HTTP requests rejected because of a request quota or a rate limit."
+    ),
+    _OPERATIONS: (
+        "Items processed, such as targets or datasets, by operation and "
+        "outcome."
+    ),
+}
+
+_Labels = tuple[tuple[str, str], ...]
+
+
+@beartype
+def endpoint(*, url: str) -> str:
+    """Get the path of a URL, with IDs replaced by a placeholder."""
+    path = urllib.parse.urlsplit(url=url).path
+    return "/".join(
+        _ID_PLACEHOLDER if _ID_PATTERN.fullmatch(string=segment) else segment
+        for segment in path.split(sep="/")
+    )
+
+
+@beartype
+def _escape_label_value(*, value: str) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+@beartype
+def _sample(*, name: str, labels: _Labels, value: float) -> str:
+    """Get a line of the Prometheus text format for a sample."""
+    if math.isinf(value):
+        value_text = "+Inf"
+    elif value.is_integer():
+        value_text = str(object=int(value))
+    else:
+        value_text = repr(value)
+    if not labels:
+        return f"{name} {value_text}\n"
+    label_text = ",".join(
+        f'{label_name}="{_escape_label_value(value=label_value)}"'
+        for label_name, label_value in labels
+    )
+    return f"{name}{{{label_text}}} {value_text}\n"
+
+
+@beartype
+class Metrics:
+    """Metrics recorded by the threads of a command."""
+
+    def __init__(self) -> None:
+        """Start recording metrics."""
+        self._lock = threading.Lock()
+        self._started_at = time.perf_counter()
+        self._finished_at: float | None = None
+        self._counters: dict[str, dict[_Labels, float]] = {
+            name: {} for name in _COUNTER_HELP
+        }
+        self._bucket_counts: dict[_Labels, list[int]] = {}
+        self._duration_sums: dict[_Labels, float] = {}
+
+    def increment(
+        self,
+        *,
+        name: str,
+        labels: Mapping[str, str],
+        amount: float,
+    ) -> None:
+        """Add to a counter."""
+        samples = self._counters[name]
+        key = tuple(labels.items())
+        with self._lock:
+            samples[key] = samples.get(key, 0.0) + amount
+
+    def observe_request_duration(
+        self,
+        *,
+        labels: Mapping[str, str],
+        seconds: float,
+    ) -> None:
+        """Add the duration of a request to the histogram."""
+        key = tuple(labels.items())
+        with self._lock:
+            bucket_counts = self._bucket_counts.setdefault(
+                key,
+                [0] * len(_REQUEST_DURATION_BUCKETS_SECONDS),
+            )
+            for index, upper_bound in enumerate(
+                _REQUEST_DURATION_BUCKETS_SECONDS,
+            ):
+                if seconds <= upper_bound:
+                    bucket_counts[index] += 1
+            self._duration_sums[key] = (
+                self._duration_sums.get(key, 0.0) + seconds
+            )
+
+    def finish(self) -> None:
+        """Record that the command has finished."""
+        with self._lock:
+            self._finished_at = time.perf_counter()
+
+    def _exposition_lines(self) -> Iterator[str]:
+        """Get the lines of the metrics in the Prometheus text format."""
+        for name, help_text in _COUNTER_HELP.items():
+            yield f"# HELP {name} {help_text}\n"
+            yield f"# TYPE {name} counter\n"
+            for labels, value in sorted(self._counters[name].items()):
+                yield _sample(name=name, labels=labels, value=value)
+
+        yield (
+            f"# HELP {_REQUEST_DURATION} The time taken by HTTP requests to "
+            "Vuforia.\n"
+        )
+        yield f"# TYPE {_REQUEST_DURATION} histogram\n"
+        for labels, bucket_counts in sorted(self._bucket_counts.items()):
+            for upper_bound, bucket_count in zip(
+                _REQUEST_DURATION_BUCKETS_SECONDS,
+                bucket_counts,
+                strict=True,
+            ):
+                upper_bound_text = (
+                    "+Inf" if math.isinf(upper_bound) else str(upper_bound)
+                )
+                yield _sample(
+                    name=f"{_REQUEST_DURATION}_bucket",
+                    labels=(*labels, ("le", upper_bound_text)),
+                    value=float(bucket_count),
+                )
+            yield _sample(
+                name=f"{_REQUEST_DURATION}_sum",
+                labels=labels,
+                value=self._duration_sums[labels],
+            )
+            yield _sample(
+                name=f"{_REQUEST_DURATION}_count",
+                labels=labels,
+                value=float(bucket_counts[-1]),
+            )
+
+        finished_at = self._finished_at
+        yield (
+            f"# HELP {_COMMAND_RUNNING} Whether the command is still "
+            "running.\n"
+        )
+        yield f"# TYPE {_COMMAND_RUNNING} gauge\n"
+        yield _sample(
+            name=_COMMAND_RUNNING,
+            labels=(),
+            value=float(finished_at is None),
+        )
+        yield (
+            f"# HELP {_COMMAND_DURATION} The time for which the command has "
+            "run.\n"
+        )
+        yield f"# TYPE {_COMMAND_DURATION} gauge\n"
+        if finished_at is None:
+            finished_at = time.perf_counter()
+        yield _sample(
+            name=_COMMAND_DURATION,
+            labels=(),
+            value=finished_at - self._started_at,
+        )
+
+    def exposition(self) -> str:
+        """Get the metrics in the Prometheus text format."""
+        with self._lock:
+            return "".join(self._exposition_lines())
+
+    def write(self, *, metrics_file_path: Path) -> None:
+        """Write the metrics to a file.
+
+        The file is replaced in one step, so that a collector never reads
+        part of it. The temporary file which is written first is removed if
+        the file cannot be replaced.
+        """
+        exposition = self.exposition()
+        file_descriptor, temporary_file_name = tempfile.mkstemp(
+            dir=metrics_file_path.parent,
+            prefix=f".{metrics_file_path.name}.",
+        )
+        temporary_path = Path(temporary_file_name)
+        try:
+            with os.fdopen(file_descriptor, "w") as temporary_file:
+                temporary_file.write(exposition)
+            # Temporary files can only be read by their owner, but
+            # collectors may run as other users.
+            temporary_path.chmod(mode=0o644)
+            temporary_path.replace(target=metrics_file_path)
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+
+@beartype
+def write_metrics(*, metrics: Metrics, metrics_file_path: Path) -> None:
+    """Write metrics to a file, or warn if they cannot be written.
+
+    A command is not stopped because its metrics cannot be written, for
+    example because the disk is full.
+    """
+    try:
+        metrics.write(metrics_file_path=metrics_file_path)
+    except OSError as exc:
+        click.echo(
+            message=(
+                "Warning: The metrics could not be written to "
+                f"{metrics_file_path}: {exc}"
+            ),
+            err=True,
+        )
+
+
+@beartype
+class PeriodicMetricsWriter:
+    """A thread which writes metrics to a file at intervals, so that they
+    can be collected while a long command runs.
+    """
+
+    def __init__(
+        self,
+        *,
+        metrics: Metrics,
+        metrics_file_path: Path,
+        interval_seconds: float,
+    ) -> None:
+        """Write the given metrics to the given file at each interval, once
+        started.
+        """
+        self._metrics = metrics
+        self._metrics_file_path = metrics_file_path
+        self._interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="metrics-writer",
+            daemon=True,
+        )
+
+    def _run(self) -> None:
+        """Write the metrics at each interval until stopped."""
+        while not self._stopped.wait(timeout=self._interval_seconds):
+            write_metrics(
+                metrics=self._metrics,
+                metrics_file_path=self._metrics_file_path,
+            )
+
+    def start(self) -> None:
+        """Start writing metrics."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop writing metrics, and wait for any write to finish."""
+        self._stopped.set()
+        self._thread.join()
+
+
+# This holds the metrics of the running command, if they are being recorded.
+_ACTIVE_METRICS: list[Metrics] = []
+
+
+@beartype
+def start_metrics() -> Metrics:
+    """Start recording metrics of the running command."""
+    metrics = Metrics()
+    _ACTIVE_METRICS.append(metrics)
+    return metrics
+
+
+@beartype
+def stop_metrics(*, metrics: Metrics) -> None:
+    """Stop recording the given metrics."""
+    metrics.finish()
+    _ACTIVE_METRICS.remove(metrics)
+
+
+@beartype
+def current_metrics() -> Metrics | None:
+    """Get the metrics of the running command, if they are being
+    recorded.
+    """
+    if not _ACTIVE_METRICS:
+        return None
+    return _ACTIVE_METRICS[-1]
+
+
+@beartype
+def record_request(
+    *,
+    metrics: Metrics,
+    method: str,
+    url: str,
+    status: str,
+    sent_bytes: int,
+    received_bytes: int,
+    seconds: float,
+    quota_error: bool,
+) -> None:
+    """Record an attempt at an HTTP request.
+
+    The status is the status code of the response, or the name of the
+    exception raised if there was no response.
+    """
+    labels = {"method": method, "endpoint": endpoint(url=url)}
+    metrics.increment(
+        name=_REQUESTS,
+        labels={**labels, "status": status},
+        amount=1.0,
+    )
+    metrics.increment(
+        name=_SENT_BYTES,
+        labels=labels,
+        amount=float(sent_bytes),
+    )
+    metrics.increment(
+        name=_RECEIVED_BYTES,
+        labels=labels,
+        amount=float(received_bytes),
+    )
+    if quota_error:
+        metrics.increment(name=_QUOTA_ERRORS, labels=labels, amount=1.0)
+    metrics.observe_request_duration(labels=labels, seconds=seconds)
+
+
+@beartype
+def count_retry(*, method: str, url: str) -> None:
+    """Count a request which is being tried again, if metrics are being
+    recorded.
+    """
+    metrics = current_metrics()
+    if metrics is None:
+        return
+    metrics.increment(
+        name=_RETRIES,
+        labels={"method": method, "endpoint": endpoint(url=url)},
+        amount=1.0,
+    )
+
+
+@beartype
+def count_operation(*, operation: str, succeeded: bool) -> None:
+    """Count an item which an operation processed, if metrics are being
+    recorded.
+
+    This is called once for each item, when the item has been processed,
+    and not for steps such as polling which do not finish an item.
+    """
+    metrics = current_metrics()
+    if metrics is None:
+        return
+    metrics.increment(
+        name=_OPERATIONS,
+        labels={
+            "operation": operation,
+            "outcome": "success" if succeeded else "error",
+        },
+        amount=1.0,
+    )
+
+
+@beartype
+@contextlib.contextmanager
+def counted_operation(*, operation: str) -> Iterator[None]:
+    """Count the item which the context processes, as a success if the
+    context exits without an error, if metrics are being recorded.
+    """
+    succeeded = False
+    try:
+        yield
+        succeeded = True
+    finally:
+        count_operation(operation=operation, succeeded=succeeded)
@@ -0,0 +1,148 @@
+"""A local registry of the Model Target datasets which have been created."""
+
+import dataclasses
+import datetime
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+
+from beartype import beartype
+from vws.model_target_datasets import ModelTargetDatasetType
+from vws.reports import ModelTargetDatasetStatuses
+
+from vws_cli._local_storage import sqlite_connection
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS datasets (
+    dataset_uuid TEXT PRIMARY KEY,
+    client_id TEXT NOT NULL,
+    base_vws_url TEXT NOT NULL,
+    name TEXT NOT NULL,
+    dataset_type TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    status TEXT NOT NULL
+);
+"""
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class RegisteredDataset:
+    """A Model Target dataset in the registry.
+
+    The status is the status of the dataset when it was last seen.
+    """
+
+    dataset_uuid: str
+    name: str
+    dataset_type: ModelTargetDatasetType
+    created_at: datetime.datetime
+    status: ModelTargetDatasetStatuses
+
+
+@beartype
+def add_dataset(
+    *,
+    registry_file_path: Path,
+    client_id: str,
+    base_vws_url: str,
+    dataset: RegisteredDataset,
+) -> None:
+    """Add a dataset to the registry."""
+    with sqlite_connection(
+        database_path=registry_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        connection.execute(
+            "INSERT OR REPLACE INTO datasets VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                dataset.dataset_uuid,
+                client_id,
+                base_vws_url,
+                dataset.name,
+                dataset.dataset_type.value,
+                dataset.created_at.isoformat(),
+                dataset.status.value,
+            ),
+        )
+
+
+@beartype
+def get_datasets(
+    *,
+    registry_file_path: Path,
+    client_id: str,
+    base_vws_url: str,
+) -> Sequence[RegisteredDataset]:
+    """Get the datasets in the registry which were created with the given
+    credentials, oldest first.
+    """
+    with sqlite_connection(
+        database_path=registry_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        rows = connection.execute(
+            "SELECT dataset_uuid, name, dataset_type, created_at, status "
+            "FROM datasets WHERE client_id = ? AND base_vws_url = ? "
+            "ORDER BY created_at, rowid",
+            (client_id, base_vws_url),
+        ).fetchall()
+
+    return [
+        RegisteredDataset(
+            dataset_uuid=dataset_uuid,
+            name=name,
+            dataset_type=ModelTargetDatasetType(value=dataset_type),
+            created_at=datetime.datetime.fromisoformat(created_at),
+            status=ModelTargetDatasetStatuses(value=status),
+        )
+        for dataset_uuid, name, dataset_type, created_at, status in rows
+    ]
+
+
+@beartype
+def set_dataset_statuses(
+    *,
+    registry_file_path: Path,
+    statuses: Mapping[str, ModelTargetDatasetStatuses],
+) -> None:
+    """Set the last seen statuses of datasets in the registry.
+
+    Datasets which are not in the registry are ignored.
+    """
+    if not registry_file_path.exists():
+        return
+
+    with sqlite_connection(
+        database_path=registry_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        connection.executemany(
+            "UPDATE datasets SET status = ? WHERE dataset_uuid = ?",
+            [
+                (status.value, dataset_uuid)
+                for dataset_uuid, status in statuses.items()
+            ],
+        )
+
+
+@beartype
+def remove_datasets(
+    *,
+    registry_file_path: Path,
+    dataset_uuids: Iterable[str],
+) -> None:
+    """Remove datasets from the registry.
+
+    Datasets which are not in the registry are ignored.
+    """
+    if not registry_file_path.exists():
+        return
+
+    with sqlite_connection(
+        database_path=registry_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        connection.executemany(
+            "DELETE FROM datasets WHERE dataset_uuid = ?",
+            [(dataset_uuid,) for dataset_uuid in dataset_uuids],
+        )
@@ -0,0 +1,140 @@
+"""CPU profiles of commands, which are written with ``--profile``.
+
+A profile is written either as ``pstats`` data from ``cProfile``, or as
+collapsed stacks, which flame graph tools read. ``cProfile`` profiles only
+the thread which starts it, so collapsed stacks are made by sampling the
+stacks of every thread, including the workers of batch commands.
+"""
+
+import cProfile
+import sys
+import threading
+from collections import Counter
+from enum import Enum, unique
+from pathlib import Path
+from types import FrameType
+
+from beartype import beartype
+
+# The stacks of each thread are sampled this often.
+_SAMPLE_INTERVAL_SECONDS = 0.005
+
+
+@unique
+class ProfileFormat(Enum):
+    """Forms in which a profile is written."""
+
+    PSTATS = "pstats"
+    COLLAPSED = "collapsed"
+
+
+@beartype
+class DeterministicProfiler:
+    """A profiler which records every call in the thread which starts it,
+    with ``cProfile``.
+    """
+
+    def __init__(self) -> None:
+        """Create a profiler which has not started."""
+        self._profile = cProfile.Profile()
+
+    def start(self) -> None:
+        """Start profiling."""
+        self._profile.enable()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        self._profile.disable()
+
+    def write(self, *, profile_file_path: Path) -> None:
+        """Write the profile as ``pstats`` data."""
+        self._profile.dump_stats(file=profile_file_path)
+
+
+@beartype
+def _collapsed_stack(*, thread_name: str, frame: FrameType) -> str:
+    """Get a stack, from the outermost frame, as a line of collapsed
+    stacks without a count.
+    """
+    functions: list[str] = []
+    current_frame: FrameType | None = frame
+    while current_frame is not None:
+        module_name = current_frame.f_globals.get("__name__", "")
+        functions.append(f"{module_name}:{current_frame.f_code.co_qualname}")
+        current_frame = current_frame.f_back
+    return ";".join([thread_name, *reversed(functions)])
+
+
+@beartype
+class SamplingProfiler:
+    """A profiler which samples the stacks of every thread at intervals."""
+
+    def __init__(self, *, interval_seconds: float) -> None:
+        """Create a profiler which has not started."""
+        self._interval_seconds = interval_seconds
+        self._stopped = threading.Event()
+        self._stack_counts: Counter[str] = Counter()
+        self._thread = threading.Thread(
+            target=self._run,
+            name="profile-sampler",
+            daemon=True,
+        )
+
+    def _sample(self) -> None:
+        """Count the current stack of each thread but this one."""
+        thread_names = {
+            thread.ident: thread.name for thread in threading.enumerate()
+        }
+        # There is no public way to get the stacks of other threads.
+        frames = sys._current_frames()  # noqa: SLF001
+        for thread_id, frame in frames.items():
+            if thread_id == self._thread.ident:
+                continue
+            thread_name = thread_names.get(thread_id, str(object=thread_id))
+            self._stack_counts[
+                _collapsed_stack(thread_name=thread_name, frame=frame)
+            ] += 1
+
+    def _run(self) -> None:
+        """Sample stacks at each interval until stopped."""
+        while not self._stopped.wait(timeout=self._interval_seconds):
+            self._sample()
+
+    def start(self) -> None:
+        """Start profiling."""
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop profiling."""
+        self._stopped.set()
+        self._thread.join()
+
+    def write(self, *, profile_file_path: Path) -> None:
+        """Write the profile as collapsed stacks, one stack and its count
+        per line.
+        """
+        with profile_file_path.open(mode="w") as profile_file:
+            profile_file.writelines(
+                f"{stack} {count}\n"
+                for stack, count in sorted(self._stack_counts.items())
+            )
+
+
+@beartype
+def start_profiling(
+    *,
+    profile_format: ProfileFormat,
+) -> DeterministicProfiler | SamplingProfiler:
+    """Start profiling the running command, for a profile in the given
+    form.
+    """
+    profiler: DeterministicProfiler | SamplingProfiler
+    match profile_format:
+        case ProfileFormat.PSTATS:
+            profiler = DeterministicProfiler()
+        case ProfileFormat.COLLAPSED:
+            profiler = SamplingProfiler(
+                interval_seconds=_SAMPLE_INTERVAL_SECONDS,
+            )
+    profiler.start()
+    return profiler
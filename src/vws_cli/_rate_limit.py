@@ -0,0 +1,122 @@
+"""A limit on the rate of requests made with a credential, which is shared
+between processes.
+
+Each credential has a token bucket, kept in a SQLite database so that
+processes which use the same credential at the same time share the limit.
+"""
+
+import hashlib
+import time
+from pathlib import Path
+
+from beartype import beartype
+from vws.response import Response
+from vws.transports import Transport
+
+from vws_cli._local_storage import sqlite_connection
+from vws_cli._tracing import traced
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS token_buckets (
+    credential_hash TEXT NOT NULL PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+@beartype
+def reserve_request(
+    *,
+    rate_limit_file_path: Path,
+    credential: str,
+    max_requests_per_second: float,
+) -> float:
+    """Take a token from the bucket of a credential, and return the number of
+    seconds to wait before making the request.
+
+    A bucket holds up to one second of requests, so that a burst of requests
+    can be made at once after a pause. When the bucket is empty, a token is
+    reserved ahead of time, so that waiting processes make their requests in
+    turn.
+    """
+    # Credentials are not stored on disk, but their hashes are.
+    credential_hash = hashlib.sha256(credential.encode()).hexdigest()
+    capacity = max(1.0, max_requests_per_second)
+    now = time.time()
+    with sqlite_connection(
+        database_path=rate_limit_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        # This is one statement so that the token is taken atomically, with
+        # the lock which SQLite holds while writing.
+        (tokens,) = connection.execute(
+            "INSERT INTO token_buckets VALUES (?, ?, ?) "
+            "ON CONFLICT (credential_hash) DO UPDATE SET "
+            "tokens = MIN("
+            "    ?, tokens + MAX(0, ? - updated_at) * ?"
+            ") - 1, "
+            "updated_at = MAX(updated_at, ?) "
+            "RETURNING tokens",
+            (
+                credential_hash,
+                capacity - 1,
+                now,
+                capacity,
+                now,
+                max_requests_per_second,
+                now,
+            ),
+        ).fetchone()
+    return max(0.0, -tokens / max_requests_per_second)
+
+
+@beartype
+class RateLimitedTransport:
+    """A transport which waits for the rate limit of a credential before
+    making each request.
+    """
+
+    def __init__(
+        self,
+        *,
+        transport: Transport,
+        rate_limit_file_path: Path,
+        credential: str,
+        max_requests_per_second: float,
+    ) -> None:
+        """Wrap a transport with a rate limit."""
+        self._transport = transport
+        self._rate_limit_file_path = rate_limit_file_path
+        self._credential = credential
+        self._max_requests_per_second = max_requests_per_second
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self._transport.close()
+
+    def __call__(
+        self,
+        *,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        data: bytes,
+        request_timeout: float | tuple[float, float],
+    ) -> Response:
+        """Wait for the rate limit, and then make a request."""
+        with traced(name="rate limit wait", category="wait", args={}):
+            time.sleep(
+                reserve_request(
+                    rate_limit_file_path=self._rate_limit_file_path,
+                    credential=self._credential,
+                    max_requests_per_second=self._max_requests_per_second,
+                ),
+            )
+        return self._transport(
+            method=method,
+            url=url,
+            headers=headers,
+            data=data,
+            request_timeout=request_timeout,
+        )
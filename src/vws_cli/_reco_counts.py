@@ -0,0 +1,446 @@
+"""Helpers for recognition counts reports."""
+
+import codecs
+import contextlib
+import csv
+import dataclasses
+import gzip
+import heapq
+import itertools
+import time
+from collections.abc import (
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from http import HTTPStatus
+from pathlib import Path
+
+import httpx
+from beartype import beartype
+from vws.exceptions.custom_exceptions import RecoCountsReportDownloadError
+from vws.reports import TargetRecord
+from vws.response import Response
+
+from vws_cli._tables import Column, ColumnType
+from vws_cli._transport import DownloadRecorder
+
+# The number of bytes of a report to hold in memory at once.
+_CHUNK_SIZE = 64 * 1024
+
+# The number of rows of a report to look up target records for at once.
+_ENRICHMENT_BATCH_SIZE = 256
+
+# The first bytes of every gzip file.
+_GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+
+RECO_COUNTS_COLUMNS = (
+    Column(name="target_id", column_type=ColumnType.STRING),
+    Column(name="reco_count", column_type=ColumnType.INTEGER),
+)
+
+ENRICHED_RECO_COUNTS_COLUMNS = (
+    Column(name="target_id", column_type=ColumnType.STRING),
+    Column(name="name", column_type=ColumnType.STRING),
+    Column(name="active_flag", column_type=ColumnType.BOOLEAN),
+    Column(name="tracking_rating", column_type=ColumnType.INTEGER),
+    Column(name="reco_count", column_type=ColumnType.INTEGER),
+)
+
+RECO_COUNTS_DELTA_COLUMNS = (
+    Column(name="target_id", column_type=ColumnType.STRING),
+    Column(name="base_reco_count", column_type=ColumnType.INTEGER),
+    Column(name="reco_count", column_type=ColumnType.INTEGER),
+    Column(name="delta", column_type=ColumnType.INTEGER),
+)
+
+
+@beartype
+def _download_error(
+    *,
+    response: httpx.Response,
+) -> RecoCountsReportDownloadError:
+    """Get the error for a response which is neither a report nor a sign
+    that the report is not ready yet.
+
+    This is the error which ``VWS-Python`` gives for such a response.
+    """
+    content = response.read()
+    return RecoCountsReportDownloadError(
+        response=Response(
+            text=response.text,
+            url=str(object=response.url),
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            request_body=None,
+            tell_position=len(content),
+            content=content,
+        ),
+    )
+
+
+@beartype
+@contextlib.contextmanager
+def reco_counts_report_chunks(
+    *,
+    download_recorder: DownloadRecorder,
+    presigned_url: str,
+    seconds_between_requests: float,
+    timeout_seconds: float,
+    request_timeout_seconds: tuple[float, float],
+) -> Generator[Iterator[bytes] | None]:
+    """Wait for a recognition counts report to be generated, and give its
+    content in chunks, so that the whole report is never held in memory.
+
+    ``None`` is given if the report is not generated within the timeout.
+    As with ``VWS-Python``, a ``404 Not Found`` response means that the
+    report is not ready yet, and any other response which is not the
+    report is a ``RecoCountsReportDownloadError``. Each request is recorded
+    by the given recorder.
+    """
+    connection_timeout_seconds, read_timeout_seconds = request_timeout_seconds
+    deadline = time.monotonic() + timeout_seconds
+    with httpx.Client(
+        timeout=httpx.Timeout(
+            timeout=read_timeout_seconds,
+            connect=connection_timeout_seconds,
+        ),
+    ) as http_client:
+        while True:
+            with download_recorder.stream(
+                http_client=http_client,
+                url=presigned_url,
+            ) as response:
+                if response.status_code == HTTPStatus.OK:
+                    yield response.iter_bytes(chunk_size=_CHUNK_SIZE)
+                    return
+                if response.status_code != HTTPStatus.NOT_FOUND:
+                    raise _download_error(response=response)
+
+            if time.monotonic() >= deadline:
+                yield None
+                return
+            time.sleep(seconds_between_requests)
+
+
+@beartype
+@contextlib.contextmanager
+def report_file_chunks(
+    *,
+    report_file_path: Path,
+) -> Generator[Iterator[bytes]]:
+    """Give the content of a stored recognition counts report in chunks.
+
+    Reports which were written with ``--gzip`` are decompressed as they are
+    read.
+    """
+    with report_file_path.open(mode="rb") as report_file:
+        is_compressed = report_file.read(len(_GZIP_MAGIC_NUMBER)) == (
+            _GZIP_MAGIC_NUMBER
+        )
+        report_file.seek(0)
+        with (
+            gzip.GzipFile(fileobj=report_file, mode="rb")
+            if is_compressed
+            else contextlib.nullcontext(enter_result=report_file)
+        ) as content:
+            yield iter(lambda: content.read(_CHUNK_SIZE), b"")
+
+
+@beartype
+def _lines(*, chunks: Iterable[bytes]) -> Iterator[str]:
+    """Split UTF-8 chunks into lines, without holding more than a chunk and a
+    line in memory.
+    """
+    decoder = codecs.getincrementaldecoder(encoding="utf-8")()
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(input=chunk)
+        *lines, pending = pending.split(sep="\n")
+        yield from lines
+    pending += decoder.decode(input=b"", final=True)
+    if pending:
+        yield pending
+
+
+@beartype
+class MalformedReportRowError(ValueError):
+    """A row of a recognition counts report is not a target ID and a
+    recognition count.
+    """
+
+    def __init__(self, *, line_number: int) -> None:
+        """
+        Args:
+            line_number: The line of the report which the row is on,
+                counting from 1.
+        """
+        super().__init__(line_number)
+        self.line_number = line_number
+
+
+@beartype
+def reco_counts_rows(*, chunks: Iterable[bytes]) -> Iterator[tuple[str, int]]:
+    """Get the ``(target_id, reco_count)`` rows of a recognition counts
+    report, one at a time.
+
+    A ``MalformedReportRowError`` is raised when a row which is not a
+    target ID and a recognition count is read.
+    """
+    reader = csv.reader(_lines(chunks=chunks))
+    # Skip the ``target_id,reco_count`` header.
+    next(reader, None)
+    for row in reader:
+        if not row:
+            continue
+        try:
+            target_id, reco_count_text = row
+            reco_count = int(reco_count_text)
+        except ValueError as exc:
+            raise MalformedReportRowError(line_number=reader.line_num) from exc
+        yield target_id, reco_count
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class RecoCountsSummary:
+    """A summary of a recognition counts report."""
+
+    target_count: int
+    total_reco_count: int
+    top_targets: Sequence[tuple[str, int]]
+    zero_reco_count_target_ids: Sequence[str]
+
+
+@beartype
+def summarize_reco_counts(
+    *,
+    rows: Iterable[tuple[str, int]],
+    top_count: int,
+    database_target_ids: Iterable[str],
+) -> RecoCountsSummary:
+    """Summarize recognition counts in one pass over the rows.
+
+    Only the ``top_count`` most recognized targets and the IDs of the
+    targets in the database which have not been recognized in the rows read
+    so far are held in memory, so memory use grows with the size of the
+    database and not with the size of the report. Targets in the database
+    which are not recognized, including targets which are not in the
+    report, have a zero recognition count.
+    """
+    target_count = 0
+    total_reco_count = 0
+    unrecognized_target_ids = set(database_target_ids)
+
+    def recognized_rows() -> Iterator[tuple[str, int]]:
+        """Give the rows of recognized targets, keeping count of all rows as
+        they are read.
+        """
+        nonlocal target_count, total_reco_count
+        for target_id, reco_count in rows:
+            target_count += 1
+            total_reco_count += reco_count
+            if reco_count:
+                unrecognized_target_ids.discard(target_id)
+                yield target_id, reco_count
+
+    recognized = recognized_rows()
+    # ``heapq.nlargest`` keeps a heap of at most ``top_count`` rows, and
+    # keeps the order of the report for rows with the same count.
+    top_targets = heapq.nlargest(
+        top_count,
+        recognized,
+        key=lambda row: row[1],
+    )
+    # ``heapq.nlargest`` does not read any rows when ``top_count`` is 0.
+    for _ in recognized:
+        pass
+
+    return RecoCountsSummary(
+        target_count=target_count,
+        total_reco_count=total_reco_count,
+        top_targets=top_targets,
+        zero_reco_count_target_ids=sorted(unrecognized_target_ids),
+    )
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class EnrichedRecoCountsRow:
+    """A row of a recognition counts report, joined with the target record.
+
+    The target record fields are ``None`` for a target which no longer
+    exists.
+    """
+
+    target_id: str
+    name: str | None
+    active_flag: bool | None
+    tracking_rating: int | None
+    reco_count: int
+
+
+@beartype
+def enrich_reco_counts_rows(
+    *,
+    rows: Iterable[tuple[str, int]],
+    get_target_records: Callable[[Sequence[str]], Mapping[str, TargetRecord]],
+) -> Iterator[EnrichedRecoCountsRow]:
+    """Join the rows of a recognition counts report with target records.
+
+    Records are looked up for one batch of rows at a time, so that lookups
+    can be made concurrently while only a batch of rows is held in memory.
+    ``get_target_records`` is given the target IDs in a batch, and it gives
+    the records of the targets which exist.
+    """
+    for batch in itertools.batched(rows, _ENRICHMENT_BATCH_SIZE, strict=False):
+        target_records = get_target_records(
+            [target_id for target_id, _ in batch],
+        )
+        for target_id, reco_count in batch:
+            target_record = target_records.get(target_id)
+            if target_record is None:
+                yield EnrichedRecoCountsRow(
+                    target_id=target_id,
+                    name=None,
+                    active_flag=None,
+                    tracking_rating=None,
+                    reco_count=reco_count,
+                )
+                continue
+            yield EnrichedRecoCountsRow(
+                target_id=target_id,
+                name=target_record.name,
+                active_flag=target_record.active_flag,
+                tracking_rating=target_record.tracking_rating,
+                reco_count=reco_count,
+            )
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class RecoCountsDelta:
+    """The change in the recognition count of a target between two reports.
+
+    ``base_reco_count`` is ``None`` for a target which is only in the other
+    report, and ``reco_count`` is ``None`` for a target which is only in the
+    base report.
+    """
+
+    target_id: str
+    base_reco_count: int | None
+    reco_count: int | None
+    delta: int
+
+
+@beartype
+def reco_counts_deltas(
+    *,
+    base_rows: Iterable[tuple[str, int]],
+    rows: Iterable[tuple[str, int]],
+) -> Iterator[RecoCountsDelta]:
+    """Join two recognition counts reports on target ID, with a hash join.
+
+    Only the counts of the base report are held in memory. The rows of the
+    other report are read one at a time, in order, and then the targets
+    which are only in the base report are given, in the order of the base
+    report.
+    """
+    base_reco_counts = dict(base_rows)
+    for target_id, reco_count in rows:
+        base_reco_count = base_reco_counts.pop(target_id, None)
+        yield RecoCountsDelta(
+            target_id=target_id,
+            base_reco_count=base_reco_count,
+            reco_count=reco_count,
+            delta=reco_count - (base_reco_count or 0),
+        )
+
+    for target_id, base_reco_count in base_reco_counts.items():
+        yield RecoCountsDelta(
+            target_id=target_id,
+            base_reco_count=base_reco_count,
+            reco_count=None,
+            delta=-base_reco_count,
+        )
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class RecoCountsDeltaSummary:
+    """A summary of the changes between two recognition counts reports."""
+
+    base_target_count: int
+    target_count: int
+    new_target_count: int
+    disappeared_target_count: int
+    base_total_reco_count: int
+    total_reco_count: int
+    biggest_increases: Sequence[RecoCountsDelta]
+    biggest_decreases: Sequence[RecoCountsDelta]
+
+
+@beartype
+def summarize_reco_counts_deltas(
+    *,
+    deltas: Iterable[RecoCountsDelta],
+    top_count: int,
+) -> RecoCountsDeltaSummary:
+    """Summarize the changes between two reports in one pass over the
+    deltas.
+
+    Only the ``top_count`` biggest increases and the ``top_count`` biggest
+    decreases are held in memory. Earlier deltas come first among deltas of
+    the same size.
+    """
+    base_target_count = 0
+    target_count = 0
+    new_target_count = 0
+    disappeared_target_count = 0
+    base_total_reco_count = 0
+    total_reco_count = 0
+    # Each heap has the smallest of the biggest changes at the front, so
+    # that it can be replaced by a bigger change. The position of a delta
+    # breaks ties, so that deltas are never compared.
+    increases: list[tuple[int, int, RecoCountsDelta]] = []
+    decreases: list[tuple[int, int, RecoCountsDelta]] = []
+
+    for position, delta in enumerate(deltas):
+        if delta.base_reco_count is None:
+            new_target_count += 1
+        else:
+            base_target_count += 1
+            base_total_reco_count += delta.base_reco_count
+
+        if delta.reco_count is None:
+            disappeared_target_count += 1
+        else:
+            target_count += 1
+            total_reco_count += delta.reco_count
+
+        if not top_count or not delta.delta:
+            continue
+        heap = increases if delta.delta > 0 else decreases
+        item = (abs(delta.delta), -position, delta)
+        if len(heap) < top_count:
+            heapq.heappush(heap, item)
+        else:
+            heapq.heappushpop(heap, item)
+
+    return RecoCountsDeltaSummary(
+        base_target_count=base_target_count,
+        target_count=target_count,
+        new_target_count=new_target_count,
+        disappeared_target_count=disappeared_target_count,
+        base_total_reco_count=base_total_reco_count,
+        total_reco_count=total_reco_count,
+        biggest_increases=[
+            delta for _, _, delta in sorted(increases, reverse=True)
+        ],
+        biggest_decreases=[
+            delta for _, _, delta in sorted(decreases, reverse=True)
+        ],
+    )
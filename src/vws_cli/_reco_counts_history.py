@@ -0,0 +1,190 @@
+"""A local history of monthly recognition counts.
+
+Vuforia gives recognition counts for only the current month and the
+previous month, so older counts are kept here.
+"""
+
+import contextlib
+import datetime
+from collections.abc import Generator, Iterable, Iterator, Mapping
+from pathlib import Path
+
+from beartype import beartype
+
+from vws_cli._local_storage import sqlite_connection
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS months (
+    database_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    is_final INTEGER NOT NULL,
+    PRIMARY KEY (database_id, month)
+);
+CREATE TABLE IF NOT EXISTS reco_counts (
+    database_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    reco_count INTEGER NOT NULL,
+    PRIMARY KEY (database_id, month, target_id)
+);
+CREATE INDEX IF NOT EXISTS reco_counts_by_target
+ON reco_counts (database_id, target_id, month);
+"""
+
+_MONTH_FORMAT = "%Y-%m"
+
+
+@beartype
+def is_month_final(
+    *,
+    history_file_path: Path,
+    database_id: str,
+    month: datetime.date,
+) -> bool:
+    """Whether the history has the final counts for a month."""
+    if not history_file_path.exists():
+        return False
+
+    with sqlite_connection(
+        database_path=history_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        row = connection.execute(
+            "SELECT is_final FROM months WHERE database_id = ? AND month = ?",
+            (database_id, month.strftime(_MONTH_FORMAT)),
+        ).fetchone()
+    return row is not None and bool(row[0])
+
+
+@beartype
+def store_month(
+    *,
+    history_file_path: Path,
+    database_id: str,
+    month: datetime.date,
+    rows: Iterable[tuple[str, int]],
+    is_final: bool,
+) -> int:
+    """Replace the counts for a month, and return the number of rows
+    stored.
+
+    The rows are staged in a temporary table as they are given, so they do
+    not all need to be in memory, and the history is not locked while they
+    are read. The stored counts for the month are then replaced in one
+    short transaction, so targets which are not in the given rows are
+    removed.
+    """
+    month_string = month.strftime(_MONTH_FORMAT)
+    row_count = 0
+
+    def counted_rows() -> Iterator[tuple[str, int]]:
+        """Give the rows to stage, counting them."""
+        nonlocal row_count
+        for row in rows:
+            row_count += 1
+            yield row
+
+    with sqlite_connection(
+        database_path=history_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        # Writes to a temporary table do not lock the history file.
+        connection.execute(
+            "CREATE TEMP TABLE staged_reco_counts ("
+            "target_id TEXT NOT NULL, reco_count INTEGER NOT NULL)",
+        )
+        connection.executemany(
+            "INSERT INTO staged_reco_counts VALUES (?, ?)",
+            counted_rows(),
+        )
+        connection.commit()
+
+        connection.execute(
+            "DELETE FROM reco_counts WHERE database_id = ? AND month = ?",
+            (database_id, month_string),
+        )
+        # The last row for a target is kept, as it was when rows were
+        # stored one at a time.
+        connection.execute(
+            "INSERT OR REPLACE INTO reco_counts "
+            "SELECT ?, ?, target_id, reco_count FROM staged_reco_counts "
+            "ORDER BY rowid",
+            (database_id, month_string),
+        )
+        connection.execute(
+            "INSERT OR REPLACE INTO months VALUES (?, ?, ?)",
+            (database_id, month_string, is_final),
+        )
+    return row_count
+
+
+@beartype
+def get_target_history(
+    *,
+    history_file_path: Path,
+    database_id: str,
+    target_id: str,
+    since_month: datetime.date,
+) -> Mapping[str, int]:
+    """Get the recognition counts of a target for each month in the history,
+    from the given month onwards.
+
+    A target which is not in a stored month has a count of 0.
+    """
+    if not history_file_path.exists():
+        return {}
+
+    with sqlite_connection(
+        database_path=history_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        rows = connection.execute(
+            "SELECT months.month, COALESCE(reco_counts.reco_count, 0) "
+            "FROM months LEFT JOIN reco_counts "
+            "ON reco_counts.database_id = months.database_id "
+            "AND reco_counts.month = months.month "
+            "AND reco_counts.target_id = ? "
+            "WHERE months.database_id = ? AND months.month >= ? "
+            "ORDER BY months.month",
+            (target_id, database_id, since_month.strftime(_MONTH_FORMAT)),
+        ).fetchall()
+    return dict(rows)
+
+
+@beartype
+@contextlib.contextmanager
+def month_reco_counts(
+    *,
+    history_file_path: Path,
+    database_id: str,
+    month: datetime.date,
+) -> Generator[Iterator[tuple[str, int]] | None]:
+    """Give the ``(target_id, reco_count)`` rows stored for a month, one at a
+    time.
+
+    ``None`` is given if the month is not in the history.
+    """
+    if not history_file_path.exists():
+        yield None
+        return
+
+    month_string = month.strftime(_MONTH_FORMAT)
+    with sqlite_connection(
+        database_path=history_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        is_stored = connection.execute(
+            "SELECT 1 FROM months WHERE database_id = ? AND month = ?",
+            (database_id, month_string),
+        ).fetchone()
+        if is_stored is None:
+            yield None
+            return
+
+        yield iter(
+            connection.execute(
+                "SELECT target_id, reco_count FROM reco_counts "
+                "WHERE database_id = ? AND month = ? ORDER BY target_id",
+                (database_id, month_string),
+            ),
+        )
@@ -0,0 +1,265 @@
+"""Trying requests again when they fail for reasons which may not last.
+
+A request is tried again when Vuforia rejects it because of a request quota
+or a rate limit, when there is a server error, or when there is a network
+error. Requests which change something, such as adding a target, are tried
+again only when it is known that Vuforia did not act on them, so that, for
+example, a target is never added twice. Cloud Recognition queries are sent
+with ``POST`` but change nothing, so they are tried again as freely as
+``GET`` requests.
+"""
+
+import contextlib
+import datetime
+import email.utils
+import json
+import random
+import urllib.parse
+from collections.abc import Callable, Mapping
+from http import HTTPStatus
+
+import requests
+from beartype import beartype
+from vws.response import Response
+from vws.transports import Transport
+
+from vws_cli._metrics import count_retry
+from vws_cli._tracing import traced
+
+# Making a request with one of these methods more than once has the same
+# effect as making it once.
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE"})
+
+# ``POST`` requests to these paths only read, so making one more than once
+# has the same effect as making it once.
+_IDEMPOTENT_POST_PATHS = frozenset({"/v1/query"})
+
+# ``VWS-Python`` raises ``RequestQuotaReachedError`` for responses with this
+# result code. Vuforia does not act on such requests.
+_REQUEST_QUOTA_REACHED_RESULT_CODE = "RequestQuotaReached"
+
+# The wait before the second attempt at a request is up to this long, and the
+# longest possible wait doubles with each attempt after that.
+_BASE_DELAY_SECONDS = 0.5
+
+# No wait is longer than this. When Vuforia asks for a longer wait with a
+# ``Retry-After`` header, the request is not tried again.
+_MAX_DELAY_SECONDS = 60.0
+
+
+@beartype
+def _result_code(*, response: Response) -> str | None:
+    """Get the VWS result code of a response, if it has one."""
+    with contextlib.suppress(ValueError):
+        response_json = json.loads(s=response.text)
+        if isinstance(response_json, dict):
+            result_code = response_json.get("result_code")
+            if isinstance(result_code, str):
+                return result_code
+    return None
+
+
+@beartype
+def _is_idempotent(*, method: str, url: str) -> bool:
+    """Whether making the given request more than once has the same effect
+    as making it once.
+    """
+    if method.upper() in _IDEMPOTENT_METHODS:
+        return True
+    path = urllib.parse.urlsplit(url=url).path
+    return method.upper() == "POST" and path in _IDEMPOTENT_POST_PATHS
+
+
+@beartype
+def is_rejected_response(*, response: Response) -> bool:
+    """Whether Vuforia rejected a request because of a request quota or a
+    rate limit, without acting on it.
+
+    These are the responses for which ``VWS-Python`` raises
+    ``TooManyRequestsError`` or ``RequestQuotaReachedError``.
+    """
+    if response.status_code == HTTPStatus.TOO_MANY_REQUESTS:
+        return True
+    return (
+        response.status_code >= HTTPStatus.BAD_REQUEST
+        and _result_code(response=response)
+        == _REQUEST_QUOTA_REACHED_RESULT_CODE
+    )
+
+
+@beartype
+def is_retryable_response(
+    *,
+    method: str,
+    url: str,
+    response: Response,
+) -> bool:
+    """Whether a request which was given the given response may succeed if it
+    is tried again.
+
+    These are rejected responses, and the responses for which
+    ``VWS-Python`` raises ``ServerError``. Vuforia may have acted on a
+    request before a server error, so such requests are tried again only if
+    they are idempotent.
+    """
+    if is_rejected_response(response=response):
+        return True
+    if response.status_code >= HTTPStatus.INTERNAL_SERVER_ERROR:
+        return _is_idempotent(method=method, url=url)
+    return False
+
+
+@beartype
+def is_retryable_exception(
+    *,
+    method: str,
+    url: str,
+    exc: requests.exceptions.RequestException,
+) -> bool:
+    """Whether a request which failed with the given network error may succeed
+    if it is tried again.
+
+    A request is not sent if a connection is not made in time, so such
+    requests are always tried again. After other connection errors and
+    timeouts, Vuforia may have acted on a request, so such requests are tried
+    again only if they are idempotent.
+    """
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(
+        exc,
+        requests.exceptions.ConnectionError
+        | requests.exceptions.Timeout
+        | requests.exceptions.ChunkedEncodingError,
+    ):
+        return _is_idempotent(method=method, url=url)
+    return False
+
+
+@beartype
+def retry_after_seconds(*, headers: Mapping[str, str]) -> float | None:
+    """Get the number of seconds which a ``Retry-After`` header asks for, if
+    there is a valid one.
+
+    The header can be a number of seconds or an HTTP date.
+    """
+    for name, value in headers.items():
+        if name.lower() != "retry-after":
+            continue
+        with contextlib.suppress(ValueError):
+            return max(0.0, float(value))
+        try:
+            retry_at = email.utils.parsedate_to_datetime(data=value)
+        except TypeError, ValueError:
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=datetime.UTC)
+        now = datetime.datetime.now(tz=datetime.UTC)
+        return max(0.0, (retry_at - now).total_seconds())
+    return None
+
+
+@beartype
+def backoff_seconds(*, attempt: int) -> float:
+    """Get the number of seconds to wait after the given failed attempt.
+
+    The longest possible wait grows exponentially, and the wait is chosen at
+    random up to that, so that processes which fail at the same time do not
+    try again at the same time.
+    """
+    max_delay_seconds = min(
+        _MAX_DELAY_SECONDS,
+        _BASE_DELAY_SECONDS * 2 ** (attempt - 1),
+    )
+    return random.uniform(a=0, b=max_delay_seconds)  # noqa: S311
+
+
+@beartype
+class RetryingTransport:
+    """A transport which tries requests again when they fail for reasons
+    which may not last.
+    """
+
+    def __init__(
+        self,
+        *,
+        transport: Transport,
+        max_attempts: int,
+        sleep_fn: Callable[[float], None],
+    ) -> None:
+        """Wrap a transport so that each request is made up to
+        ``max_attempts`` times.
+        """
+        self._transport = transport
+        self._max_attempts = max_attempts
+        self._sleep_fn = sleep_fn
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self._transport.close()
+
+    def __call__(
+        self,
+        *,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        data: bytes,
+        request_timeout: float | tuple[float, float],
+    ) -> Response:
+        """Make a request, trying it again if it fails for a reason which
+        may not last.
+
+        After the last attempt, the response is given or the exception is
+        raised as it would be without retries.
+        """
+        for attempt in range(1, self._max_attempts):
+            try:
+                response = self._transport(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    data=data,
+                    request_timeout=request_timeout,
+                )
+            except requests.exceptions.RequestException as exc:
+                if not is_retryable_exception(
+                    method=method,
+                    url=url,
+                    exc=exc,
+                ):
+                    raise
+                delay_seconds = backoff_seconds(attempt=attempt)
+            else:
+                if not is_retryable_response(
+                    method=method,
+                    url=url,
+                    response=response,
+                ):
+                    return response
+                requested_delay_seconds = retry_after_seconds(
+                    headers=response.headers,
+                )
+                if requested_delay_seconds is None:
+                    requested_delay_seconds = 0.0
+                if requested_delay_seconds > _MAX_DELAY_SECONDS:
+                    return response
+                delay_seconds = max(
+                    requested_delay_seconds,
+                    backoff_seconds(attempt=attempt),
+                )
+            count_retry(method=method, url=url)
+            with traced(
+                name="retry wait",
+                category="wait",
+                args={"attempt": attempt},
+            ):
+                self._sleep_fn(delay_seconds)
+
+        return self._transport(
+            method=method,
+            url=url,
+            headers=headers,
+            data=data,
+            request_timeout=request_timeout,
+        )
@@ -0,0 +1,247 @@
+"""Helpers for writing rows of records, as text or in columnar forms.
+
+Rows are written as they are given, a chunk or a batch at a time, so that
+all of the rows are never held in memory.
+"""
+
+import csv
+import dataclasses
+import datetime
+import io
+import itertools
+import json
+import zlib
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from enum import Enum, unique
+from pathlib import Path
+
+import click
+from beartype import beartype
+
+from vws_cli._local_storage import partial_file_path
+
+# The number of bytes of text to join into one chunk.
+_CHUNK_SIZE = 64 * 1024
+
+# The number of rows in each batch of columnar output.
+_ROWS_PER_BATCH = 16 * 1024
+
+# Adding this to the ``wbits`` given to ``zlib`` gives gzip output.
+_GZIP_WBITS_FLAG = 16
+
+
+@unique
+class ColumnType(Enum):
+    """The types of values in columns."""
+
+    STRING = "string"
+    INTEGER = "integer"
+    FLOAT = "float"
+    BOOLEAN = "boolean"
+    DATE = "date"
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class Column:
+    """A column of rows. Any value can be ``None``."""
+
+    name: str
+    column_type: ColumnType
+
+
+@unique
+class ColumnarFormat(Enum):
+    """Columnar forms which need ``pyarrow``."""
+
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+@beartype
+def _gzip_chunks(*, chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compress chunks with gzip as they are given."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | _GZIP_WBITS_FLAG)
+    for chunk in chunks:
+        yield compressor.compress(chunk)
+    yield compressor.flush()
+
+
+@beartype
+def write_chunks(
+    *,
+    chunks: Iterable[bytes],
+    output_file_path: Path | None,
+    compress: bool,
+) -> None:
+    """Write chunks to a file, or to stdout if no file is given.
+
+    A file is written in full or not at all.
+    """
+    if compress:
+        chunks = _gzip_chunks(chunks=chunks)
+
+    if output_file_path is None:
+        stdout = click.get_binary_stream(name="stdout")
+        for chunk in chunks:
+            stdout.write(chunk)
+        stdout.flush()
+        return
+
+    with (
+        partial_file_path(output_file_path=output_file_path) as path,
+        path.open(mode="wb") as partial_file,
+    ):
+        for chunk in chunks:
+            partial_file.write(chunk)
+
+
+class _Echo:
+    """A file-like object which gives back what is written to it, so that a
+    ``csv`` writer gives each line rather than writing it.
+    """
+
+    @staticmethod
+    def write(value: str) -> str:
+        """Give back the given value."""
+        return value
+
+
+@beartype
+def _encoded_chunks(*, lines: Iterable[str]) -> Iterator[bytes]:
+    """Join lines into UTF-8 chunks of about ``_CHUNK_SIZE`` bytes."""
+    buffer = io.StringIO()
+    for line in lines:
+        buffer.write(line)
+        if buffer.tell() >= _CHUNK_SIZE:
+            yield buffer.getvalue().encode()
+            buffer = io.StringIO()
+    yield buffer.getvalue().encode()
+
+
+@beartype
+def _text_value(*, value: object) -> object:
+    """Get the form of a value for text output.
+
+    Booleans are ``true`` or ``false`` and dates are ISO 8601 strings.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+@beartype
+def csv_chunks(
+    *,
+    records: Iterable[Mapping[str, object]],
+    columns: Sequence[Column],
+) -> Iterator[bytes]:
+    """Give records as CSV chunks, with a header.
+
+    Missing values are empty.
+    """
+    writer = csv.writer(_Echo())
+
+    def lines() -> Iterator[str]:
+        """Give the CSV lines."""
+        yield writer.writerow([column.name for column in columns])
+        for record in records:
+            yield writer.writerow(
+                [_text_value(value=record[column.name]) for column in columns],
+            )
+
+    return _encoded_chunks(lines=lines())
+
+
+@beartype
+def ndjson_chunks(
+    *,
+    records: Iterable[Mapping[str, object]],
+    columns: Sequence[Column],
+) -> Iterator[bytes]:
+    """Give records as newline-delimited JSON chunks, with one object per
+    record.
+
+    Dates are ISO 8601 strings.
+    """
+    return _encoded_chunks(
+        lines=(
+            json.dumps(
+                obj={column.name: record[column.name] for column in columns},
+                # Dates are the only values which are not JSON types.
+                default=datetime.date.isoformat,
+            )
+            + "\n"
+            for record in records
+        ),
+    )
+
+
+@beartype
+def write_columnar(
+    *,
+    records: Iterable[Mapping[str, object]],
+    columns: Sequence[Column],
+    columnar_format: ColumnarFormat,
+    output_file_path: Path | None,
+) -> None:
+    """Write records as Parquet or as an Arrow IPC stream, to a file or to
+    stdout if no file is given.
+
+    Each column has a type, rather than every value being text. Records are
+    written a batch at a time. ``pyarrow`` is imported only here, as it is
+    an optional dependency which is slow to import.
+    """
+    import pyarrow as pa  # noqa: PLC0415
+    import pyarrow.ipc  # noqa: PLC0415
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    arrow_types = {
+        ColumnType.STRING: pa.string(),
+        ColumnType.INTEGER: pa.int64(),
+        ColumnType.FLOAT: pa.float64(),
+        ColumnType.BOOLEAN: pa.bool_(),
+        ColumnType.DATE: pa.date32(),
+    }
+    schema = pa.schema(
+        fields=[
+            pa.field(column.name, arrow_types[column.column_type])
+            for column in columns
+        ],
+    )
+
+    def write(sink: str | pa.NativeFile) -> None:
+        """Write the records to a path or a stream."""
+        writer_contexts = {
+            ColumnarFormat.PARQUET: lambda: pq.ParquetWriter(
+                where=sink,
+                schema=schema,
+            ),
+            ColumnarFormat.ARROW: lambda: pa.ipc.new_stream(
+                sink=sink,
+                schema=schema,
+            ),
+        }
+        with writer_contexts[columnar_format]() as writer:
+            for batch in itertools.batched(
+                records,
+                _ROWS_PER_BATCH,
+                strict=False,
+            ):
+                writer.write_batch(
+                    pa.RecordBatch.from_pylist(
+                        mapping=list(batch),
+                        schema=schema,
+                    ),
+                )
+
+    if output_file_path is None:
+        stdout = click.get_binary_stream(name="stdout")
+        write(sink=pa.PythonFile(handle=stdout, mode="w"))
+        stdout.flush()
+        return
+
+    with partial_file_path(output_file_path=output_file_path) as path:
+        write(sink=str(object=path))
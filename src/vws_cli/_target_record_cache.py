@@ -0,0 +1,118 @@
+"""A local cache of target records.
+
+Looking up the records of many targets needs one request per target, so
+records which were fetched recently are kept here.
+"""
+
+import time
+from collections.abc import Iterable, Mapping, Sequence
+from pathlib import Path
+
+from beartype import beartype
+from vws.reports import TargetRecord
+
+from vws_cli._local_storage import sqlite_connection
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS target_records (
+    base_vws_url TEXT NOT NULL,
+    database_id TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    active_flag INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    width REAL NOT NULL,
+    tracking_rating INTEGER NOT NULL,
+    reco_rating TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (base_vws_url, database_id, target_id)
+);
+"""
+
+
+@beartype
+def get_target_records(
+    *,
+    cache_file_path: Path,
+    base_vws_url: str,
+    database_id: str,
+    target_ids: Sequence[str],
+    max_age_seconds: float,
+) -> Mapping[str, TargetRecord]:
+    """Get the cached records of the given targets which were fetched at
+    most ``max_age_seconds`` ago.
+
+    Targets without such a record are not in the returned mapping.
+    """
+    if not target_ids or not cache_file_path.exists():
+        return {}
+
+    placeholders = ", ".join("?" * len(target_ids))
+    with sqlite_connection(
+        database_path=cache_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        rows = connection.execute(
+            "SELECT target_id, active_flag, name, width, "  # noqa: S608
+            "tracking_rating, reco_rating FROM target_records "
+            "WHERE base_vws_url = ? AND database_id = ? AND fetched_at >= ? "
+            f"AND target_id IN ({placeholders})",
+            (
+                base_vws_url,
+                database_id,
+                time.time() - max_age_seconds,
+                *target_ids,
+            ),
+        ).fetchall()
+
+    return {
+        target_id: TargetRecord(
+            target_id=target_id,
+            active_flag=bool(active_flag),
+            name=name,
+            width=width,
+            tracking_rating=tracking_rating,
+            reco_rating=reco_rating,
+        )
+        for (
+            target_id,
+            active_flag,
+            name,
+            width,
+            tracking_rating,
+            reco_rating,
+        ) in rows
+    }
+
+
+@beartype
+def add_target_records(
+    *,
+    cache_file_path: Path,
+    base_vws_url: str,
+    database_id: str,
+    target_records: Iterable[TargetRecord],
+) -> None:
+    """Add or replace the cached records of targets."""
+    fetched_at = time.time()
+    with sqlite_connection(
+        database_path=cache_file_path,
+        schema=_SCHEMA,
+    ) as connection:
+        connection.executemany(
+            "INSERT OR REPLACE INTO target_records VALUES "
+            "(?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    base_vws_url,
+                    database_id,
+                    target_record.target_id,
+                    target_record.active_flag,
+                    target_record.name,
+                    target_record.width,
+                    target_record.tracking_rating,
+                    target_record.reco_rating,
+                    fetched_at,
+                )
+                for target_record in target_records
+            ],
+        )
@@ -0,0 +1,168 @@
+"""Timings of the parts of a command, which are shown with ``--timings``.
+
+The timings of a command are kept in the ``click`` context. Nothing is
+timed unless ``--timings`` is given.
+
+The ``click`` context is not available in threads which a command starts,
+so the timings are found before work is given to other threads, and passed
+to whatever records timings there.
+"""
+
+import contextlib
+import dataclasses
+import time
+from collections.abc import Iterator
+
+import click
+import yaml
+from beartype import beartype
+
+from vws_cli._import_time import IMPORT_STARTED_AT
+
+_META_KEY = "vws_cli.timings"
+
+# Timings are shown in milliseconds, to this many decimal places.
+_MILLISECONDS_DECIMAL_PLACES = 1
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class PhaseTiming:
+    """The time taken by a part of a command."""
+
+    phase: str
+    seconds: float
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class RequestTiming:
+    """The time taken by an HTTP request.
+
+    The connection time is the time taken to make a connection, including
+    any TLS handshake, and is ``None`` if no new connection was made or the
+    time is not known. The time to the first byte is the time until the
+    response headers were received, which includes making the connection.
+    The status code is ``None`` if no response was received.
+    """
+
+    method: str
+    path: str
+    status_code: int | None
+    sent_bytes: int
+    received_bytes: int
+    connect_seconds: float | None
+    time_to_first_byte_seconds: float | None
+    total_seconds: float
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class Timings:
+    """The timings of a command."""
+
+    import_seconds: float
+    started_at: float
+    phases: list[PhaseTiming] = dataclasses.field(
+        default_factory=list[PhaseTiming],
+    )
+    requests: list[RequestTiming] = dataclasses.field(
+        default_factory=list[RequestTiming],
+    )
+
+
+@beartype
+def start_timings(*, ctx: click.Context) -> Timings:
+    """Start timing a command, and keep the timings in the given context."""
+    started_at = time.perf_counter()
+    timings = Timings(
+        import_seconds=started_at - IMPORT_STARTED_AT,
+        started_at=started_at,
+    )
+    ctx.meta[_META_KEY] = timings
+    return timings
+
+
+@beartype
+def current_timings() -> Timings | None:
+    """Get the timings of the current command, if it is being timed."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is None:
+        return None
+    timings = ctx.meta.get(_META_KEY)
+    if isinstance(timings, Timings):
+        return timings
+    return None
+
+
+@beartype
+@contextlib.contextmanager
+def timed(*, timings: Timings | None, phase: str) -> Iterator[None]:
+    """Time the given part of a command in the given timings, if the command
+    is being timed.
+    """
+    if timings is None:
+        yield
+        return
+
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.phases.append(
+            PhaseTiming(
+                phase=phase,
+                seconds=time.perf_counter() - started_at,
+            ),
+        )
+
+
+@beartype
+def _milliseconds(*, seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    if seconds is None:
+        return None
+    return round(seconds * 1000, _MILLISECONDS_DECIMAL_PLACES)
+
+
+@beartype
+def timings_yaml(*, timings: Timings) -> str:
+    """Get a YAML representation of the timings of a command.
+
+    Times are in milliseconds.
+    """
+    command_seconds = time.perf_counter() - timings.started_at
+    data = {
+        "import_ms": _milliseconds(seconds=timings.import_seconds),
+        "phases": [
+            {
+                "phase": phase_timing.phase,
+                "ms": _milliseconds(seconds=phase_timing.seconds),
+            }
+            for phase_timing in timings.phases
+        ],
+        "requests": [
+            {
+                "method": request_timing.method,
+                "path": request_timing.path,
+                "status_code": request_timing.status_code,
+                "sent_bytes": request_timing.sent_bytes,
+                "received_bytes": request_timing.received_bytes,
+                "connect_ms": _milliseconds(
+                    seconds=request_timing.connect_seconds,
+                ),
+                "time_to_first_byte_ms": _milliseconds(
+                    seconds=request_timing.time_to_first_byte_seconds,
+                ),
+                "total_ms": _milliseconds(
+                    seconds=request_timing.total_seconds,
+                ),
+            }
+            for request_timing in timings.requests
+        ],
+        "command_ms": _milliseconds(seconds=command_seconds),
+        "total_ms": _milliseconds(
+            seconds=timings.import_seconds + command_seconds,
+        ),
+    }
+    return yaml.dump(data={"timings": data}, sort_keys=False)
@@ -0,0 +1,220 @@
+"""Spans of the operations of a command and of its HTTP requests, which are
+written with ``--trace-file``.
+
+Spans are recorded from every thread, so the tracer of a command is kept
+for the whole process rather than in the ``click`` context, which is local
+to a thread. Nothing is recorded unless ``--trace-file`` is given.
+"""
+
+import contextlib
+import dataclasses
+import json
+import threading
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from enum import Enum, unique
+from pathlib import Path
+
+from beartype import beartype
+
+# Chrome trace events give times in microseconds.
+_MICROSECONDS_PER_SECOND = 1_000_000
+
+
+@unique
+class TraceFormat(Enum):
+    """Forms in which a trace is written."""
+
+    CHROME = "chrome"
+    JSON_LINES = "jsonl"
+
+
+@beartype
+@dataclasses.dataclass(frozen=True)
+class Span:
+    """An operation, or an HTTP request, and when it happened."""
+
+    name: str
+    category: str
+    started_at: float
+    duration_seconds: float
+    thread_id: int
+    thread_name: str
+    args: Mapping[str, object]
+
+
+@beartype
+class Tracer:
+    """Spans recorded by the threads of a command."""
+
+    def __init__(self) -> None:
+        """Start a trace."""
+        self._lock = threading.Lock()
+        self._spans: list[Span] = []
+        # Spans are timed with a monotonic clock, and this gives the wall
+        # clock time which that clock started at.
+        self._wall_clock_offset = time.time() - time.perf_counter()
+
+    def add_span(self, *, span: Span) -> None:
+        """Add a finished span."""
+        with self._lock:
+            self._spans.append(span)
+
+    @property
+    def spans(self) -> Sequence[Span]:
+        """The spans which have finished, in the order in which they
+        finished.
+        """
+        with self._lock:
+            return list(self._spans)
+
+    def _wall_clock_time(self, *, started_at: float) -> float:
+        """Get the wall clock time of a time from the monotonic clock."""
+        return started_at + self._wall_clock_offset
+
+    def _chrome_trace(self) -> dict[str, object]:
+        """Get the trace as Chrome trace events.
+
+        Each span is a complete event, and each thread is named with a
+        metadata event. This can be viewed in Perfetto.
+        """
+        spans = self.spans
+        thread_names = {span.thread_id: span.thread_name for span in spans}
+        process_id = 1
+        events: list[dict[str, object]] = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": process_id,
+                "tid": thread_id,
+                "args": {"name": thread_name},
+            }
+            for thread_id, thread_name in thread_names.items()
+        ]
+        events += [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": self._wall_clock_time(started_at=span.started_at)
+                * _MICROSECONDS_PER_SECOND,
+                "dur": span.duration_seconds * _MICROSECONDS_PER_SECOND,
+                "pid": process_id,
+                "tid": span.thread_id,
+                "args": dict(span.args),
+            }
+            for span in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def _json_lines(self) -> Iterator[str]:
+        """Get the trace as one JSON object per span."""
+        for span in self.spans:
+            yield (
+                json.dumps(
+                    obj={
+                        "name": span.name,
+                        "category": span.category,
+                        "started_at": self._wall_clock_time(
+                            started_at=span.started_at,
+                        ),
+                        "duration_seconds": span.duration_seconds,
+                        "thread_id": span.thread_id,
+                        "thread_name": span.thread_name,
+                        "args": dict(span.args),
+                    },
+                )
+                + "\n"
+            )
+
+    def write(
+        self,
+        *,
+        trace_file_path: Path,
+        trace_format: TraceFormat,
+    ) -> None:
+        """Write the trace to a file."""
+        with trace_file_path.open(mode="w") as trace_file:
+            match trace_format:
+                case TraceFormat.CHROME:
+                    json.dump(obj=self._chrome_trace(), fp=trace_file)
+                case TraceFormat.JSON_LINES:
+                    trace_file.writelines(self._json_lines())
+
+
+# This holds the tracer of the running command, if it is being traced.
+_ACTIVE_TRACERS: list[Tracer] = []
+
+
+@beartype
+def start_tracing() -> Tracer:
+    """Start tracing the running command."""
+    tracer = Tracer()
+    _ACTIVE_TRACERS.append(tracer)
+    return tracer
+
+
+@beartype
+def stop_tracing(*, tracer: Tracer) -> None:
+    """Stop tracing with the given tracer."""
+    _ACTIVE_TRACERS.remove(tracer)
+
+
+@beartype
+def current_tracer() -> Tracer | None:
+    """Get the tracer of the running command, if it is being traced."""
+    if not _ACTIVE_TRACERS:
+        return None
+    return _ACTIVE_TRACERS[-1]
+
+
+@beartype
+def add_span(
+    *,
+    tracer: Tracer,
+    name: str,
+    category: str,
+    started_at: float,
+    args: Mapping[str, object],
+) -> None:
+    """Add a span which started at the given time and which has just
+    finished, in the current thread.
+    """
+    thread = threading.current_thread()
+    tracer.add_span(
+        span=Span(
+            name=name,
+            category=category,
+            started_at=started_at,
+            duration_seconds=time.perf_counter() - started_at,
+            thread_id=threading.get_native_id(),
+            thread_name=thread.name,
+            args=args,
+        ),
+    )
+
+
+@beartype
+@contextlib.contextmanager
+def traced(
+    *,
+    name: str,
+    category: str,
+    args: Mapping[str, object],
+) -> Iterator[None]:
+    """Record a span for the given operation, if the running command is
+    being traced.
+    """
+    tracer = current_tracer()
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        if tracer is not None:
+            add_span(
+                tracer=tracer,
+                name=name,
+                category=category,
+                started_at=started_at,
+                args=args,
+            )
@@ -0,0 +1,619 @@
+"""The transport through which requests to Vuforia are made."""
+
+import contextlib
+import datetime
+import sqlite3
+import time
+import urllib.parse
+from collections.abc import Generator, Mapping
+from pathlib import Path
+
+import click
+import httpx
+import requests
+from beartype import beartype
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from vws.response import Response
+from vws.transports import RequestsTransport, Transport
+
+from vws_cli._api_call_ledger import (
+    ApiCall,
+    ApiCallLedger,
+    credential_fingerprint,
+    current_api_call_ledger_file_path,
+    current_command_name,
+    current_job_tag,
+)
+from vws_cli._metrics import (
+    Metrics,
+    current_metrics,
+    endpoint,
+    record_request,
+)
+from vws_cli._rate_limit import RateLimitedTransport
+from vws_cli._retry import RetryingTransport, is_rejected_response
+from vws_cli._timings import RequestTiming, Timings, current_timings
+from vws_cli._tracing import Tracer, add_span, current_tracer
+
+
+@beartype
+class _TimedHTTPConnection(HTTPConnection):
+    """An HTTP connection which records how long it took to connect."""
+
+    connect_seconds: float | None = None
+
+    def connect(self) -> None:
+        """Connect, and record how long it took."""
+        started_at = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            self.connect_seconds = time.perf_counter() - started_at
+
+
+@beartype
+class _TimedHTTPSConnection(HTTPSConnection):
+    """An HTTPS connection which records how long it took to connect,
+    including the TLS handshake.
+    """
+
+    connect_seconds: float | None = None
+
+    def connect(self) -> None:
+        """Connect, and record how long it took."""
+        started_at = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            self.connect_seconds = time.perf_counter() - started_at
+
+
+@beartype
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    """A pool of HTTP connections which record how long they took to
+    connect.
+    """
+
+    ConnectionCls = _TimedHTTPConnection
+
+
+@beartype
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    """A pool of HTTPS connections which record how long they took to
+    connect.
+    """
+
+    ConnectionCls = _TimedHTTPSConnection
+
+
+@beartype
+class _ConnectTimingAdapter(HTTPAdapter):
+    """A transport adapter whose connections record how long they took to
+    connect.
+    """
+
+    def init_poolmanager(self, *args: object, **kwargs: object) -> None:
+        """Make a pool manager which makes connections which are timed."""
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _TimedHTTPConnectionPool,
+            "https": _TimedHTTPSConnectionPool,
+        }
+
+
+@beartype
+class _HttpxConnectTimer:
+    """An ``httpx`` trace extension which records how long it took to make
+    a connection, including any TLS handshake.
+    """
+
+    def __init__(self) -> None:
+        """Record nothing until a connection is made."""
+        self._started_at: float | None = None
+        self.connect_seconds: float | None = None
+
+    def __call__(self, event_name: str, info: Mapping[str, object]) -> None:
+        """Record the start or the end of making a connection."""
+        del info
+        if event_name == "connection.connect_tcp.started":
+            self._started_at = time.perf_counter()
+        elif self._started_at is not None and event_name in {
+            "connection.connect_tcp.complete",
+            "connection.start_tls.complete",
+        }:
+            self.connect_seconds = time.perf_counter() - self._started_at
+
+
+@beartype
+class TimedRequestsTransport:
+    """A transport which makes requests as ``RequestsTransport`` does, and
+    records how long each request took, including how long it took to
+    connect.
+    """
+
+    def __init__(self, *, timings: Timings) -> None:
+        """Record the timings of requests in the given timings."""
+        self._timings = timings
+
+    def close(self) -> None:
+        """Do nothing, as no connections are held."""
+
+    def __call__(
+        self,
+        *,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        data: bytes,
+        request_timeout: float | tuple[float, float],
+    ) -> Response:
+        """Make an HTTP request, and record how long it took."""
+        path = urllib.parse.urlsplit(url=url).path
+        started_at = time.perf_counter()
+        connect_seconds: float | None = None
+        try:
+            # A new session is used for each request, as ``requests.request``
+            # does, so each request makes a new connection.
+            with requests.Session() as session:
+                adapter = _ConnectTimingAdapter()
+                session.mount(prefix="https://", adapter=adapter)
+                session.mount(prefix="http://", adapter=adapter)
+                requests_response = session.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    data=data,
+                    timeout=request_timeout,
+                    stream=True,
+                )
+                # The connection is given back to the pool when the content
+                # has been read.
+                connection = requests_response.raw.connection
+                if isinstance(
+                    connection,
+                    _TimedHTTPConnection | _TimedHTTPSConnection,
+                ):
+                    connect_seconds = connection.connect_seconds
+                content = requests_response.content
+        except requests.exceptions.RequestException:
+            self._timings.requests.append(
+                RequestTiming(
+                    method=method,
+                    path=path,
+                    status_code=None,
+                    sent_bytes=len(data),
+                    received_bytes=0,
+                    connect_seconds=connect_seconds,
+                    time_to_first_byte_seconds=None,
+                    total_seconds=time.perf_counter() - started_at,
+                ),
+            )
+            raise
+
+        self._timings.requests.append(
+            RequestTiming(
+                method=method,
+                path=path,
+                status_code=requests_response.status_code,
+                sent_bytes=len(data),
+                received_bytes=len(content),
+                connect_seconds=connect_seconds,
+                # This is the time until the response headers were parsed.
+                time_to_first_byte_seconds=(
+                    requests_response.elapsed.total_seconds()
+                ),
+                total_seconds=time.perf_counter() - started_at,
+            ),
+        )
+        return Response(
+            text=requests_response.text,
+            url=requests_response.url,
+            status_code=requests_response.status_code,
+            headers=dict(requests_response.headers),
+            request_body=requests_response.request.body,
+            tell_position=requests_response.raw.tell(),
+            content=bytes(content),
+        )
+
+
+@beartype
+class TracedTransport:
+    """A transport which records a span for each request."""
+
+    def __init__(self, *, transport: Transport, tracer: Tracer) -> None:
+        """Wrap a transport so that its requests are traced."""
+        self._transport = transport
+        self._tracer = tracer
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self._transport.close()
+
+    def __call__(
+        self,
+        *,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        data: bytes,
+        request_timeout: float | tuple[float, float],
+    ) -> Response:
+        """Make a request, and record a span for it."""
+        path = urllib.parse.urlsplit(url=url).path
+        args: dict[str, object] = {
+            "method": method,
+            "path": path,
+            "sent_bytes": len(data),
+        }
+        started_at = time.perf_counter()
+        try:
+            response = self._transport(
+                method=method,
+                url=url,
+                headers=headers,
+                data=data,
+                request_timeout=request_timeout,
+            )
+        except requests.exceptions.RequestException as exc:
+            args["error"] = type(exc).__name__
+            raise
+        else:
+            args["status_code"] = response.status_code
+            args["received_bytes"] = len(response.content)
+        finally:
+            add_span(
+                tracer=self._tracer,
+                name=f"{method} {path}",
+                category="http",
+                started_at=started_at,
+                args=args,
+            )
+        return response
+
+
+@beartype
+class MeasuredTransport:
+    """A transport which records metrics of each request."""
+
+    def __init__(self, *, transport: Transport, metrics: Metrics) -> None:
+        """Wrap a transport so that metrics of its requests are recorded."""
+        self._transport = transport
+        self._metrics = metrics
+
+    def close(self) -> None:
+        """Close the wrapped transport."""
+        self._transport.close()
+
+    def __call__(
+        self,
+        *,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        data: bytes,
+        request_timeout: float | tuple[float, float],
+    ) -> Response:
+        """Make a request, and record metrics of it."""
+        started_at = time.perf_counter()
+        try:
+            response = self._transport(
+                method=method,
+                url=url,
+                headers=headers,
+                data=data,
+                request_timeout=request_timeout,
+            )
+        except requests.exceptions.RequestException as exc:
+            record_request(
+                metrics=self._metrics,
+                method=method,
+                url=url,
+                status=type(exc).__name__,
+                sent_bytes=len(data),
+                received_bytes=0,
+                seconds=time.perf_counter() - started_at,
+                quota_error=False,
+            )
+            raise
+        record_request(
+            metrics=self._metrics,
+            method=method,
+            url=url,
+            status=str(object=response.status_code),
+            sent_bytes=len(data),
+            received_bytes=len(response.content),
+            seconds=time.perf_counter() - started_at,
+            quota_error=is_rejected_response(response=response),
+        )
+        return response
+
+
+@beartype
+class LedgerTransport:
+    """A transport which adds a record of each request to an API call
+    ledger.
+    """
+
+    def __init__(
+        self,
+        *,
+        transport: Transport,
+        ledger_file_path: Path,
+        credential: str,
+        job_tag: str | None,
+        command: str,
+    ) -> None:
+        """Wrap a transport so that its requests are recorded in the given
+        ledger, as made with the given credential by the given command.
+        """
+        self._transport = transport
+        self._ledger_file_path = ledger_file_path
+        self._ledger = ApiCallLedger(ledger_file_path=ledger_file_path)
+        self._credential_fingerprint = credential_fingerprint(
+            credential=credential,
+        )
+        self._job_tag = job_tag
+        self._command = command
+
+    def close(self) -> None:
+        """Close the wrapped transport and the ledger."""
+        self._transport.close()
+        self._ledger.close()
+
+    def _record(
+        self,
+        *,
+        requested_at: datetime.datetime,
+        started_at: float,
+        method: str,
+        url: str,
+        status: str,
+        quota_error: bool,
+    ) -> None:
+        """Add a record of a request to the ledger, or warn if it cannot be
+        added.
+
+        A request which has been made is not failed because the ledger
+        cannot be written, for example because it is locked for too long.
+        """
+        api_call = ApiCall(
+            requested_at=requested_at,
+            credential_fingerprint=self._credential_fingerprint,
+            job_tag=self._job_tag,
+            command=self._command,
+            method=method,
+            endpoint=endpoint(url=url),
+            status=status,
+            quota_error=quota_error,
+            latency_seconds=time.perf_counter() - started_at,
+        )
+        try:
+            self._ledger.record(api_call=api_call)
+        except (sqlite3.Error, OSError) as exc:
+            click.echo(
+                message=(
+                    "Warning: A request could not be recorded in the API "
+                    f"call ledger {self._ledger_file_path}: {exc}"
+                ),
+                err=True,
+            )
+
+    def __call__(
+        self,
+        *,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        data: bytes,
+        request_timeout: float | tuple[float, float],
+    ) -> Response:
+        """Make a request, and add a record of it to the ledger."""
+        requested_at = datetime.datetime.now(tz=datetime.UTC)
+        started_at = time.perf_counter()
+        try:
+            response = self._transport(
+                method=method,
+                url=url,
+                headers=headers,
+                data=data,
+                request_timeout=request_timeout,
+            )
+        except requests.exceptions.RequestException as exc:
+            self._record(
+                requested_at=requested_at,
+                started_at=started_at,
+                method=method,
+                url=url,
+                status=type(exc).__name__,
+                quota_error=False,
+            )
+            raise
+        self._record(
+            requested_at=requested_at,
+            started_at=started_at,
+            method=method,
+            url=url,
+            status=str(object=response.status_code),
+            quota_error=is_rejected_response(response=response),
+        )
+        return response
+
+
+@beartype
+def api_transport(
+    *,
+    credential: str,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
+) -> Transport:
+    """Get a transport for requests made with a credential.
+
+    Each attempt at a request waits for the rate limit, if one is given, and
+    is timed, traced and measured if the command is being timed, traced or
+    measured. Each attempt is recorded if the command has an API call
+    ledger.
+    """
+    timings = current_timings()
+    transport: Transport = (
+        RequestsTransport()
+        if timings is None
+        else TimedRequestsTransport(timings=timings)
+    )
+    tracer = current_tracer()
+    if tracer is not None:
+        transport = TracedTransport(transport=transport, tracer=tracer)
+    metrics = current_metrics()
+    if metrics is not None:
+        transport = MeasuredTransport(transport=transport, metrics=metrics)
+    ledger_file_path = current_api_call_ledger_file_path()
+    if ledger_file_path is not None:
+        transport = LedgerTransport(
+            transport=transport,
+            ledger_file_path=ledger_file_path,
+            credential=credential,
+            job_tag=current_job_tag(),
+            command=current_command_name(),
+        )
+    if max_requests_per_second is not None:
+        transport = RateLimitedTransport(
+            transport=transport,
+            rate_limit_file_path=rate_limit_file_path,
+            credential=credential,
+            max_requests_per_second=max_requests_per_second,
+        )
+    if max_attempts > 1:
+        transport = RetryingTransport(
+            transport=transport,
+            max_attempts=max_attempts,
+            sleep_fn=time.sleep,
+        )
+    return transport
+
+
+@beartype
+class DownloadRecorder:
+    """Streams downloads from URLs which are not Vuforia API endpoints, such
+    as the presigned URLs of recognition counts reports, and times, traces
+    and measures each download as ``api_transport`` does for requests.
+
+    Downloads are not rate limited, tried again or added to an API call
+    ledger, as they are not requests to a Vuforia API and they do not count
+    towards a request quota.
+
+    The timings, tracer and metrics of the running command are found when
+    this is made, so that downloads made in other threads are recorded.
+    """
+
+    def __init__(self) -> None:
+        """Record downloads for the running command."""
+        self._timings = current_timings()
+        self._tracer = current_tracer()
+        self._metrics = current_metrics()
+
+    @contextlib.contextmanager
+    def stream(
+        self,
+        *,
+        http_client: httpx.Client,
+        url: str,
+    ) -> Generator[httpx.Response]:
+        """Stream a ``GET`` request, and record it when the context exits,
+        so that the bytes which were read are counted.
+        """
+        path = urllib.parse.urlsplit(url=url).path
+        started_at = time.perf_counter()
+        status_code: int | None = None
+        time_to_first_byte_seconds: float | None = None
+        received_bytes = 0
+        error_name: str | None = None
+        connect_timer = _HttpxConnectTimer()
+        try:
+            with http_client.stream(
+                method="GET",
+                url=url,
+                extensions={"trace": connect_timer},
+            ) as response:
+                status_code = response.status_code
+                time_to_first_byte_seconds = time.perf_counter() - started_at
+                try:
+                    yield response
+                finally:
+                    received_bytes = response.num_bytes_downloaded
+        except httpx.HTTPError as exc:
+            error_name = type(exc).__name__
+            raise
+        finally:
+            self._record(
+                path=path,
+                url=url,
+                started_at=started_at,
+                status_code=status_code,
+                error_name=error_name,
+                connect_seconds=connect_timer.connect_seconds,
+                time_to_first_byte_seconds=time_to_first_byte_seconds,
+                received_bytes=received_bytes,
+            )
+
+    def _record(
+        self,
+        *,
+        path: str,
+        url: str,
+        started_at: float,
+        status_code: int | None,
+        error_name: str | None,
+        connect_seconds: float | None,
+        time_to_first_byte_seconds: float | None,
+        received_bytes: int,
+    ) -> None:
+        """Record a download in the timings, trace and metrics of the
+        command, if there are any.
+        """
+        total_seconds = time.perf_counter() - started_at
+        if self._timings is not None:
+            self._timings.requests.append(
+                RequestTiming(
+                    method="GET",
+                    path=path,
+                    status_code=status_code,
+                    sent_bytes=0,
+                    received_bytes=received_bytes,
+                    connect_seconds=connect_seconds,
+                    time_to_first_byte_seconds=time_to_first_byte_seconds,
+                    total_seconds=total_seconds,
+                ),
+            )
+        if self._tracer is not None:
+            args: dict[str, object] = {
+                "method": "GET",
+                "path": path,
+                "sent_bytes": 0,
+                "received_bytes": received_bytes,
+            }
+            if status_code is not None:
+                args["status_code"] = status_code
+            if error_name is not None:
+                args["error"] = error_name
+            add_span(
+                tracer=self._tracer,
+                name=f"GET {path}",
+                category="http",
+                started_at=started_at,
+                args=args,
+            )
+        if self._metrics is not None:
+            record_request(
+                metrics=self._metrics,
+                method="GET",
+                url=url,
+                # As for requests, the status is the name of the exception
+                # raised, if there was one.
+                status=error_name or str(object=status_code),
+                sent_bytes=0,
+                received_bytes=received_bytes,
+                seconds=total_seconds,
+                quota_error=False,
+            )
@@ -5,29 +5,104 @@ import contextlib
 import dataclasses
 import datetime
 import io
+import itertools
 import sys
-from collections.abc import Generator
+from collections.abc import (
+    Callable,
+    Generator,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 import click
+import httpx
 import yaml
 from beartype import beartype
 from vws import VWS
 from vws.exceptions.base_exceptions import VWSError
 from vws.exceptions.custom_exceptions import (
     RecoCountsReportDownloadError,
-    RecoCountsReportTimeoutError,
     ServerError,
     TargetProcessingTimeoutError,
 )
-from vws.exceptions.vws_exceptions import AuthenticationFailureError
+from vws.exceptions.vws_exceptions import (
+    AuthenticationFailureError,
+    UnknownTargetError,
+)
+from vws.reports import TargetRecord
 
 from vws_cli._error_handling import get_error_message
+from vws_cli._metrics import counted_operation
+from vws_cli._reco_counts import (
+    ENRICHED_RECO_COUNTS_COLUMNS,
+    RECO_COUNTS_COLUMNS,
+    RECO_COUNTS_DELTA_COLUMNS,
+    MalformedReportRowError,
+    RecoCountsDeltaSummary,
+    RecoCountsSummary,
+    enrich_reco_counts_rows,
+    reco_counts_deltas,
+    reco_counts_report_chunks,
+    reco_counts_rows,
+    report_file_chunks,
+    summarize_reco_counts,
+    summarize_reco_counts_deltas,
+)
+from vws_cli._reco_counts_history import (
+    get_target_history,
+    is_month_final,
+    month_reco_counts,
+    store_month,
+)
+from vws_cli._tables import (
+    Column,
+    ColumnarFormat,
+    ColumnType,
+    csv_chunks,
+    ndjson_chunks,
+    write_chunks,
+    write_columnar,
+)
+from vws_cli._target_record_cache import (
+    add_target_records,
+    get_target_records,
+)
+from vws_cli._timings import current_timings, timed
+from vws_cli._tracing import traced
+from vws_cli._transport import DownloadRecorder, api_transport
+from vws_cli.options.concurrency import max_workers_option
 from vws_cli.options.credentials import (
     server_access_key_option,
     server_secret_key_option,
 )
+from vws_cli.options.rate_limit import (
+    max_requests_per_second_option,
+    rate_limit_file_option,
+)
+from vws_cli.options.reco_counts import (
+    enrich_option,
+    gzip_option,
+    history_file_option,
+    report_output_option,
+    summary_option,
+    target_record_cache_file_option,
+    target_record_cache_max_age_option,
+    top_option,
+)
+from vws_cli.options.retry import (
+    read_max_attempts_option,
+    write_max_attempts_option,
+)
+from vws_cli.options.table_format import (
+    COLUMNAR_TABLE_FORMATS,
+    TableFormatChoice,
+    table_format_option,
+)
 from vws_cli.options.targets import (
     ActiveFlagChoice,
     active_flag_option,
@@ -66,6 +141,59 @@ def _handle_vws_exceptions() -> Generator[None]:
     sys.exit(1)
 
 
+@beartype
+def _vws_client(
+    *,
+    server_access_key: str,
+    server_secret_key: str,
+    base_vws_url: str,
+    database_id: str | None,
+    connection_timeout_seconds: float,
+    read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
+) -> VWS:
+    """Get a client for the Vuforia Web Services API."""
+    timings = current_timings()
+    with timed(timings=timings, phase="client construction"):
+        return VWS(
+            server_access_key=server_access_key,
+            server_secret_key=server_secret_key,
+            base_vws_url=base_vws_url,
+            database_id=database_id,
+            request_timeout_seconds=(
+                connection_timeout_seconds,
+                read_timeout_seconds,
+            ),
+            transport=api_transport(
+                credential=server_access_key,
+                max_requests_per_second=max_requests_per_second,
+                rate_limit_file_path=rate_limit_file_path,
+                max_attempts=max_attempts,
+            ),
+        )
+
+
+@beartype
+@contextlib.contextmanager
+def _handle_malformed_reports() -> Generator[None]:
+    """Show an error message when a recognition counts report has a row
+    which cannot be read.
+    """
+    try:
+        yield
+    except MalformedReportRowError as exc:
+        click.echo(
+            message=(
+                f"Error: Line {exc.line_number} of the recognition counts "
+                "report is not a target ID and a recognition count."
+            ),
+            err=True,
+        )
+        sys.exit(1)
+
+
 @click.command(name="get-target-record")
 @server_access_key_option
 @server_secret_key_option
@@ -73,6 +201,9 @@ def _handle_vws_exceptions() -> Generator[None]:
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @_handle_vws_exceptions()
 @beartype
 def get_target_record(
@@ -83,6 +214,9 @@ def get_target_record(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Get a target record.
 
@@ -90,19 +224,24 @@ def get_target_record(
     See
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#target-record.
     """
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
     record = vws_client.get_target_record(target_id=target_id).target_record
 
-    yaml_record = yaml.dump(data=dataclasses.asdict(obj=record))
-    click.echo(message=yaml_record)
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_record = yaml.dump(data=dataclasses.asdict(obj=record))
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_record)
 
 
 @click.command(name="list-targets")
@@ -112,6 +251,9 @@ def get_target_record(
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @beartype
 def list_targets(
     *,
@@ -120,6 +262,9 @@ def list_targets(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """List targets.
 
@@ -127,18 +272,167 @@ def list_targets(
     See
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#details-list.
     """
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
     targets = vws_client.list_targets()
-    yaml_list = yaml.dump(data=targets)
-    click.echo(message=yaml_list)
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_list = yaml.dump(data=targets)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_list)
+
+
+# The number of targets to request records and summaries for at once, so
+# that only a batch of target details is held in memory.
+_EXPORT_BATCH_SIZE = 256
+
+_TARGET_EXPORT_COLUMNS = (
+    Column(name="target_id", column_type=ColumnType.STRING),
+    Column(name="name", column_type=ColumnType.STRING),
+    Column(name="active_flag", column_type=ColumnType.BOOLEAN),
+    Column(name="width", column_type=ColumnType.FLOAT),
+    Column(name="tracking_rating", column_type=ColumnType.INTEGER),
+    Column(name="reco_rating", column_type=ColumnType.STRING),
+    Column(name="status", column_type=ColumnType.STRING),
+    Column(name="upload_date", column_type=ColumnType.DATE),
+    Column(name="total_recos", column_type=ColumnType.INTEGER),
+    Column(name="current_month_recos", column_type=ColumnType.INTEGER),
+    Column(name="previous_month_recos", column_type=ColumnType.INTEGER),
+)
+
+
+@beartype
+def _target_export_records(
+    *,
+    vws_client: VWS,
+    target_ids: Iterable[str],
+    max_workers: int,
+) -> Iterator[Mapping[str, object]]:
+    """Give the record and summary report of each target, joined.
+
+    Requests are made for a batch of targets at a time. Targets which are
+    deleted while they are being exported are skipped.
+    """
+
+    def target_details(target_id: str) -> Mapping[str, object] | None:
+        """Get the record and summary report of a target, or ``None`` if it
+        does not exist.
+        """
+        with (
+            traced(
+                name="get target details",
+                category="operation",
+                args={"target_id": target_id},
+            ),
+            counted_operation(operation="get target details"),
+        ):
+            try:
+                record = vws_client.get_target_record(
+                    target_id=target_id,
+                ).target_record
+                summary_report = vws_client.get_target_summary_report(
+                    target_id=target_id,
+                )
+            except UnknownTargetError:
+                return None
+        return {
+            **dataclasses.asdict(obj=record),
+            "status": summary_report.status.value,
+            "upload_date": summary_report.upload_date,
+            "total_recos": summary_report.total_recos,
+            "current_month_recos": summary_report.current_month_recos,
+            "previous_month_recos": summary_report.previous_month_recos,
+        }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch in itertools.batched(
+            target_ids,
+            _EXPORT_BATCH_SIZE,
+            strict=False,
+        ):
+            for details in executor.map(target_details, batch):
+                if details is not None:
+                    yield details
+
+
+@click.command(name="export-target-records")
+@table_format_option
+@click.option(
+    "--output",
+    "output_file_path",
+    type=click.Path(
+        dir_okay=False,
+        writable=True,
+        path_type=Path,
+    ),
+    required=False,
+    help=(
+        "The path to write the target records to. By default, the target "
+        "records are written to stdout."
+    ),
+)
+@max_workers_option
+@server_access_key_option
+@server_secret_key_option
+@base_vws_url_option
+@connection_timeout_seconds_option
+@read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
+@_handle_vws_exceptions()
+@beartype
+def export_target_records(
+    *,
+    server_access_key: str,
+    server_secret_key: str,
+    table_format: TableFormatChoice,
+    output_file_path: Path | None,
+    max_workers: int,
+    base_vws_url: str,
+    connection_timeout_seconds: float,
+    read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
+) -> None:
+    """Export the record and summary report of every target in a database.
+
+    There is one row for each target. Records are requested with up to
+    --max-workers requests at a time, and rows are written as the records
+    are received, so not all records are held in memory.
+    """
+    vws_client = _vws_client(
+        server_access_key=server_access_key,
+        server_secret_key=server_secret_key,
+        base_vws_url=base_vws_url,
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
+    )
+    _write_table(
+        records=_target_export_records(
+            vws_client=vws_client,
+            target_ids=vws_client.list_targets(),
+            max_workers=max_workers,
+        ),
+        columns=_TARGET_EXPORT_COLUMNS,
+        table_format=table_format,
+        output_file_path=output_file_path,
+        compress=False,
+    )
 
 
 @click.command(name="get-duplicate-targets")
@@ -149,6 +443,9 @@ def list_targets(
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @beartype
 def get_duplicate_targets(
     *,
@@ -158,6 +455,9 @@ def get_duplicate_targets(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Get a list of potential duplicate targets.
 
@@ -165,19 +465,24 @@ def get_duplicate_targets(
     See
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#check.
     """
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
     record = vws_client.get_duplicate_targets(target_id=target_id)
 
-    yaml_record = yaml.dump(data=record)
-    click.echo(message=yaml_record)
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_record = yaml.dump(data=record)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_record)
 
 
 @click.command(name="get-database-summary-report")
@@ -187,6 +492,9 @@ def get_duplicate_targets(
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @beartype
 def get_database_summary_report(
     *,
@@ -195,6 +503,9 @@ def get_database_summary_report(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Get a database summary report.
 
@@ -202,18 +513,23 @@ def get_database_summary_report(
     See
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#summary-report.
     """
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
     report = vws_client.get_database_summary_report()
-    yaml_report = yaml.dump(data=dataclasses.asdict(obj=report))
-    click.echo(message=yaml_report)
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_report = yaml.dump(data=dataclasses.asdict(obj=report))
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_report)
 
 
 @click.command(name="get-target-summary-report")
@@ -224,6 +540,9 @@ def get_database_summary_report(
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @beartype
 def get_target_summary_report(
     *,
@@ -233,6 +552,9 @@ def get_target_summary_report(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Get a target summary report.
 
@@ -240,21 +562,26 @@ def get_target_summary_report(
     See
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#retrieve-report.
     """
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
     report = vws_client.get_target_summary_report(target_id=target_id)
     report_dict = dataclasses.asdict(obj=report)
     report_dict["status"] = report_dict["status"].value
     report_dict["upload_date"] = str(object=report_dict["upload_date"])
-    yaml_summary_report = yaml.dump(data=report_dict)
-    click.echo(message=yaml_summary_report)
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_summary_report = yaml.dump(data=report_dict)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_summary_report)
 
 
 @click.command(name="delete-target")
@@ -265,6 +592,9 @@ def get_target_summary_report(
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@write_max_attempts_option
 @beartype
 def delete_target(
     *,
@@ -274,6 +604,9 @@ def delete_target(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Delete a target.
 
@@ -281,14 +614,16 @@ def delete_target(
     See
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#delete.
     """
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
     vws_client.delete_target(target_id=target_id)
@@ -306,6 +641,9 @@ def delete_target(
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@write_max_attempts_option
 @beartype
 def add_target(
     *,
@@ -318,6 +656,9 @@ def add_target(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
     application_metadata: str | None = None,
 ) -> None:
     """Add a target.
@@ -326,14 +667,16 @@ def add_target(
     See
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#add
     """
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
     image_bytes = image_file_path.read_bytes()
@@ -368,6 +711,9 @@ def add_target(
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@write_max_attempts_option
 @beartype
 def update_target(
     *,
@@ -378,6 +724,9 @@ def update_target(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
     name: str | None = None,
     application_metadata: str | None = None,
     active_flag_choice: ActiveFlagChoice | None = None,
@@ -389,14 +738,16 @@ def update_target(
     See
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api#update
     """
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
     if image_file_path is None:
@@ -457,6 +808,9 @@ _TIMEOUT_SECONDS_HELP = (
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @_handle_vws_exceptions()
 @beartype
 def wait_for_target_processed(
@@ -468,19 +822,24 @@ def wait_for_target_processed(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
     timeout_seconds: float,
 ) -> None:
     """Wait for a target to be "processed". This is done by polling the VWS
     API.
     """
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        database_id=None,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
     try:
@@ -512,23 +871,12 @@ _REPORT_TIMEOUT_SECONDS_HELP = (
 )
 
 
-@beartype
-def _default_month() -> str:
-    """Return the current month, in the form which ``--month`` takes."""
-    now = datetime.datetime.now(tz=ZoneInfo(key="UTC"))
-    return now.strftime(format=_MONTH_FORMAT)
+_MONTH_PLACEHOLDER = "{month}"
 
 
 @beartype
-def _validate_month(
-    ctx: click.Context,
-    param: click.Parameter,
-    value: str,
-) -> datetime.date:
+def _parse_month(*, value: str) -> datetime.date:
     """Turn a ``YYYY-mm`` string into the first day of that month."""
-    # These are given by ``click``, and we do not use them.
-    del ctx
-    del param
     try:
         parsed = datetime.datetime.strptime(  # noqa: DTZ007
             value,
@@ -540,32 +888,448 @@ def _validate_month(
     return parsed.date()
 
 
+@beartype
+def _validate_months(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: tuple[str, ...],
+) -> tuple[datetime.date, ...]:
+    """Turn ``YYYY-mm`` strings into the first days of those months, without
+    duplicates.
+    """
+    # These are given by ``click``, and we do not use them.
+    del ctx
+    del param
+    months = [_parse_month(value=month_string) for month_string in value]
+    return tuple(dict.fromkeys(months))
+
+
+@beartype
+def _month_output_file_path(
+    *,
+    output_file_path: Path | None,
+    month: datetime.date,
+) -> Path | None:
+    """Get the path to write the report for a month to, from an ``--output``
+    path which may contain a ``{month}`` placeholder.
+    """
+    if output_file_path is None:
+        return None
+    return Path(
+        str(object=output_file_path).replace(
+            _MONTH_PLACEHOLDER,
+            month.strftime(_MONTH_FORMAT),
+        ),
+    )
+
+
+@beartype
+def _request_reco_counts_report(
+    *,
+    vws_client: VWS,
+    month: datetime.date,
+) -> str:
+    """Request a recognition counts report, and return the URL to download
+    it from once it has been generated.
+    """
+    try:
+        report_request = vws_client.request_database_reco_counts_report(
+            year=month.year,
+            month=calendar.Month(value=month.month),
+        )
+    except AuthenticationFailureError:
+        click.echo(
+            message=(
+                "Error: The given secret key was incorrect, or the given "
+                "database ID is not the ID of the database which the given "
+                "server keys belong to."
+            ),
+            err=True,
+        )
+        sys.exit(1)
+    return report_request.presigned_url
+
+
+@beartype
+@contextlib.contextmanager
+def _reco_counts_report_chunks(
+    *,
+    download_recorder: DownloadRecorder,
+    presigned_url: str,
+    seconds_between_requests: float,
+    timeout_seconds: float,
+    request_timeout_seconds: tuple[float, float],
+) -> Generator[Iterator[bytes]]:
+    """Wait for a recognition counts report, and give its content in
+    chunks. An error is shown if the report is not generated in time, or if
+    the connection to the report's URL fails.
+    """
+    try:
+        with reco_counts_report_chunks(
+            download_recorder=download_recorder,
+            presigned_url=presigned_url,
+            seconds_between_requests=seconds_between_requests,
+            timeout_seconds=timeout_seconds,
+            request_timeout_seconds=request_timeout_seconds,
+        ) as chunks:
+            if chunks is None:
+                click.echo(
+                    message=f"Timeout of {timeout_seconds} seconds reached.",
+                    err=True,
+                )
+                sys.exit(1)
+            yield chunks
+    except httpx.HTTPError as exc:
+        click.echo(
+            message=(
+                "Error: The recognition counts report could not be "
+                f"downloaded: {exc}"
+            ),
+            err=True,
+        )
+        sys.exit(1)
+
+
+@beartype
+def _reco_counts_summary_yaml(*, summary: RecoCountsSummary) -> str:
+    """Get a YAML representation of a recognition counts summary."""
+    return yaml.dump(
+        data={
+            "target_count": summary.target_count,
+            "total_reco_count": summary.total_reco_count,
+            "top_targets": [
+                {"target_id": target_id, "reco_count": reco_count}
+                for target_id, reco_count in summary.top_targets
+            ],
+            "zero_reco_count_target_ids": list(
+                summary.zero_reco_count_target_ids,
+            ),
+        },
+        sort_keys=False,
+    )
+
+
+@beartype
+def _validate_report_output_options(
+    *,
+    compress: bool,
+    summary: bool,
+    enrich: bool,
+    table_format: TableFormatChoice,
+) -> None:
+    """Raise a usage error for options which change the report and which
+    cannot be used together.
+    """
+    summary_conflicts = {
+        "--gzip": compress,
+        "--enrich": enrich,
+        f"--format {table_format.value}": (
+            table_format is not TableFormatChoice.CSV
+        ),
+    }
+    for option_name, value in summary_conflicts.items():
+        if summary and value:
+            message = f"{option_name} cannot be used with --summary."
+            raise click.UsageError(message=message)
+
+    if compress and table_format in COLUMNAR_TABLE_FORMATS:
+        message = f"--gzip cannot be used with --format {table_format.value}."
+        raise click.UsageError(message=message)
+
+
+@beartype
+def _write_table(
+    *,
+    records: Iterable[Mapping[str, object]],
+    columns: Sequence[Column],
+    table_format: TableFormatChoice,
+    output_file_path: Path | None,
+    compress: bool,
+) -> None:
+    """Write records in the given form, to a file or to stdout if no file
+    is given.
+    """
+    match table_format:
+        case TableFormatChoice.CSV:
+            write_chunks(
+                chunks=csv_chunks(records=records, columns=columns),
+                output_file_path=output_file_path,
+                compress=compress,
+            )
+        case TableFormatChoice.NDJSON:
+            write_chunks(
+                chunks=ndjson_chunks(records=records, columns=columns),
+                output_file_path=output_file_path,
+                compress=compress,
+            )
+        case TableFormatChoice.PARQUET | TableFormatChoice.ARROW:
+            write_columnar(
+                records=records,
+                columns=columns,
+                columnar_format=ColumnarFormat(value=table_format.value),
+                output_file_path=output_file_path,
+            )
+
+
+@beartype
+@contextlib.contextmanager
+def _target_records_getter(
+    *,
+    vws_client: VWS,
+    base_vws_url: str,
+    database_id: str,
+    cache_file_path: Path,
+    cache_max_age_seconds: float,
+    max_workers: int,
+) -> Generator[Callable[[Sequence[str]], Mapping[str, TargetRecord]]]:
+    """Give a function which gives the records of the given targets which
+    exist, using cached records when they are recent enough and requesting
+    the other records concurrently.
+
+    Every call shares one pool of ``max_workers`` threads, which is shut
+    down when the context exits.
+    """
+    use_cache = bool(cache_max_age_seconds)
+
+    def get_target_record(target_id: str) -> TargetRecord | None:
+        """Get the record of a target, or ``None`` if it does not exist."""
+        with (
+            traced(
+                name="get target record",
+                category="operation",
+                args={"target_id": target_id},
+            ),
+            counted_operation(operation="get target record"),
+        ):
+            try:
+                return vws_client.get_target_record(
+                    target_id=target_id,
+                ).target_record
+            except UnknownTargetError:
+                return None
+
+    def target_records(
+        target_ids: Sequence[str],
+    ) -> Mapping[str, TargetRecord]:
+        """Get the records of the given targets which exist."""
+        cached_records = (
+            get_target_records(
+                cache_file_path=cache_file_path,
+                base_vws_url=base_vws_url,
+                database_id=database_id,
+                target_ids=target_ids,
+                max_age_seconds=cache_max_age_seconds,
+            )
+            if use_cache
+            else {}
+        )
+        missing_target_ids = [
+            target_id
+            for target_id in dict.fromkeys(target_ids)
+            if target_id not in cached_records
+        ]
+        fetched_records = [
+            record
+            for record in executor.map(get_target_record, missing_target_ids)
+            if record is not None
+        ]
+        if use_cache and fetched_records:
+            add_target_records(
+                cache_file_path=cache_file_path,
+                base_vws_url=base_vws_url,
+                database_id=database_id,
+                target_records=fetched_records,
+            )
+        return {
+            **cached_records,
+            **{record.target_id: record for record in fetched_records},
+        }
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield target_records
+
+
+@beartype
+def _write_reco_counts_output(
+    *,
+    download_recorder: DownloadRecorder,
+    presigned_url: str,
+    output_file_path: Path | None,
+    compress: bool,
+    summary: bool,
+    top_count: int,
+    database_target_ids: Sequence[str],
+    enrich: bool,
+    table_format: TableFormatChoice,
+    get_target_records_for_ids: Callable[
+        [Sequence[str]],
+        Mapping[str, TargetRecord],
+    ],
+    seconds_between_requests: float,
+    timeout_seconds: float,
+    request_timeout_seconds: tuple[float, float],
+) -> None:
+    """Wait for a recognition counts report, and write it, its summary or
+    the report joined with target records.
+
+    ``database_target_ids`` is needed only for a summary.
+    """
+    with _reco_counts_report_chunks(
+        download_recorder=download_recorder,
+        presigned_url=presigned_url,
+        seconds_between_requests=seconds_between_requests,
+        timeout_seconds=timeout_seconds,
+        request_timeout_seconds=request_timeout_seconds,
+    ) as chunks:
+        if summary:
+            summary_yaml = _reco_counts_summary_yaml(
+                summary=summarize_reco_counts(
+                    rows=reco_counts_rows(chunks=chunks),
+                    top_count=top_count,
+                    database_target_ids=database_target_ids,
+                ),
+            )
+            write_chunks(
+                chunks=[summary_yaml.encode()],
+                output_file_path=output_file_path,
+                compress=False,
+            )
+            return
+
+        # The report is already CSV, so it is written as it is downloaded
+        # rather than being parsed.
+        if table_format is TableFormatChoice.CSV and not enrich:
+            write_chunks(
+                chunks=chunks,
+                output_file_path=output_file_path,
+                compress=compress,
+            )
+            return
+
+        rows = reco_counts_rows(chunks=chunks)
+        if enrich:
+            records: Iterable[Mapping[str, object]] = (
+                dataclasses.asdict(obj=enriched_row)
+                for enriched_row in enrich_reco_counts_rows(
+                    rows=rows,
+                    get_target_records=get_target_records_for_ids,
+                )
+            )
+            columns = ENRICHED_RECO_COUNTS_COLUMNS
+        else:
+            records = (
+                {"target_id": target_id, "reco_count": reco_count}
+                for target_id, reco_count in rows
+            )
+            columns = RECO_COUNTS_COLUMNS
+
+        _write_table(
+            records=records,
+            columns=columns,
+            table_format=table_format,
+            output_file_path=output_file_path,
+            compress=compress,
+        )
+
+
+@beartype
+def _database_report_months(
+    *,
+    months: tuple[datetime.date, ...],
+    all_available: bool,
+    output_file_path: Path | None,
+    no_wait: bool,
+    compress: bool,
+    summary: bool,
+    table_format: TableFormatChoice,
+    enrich: bool,
+) -> tuple[datetime.date, ...]:
+    """Check that the options given for getting database reports can be
+    used together, and get the months to get reports for.
+
+    Without ``--month`` or ``--all-available``, only the current month is
+    given.
+    """
+    if no_wait and output_file_path is not None:
+        message = "--output cannot be used with --no-wait."
+        raise click.UsageError(message=message)
+
+    no_wait_conflicts = {
+        "--gzip": compress,
+        "--summary": summary,
+        "--format": table_format is not TableFormatChoice.CSV,
+        "--enrich": enrich,
+    }
+    for option_name, value in no_wait_conflicts.items():
+        if no_wait and value:
+            message = f"{option_name} cannot be used with --no-wait."
+            raise click.UsageError(message=message)
+
+    _validate_report_output_options(
+        compress=compress,
+        summary=summary,
+        enrich=enrich,
+        table_format=table_format,
+    )
+
+    if all_available and months:
+        message = "--month cannot be used with --all-available."
+        raise click.UsageError(message=message)
+
+    if all_available:
+        months = _available_report_months()
+    elif not months:
+        _, current_month = _available_report_months()
+        months = (current_month,)
+
+    has_month_placeholder = output_file_path is not None and (
+        _MONTH_PLACEHOLDER in str(object=output_file_path)
+    )
+    if len(months) > 1 and not no_wait and not has_month_placeholder:
+        message = (
+            f"--output with a {_MONTH_PLACEHOLDER} placeholder must be given "
+            "when getting reports for more than one month."
+        )
+        raise click.UsageError(message=message)
+
+    return months
+
+
 @click.command(name="get-database-reco-counts-report")
 @click.option(
     "--month",
+    "months",
     type=str,
-    default=_default_month,
-    callback=_validate_month,
+    multiple=True,
+    callback=_validate_months,
     help=(
         "The month to get recognition counts for, in the YYYY-mm form. "
-        "Vuforia accepts only the current month and the previous month."
+        "Vuforia accepts only the current month and the previous month. "
+        "Give this more than once to get reports for more than one month. "
+        "Each report is then written to the --output path with "
+        f"{_MONTH_PLACEHOLDER} replaced by the month."
     ),
     show_default="the current month",
 )
 @click.option(
-    "--output",
-    "output_file_path",
-    type=click.Path(
-        dir_okay=False,
-        writable=True,
-        path_type=Path,
-    ),
-    required=False,
+    "--all-available",
+    "all_available",
+    is_flag=True,
+    default=False,
     help=(
-        "The path to write the CSV report to. By default, the report is "
-        "written to stdout."
+        "Get reports for every month which Vuforia gives reports for, "
+        "which are the current month and the previous month."
     ),
 )
+@report_output_option
+@gzip_option
+@summary_option
+@top_option
+@table_format_option
+@enrich_option
+@max_workers_option
+@target_record_cache_file_option
+@target_record_cache_max_age_option
 @click.option(
     "--no-wait",
     "no_wait",
@@ -596,82 +1360,725 @@ def _validate_month(
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @_handle_vws_exceptions()
+@_handle_malformed_reports()
 @beartype
 def get_database_reco_counts_report(
     *,
     server_access_key: str,
     server_secret_key: str,
     database_id: str,
-    month: datetime.date,
+    months: tuple[datetime.date, ...],
+    all_available: bool,
     output_file_path: Path | None,
+    compress: bool,
+    summary: bool,
+    top_count: int,
+    table_format: TableFormatChoice,
+    enrich: bool,
+    max_workers: int,
+    target_record_cache_file_path: Path,
+    target_record_cache_max_age_seconds: float,
     no_wait: bool,
     seconds_between_requests: float,
     timeout_seconds: float,
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Get a per-target recognition counts report for a database.
 
     The report is a CSV with a ``target_id,reco_count`` header. Vuforia
     generates the report in the background, so by default we wait for the
-    report to be generated before downloading it.
+    report to be generated before downloading it. The report is written as
+    it is downloaded, rather than being held in memory.
+
+    When reports for more than one month are requested, all of the reports
+    are requested first and then up to --max-workers of them are waited for
+    at the same time. With ``--no-wait``, the URL for each month is shown on
+    its own line, in the order in which the months were given.
+
+    Downloads from a report's URL are timed, traced and measured as
+    requests to Vuforia are. They are not requests to the Vuforia Web
+    Services API and they do not count towards a request quota, so they are
+    not limited by --max-requests-per-second, tried again with
+    --max-attempts or added to the ledger given with ``vws --ledger-file``.
 
     \b
     See
     https://developer.vuforia.com/library/web-api/cloud-targets-web-services-api.
     """
-    if no_wait and output_file_path is not None:
-        message = "--output cannot be used with --no-wait."
-        raise click.UsageError(message=message)
+    months = _database_report_months(
+        months=months,
+        all_available=all_available,
+        output_file_path=output_file_path,
+        no_wait=no_wait,
+        compress=compress,
+        summary=summary,
+        table_format=table_format,
+        enrich=enrich,
+    )
 
-    vws_client = VWS(
+    vws_client = _vws_client(
         server_access_key=server_access_key,
         server_secret_key=server_secret_key,
         base_vws_url=base_vws_url,
         database_id=database_id,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
-    try:
-        report_request = vws_client.request_database_reco_counts_report(
-            year=month.year,
-            month=calendar.Month(value=month.month),
-        )
-    except AuthenticationFailureError:
-        click.echo(
-            message=(
-                "Error: The given secret key was incorrect, or the given "
-                "database ID is not the ID of the database which the given "
-                "server keys belong to."
-            ),
-            err=True,
-        )
-        sys.exit(1)
+    # Vuforia generates the reports in the background, so requesting every
+    # report before waiting for any of them means that they are generated at
+    # the same time.
+    presigned_urls = [
+        _request_reco_counts_report(vws_client=vws_client, month=month)
+        for month in months
+    ]
 
     if no_wait:
-        click.echo(message=report_request.presigned_url)
+        for presigned_url in presigned_urls:
+            click.echo(message=presigned_url)
         return
 
-    try:
-        report = vws_client.wait_for_reco_counts_report(
-            presigned_url=report_request.presigned_url,
+    # Targets which are not in a report have not been recognized, so the
+    # summary needs every target in the database. The targets are listed
+    # once for every month.
+    database_target_ids = vws_client.list_targets() if summary else []
+    # Reports are downloaded in other threads, which cannot find the
+    # instrumentation of the command.
+    download_recorder = DownloadRecorder()
+
+    def write_month_output(month: datetime.date, presigned_url: str) -> None:
+        """Wait for the report for a month, and write it."""
+        with (
+            traced(
+                name="get reco counts report",
+                category="operation",
+                args={"month": month.strftime(_MONTH_FORMAT)},
+            ),
+            counted_operation(operation="get reco counts report"),
+        ):
+            _write_reco_counts_output(
+                download_recorder=download_recorder,
+                presigned_url=presigned_url,
+                output_file_path=_month_output_file_path(
+                    output_file_path=output_file_path,
+                    month=month,
+                ),
+                compress=compress,
+                summary=summary,
+                top_count=top_count,
+                database_target_ids=database_target_ids,
+                enrich=enrich,
+                table_format=table_format,
+                get_target_records_for_ids=get_target_records_for_ids,
+                seconds_between_requests=seconds_between_requests,
+                timeout_seconds=timeout_seconds,
+                request_timeout_seconds=(
+                    connection_timeout_seconds,
+                    read_timeout_seconds,
+                ),
+            )
+
+    with (
+        _target_records_getter(
+            vws_client=vws_client,
+            base_vws_url=base_vws_url,
+            database_id=database_id,
+            cache_file_path=target_record_cache_file_path,
+            cache_max_age_seconds=target_record_cache_max_age_seconds,
+            max_workers=max_workers,
+        ) as get_target_records_for_ids,
+        ThreadPoolExecutor(max_workers=max_workers) as executor,
+    ):
+        list(executor.map(write_month_output, months, presigned_urls))
+
+
+@beartype
+def _available_report_months() -> tuple[datetime.date, datetime.date]:
+    """Return the first days of the previous month and the current month,
+    which are the months that Vuforia gives reports for.
+    """
+    now = datetime.datetime.now(tz=ZoneInfo(key="UTC"))
+    current_month = now.date().replace(day=1)
+    previous_month = (current_month - datetime.timedelta(days=1)).replace(
+        day=1,
+    )
+    return previous_month, current_month
+
+
+# Recognitions made near the end of a month may be counted after the month
+# ends, so the counts for a month are final only once this long has passed
+# since the month ended.
+_FINAL_MONTH_GRACE_PERIOD = datetime.timedelta(days=2)
+
+
+@beartype
+def _is_previous_month_final(*, current_month: datetime.date) -> bool:
+    """Whether the grace period since the previous month ended, at the start
+    of the given current month, has passed.
+    """
+    today = datetime.datetime.now(tz=ZoneInfo(key="UTC")).date()
+    return today - current_month >= _FINAL_MONTH_GRACE_PERIOD
+
+
+@click.command(name="update-reco-counts-history")
+@click.option(
+    "--seconds-between-requests",
+    type=click.FloatRange(min=0.05),
+    default=_SECONDS_BETWEEN_REQUESTS_DEFAULT,
+    help=_REPORT_SECONDS_BETWEEN_REQUESTS_HELP,
+    show_default=True,
+)
+@click.option(
+    "--timeout-seconds",
+    type=click.FloatRange(min=0.05),
+    default=300,
+    help=_REPORT_TIMEOUT_SECONDS_HELP,
+    show_default=True,
+)
+@history_file_option
+@server_access_key_option
+@server_secret_key_option
+@database_id_option
+@base_vws_url_option
+@connection_timeout_seconds_option
+@read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
+@_handle_vws_exceptions()
+@_handle_malformed_reports()
+@beartype
+def update_reco_counts_history(
+    *,
+    server_access_key: str,
+    server_secret_key: str,
+    database_id: str,
+    history_file_path: Path,
+    seconds_between_requests: float,
+    timeout_seconds: float,
+    base_vws_url: str,
+    connection_timeout_seconds: float,
+    read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
+) -> None:
+    """Add recognition counts to the local history of a database.
+
+    Vuforia gives recognition counts for only the current month and the
+    previous month, so running this at least once a month keeps every month.
+    The counts for both months are replaced. A month whose counts were
+    stored at least two days after the month ended is final, and it is not
+    requested again.
+
+    As with ``get-database-reco-counts-report``, downloads from a report's
+    URL are not rate limited, tried again or added to an API call ledger.
+    """
+    vws_client = _vws_client(
+        server_access_key=server_access_key,
+        server_secret_key=server_secret_key,
+        base_vws_url=base_vws_url,
+        database_id=database_id,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
+    )
+
+    previous_month, current_month = _available_report_months()
+    months_summary: list[dict[str, object]] = []
+    is_previous_month_final = _is_previous_month_final(
+        current_month=current_month,
+    )
+    for month, is_final in (
+        (previous_month, is_previous_month_final),
+        (current_month, False),
+    ):
+        month_string = month.strftime(_MONTH_FORMAT)
+        if is_month_final(
+            history_file_path=history_file_path,
+            database_id=database_id,
+            month=month,
+        ):
+            months_summary.append({"month": month_string, "skipped": True})
+            continue
+
+        presigned_url = _request_reco_counts_report(
+            vws_client=vws_client,
+            month=month,
+        )
+        with _reco_counts_report_chunks(
+            download_recorder=DownloadRecorder(),
+            presigned_url=presigned_url,
             seconds_between_requests=seconds_between_requests,
             timeout_seconds=timeout_seconds,
+            request_timeout_seconds=(
+                connection_timeout_seconds,
+                read_timeout_seconds,
+            ),
+        ) as chunks:
+            target_count = store_month(
+                history_file_path=history_file_path,
+                database_id=database_id,
+                month=month,
+                rows=reco_counts_rows(chunks=chunks),
+                is_final=is_final,
+            )
+        months_summary.append(
+            {
+                "month": month_string,
+                "skipped": False,
+                "targets": target_count,
+                "final": is_final,
+            },
         )
-    except RecoCountsReportTimeoutError:
-        click.echo(
-            message=f"Timeout of {timeout_seconds} seconds reached.",
-            err=True,
+
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_output = yaml.dump(data=months_summary, sort_keys=False)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_output)
+
+
+@click.command(name="get-reco-counts-history")
+@target_id_option
+@click.option(
+    "--months",
+    type=click.IntRange(min=1),
+    default=12,
+    help="The number of months, up to and including this month, to show.",
+    show_default=True,
+)
+@history_file_option
+@database_id_option
+@beartype
+def get_reco_counts_history(
+    *,
+    target_id: str,
+    months: int,
+    database_id: str,
+    history_file_path: Path,
+) -> None:
+    """Show the monthly recognition counts of a target from the local history.
+
+    No requests are made to Vuforia. Months which are not in the history are
+    not shown.
+    """
+    _, since_month = _available_report_months()
+    for _ in range(months - 1):
+        since_month = (since_month - datetime.timedelta(days=1)).replace(
+            day=1,
         )
-        sys.exit(1)
 
-    if output_file_path is None:
-        click.echo(message=report.raw_csv, nl=False)
+    history = get_target_history(
+        history_file_path=history_file_path,
+        database_id=database_id,
+        target_id=target_id,
+        since_month=since_month,
+    )
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_output = yaml.dump(data=dict(history))
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_output)
+
+
+@beartype
+def _validate_optional_month(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: str | None,
+) -> datetime.date | None:
+    """Turn a ``YYYY-mm`` string into the first day of that month."""
+    # These are given by ``click``, and we do not use them.
+    del ctx
+    del param
+    if value is None:
+        return None
+    return _parse_month(value=value)
+
+
+@beartype
+@contextlib.contextmanager
+def _stored_reco_counts_rows(
+    *,
+    report_file_path: Path | None,
+    month: datetime.date | None,
+    report_option_name: str,
+    month_option_name: str,
+    history_file_path: Path,
+    database_id: str | None,
+) -> Generator[Iterator[tuple[str, int]]]:
+    """Give the rows of a stored report, from a report file or from a month
+    in the local history.
+    """
+    if report_file_path is not None and month is None:
+        with report_file_chunks(report_file_path=report_file_path) as chunks:
+            yield reco_counts_rows(chunks=chunks)
         return
 
-    output_file_path.write_bytes(data=report.raw_csv)
+    if report_file_path is not None or month is None:
+        message = (
+            f"Exactly one of {report_option_name} and {month_option_name} "
+            "must be given."
+        )
+        raise click.UsageError(message=message)
+
+    if database_id is None:
+        message = f"--database-id must be given with {month_option_name}."
+        raise click.UsageError(message=message)
+
+    with month_reco_counts(
+        history_file_path=history_file_path,
+        database_id=database_id,
+        month=month,
+    ) as rows:
+        if rows is None:
+            click.echo(
+                message=(
+                    f"Error: {month.strftime(_MONTH_FORMAT)} is not in the "
+                    "local history. Use update-reco-counts-history to add "
+                    "it."
+                ),
+                err=True,
+            )
+            sys.exit(1)
+        yield rows
+
+
+@beartype
+def _reco_counts_delta_summary_yaml(*, summary: RecoCountsDeltaSummary) -> str:
+    """Get a YAML representation of a summary of the changes between two
+    recognition counts reports.
+    """
+    return yaml.dump(
+        data={
+            "base_target_count": summary.base_target_count,
+            "target_count": summary.target_count,
+            "new_target_count": summary.new_target_count,
+            "disappeared_target_count": summary.disappeared_target_count,
+            "base_total_reco_count": summary.base_total_reco_count,
+            "total_reco_count": summary.total_reco_count,
+            "biggest_increases": [
+                dataclasses.asdict(obj=delta)
+                for delta in summary.biggest_increases
+            ],
+            "biggest_decreases": [
+                dataclasses.asdict(obj=delta)
+                for delta in summary.biggest_decreases
+            ],
+        },
+        sort_keys=False,
+    )
+
+
+@click.command(name="compare-reco-counts")
+@click.option(
+    "--base-report",
+    "base_report_file_path",
+    type=click.Path(
+        exists=True,
+        dir_okay=False,
+        readable=True,
+        path_type=Path,
+    ),
+    help=(
+        "A recognition counts report CSV to compare against, as written by "
+        "get-database-reco-counts-report, with or without --gzip."
+    ),
+)
+@click.option(
+    "--base-month",
+    type=str,
+    callback=_validate_optional_month,
+    help=(
+        "A month in the local history to compare against, in the YYYY-mm form."
+    ),
+)
+@click.option(
+    "--report",
+    "report_file_path",
+    type=click.Path(
+        exists=True,
+        dir_okay=False,
+        readable=True,
+        path_type=Path,
+    ),
+    help=(
+        "A recognition counts report CSV to compare with the base, as "
+        "written by get-database-reco-counts-report, with or without --gzip."
+    ),
+)
+@click.option(
+    "--month",
+    type=str,
+    callback=_validate_optional_month,
+    help=(
+        "A month in the local history to compare with the base, in the "
+        "YYYY-mm form."
+    ),
+)
+@click.option(
+    "--output",
+    "output_file_path",
+    type=click.Path(
+        dir_okay=False,
+        writable=True,
+        path_type=Path,
+    ),
+    required=False,
+    help=(
+        "The path to write the changes, or their summary, to. By default, "
+        "they are written to stdout."
+    ),
+)
+@table_format_option
+@click.option(
+    "--summary",
+    is_flag=True,
+    default=False,
+    help=(
+        "Show a summary of the changes rather than the change for each "
+        "target. The summary has the number of targets and the total "
+        "recognition count in each report, the number of new and "
+        "disappeared targets, and the targets whose recognition counts "
+        "changed the most."
+    ),
+)
+@click.option(
+    "--top",
+    "top_count",
+    type=click.IntRange(min=0),
+    default=100,
+    help=(
+        "The number of biggest increases, and of biggest decreases, to show "
+        "in a summary."
+    ),
+    show_default=True,
+)
+@history_file_option
+@click.option(
+    "--database-id",
+    type=str,
+    help=(
+        "The ID of the Vuforia database whose local history has the months "
+        "to compare. This is needed only with --base-month or --month."
+    ),
+    envvar="VUFORIA_DATABASE_ID",
+    show_envvar=True,
+)
+@_handle_malformed_reports()
+@beartype
+def compare_reco_counts(
+    *,
+    base_report_file_path: Path | None,
+    base_month: datetime.date | None,
+    report_file_path: Path | None,
+    month: datetime.date | None,
+    output_file_path: Path | None,
+    table_format: TableFormatChoice,
+    summary: bool,
+    top_count: int,
+    history_file_path: Path,
+    database_id: str | None,
+) -> None:
+    """Compare the recognition counts of two reports, target by target.
+
+    Each report is either a stored report file or a month in the local
+    history. No requests are made to Vuforia.
+
+    There is one row for each target in either report. A target which is
+    only in one report has an empty count for the other report. Only the
+    counts of the base report are held in memory, and the other report is
+    read as the rows are written.
+    """
+    if summary and table_format is not TableFormatChoice.CSV:
+        message = (
+            f"--format {table_format.value} cannot be used with --summary."
+        )
+        raise click.UsageError(message=message)
+
+    with (
+        _stored_reco_counts_rows(
+            report_file_path=base_report_file_path,
+            month=base_month,
+            report_option_name="--base-report",
+            month_option_name="--base-month",
+            history_file_path=history_file_path,
+            database_id=database_id,
+        ) as base_rows,
+        _stored_reco_counts_rows(
+            report_file_path=report_file_path,
+            month=month,
+            report_option_name="--report",
+            month_option_name="--month",
+            history_file_path=history_file_path,
+            database_id=database_id,
+        ) as rows,
+    ):
+        deltas = reco_counts_deltas(base_rows=base_rows, rows=rows)
+        if summary:
+            summary_yaml = _reco_counts_delta_summary_yaml(
+                summary=summarize_reco_counts_deltas(
+                    deltas=deltas,
+                    top_count=top_count,
+                ),
+            )
+            write_chunks(
+                chunks=[summary_yaml.encode()],
+                output_file_path=output_file_path,
+                compress=False,
+            )
+            return
+
+        _write_table(
+            records=(dataclasses.asdict(obj=delta) for delta in deltas),
+            columns=RECO_COUNTS_DELTA_COLUMNS,
+            table_format=table_format,
+            output_file_path=output_file_path,
+            compress=False,
+        )
+
+
+@click.command(name="fetch-reco-counts-report")
+@click.option(
+    "--url",
+    "presigned_url",
+    type=str,
+    required=True,
+    help=(
+        "The URL to download the report from, as shown by "
+        "get-database-reco-counts-report --no-wait."
+    ),
+)
+@report_output_option
+@gzip_option
+@summary_option
+@top_option
+@table_format_option
+@enrich_option
+@max_workers_option
+@target_record_cache_file_option
+@target_record_cache_max_age_option
+@click.option(
+    "--seconds-between-requests",
+    type=click.FloatRange(min=0.05),
+    default=_SECONDS_BETWEEN_REQUESTS_DEFAULT,
+    help=_REPORT_SECONDS_BETWEEN_REQUESTS_HELP,
+    show_default=True,
+)
+@click.option(
+    "--timeout-seconds",
+    type=click.FloatRange(min=0.05),
+    default=300,
+    help=_REPORT_TIMEOUT_SECONDS_HELP,
+    show_default=True,
+)
+@server_access_key_option
+@server_secret_key_option
+@database_id_option
+@base_vws_url_option
+@connection_timeout_seconds_option
+@read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
+@_handle_vws_exceptions()
+@_handle_malformed_reports()
+@beartype
+def fetch_reco_counts_report(
+    *,
+    server_access_key: str,
+    server_secret_key: str,
+    database_id: str,
+    presigned_url: str,
+    output_file_path: Path | None,
+    compress: bool,
+    summary: bool,
+    top_count: int,
+    table_format: TableFormatChoice,
+    enrich: bool,
+    max_workers: int,
+    target_record_cache_file_path: Path,
+    target_record_cache_max_age_seconds: float,
+    seconds_between_requests: float,
+    timeout_seconds: float,
+    base_vws_url: str,
+    connection_timeout_seconds: float,
+    read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
+) -> None:
+    """Get a recognition counts report which was requested earlier.
+
+    This downloads a report requested with
+    ``get-database-reco-counts-report --no-wait``, waiting for the report to
+    be generated if it is not ready yet. Many reports can be requested at
+    once, and then fetched later without a process waiting for each report.
+
+    As with ``get-database-reco-counts-report``, downloads from the report's
+    URL are not rate limited, tried again or added to an API call ledger.
+    """
+    _validate_report_output_options(
+        compress=compress,
+        summary=summary,
+        enrich=enrich,
+        table_format=table_format,
+    )
+
+    vws_client = _vws_client(
+        server_access_key=server_access_key,
+        server_secret_key=server_secret_key,
+        base_vws_url=base_vws_url,
+        database_id=database_id,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
+    )
+
+    # Targets which are not in the report have not been recognized, so the
+    # summary needs every target in the database.
+    database_target_ids = vws_client.list_targets() if summary else []
+
+    with _target_records_getter(
+        vws_client=vws_client,
+        base_vws_url=base_vws_url,
+        database_id=database_id,
+        cache_file_path=target_record_cache_file_path,
+        cache_max_age_seconds=target_record_cache_max_age_seconds,
+        max_workers=max_workers,
+    ) as get_target_records_for_ids:
+        _write_reco_counts_output(
+            download_recorder=DownloadRecorder(),
+            presigned_url=presigned_url,
+            output_file_path=output_file_path,
+            compress=compress,
+            summary=summary,
+            top_count=top_count,
+            database_target_ids=database_target_ids,
+            enrich=enrich,
+            table_format=table_format,
+            get_target_records_for_ids=get_target_records_for_ids,
+            seconds_between_requests=seconds_between_requests,
+            timeout_seconds=timeout_seconds,
+            request_timeout_seconds=(
+                connection_timeout_seconds,
+                read_timeout_seconds,
+            ),
+        )
@@ -3,9 +3,13 @@
 import base64
 import contextlib
 import dataclasses
+import datetime
 import json
+import sqlite3
 import sys
-from collections.abc import Generator, Sequence
+import time
+from collections.abc import Generator, Mapping, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import StrEnum
 from pathlib import Path
 from typing import Any
@@ -19,6 +23,7 @@ from vws.exceptions.model_target_exceptions import (
     ModelTargetDatasetTimeoutError,
     ModelTargetError,
     ModelTargetOAuth2Error,
+    UnknownModelTargetDatasetError,
 )
 from vws.model_target_datasets import (
     AutomaticColoring,
@@ -38,12 +43,37 @@ from vws.reports import (
     ModelTargetDatasetStatusReport,
 )
 
+from vws_cli._dataset_cache import DatasetCache
 from vws_cli._error_handling import get_model_target_error_message
+from vws_cli._local_storage import partial_file_path
+from vws_cli._metrics import count_operation, counted_operation
+from vws_cli._model_target_registry import (
+    RegisteredDataset,
+    add_dataset,
+    get_datasets,
+    remove_datasets,
+    set_dataset_statuses,
+)
+from vws_cli._timings import current_timings, timed
+from vws_cli._tracing import traced
+from vws_cli._transport import api_transport
+from vws_cli.options.concurrency import max_workers_option
 from vws_cli.options.model_targets import (
+    cache_directory_option,
     client_id_option,
     client_secret_option,
     dataset_type_option,
     dataset_uuid_option,
+    max_cache_megabytes_option,
+    registry_file_option,
+)
+from vws_cli.options.rate_limit import (
+    max_requests_per_second_option,
+    rate_limit_file_option,
+)
+from vws_cli.options.retry import (
+    read_max_attempts_option,
+    write_max_attempts_option,
 )
 from vws_cli.options.timeout import (
     connection_timeout_seconds_option,
@@ -91,17 +121,28 @@ def _model_target_client(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> ModelTargetService:
     """Get a client for the Model Target Web API."""
-    return ModelTargetService(
-        client_id=client_id,
-        client_secret=client_secret,
-        base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
-    )
+    timings = current_timings()
+    with timed(timings=timings, phase="client construction"):
+        return ModelTargetService(
+            client_id=client_id,
+            client_secret=client_secret,
+            base_vws_url=base_vws_url,
+            request_timeout_seconds=(
+                connection_timeout_seconds,
+                read_timeout_seconds,
+            ),
+            transport=api_transport(
+                credential=client_id,
+                max_requests_per_second=max_requests_per_second,
+                rate_limit_file_path=rate_limit_file_path,
+                max_attempts=max_attempts,
+            ),
+        )
 
 
 @beartype
@@ -115,8 +156,120 @@ def _status_report_yaml(*, report: ModelTargetDatasetStatusReport) -> str:
     return yaml.dump(data=report_dict)
 
 
+@beartype
+def _register_dataset(
+    *,
+    registry_file_path: Path,
+    client_id: str,
+    base_vws_url: str,
+    dataset_uuid: str,
+    name: str,
+    dataset_type: ModelTargetDatasetType,
+) -> None:
+    """Add a newly created dataset to the local registry.
+
+    The dataset has already been created, so a registry which cannot be
+    written to gives a warning rather than an error.
+    """
+    try:
+        add_dataset(
+            registry_file_path=registry_file_path,
+            client_id=client_id,
+            base_vws_url=base_vws_url,
+            dataset=RegisteredDataset(
+                dataset_uuid=dataset_uuid,
+                name=name,
+                dataset_type=dataset_type,
+                created_at=datetime.datetime.now(tz=datetime.UTC),
+                status=ModelTargetDatasetStatuses.PROCESSING,
+            ),
+        )
+    except (OSError, sqlite3.Error) as exc:
+        click.echo(
+            message=(
+                f'Warning: The dataset "{name}" ({dataset_uuid}) could not be '
+                f"added to the local registry at {registry_file_path}: {exc}"
+            ),
+            err=True,
+        )
+
+
+@beartype
+def _record_statuses(
+    *,
+    registry_file_path: Path,
+    statuses: Mapping[str, ModelTargetDatasetStatuses],
+) -> None:
+    """Record the latest known statuses of datasets in the local registry.
+
+    A registry which cannot be written to gives a warning rather than an
+    error, so that the statuses are still shown.
+    """
+    try:
+        set_dataset_statuses(
+            registry_file_path=registry_file_path,
+            statuses=statuses,
+        )
+    except (OSError, sqlite3.Error) as exc:
+        click.echo(
+            message=(
+                "Warning: The local registry at "
+                f"{registry_file_path} could not be updated: {exc}"
+            ),
+            err=True,
+        )
+
+
+@beartype
+def _unregister_datasets(
+    *,
+    registry_file_path: Path,
+    dataset_uuids: Sequence[str],
+) -> None:
+    """Remove deleted datasets from the local registry.
+
+    The datasets have already been deleted, so a registry which cannot be
+    written to gives a warning rather than an error.
+    """
+    try:
+        remove_datasets(
+            registry_file_path=registry_file_path,
+            dataset_uuids=dataset_uuids,
+        )
+    except (OSError, sqlite3.Error) as exc:
+        click.echo(
+            message=(
+                "Warning: The local registry at "
+                f"{registry_file_path} could not be updated: {exc}"
+            ),
+            err=True,
+        )
+
+
+@beartype
+def _registered_datasets_yaml(
+    *,
+    datasets: Sequence[RegisteredDataset],
+) -> str:
+    """Get a YAML representation of datasets in the local registry."""
+    return yaml.dump(
+        data=[
+            {
+                "name": dataset.name,
+                "dataset_uuid": dataset.dataset_uuid,
+                "dataset_type": dataset.dataset_type.value,
+                "created_at": str(object=dataset.created_at),
+                "status": dataset.status.value,
+            }
+            for dataset in datasets
+        ],
+    )
+
+
 _MODELS_FILE_HINT = "'--models-file'"
 
+_DATASETS_FILE_HINT = "'--datasets-file'"
+
 _MODEL_STRING_FIELDS = {
     "cadDataBlob": "cad_data_blob",
     "cadDataUrl": "cad_data_url",
@@ -137,253 +290,568 @@ _MODEL_ENUM_FIELDS: dict[str, tuple[str, type[StrEnum]]] = {
 }
 
 _MODEL_FIELDS = frozenset(
-    {*_MODEL_STRING_FIELDS, *_MODEL_ENUM_FIELDS, "views"},
+    {*_MODEL_STRING_FIELDS, *_MODEL_ENUM_FIELDS, "cadDataFile", "views"},
 )
 
 _VIEW_FIELDS = frozenset({"guideViewPosition", "name", "states"})
 
 _POSITION_FIELDS = frozenset({"rotation", "translation"})
 
+_DATASET_FIELDS = frozenset({"datasetType", "models", "name", "targetSdk"})
+
 
 @beartype
-def _models_file_error(*, message: str) -> click.BadParameter:
-    """Get an error to raise for an invalid models file."""
-    return click.BadParameter(message=message, param_hint=_MODELS_FILE_HINT)
+@dataclasses.dataclass(frozen=True)
+class _ModelSpec:
+    """A model to send to Vuforia, with any CAD data file not yet read.
 
+    CAD data files can be large, so they are read and encoded only when
+    the request to create a dataset is made.
+    """
 
-@beartype
-def _is_json_object(*, value: object) -> bool:
-    """Get whether a value from a models file is an object."""
-    return isinstance(value, dict)
+    model_kwargs: Mapping[str, Any]
+    cad_data_file_path: Path | None
+
+    def build(self) -> ModelTargetModel:
+        """Get the model, with the CAD data file read and encoded."""
+        model_kwargs = dict(self.model_kwargs)
+        if self.cad_data_file_path is not None:
+            model_kwargs["cad_data_blob"] = base64.b64encode(
+                s=self.cad_data_file_path.read_bytes(),
+            ).decode(encoding="ascii")
+        return ModelTargetModel(**model_kwargs)
 
 
 @beartype
-def _is_json_array(*, value: object) -> bool:
-    """Get whether a value from a models file is an array."""
-    return isinstance(value, list)
+def _build_models(
+    *,
+    model_specs: Sequence[_ModelSpec],
+) -> Sequence[ModelTargetModel]:
+    """Get models to send to Vuforia, reading CAD data files one at a time.
+
+    Several datasets may be created at once, each on a worker thread, so
+    the files of one dataset are not read on further threads.
+    """
+    return [model_spec.build() for model_spec in model_specs]
 
 
 @beartype
-def _as_json_object(*, value: object) -> dict[str, Any] | None:
-    """Get an object from a models file, or ``None``."""
-    if not _is_json_object(value=value):
-        return None
-    # The value goes through a variable which is typed as ``Any`` so that
-    # the keys and values of the returned object are not unknown types.
-    value_any: Any = value
-    value_dict: dict[str, Any] = value_any
-    return value_dict
+@dataclasses.dataclass(frozen=True)
+class _DatasetSpec:
+    """A dataset to generate, as described in a datasets file."""
 
+    name: str
+    target_sdk: str
+    dataset_type: ModelTargetDatasetType
+    models: Sequence[_ModelSpec]
 
-@beartype
-def _json_object(*, value: object, message: str) -> dict[str, Any]:
-    """Get an object from a models file, or raise an error."""
-    value_dict = _as_json_object(value=value)
-    if value_dict is None:
-        raise _models_file_error(message=message)
-    return value_dict
 
+class _ModelsJSONParser:
+    """A single-pass parser for the JSON in models files and datasets files.
 
-@beartype
-def _json_array(*, value: object, message: str) -> list[Any]:
-    """Get an array from a models file, or raise an error."""
-    if not _is_json_array(value=value):
-        raise _models_file_error(message=message)
-    # The value goes through a variable which is typed as ``Any`` so that
-    # the items of the returned array are not unknown types.
-    value_any: Any = value
-    value_list: list[Any] = value_any
-    return value_list
+    Models for State-Based Model Targets can have many thousands of views.
+    This is therefore not decorated with ``beartype``, and it keeps the path
+    to the value being parsed as a stack of parts, which is joined into a
+    string only to describe an invalid value.
+    """
 
+    def __init__(self, *, param_hint: str, base_directory: Path) -> None:
+        """
+        Args:
+            param_hint: The option to name in errors.
+            base_directory: The directory which CAD data file paths are
+                relative to.
+        """
+        self._param_hint = param_hint
+        self._base_directory = base_directory
+        self._path: list[str | int] = []
+
+    def _error(self, *, problem: str) -> click.BadParameter:
+        """Get an error to raise for the value at the current path."""
+        path = "".join(
+            f"({part})" if isinstance(part, int) else part
+            for part in self._path
+        )
+        return click.BadParameter(
+            message=f"{path}{problem}",
+            param_hint=self._param_hint,
+        )
 
-@beartype
-def _checked_object(
-    *,
-    value: object,
-    known_fields: frozenset[str],
-    required_fields: Sequence[str],
-    path: str,
-) -> dict[str, Any]:
-    """Get an object with known and required fields, or raise an error."""
-    value_dict = _json_object(
-        value=value,
-        message=f"{path} must be an object.",
-    )
-    unknown_fields = sorted(set(value_dict) - known_fields)
-    if unknown_fields:
-        message = f"{path} has unknown fields: {', '.join(unknown_fields)}."
-        raise _models_file_error(message=message)
+    def _array(self, *, value: object, problem: str) -> list[Any]:
+        """Get an array, or raise an error with the given problem."""
+        if not isinstance(value, list):
+            raise self._error(problem=problem)
+        # The value goes through a variable which is typed as ``Any`` so
+        # that the items of the returned array are not unknown types.
+        value_any: Any = value
+        value_list: list[Any] = value_any
+        return value_list
+
+    def _object(
+        self,
+        *,
+        value: object,
+        known_fields: frozenset[str],
+        required_fields: Sequence[str],
+    ) -> dict[str, Any]:
+        """Get an object with known and required fields, or raise an
+        error.
+        """
+        if not isinstance(value, dict):
+            raise self._error(problem=" must be an object.")
+        # The value goes through a variable which is typed as ``Any`` so
+        # that the keys and values of the returned object are not unknown
+        # types.
+        value_any: Any = value
+        value_dict: dict[str, Any] = value_any
+        if not known_fields.issuperset(value_dict):
+            unknown_fields = sorted(set(value_dict) - known_fields)
+            problem = f" has unknown fields: {', '.join(unknown_fields)}."
+            raise self._error(problem=problem)
+
+        for required_field in required_fields:
+            if required_field not in value_dict:
+                problem = f"/{required_field} is required."
+                raise self._error(problem=problem)
+
+        return value_dict
+
+    def _string_field(self, *, value_dict: dict[str, Any], field: str) -> str:
+        """Get a string field of an object, or raise an error."""
+        value = value_dict[field]
+        if not isinstance(value, str):
+            self._path.append(f"/{field}")
+            raise self._error(problem=" must be a string.")
+        return value
+
+    def _enum_field(
+        self,
+        *,
+        value_dict: dict[str, Any],
+        field: str,
+        enum_type: type[StrEnum],
+    ) -> StrEnum:
+        """Get an enumeration member field of an object, or raise an
+        error.
+        """
+        string_value = self._string_field(value_dict=value_dict, field=field)
+        try:
+            return enum_type(value=string_value)
+        except ValueError as exc:
+            self._path.append(f"/{field}")
+            allowed = ", ".join(sorted(member.value for member in enum_type))
+            problem = f" must be one of: {allowed}."
+            raise self._error(problem=problem) from exc
+
+    def _numbers_field(
+        self,
+        *,
+        value_dict: dict[str, Any],
+        field: str,
+    ) -> Sequence[float]:
+        """Get an array of numbers field of an object, or raise an error."""
+        value = value_dict[field]
+        numbers: list[float] = []
+        if isinstance(value, list):
+            value_any: Any = value
+            items: list[Any] = value_any
+            for item in items:
+                if isinstance(item, bool) or not isinstance(item, int | float):
+                    break
+                numbers.append(float(item))
+            else:
+                return numbers
+
+        self._path.append(f"/{field}")
+        raise self._error(problem=" must be an array of numbers.")
+
+    def _guide_view_position(self, *, value: object) -> GuideViewPosition:
+        """Get a guide view position, or raise an error."""
+        position_dict = self._object(
+            value=value,
+            known_fields=_POSITION_FIELDS,
+            required_fields=("rotation", "translation"),
+        )
+        return GuideViewPosition(
+            rotation=self._numbers_field(
+                value_dict=position_dict,
+                field="rotation",
+            ),
+            translation=self._numbers_field(
+                value_dict=position_dict,
+                field="translation",
+            ),
+        )
 
-    for required_field in required_fields:
-        if required_field not in value_dict:
-            message = f"{path}/{required_field} is required."
-            raise _models_file_error(message=message)
+    def _view(self, *, value: object) -> ModelTargetView:
+        """Get a guide view, or raise an error."""
+        path = self._path
+        view_dict = self._object(
+            value=value,
+            known_fields=_VIEW_FIELDS,
+            required_fields=("guideViewPosition", "name"),
+        )
 
-    return value_dict
+        states: Sequence[str] | None = None
+        if "states" in view_dict:
+            path.append("/states")
+            states_items = self._array(
+                value=view_dict["states"],
+                problem=" must be an array of strings.",
+            )
+            for index, state in enumerate(iterable=states_items):
+                if not isinstance(state, str):
+                    path.append(index)
+                    raise self._error(problem=" must be a string.")
+            path.pop()
+            states = states_items
+
+        name = self._string_field(value_dict=view_dict, field="name")
+        path.append("/guideViewPosition")
+        guide_view_position = self._guide_view_position(
+            value=view_dict["guideViewPosition"],
+        )
+        path.pop()
+        return ModelTargetView(
+            name=name,
+            guide_view_position=guide_view_position,
+            states=states,
+        )
 
+    def _model(self, *, value: object) -> _ModelSpec:
+        """Get a model, or raise an error."""
+        path = self._path
+        model_dict = self._object(
+            value=value,
+            known_fields=_MODEL_FIELDS,
+            required_fields=("name",),
+        )
 
-@beartype
-def _string_value(*, value: object, path: str) -> str:
-    """Get a string from a models file, or raise an error."""
-    if not isinstance(value, str):
-        message = f"{path} must be a string."
-        raise _models_file_error(message=message)
-    return value
+        model_kwargs: dict[str, Any] = {
+            field_name: self._string_field(
+                value_dict=model_dict,
+                field=json_field,
+            )
+            for json_field, field_name in _MODEL_STRING_FIELDS.items()
+            if json_field in model_dict
+        }
+
+        for json_field, (field_name, enum_type) in _MODEL_ENUM_FIELDS.items():
+            if json_field in model_dict:
+                model_kwargs[field_name] = self._enum_field(
+                    value_dict=model_dict,
+                    field=json_field,
+                    enum_type=enum_type,
+                )
+
+        if "views" in model_dict:
+            path.append("/views")
+            views_items = self._array(
+                value=model_dict["views"],
+                problem=" must be an array.",
+            )
+            views: list[ModelTargetView] = []
+            for index, view_json in enumerate(iterable=views_items):
+                path.append(index)
+                views.append(self._view(value=view_json))
+                path.pop()
+            path.pop()
+            model_kwargs["views"] = views
+
+        cad_data_file_path: Path | None = None
+        if "cadDataFile" in model_dict:
+            if {"cad_data_blob", "cad_data_url"} & model_kwargs.keys():
+                path.append("/cadDataFile")
+                problem = " cannot be used with cadDataBlob or cadDataUrl."
+                raise self._error(problem=problem)
+            cad_data_file_path = self._base_directory / self._string_field(
+                value_dict=model_dict,
+                field="cadDataFile",
+            )
+            if not cad_data_file_path.is_file():
+                path.append("/cadDataFile")
+                problem = f": {cad_data_file_path} is not a file."
+                raise self._error(problem=problem)
+
+        return _ModelSpec(
+            model_kwargs=model_kwargs,
+            cad_data_file_path=cad_data_file_path,
+        )
+
+    def _top_level_array(self, *, file_json: object, key: str) -> list[Any]:
+        """Get the array of items in a file.
+
+        A file holds either an array or an object with the array at the
+        given key.
+        """
+        self._path.append(f"/{key}")
+        items_json = file_json
+        if isinstance(file_json, dict):
+            if key not in file_json:
+                raise self._error(problem=" is required.")
+            file_json_any: Any = file_json
+            file_dict: dict[str, Any] = file_json_any
+            items_json = file_dict[key]
+
+        return self._array(value=items_json, problem=" must be an array.")
+
+    def _models(self, *, value: object) -> Sequence[_ModelSpec]:
+        """Get the models in an array of models, or raise an error."""
+        path = self._path
+        models_items = self._array(value=value, problem=" must be an array.")
+        models: list[_ModelSpec] = []
+        for index, model_json in enumerate(iterable=models_items):
+            path.append(index)
+            models.append(self._model(value=model_json))
+            path.pop()
+        return models
+
+    def models_file(self, *, file_json: object) -> Sequence[_ModelSpec]:
+        """Get the models described by a models file, or raise an error."""
+        models_items = self._top_level_array(file_json=file_json, key="models")
+        return self._models(value=models_items)
+
+    def datasets_file(self, *, file_json: object) -> Sequence[_DatasetSpec]:
+        """Get the datasets described by a datasets file, or raise an
+        error.
+        """
+        path = self._path
+        datasets_items = self._top_level_array(
+            file_json=file_json,
+            key="datasets",
+        )
+        specs: list[_DatasetSpec] = []
+        seen_names: set[str] = set()
+        for index, dataset_json in enumerate(iterable=datasets_items):
+            path.append(index)
+            dataset_dict = self._object(
+                value=dataset_json,
+                known_fields=_DATASET_FIELDS,
+                required_fields=("name", "targetSdk", "models"),
+            )
+
+            name = self._string_field(value_dict=dataset_dict, field="name")
+            # ``Path("..").name`` is ``".."``, and ``Path("").name`` is
+            # ``""``, so these are not caught by comparing with the name.
+            if name in {"", ".", ".."} or Path(name).name != name:
+                path.append("/name")
+                raise self._error(problem=" must be usable as a file name.")
+
+            dataset_type = ModelTargetDatasetType.STANDARD
+            if "datasetType" in dataset_dict:
+                dataset_type = ModelTargetDatasetType(
+                    value=self._enum_field(
+                        value_dict=dataset_dict,
+                        field="datasetType",
+                        enum_type=ModelTargetDatasetType,
+                    ),
+                )
+
+            target_sdk = self._string_field(
+                value_dict=dataset_dict,
+                field="targetSdk",
+            )
+            path.append("/models")
+            models = self._models(value=dataset_dict["models"])
+            path.pop()
+
+            specs.append(
+                _DatasetSpec(
+                    name=name,
+                    target_sdk=target_sdk,
+                    dataset_type=dataset_type,
+                    models=models,
+                ),
+            )
+            path.pop()
+
+        for index, spec in enumerate(iterable=specs):
+            if spec.name in seen_names:
+                path.append(index)
+                path.append("/name")
+                raise self._error(problem=" is the name of another dataset.")
+            seen_names.add(spec.name)
+
+        return specs
 
 
 @beartype
-def _enum_value(
+def _models_from_file(
     *,
-    value: object,
-    enum_type: type[StrEnum],
-    path: str,
-) -> StrEnum:
-    """Get an enumeration member from a models file, or raise an error."""
-    string_value = _string_value(value=value, path=path)
+    models_file_path: Path,
+) -> Sequence[_ModelSpec]:
+    """Get the models described by a models file, or raise an error."""
     try:
-        return enum_type(value=string_value)
-    except ValueError as exc:
-        allowed = ", ".join(sorted(member.value for member in enum_type))
-        message = f"{path} must be one of: {allowed}."
-        raise _models_file_error(message=message) from exc
+        file_json: object = json.loads(s=models_file_path.read_text())
+    except json.JSONDecodeError as exc:
+        message = f"{models_file_path} is not valid JSON."
+        raise click.BadParameter(
+            message=message,
+            param_hint=_MODELS_FILE_HINT,
+        ) from exc
+
+    parser = _ModelsJSONParser(
+        param_hint=_MODELS_FILE_HINT,
+        base_directory=models_file_path.parent,
+    )
+    return parser.models_file(file_json=file_json)
 
 
 @beartype
-def _number_sequence(*, value: object, path: str) -> Sequence[float]:
-    """Get a sequence of numbers from a models file, or raise an error."""
-    message = f"{path} must be an array of numbers."
-    items = _json_array(value=value, message=message)
-    for item in items:
-        if isinstance(item, bool) or not isinstance(item, int | float):
-            raise _models_file_error(message=message)
-
-    return [float(item) for item in items]
+def _dataset_specs_from_file(
+    *,
+    datasets_file_path: Path,
+) -> Sequence[_DatasetSpec]:
+    """Get the datasets described by a datasets file, or raise an error."""
+    try:
+        file_json: object = json.loads(s=datasets_file_path.read_text())
+    except json.JSONDecodeError as exc:
+        message = f"{datasets_file_path} is not valid JSON."
+        raise click.BadParameter(
+            message=message,
+            param_hint=_DATASETS_FILE_HINT,
+        ) from exc
+
+    parser = _ModelsJSONParser(
+        param_hint=_DATASETS_FILE_HINT,
+        base_directory=datasets_file_path.parent,
+    )
+    return parser.datasets_file(file_json=file_json)
 
 
 @beartype
-def _guide_view_position_from_json(
+def _dataset_cache(
     *,
-    value: object,
-    path: str,
-) -> GuideViewPosition:
-    """Get a guide view position from a models file, or raise an error."""
-    position_dict = _checked_object(
-        value=value,
-        known_fields=_POSITION_FIELDS,
-        required_fields=("rotation", "translation"),
-        path=path,
-    )
-    return GuideViewPosition(
-        rotation=_number_sequence(
-            value=position_dict["rotation"],
-            path=f"{path}/rotation",
-        ),
-        translation=_number_sequence(
-            value=position_dict["translation"],
-            path=f"{path}/translation",
-        ),
+    cache_directory_path: Path,
+    max_cache_megabytes: float,
+) -> DatasetCache | None:
+    """Get the cache of downloaded datasets, if it is to be used."""
+    if max_cache_megabytes == 0:
+        return None
+    return DatasetCache(
+        directory_path=cache_directory_path,
+        max_size_bytes=int(max_cache_megabytes * 1024 * 1024),
     )
 
 
 @beartype
-def _view_from_json(*, value: object, path: str) -> ModelTargetView:
-    """Get a guide view from a models file, or raise an error."""
-    view_dict = _checked_object(
-        value=value,
-        known_fields=_VIEW_FIELDS,
-        required_fields=("guideViewPosition", "name"),
-        path=path,
-    )
-
-    states: Sequence[str] | None = None
-    if "states" in view_dict:
-        states_items = _json_array(
-            value=view_dict["states"],
-            message=f"{path}/states must be an array of strings.",
-        )
-        states = [
-            _string_value(value=state, path=f"{path}/states({index})")
-            for index, state in enumerate(iterable=states_items)
-        ]
-
-    return ModelTargetView(
-        name=_string_value(value=view_dict["name"], path=f"{path}/name"),
-        guide_view_position=_guide_view_position_from_json(
-            value=view_dict["guideViewPosition"],
-            path=f"{path}/guideViewPosition",
-        ),
-        states=states,
-    )
+def _write_dataset(*, output_file_path: Path, dataset: bytes) -> None:
+    """Write a dataset to a file, so that the file is written in full or not
+    at all.
+    """
+    with partial_file_path(output_file_path=output_file_path) as path:
+        path.write_bytes(data=dataset)
 
 
 @beartype
-def _model_from_json(*, value: object, path: str) -> ModelTargetModel:
-    """Get a model from a models file, or raise an error."""
-    model_dict = _checked_object(
-        value=value,
-        known_fields=_MODEL_FIELDS,
-        required_fields=("name",),
-        path=path,
-    )
-
-    model_kwargs: dict[str, Any] = {
-        field_name: _string_value(
-            value=model_dict[json_field],
-            path=f"{path}/{json_field}",
-        )
-        for json_field, field_name in _MODEL_STRING_FIELDS.items()
-        if json_field in model_dict
-    }
-
-    for json_field, (field_name, enum_type) in _MODEL_ENUM_FIELDS.items():
-        if json_field in model_dict:
-            model_kwargs[field_name] = _enum_value(
-                value=model_dict[json_field],
-                enum_type=enum_type,
-                path=f"{path}/{json_field}",
-            )
+def _cached_dataset(
+    *,
+    dataset_cache: DatasetCache,
+    base_vws_url: str,
+    dataset_type: ModelTargetDatasetType,
+    dataset_uuid: str,
+) -> bytes | None:
+    """Get a dataset from the cache, or ``None`` if it is not cached.
 
-    if "views" in model_dict:
-        views_items = _json_array(
-            value=model_dict["views"],
-            message=f"{path}/views must be an array.",
+    A cache which cannot be read gives a warning rather than an error, and
+    the dataset is downloaded instead.
+    """
+    try:
+        return dataset_cache.get(
+            base_vws_url=base_vws_url,
+            dataset_type=dataset_type,
+            dataset_uuid=dataset_uuid,
         )
-        model_kwargs["views"] = [
-            _view_from_json(value=view_json, path=f"{path}/views({index})")
-            for index, view_json in enumerate(iterable=views_items)
-        ]
-
-    return ModelTargetModel(**model_kwargs)
+    except (OSError, sqlite3.Error) as exc:
+        click.echo(
+            message=(
+                "Warning: The dataset cache at "
+                f"{dataset_cache.directory_path} could not be read: {exc}"
+            ),
+            err=True,
+        )
+        return None
 
 
 @beartype
-def _models_from_file(
+def _cache_dataset(
     *,
-    models_file_path: Path,
-) -> Sequence[ModelTargetModel]:
-    """Get the models described by a models file, or raise an error."""
+    dataset_cache: DatasetCache,
+    base_vws_url: str,
+    dataset_type: ModelTargetDatasetType,
+    dataset_uuid: str,
+    dataset: bytes,
+) -> None:
+    """Add a downloaded dataset to the cache.
+
+    The dataset has already been downloaded, so a cache which cannot be
+    written to gives a warning rather than an error, and the dataset is
+    still written to its output file.
+    """
     try:
-        file_json: object = json.loads(s=models_file_path.read_text())
-    except json.JSONDecodeError as exc:
-        message = f"{models_file_path} is not valid JSON."
-        raise _models_file_error(message=message) from exc
-
-    models_json: object = file_json
-    file_dict = _as_json_object(value=file_json)
-    if file_dict is not None:
-        if "models" not in file_dict:
-            message = "/models is required."
-            raise _models_file_error(message=message)
-        models_json = file_dict["models"]
-
-    models_items = _json_array(
-        value=models_json,
-        message="/models must be an array.",
-    )
-    return [
-        _model_from_json(value=model_json, path=f"/models({index})")
-        for index, model_json in enumerate(iterable=models_items)
-    ]
+        dataset_cache.add(
+            base_vws_url=base_vws_url,
+            dataset_type=dataset_type,
+            dataset_uuid=dataset_uuid,
+            dataset=dataset,
+        )
+    except (OSError, sqlite3.Error) as exc:
+        click.echo(
+            message=(
+                "Warning: The dataset cache at "
+                f"{dataset_cache.directory_path} could not be written to: "
+                f"{exc}"
+            ),
+            err=True,
+        )
+
+
+@beartype
+def _download_dataset(
+    *,
+    model_target_client: ModelTargetService,
+    base_vws_url: str,
+    dataset_uuid: str,
+    dataset_type: ModelTargetDatasetType,
+    output_file_path: Path,
+    dataset_cache: DatasetCache | None,
+) -> None:
+    """Download a generated dataset to a file, using the cache if given."""
+    with (
+        traced(
+            name="download dataset",
+            category="operation",
+            args={"dataset_uuid": dataset_uuid},
+        ),
+        counted_operation(operation="download dataset"),
+    ):
+        if dataset_cache is not None:
+            cached_dataset = _cached_dataset(
+                dataset_cache=dataset_cache,
+                base_vws_url=base_vws_url,
+                dataset_type=dataset_type,
+                dataset_uuid=dataset_uuid,
+            )
+            if cached_dataset is not None:
+                _write_dataset(
+                    output_file_path=output_file_path,
+                    dataset=cached_dataset,
+                )
+                return
+
+        dataset = model_target_client.download_dataset(
+            dataset_uuid=dataset_uuid,
+            dataset_type=dataset_type,
+        )
+        if dataset_cache is not None:
+            _cache_dataset(
+                dataset_cache=dataset_cache,
+                base_vws_url=base_vws_url,
+                dataset_type=dataset_type,
+                dataset_uuid=dataset_uuid,
+                dataset=dataset,
+            )
+        _write_dataset(output_file_path=output_file_path, dataset=dataset)
 
 
 @click.command(name="create-model-target-dataset")
@@ -494,20 +962,27 @@ def _models_from_file(
         "file holds either an array of models or an object with a "
         '"models" array. This is the only way to give multiple models, or '
         "to give guide views, and it cannot be used with the other model "
-        "options."
+        'options. A model may have a "cadDataFile" path, relative to the '
+        "models file, which is read and sent to Vuforia as base64 encoded "
+        "data."
     ),
 )
+@registry_file_option
 @client_id_option
 @client_secret_option
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@write_max_attempts_option
 @_handle_model_target_exceptions()
 @beartype
 def create_model_target_dataset(
     *,
     client_id: str,
     client_secret: str,
+    registry_file_path: Path,
     name: str,
     target_sdk: str,
     dataset_type: ModelTargetDatasetType,
@@ -526,12 +1001,17 @@ def create_model_target_dataset(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Create a Model Target dataset.
 
     Vuforia generates the dataset in the background, so the dataset is not
     available to download immediately. The UUID of the new dataset is shown.
 
+    The new dataset is added to the local registry of datasets.
+
     \b
     See
     https://developer.vuforia.com/library/vuforia-engine/web-api/model-target-web-api/
@@ -564,7 +1044,7 @@ def create_model_target_dataset(
                 f"{', '.join(given_model_options)}."
             )
             raise click.UsageError(message=message)
-        models = _models_from_file(models_file_path=models_file_path)
+        model_specs = _models_from_file(models_file_path=models_file_path)
     else:
         if model_name is None:
             message = "--model-name is required when --models-file is not."
@@ -577,33 +1057,29 @@ def create_model_target_dataset(
             )
             raise click.UsageError(message=message)
 
-        cad_data_blob: str | None = None
-        if cad_data_file_path is not None:
-            cad_data_blob = base64.b64encode(
-                s=cad_data_file_path.read_bytes(),
-            ).decode(encoding="ascii")
-
         state_based_configuration_json_string: str | None = None
         if state_based_configuration_file_path is not None:
             state_based_configuration_json_string = (
                 state_based_configuration_file_path.read_text()
             )
 
-        models = [
-            ModelTargetModel(
-                name=model_name,
-                cad_data_url=cad_data_url,
-                cad_data_blob=cad_data_blob,
-                automatic_coloring=automatic_coloring,
-                cad_data_format=cad_data_format,
-                motion_hint=motion_hint,
-                optimize_tracking_for=optimize_tracking_for,
-                realistic_appearance=realistic_appearance,
-                simplify=simplify,
-                tracking_mode=tracking_mode,
-                state_based_configuration_json_string=(
-                    state_based_configuration_json_string
-                ),
+        model_specs = [
+            _ModelSpec(
+                model_kwargs={
+                    "name": model_name,
+                    "cad_data_url": cad_data_url,
+                    "automatic_coloring": automatic_coloring,
+                    "cad_data_format": cad_data_format,
+                    "motion_hint": motion_hint,
+                    "optimize_tracking_for": optimize_tracking_for,
+                    "realistic_appearance": realistic_appearance,
+                    "simplify": simplify,
+                    "tracking_mode": tracking_mode,
+                    "state_based_configuration_json_string": (
+                        state_based_configuration_json_string
+                    ),
+                },
+                cad_data_file_path=cad_data_file_path,
             ),
         ]
 
@@ -613,37 +1089,55 @@ def create_model_target_dataset(
         base_vws_url=base_vws_url,
         connection_timeout_seconds=connection_timeout_seconds,
         read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
     dataset_uuid = model_target_client.create_dataset(
         name=name,
         target_sdk=target_sdk,
-        models=models,
+        models=_build_models(model_specs=model_specs),
         dataset_type=dataset_type,
     )
-
     click.echo(message=dataset_uuid)
+    _register_dataset(
+        registry_file_path=registry_file_path,
+        client_id=client_id,
+        base_vws_url=base_vws_url,
+        dataset_uuid=dataset_uuid,
+        name=name,
+        dataset_type=dataset_type,
+    )
 
 
 @click.command(name="get-model-target-dataset-status")
 @dataset_uuid_option
 @dataset_type_option
+@registry_file_option
 @client_id_option
 @client_secret_option
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @_handle_model_target_exceptions()
 @beartype
 def get_model_target_dataset_status(
     *,
     client_id: str,
     client_secret: str,
+    registry_file_path: Path,
     dataset_uuid: str,
     dataset_type: ModelTargetDatasetType,
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Get the status of a Model Target dataset.
 
@@ -657,14 +1151,25 @@ def get_model_target_dataset_status(
         base_vws_url=base_vws_url,
         connection_timeout_seconds=connection_timeout_seconds,
         read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
     report = model_target_client.get_dataset_status(
         dataset_uuid=dataset_uuid,
         dataset_type=dataset_type,
     )
+    _record_statuses(
+        registry_file_path=registry_file_path,
+        statuses={dataset_uuid: report.status},
+    )
 
-    click.echo(message=_status_report_yaml(report=report))
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_output = _status_report_yaml(report=report)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_output)
 
 
 @click.command(name="wait-for-model-target-dataset-generated")
@@ -684,17 +1189,22 @@ def get_model_target_dataset_status(
 )
 @dataset_uuid_option
 @dataset_type_option
+@registry_file_option
 @client_id_option
 @client_secret_option
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @_handle_model_target_exceptions()
 @beartype
 def wait_for_model_target_dataset_generated(
     *,
     client_id: str,
     client_secret: str,
+    registry_file_path: Path,
     dataset_uuid: str,
     dataset_type: ModelTargetDatasetType,
     seconds_between_requests: float,
@@ -702,6 +1212,9 @@ def wait_for_model_target_dataset_generated(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Wait for Vuforia to finish generating a Model Target dataset.
 
@@ -715,6 +1228,9 @@ def wait_for_model_target_dataset_generated(
         base_vws_url=base_vws_url,
         connection_timeout_seconds=connection_timeout_seconds,
         read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
     try:
@@ -731,7 +1247,15 @@ def wait_for_model_target_dataset_generated(
         )
         sys.exit(1)
 
-    click.echo(message=_status_report_yaml(report=report))
+    _record_statuses(
+        registry_file_path=registry_file_path,
+        statuses={dataset_uuid: report.status},
+    )
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_output = _status_report_yaml(report=report)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_output)
 
     if report.status == ModelTargetDatasetStatuses.FAILED:
         click.echo(
@@ -755,11 +1279,16 @@ def wait_for_model_target_dataset_generated(
 )
 @dataset_uuid_option
 @dataset_type_option
+@cache_directory_option
+@max_cache_megabytes_option
 @client_id_option
 @client_secret_option
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
 @_handle_model_target_exceptions()
 @beartype
 def download_model_target_dataset(
@@ -769,12 +1298,20 @@ def download_model_target_dataset(
     dataset_uuid: str,
     dataset_type: ModelTargetDatasetType,
     output_file_path: Path,
+    cache_directory_path: Path,
+    max_cache_megabytes: float,
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Download a generated Model Target dataset.
 
+    Downloaded datasets are cached, and a cached dataset is checked against
+    its checksum before it is used.
+
     \b
     See
     https://developer.vuforia.com/library/vuforia-engine/web-api/model-target-web-api/
@@ -785,35 +1322,51 @@ def download_model_target_dataset(
         base_vws_url=base_vws_url,
         connection_timeout_seconds=connection_timeout_seconds,
         read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
-    dataset = model_target_client.download_dataset(
+    _download_dataset(
+        model_target_client=model_target_client,
+        base_vws_url=base_vws_url,
         dataset_uuid=dataset_uuid,
         dataset_type=dataset_type,
+        output_file_path=output_file_path,
+        dataset_cache=_dataset_cache(
+            cache_directory_path=cache_directory_path,
+            max_cache_megabytes=max_cache_megabytes,
+        ),
     )
 
-    output_file_path.write_bytes(data=dataset)
-
 
 @click.command(name="delete-model-target-dataset")
 @dataset_uuid_option
 @dataset_type_option
+@registry_file_option
 @client_id_option
 @client_secret_option
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@write_max_attempts_option
 @_handle_model_target_exceptions()
 @beartype
 def delete_model_target_dataset(
     *,
     client_id: str,
     client_secret: str,
+    registry_file_path: Path,
     dataset_uuid: str,
     dataset_type: ModelTargetDatasetType,
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Delete a Model Target dataset.
 
@@ -827,9 +1380,757 @@ def delete_model_target_dataset(
         base_vws_url=base_vws_url,
         connection_timeout_seconds=connection_timeout_seconds,
         read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
     )
 
     model_target_client.delete_dataset(
         dataset_uuid=dataset_uuid,
         dataset_type=dataset_type,
     )
+    _unregister_datasets(
+        registry_file_path=registry_file_path,
+        dataset_uuids=[dataset_uuid],
+    )
+
+
+_FINISHED_STATUSES = frozenset(
+    {ModelTargetDatasetStatuses.DONE, ModelTargetDatasetStatuses.FAILED},
+)
+
+_GENERATE_TIMEOUT_SECONDS_HELP = (
+    "The maximum number of seconds to wait for all of the datasets to be "
+    "generated."
+)
+
+
+@beartype
+def _create_datasets(
+    *,
+    executor: ThreadPoolExecutor,
+    model_target_client: ModelTargetService,
+    specs: Sequence[_DatasetSpec],
+    registry_file_path: Path,
+    client_id: str,
+    base_vws_url: str,
+) -> Mapping[str, _DatasetSpec]:
+    """Create datasets together, add them to the local registry, and return
+    them by UUID.
+
+    If any dataset cannot be created, for example because a CAD data file
+    cannot be read, the datasets which were created are shown so that they
+    can be found and deleted, the error for each dataset which was not
+    created is shown, and the command exits.
+    """
+
+    def create_dataset(spec: _DatasetSpec) -> str:
+        """Create a dataset, and return its UUID."""
+        with (
+            traced(
+                name="create dataset",
+                category="operation",
+                args={"name": spec.name},
+            ),
+            counted_operation(operation="create dataset"),
+        ):
+            return model_target_client.create_dataset(
+                name=spec.name,
+                target_sdk=spec.target_sdk,
+                models=_build_models(model_specs=spec.models),
+                dataset_type=spec.dataset_type,
+            )
+
+    creations = [executor.submit(create_dataset, spec) for spec in specs]
+    created_specs: dict[str, _DatasetSpec] = {}
+    creation_error_messages: list[str] = []
+    for creation, spec in zip(creations, specs, strict=True):
+        try:
+            dataset_uuid = creation.result()
+        except (
+            ModelTargetError,
+            ModelTargetOAuth2Error,
+            ServerError,
+            OSError,
+        ) as exc:
+            error_message = (
+                f"Error: A CAD data file could not be read: {exc}"
+                if isinstance(exc, OSError)
+                else get_model_target_error_message(exc=exc)
+            )
+            creation_error_messages.append(
+                f'Dataset "{spec.name}": {error_message}',
+            )
+            continue
+        created_specs[dataset_uuid] = spec
+        _register_dataset(
+            registry_file_path=registry_file_path,
+            client_id=client_id,
+            base_vws_url=base_vws_url,
+            dataset_uuid=dataset_uuid,
+            name=spec.name,
+            dataset_type=spec.dataset_type,
+        )
+
+    if creation_error_messages:
+        click.echo(
+            message=yaml.dump(
+                data=[
+                    {"name": spec.name, "dataset_uuid": dataset_uuid}
+                    for dataset_uuid, spec in created_specs.items()
+                ],
+            ),
+        )
+        for error_message in creation_error_messages:
+            click.echo(message=error_message, err=True)
+        click.echo(
+            message=(
+                "Not every dataset was created. The datasets which were "
+                "created are shown, and they are in the local registry."
+            ),
+            err=True,
+        )
+        sys.exit(1)
+
+    return created_specs
+
+
+@beartype
+def _wait_for_datasets(
+    *,
+    executor: ThreadPoolExecutor,
+    model_target_client: ModelTargetService,
+    base_vws_url: str,
+    created_specs: Mapping[str, _DatasetSpec],
+    output_directory_path: Path,
+    seconds_between_requests: float,
+    timeout_seconds: float,
+) -> tuple[dict[str, ModelTargetDatasetStatuses], dict[str, Path]]:
+    """Poll the statuses of datasets together until each has finished or
+    the timeout is reached, downloading each as soon as it is generated.
+
+    Return the last status of each dataset and the file which each
+    generated dataset was downloaded to, by UUID.
+    """
+    statuses: dict[str, ModelTargetDatasetStatuses] = {}
+    output_file_paths: dict[str, Path] = {}
+    downloads: list[Future[None]] = []
+    pending = dict(created_specs)
+    deadline = time.monotonic() + timeout_seconds
+
+    while True:
+        for dataset_uuid, spec in list(pending.items()):
+            with traced(
+                name="poll dataset status",
+                category="operation",
+                args={"dataset_uuid": dataset_uuid},
+            ):
+                report = model_target_client.get_dataset_status(
+                    dataset_uuid=dataset_uuid,
+                    dataset_type=spec.dataset_type,
+                )
+            statuses[dataset_uuid] = report.status
+            if report.status not in _FINISHED_STATUSES:
+                continue
+
+            del pending[dataset_uuid]
+            count_operation(
+                operation="generate dataset",
+                succeeded=report.status == ModelTargetDatasetStatuses.DONE,
+            )
+            if report.status == ModelTargetDatasetStatuses.DONE:
+                output_file_path = output_directory_path / f"{spec.name}.zip"
+                output_file_paths[dataset_uuid] = output_file_path
+                download = executor.submit(
+                    _download_dataset,
+                    model_target_client=model_target_client,
+                    base_vws_url=base_vws_url,
+                    dataset_uuid=dataset_uuid,
+                    dataset_type=spec.dataset_type,
+                    output_file_path=output_file_path,
+                    # New datasets are never in the cache.
+                    dataset_cache=None,
+                )
+                downloads.append(download)
+
+        if not pending or time.monotonic() >= deadline:
+            break
+        time.sleep(seconds_between_requests)
+
+    for download in downloads:
+        download.result()
+
+    return statuses, output_file_paths
+
+
+@beartype
+def _show_generated_datasets(
+    *,
+    created_specs: Mapping[str, _DatasetSpec],
+    statuses: Mapping[str, ModelTargetDatasetStatuses],
+    output_file_paths: Mapping[str, Path],
+    timeout_seconds: float,
+) -> None:
+    """Show a summary of generated datasets, and exit with an error if any
+    failed to generate or was not generated before the timeout.
+    """
+    summary = [
+        {
+            "name": spec.name,
+            "dataset_uuid": dataset_uuid,
+            "dataset_type": spec.dataset_type.value,
+            "status": statuses[dataset_uuid].value,
+            "output": (
+                str(object=output_file_paths[dataset_uuid])
+                if dataset_uuid in output_file_paths
+                else None
+            ),
+        }
+        for dataset_uuid, spec in created_specs.items()
+    ]
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_output = yaml.dump(data=summary)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_output)
+
+    failed_names = [
+        spec.name
+        for dataset_uuid, spec in created_specs.items()
+        if statuses[dataset_uuid] == ModelTargetDatasetStatuses.FAILED
+    ]
+    if failed_names:
+        click.echo(
+            message=(
+                "Error: Vuforia failed to generate the datasets: "
+                f"{', '.join(failed_names)}."
+            ),
+            err=True,
+        )
+
+    timed_out = any(
+        status not in _FINISHED_STATUSES for status in statuses.values()
+    )
+    if timed_out:
+        click.echo(
+            message=f"Timeout of {timeout_seconds} seconds reached.",
+            err=True,
+        )
+
+    if failed_names or timed_out:
+        sys.exit(1)
+
+
+@click.command(name="generate-model-target-datasets")
+@click.option(
+    "--datasets-file",
+    "datasets_file_path",
+    type=click.Path(
+        exists=True,
+        dir_okay=False,
+        path_type=Path,
+    ),
+    required=True,
+    help=(
+        "The path to a JSON file which describes the datasets to generate. "
+        "The file holds either an array of datasets or an object with a "
+        '"datasets" array. Each dataset has a "name", a "targetSdk", a '
+        '"models" array in the form which --models-file takes, and '
+        'optionally a "datasetType".'
+    ),
+)
+@click.option(
+    "--output-directory",
+    "output_directory_path",
+    type=click.Path(
+        exists=True,
+        file_okay=False,
+        writable=True,
+        path_type=Path,
+    ),
+    required=True,
+    help=(
+        "The directory to write the generated dataset zip files to. Each "
+        "file is named after its dataset."
+    ),
+)
+@click.option(
+    "--seconds-between-requests",
+    type=click.FloatRange(min=0.05),
+    default=_SECONDS_BETWEEN_REQUESTS_DEFAULT,
+    help=_SECONDS_BETWEEN_REQUESTS_HELP,
+    show_default=True,
+)
+@click.option(
+    "--timeout-seconds",
+    type=click.FloatRange(min=0.05),
+    default=300,
+    help=_GENERATE_TIMEOUT_SECONDS_HELP,
+    show_default=True,
+)
+@max_workers_option
+@registry_file_option
+@client_id_option
+@client_secret_option
+@base_vws_url_option
+@connection_timeout_seconds_option
+@read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@write_max_attempts_option
+@_handle_model_target_exceptions()
+@beartype
+def generate_model_target_datasets(
+    *,
+    client_id: str,
+    client_secret: str,
+    registry_file_path: Path,
+    datasets_file_path: Path,
+    output_directory_path: Path,
+    seconds_between_requests: float,
+    timeout_seconds: float,
+    max_workers: int,
+    base_vws_url: str,
+    connection_timeout_seconds: float,
+    read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
+) -> None:
+    """Create Model Target datasets, wait for them, and download them.
+
+    All of the datasets are created first, and then the statuses of the
+    datasets are polled together. Each dataset is downloaded as soon as
+    Vuforia has finished generating it, while the other datasets are still
+    being generated. The datasets are added to the local registry of
+    datasets.
+
+    A summary of the datasets is shown. A dataset which failed to generate,
+    or which was not generated before the timeout, gives a non-zero exit
+    code.
+    """
+    specs = _dataset_specs_from_file(datasets_file_path=datasets_file_path)
+
+    model_target_client = _model_target_client(
+        client_id=client_id,
+        client_secret=client_secret,
+        base_vws_url=base_vws_url,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
+    )
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        created_specs = _create_datasets(
+            executor=executor,
+            model_target_client=model_target_client,
+            specs=specs,
+            registry_file_path=registry_file_path,
+            client_id=client_id,
+            base_vws_url=base_vws_url,
+        )
+        statuses, output_file_paths = _wait_for_datasets(
+            executor=executor,
+            model_target_client=model_target_client,
+            base_vws_url=base_vws_url,
+            created_specs=created_specs,
+            output_directory_path=output_directory_path,
+            seconds_between_requests=seconds_between_requests,
+            timeout_seconds=timeout_seconds,
+        )
+
+    _record_statuses(
+        registry_file_path=registry_file_path,
+        statuses=statuses,
+    )
+    _show_generated_datasets(
+        created_specs=created_specs,
+        statuses=statuses,
+        output_file_paths=output_file_paths,
+        timeout_seconds=timeout_seconds,
+    )
+
+
+@beartype
+def _refresh_datasets(
+    *,
+    model_target_client: ModelTargetService,
+    registry_file_path: Path,
+    datasets: Sequence[RegisteredDataset],
+    max_workers: int,
+) -> Sequence[RegisteredDataset]:
+    """Get the current statuses of datasets and update the local registry.
+
+    Datasets which Vuforia no longer knows about, for example because they
+    were deleted elsewhere, are removed from the registry and are not
+    returned.
+    """
+
+    def get_status(
+        dataset: RegisteredDataset,
+    ) -> ModelTargetDatasetStatuses | None:
+        """Get the status of a dataset, or ``None`` if it does not exist."""
+        with (
+            traced(
+                name="get dataset status",
+                category="operation",
+                args={"dataset_uuid": dataset.dataset_uuid},
+            ),
+            counted_operation(operation="get dataset status"),
+        ):
+            try:
+                report = model_target_client.get_dataset_status(
+                    dataset_uuid=dataset.dataset_uuid,
+                    dataset_type=dataset.dataset_type,
+                )
+            except UnknownModelTargetDatasetError:
+                return None
+        return report.status
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        statuses = list(executor.map(get_status, datasets))
+
+    refreshed_datasets = [
+        dataclasses.replace(dataset, status=status)
+        for dataset, status in zip(datasets, statuses, strict=True)
+        if status is not None
+    ]
+    set_dataset_statuses(
+        registry_file_path=registry_file_path,
+        statuses={
+            dataset.dataset_uuid: dataset.status
+            for dataset in refreshed_datasets
+        },
+    )
+    remove_datasets(
+        registry_file_path=registry_file_path,
+        dataset_uuids=[
+            dataset.dataset_uuid
+            for dataset, status in zip(datasets, statuses, strict=True)
+            if status is None
+        ],
+    )
+    return refreshed_datasets
+
+
+@click.command(name="list-model-target-datasets")
+@registry_file_option
+@client_id_option
+@base_vws_url_option
+@beartype
+def list_model_target_datasets(
+    *,
+    client_id: str,
+    registry_file_path: Path,
+    base_vws_url: str,
+) -> None:
+    """List the Model Target datasets in the local registry.
+
+    These are the datasets which were created on this machine with the given
+    client ID. Each status is the status of the dataset when it was last
+    seen. No requests are made to Vuforia.
+    """
+    datasets = get_datasets(
+        registry_file_path=registry_file_path,
+        client_id=client_id,
+        base_vws_url=base_vws_url,
+    )
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_output = _registered_datasets_yaml(datasets=datasets)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_output)
+
+
+@click.command(name="refresh-model-target-datasets")
+@max_workers_option
+@registry_file_option
+@client_id_option
+@client_secret_option
+@base_vws_url_option
+@connection_timeout_seconds_option
+@read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
+@_handle_model_target_exceptions()
+@beartype
+def refresh_model_target_datasets(
+    *,
+    client_id: str,
+    client_secret: str,
+    registry_file_path: Path,
+    max_workers: int,
+    base_vws_url: str,
+    connection_timeout_seconds: float,
+    read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
+) -> None:
+    """Update the statuses of the Model Target datasets in the local registry.
+
+    The status of each dataset is requested from Vuforia. Datasets which
+    Vuforia no longer knows about are removed from the registry. The updated
+    registry is shown.
+    """
+    model_target_client = _model_target_client(
+        client_id=client_id,
+        client_secret=client_secret,
+        base_vws_url=base_vws_url,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
+    )
+    datasets = _refresh_datasets(
+        model_target_client=model_target_client,
+        registry_file_path=registry_file_path,
+        datasets=get_datasets(
+            registry_file_path=registry_file_path,
+            client_id=client_id,
+            base_vws_url=base_vws_url,
+        ),
+        max_workers=max_workers,
+    )
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_output = _registered_datasets_yaml(datasets=datasets)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_output)
+
+
+@click.command(name="download-model-target-datasets")
+@click.option(
+    "--output-directory",
+    "output_directory_path",
+    type=click.Path(
+        exists=True,
+        file_okay=False,
+        writable=True,
+        path_type=Path,
+    ),
+    required=True,
+    help=(
+        "The directory to write the generated dataset zip files to. Each "
+        "file is named after the UUID of its dataset."
+    ),
+)
+@max_workers_option
+@registry_file_option
+@cache_directory_option
+@max_cache_megabytes_option
+@client_id_option
+@client_secret_option
+@base_vws_url_option
+@connection_timeout_seconds_option
+@read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
+@_handle_model_target_exceptions()
+@beartype
+def download_model_target_datasets(
+    *,
+    client_id: str,
+    client_secret: str,
+    registry_file_path: Path,
+    output_directory_path: Path,
+    cache_directory_path: Path,
+    max_cache_megabytes: float,
+    max_workers: int,
+    base_vws_url: str,
+    connection_timeout_seconds: float,
+    read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
+) -> None:
+    """Download every generated Model Target dataset in the local registry.
+
+    The statuses of datasets which were not generated when they were last
+    seen are updated first. Downloaded datasets are cached. The downloaded
+    datasets are shown.
+    """
+    model_target_client = _model_target_client(
+        client_id=client_id,
+        client_secret=client_secret,
+        base_vws_url=base_vws_url,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
+    )
+    datasets = get_datasets(
+        registry_file_path=registry_file_path,
+        client_id=client_id,
+        base_vws_url=base_vws_url,
+    )
+    refreshed_datasets = _refresh_datasets(
+        model_target_client=model_target_client,
+        registry_file_path=registry_file_path,
+        datasets=[
+            dataset
+            for dataset in datasets
+            if dataset.status != ModelTargetDatasetStatuses.DONE
+        ],
+        max_workers=max_workers,
+    )
+    statuses = {dataset.dataset_uuid: dataset.status for dataset in datasets}
+    statuses.update(
+        (dataset.dataset_uuid, dataset.status)
+        for dataset in refreshed_datasets
+    )
+    done_datasets = [
+        dataset
+        for dataset in datasets
+        if statuses[dataset.dataset_uuid] == ModelTargetDatasetStatuses.DONE
+    ]
+
+    dataset_cache = _dataset_cache(
+        cache_directory_path=cache_directory_path,
+        max_cache_megabytes=max_cache_megabytes,
+    )
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(
+            executor.map(
+                lambda dataset: _download_dataset(
+                    model_target_client=model_target_client,
+                    base_vws_url=base_vws_url,
+                    dataset_uuid=dataset.dataset_uuid,
+                    dataset_type=dataset.dataset_type,
+                    output_file_path=output_directory_path
+                    / f"{dataset.dataset_uuid}.zip",
+                    dataset_cache=dataset_cache,
+                ),
+                done_datasets,
+            ),
+        )
+
+    summary = [
+        {
+            "name": dataset.name,
+            "dataset_uuid": dataset.dataset_uuid,
+            "output": str(
+                object=output_directory_path / f"{dataset.dataset_uuid}.zip",
+            ),
+        }
+        for dataset in done_datasets
+    ]
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_output = yaml.dump(data=summary)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_output)
+
+
+@click.command(name="delete-model-target-datasets")
+@click.option(
+    "--older-than-days",
+    type=click.FloatRange(min=0),
+    required=True,
+    help=(
+        "Delete the datasets in the local registry which were created more "
+        "than this many days ago."
+    ),
+)
+@click.option(
+    "--dry-run",
+    "dry_run",
+    is_flag=True,
+    default=False,
+    help=(
+        "Show the datasets which would be deleted, without deleting them or "
+        "changing the local registry."
+    ),
+)
+@max_workers_option
+@registry_file_option
+@client_id_option
+@client_secret_option
+@base_vws_url_option
+@connection_timeout_seconds_option
+@read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@write_max_attempts_option
+@_handle_model_target_exceptions()
+@beartype
+def delete_model_target_datasets(
+    *,
+    client_id: str,
+    client_secret: str,
+    registry_file_path: Path,
+    older_than_days: float,
+    dry_run: bool,
+    max_workers: int,
+    base_vws_url: str,
+    connection_timeout_seconds: float,
+    read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
+) -> None:
+    """Delete old Model Target datasets in the local registry.
+
+    The deleted datasets are removed from the registry and shown. Datasets
+    which Vuforia no longer knows about are removed from the registry
+    without error. With ``--dry-run``, the datasets which would be deleted
+    are shown, and nothing is deleted.
+    """
+    model_target_client = _model_target_client(
+        client_id=client_id,
+        client_secret=client_secret,
+        base_vws_url=base_vws_url,
+        connection_timeout_seconds=connection_timeout_seconds,
+        read_timeout_seconds=read_timeout_seconds,
+        max_requests_per_second=max_requests_per_second,
+        rate_limit_file_path=rate_limit_file_path,
+        max_attempts=max_attempts,
+    )
+    created_before = datetime.datetime.now(tz=datetime.UTC) - (
+        datetime.timedelta(days=older_than_days)
+    )
+    old_datasets = [
+        dataset
+        for dataset in get_datasets(
+            registry_file_path=registry_file_path,
+            client_id=client_id,
+            base_vws_url=base_vws_url,
+        )
+        if dataset.created_at < created_before
+    ]
+
+    def delete_dataset(dataset: RegisteredDataset) -> None:
+        """Delete a dataset, ignoring datasets which do not exist."""
+        with (
+            traced(
+                name="delete dataset",
+                category="operation",
+                args={"dataset_uuid": dataset.dataset_uuid},
+            ),
+            counted_operation(operation="delete dataset"),
+            contextlib.suppress(UnknownModelTargetDatasetError),
+        ):
+            model_target_client.delete_dataset(
+                dataset_uuid=dataset.dataset_uuid,
+                dataset_type=dataset.dataset_type,
+            )
+        _unregister_datasets(
+            registry_file_path=registry_file_path,
+            dataset_uuids=[dataset.dataset_uuid],
+        )
+
+    if not dry_run:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(delete_dataset, old_datasets))
+
+    timings = current_timings()
+    with timed(timings=timings, phase="serialisation"):
+        yaml_output = _registered_datasets_yaml(datasets=old_datasets)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_output)
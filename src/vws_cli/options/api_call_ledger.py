@@ -0,0 +1,143 @@
+"""``click`` options regarding the API call ledger."""
+
+import datetime
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+from beartype import beartype
+
+from vws_cli._api_call_ledger import set_job_tag, start_api_call_ledger
+
+_LEDGER_FILE_ENVVAR = "VWS_CLI_LEDGER_FILE"
+
+
+@beartype
+def _start_api_call_ledger(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: Path | None,
+) -> Path | None:
+    """Record the requests of the command if a ledger file is given."""
+    # This is given by ``click``, and we do not use it.
+    del param
+    if value is not None:
+        start_api_call_ledger(ctx=ctx, ledger_file_path=value)
+    return value
+
+
+@beartype
+def ledger_file_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for recording the requests of a command in an
+    API call ledger.
+    """
+    return click.option(
+        "--ledger-file",
+        type=click.Path(
+            dir_okay=False,
+            path_type=Path,
+        ),
+        default=None,
+        expose_value=False,
+        callback=_start_api_call_ledger,
+        help=(
+            "Add a record of each HTTP request made to Vuforia to this "
+            "ledger file, for accounting for request quotas with "
+            '"vws usage". Each record has the time, a fingerprint of the '
+            "credentials, the job tag, the command, the endpoint, the status "
+            "and the latency."
+        ),
+        envvar=_LEDGER_FILE_ENVVAR,
+        show_envvar=True,
+    )(command)
+
+
+@beartype
+def _set_job_tag(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: str | None,
+) -> str | None:
+    """Tag the records of the requests of the command if a tag is given."""
+    # This is given by ``click``, and we do not use it.
+    del param
+    if value is not None:
+        set_job_tag(ctx=ctx, job_tag=value)
+    return value
+
+
+@beartype
+def job_tag_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the job tag of the records of the requests of
+    a command.
+    """
+    return click.option(
+        "--job-tag",
+        type=str,
+        default=None,
+        expose_value=False,
+        callback=_set_job_tag,
+        help=(
+            "A tag for the records of the HTTP requests of this command in "
+            "the ledger file, such as the name of a scheduled job."
+        ),
+        envvar="VWS_CLI_JOB_TAG",
+        show_envvar=True,
+    )(command)
+
+
+@beartype
+def usage_ledger_file_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the API call ledger file to read."""
+    return click.option(
+        "--ledger-file",
+        "ledger_file_path",
+        type=click.Path(
+            exists=True,
+            dir_okay=False,
+            path_type=Path,
+        ),
+        required=True,
+        help="The ledger file to which HTTP requests were recorded.",
+        envvar=_LEDGER_FILE_ENVVAR,
+        show_envvar=True,
+    )(command)
+
+
+@beartype
+def _since_date(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: datetime.datetime | None,
+) -> datetime.date | None:
+    """Get the date of the given date and time."""
+    # These are given by ``click``, and we do not use them.
+    del ctx
+    del param
+    if value is None:
+        return None
+    return value.date()
+
+
+@beartype
+def since_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the first day of usage to show."""
+    return click.option(
+        "--since",
+        type=click.DateTime(formats=["%Y-%m-%d"]),
+        default=None,
+        callback=_since_date,
+        help=(
+            "Show only requests made on or after this day (UTC). By "
+            "default, all requests in the ledger are shown."
+        ),
+    )(command)
@@ -0,0 +1,24 @@
+"""``click`` options regarding concurrent requests."""
+
+from collections.abc import Callable
+from typing import Any
+
+import click
+from beartype import beartype
+
+
+@beartype
+def max_workers_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the number of requests made at once."""
+    return click.option(
+        "--max-workers",
+        type=click.IntRange(min=1),
+        default=4,
+        help=(
+            "The maximum number of requests to make to Vuforia at the same "
+            "time."
+        ),
+        show_default=True,
+    )(command)
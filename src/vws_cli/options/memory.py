@@ -0,0 +1,60 @@
+"""``click`` options regarding the memory which commands allocate."""
+
+from collections.abc import Callable
+from typing import Any
+
+import click
+from beartype import beartype
+
+from vws_cli._memory import MemoryTracer, memory_yaml, start_memory_tracing
+
+
+@beartype
+def _show_memory_report(*, memory_tracer: MemoryTracer) -> None:
+    """Stop tracing memory allocations, and show a report on them."""
+    report = memory_tracer.stop()
+    click.echo(message=memory_yaml(report=report), err=True, nl=False)
+
+
+@beartype
+def _start_memory_tracing(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: bool,  # noqa: FBT001
+) -> bool:
+    """Start tracing memory allocations if asked to, and show a report on
+    them when the command ends.
+    """
+    # This is given by ``click``, and we do not use it.
+    del param
+    if value:
+        memory_tracer = start_memory_tracing()
+        ctx.call_on_close(
+            f=lambda: _show_memory_report(memory_tracer=memory_tracer),
+        )
+    return value
+
+
+@beartype
+def trace_memory_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for showing the memory which a command
+    allocates.
+    """
+    return click.option(
+        "--trace-memory",
+        is_flag=True,
+        default=False,
+        expose_value=False,
+        is_eager=True,
+        callback=_start_memory_tracing,
+        help=(
+            "Trace memory allocations, and show, on stderr, the peak memory "
+            "use of the command and the lines of source code which had "
+            "allocated the most memory when the most memory was in use. "
+            "This makes the command slower."
+        ),
+        envvar="VWS_CLI_TRACE_MEMORY",
+        show_envvar=True,
+    )(command)
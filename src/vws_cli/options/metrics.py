@@ -0,0 +1,91 @@
+"""``click`` options regarding metrics of commands."""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+from beartype import beartype
+
+from vws_cli._metrics import (
+    Metrics,
+    PeriodicMetricsWriter,
+    start_metrics,
+    stop_metrics,
+    write_metrics,
+)
+
+# Metrics are written this often while a command runs, as well as when it
+# ends.
+_WRITE_INTERVAL_SECONDS = 15.0
+
+
+@beartype
+def _write_metrics(
+    *,
+    metrics: Metrics,
+    periodic_writer: PeriodicMetricsWriter,
+    metrics_file_path: Path,
+) -> None:
+    """Stop recording metrics, and write them."""
+    periodic_writer.stop()
+    stop_metrics(metrics=metrics)
+    write_metrics(metrics=metrics, metrics_file_path=metrics_file_path)
+
+
+@beartype
+def _start_metrics(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: Path | None,
+) -> Path | None:
+    """Start recording metrics of the command if a metrics file is given,
+    and write them while the command runs and when it ends.
+    """
+    # This is given by ``click``, and we do not use it.
+    del param
+    if value is not None:
+        metrics = start_metrics()
+        periodic_writer = PeriodicMetricsWriter(
+            metrics=metrics,
+            metrics_file_path=value,
+            interval_seconds=_WRITE_INTERVAL_SECONDS,
+        )
+        periodic_writer.start()
+        ctx.call_on_close(
+            f=lambda: _write_metrics(
+                metrics=metrics,
+                periodic_writer=periodic_writer,
+                metrics_file_path=value,
+            ),
+        )
+    return value
+
+
+@beartype
+def metrics_file_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for writing metrics of a command."""
+    return click.option(
+        "--metrics-file",
+        type=click.Path(
+            dir_okay=False,
+            writable=True,
+            path_type=Path,
+        ),
+        default=None,
+        expose_value=False,
+        callback=_start_metrics,
+        help=(
+            "Write metrics of the command to this file in the Prometheus "
+            "text format, for the textfile collector of the node exporter. "
+            "These include HTTP requests by endpoint and status, retries, "
+            "quota errors, bytes sent and received, request durations and "
+            "items processed. The file is written every "
+            f"{_WRITE_INTERVAL_SECONDS:g} seconds while the command runs, "
+            "and when it ends."
+        ),
+        envvar="VWS_CLI_METRICS_FILE",
+        show_envvar=True,
+    )(command)
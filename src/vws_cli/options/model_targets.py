@@ -1,12 +1,15 @@
 """``click`` options regarding Model Target datasets."""
 
 from collections.abc import Callable
+from pathlib import Path
 from typing import Any
 
 import click
 from beartype import beartype
 from vws.model_target_datasets import ModelTargetDatasetType
 
+from vws_cli._local_storage import default_path
+
 
 @beartype
 def client_id_option(
@@ -79,3 +82,106 @@ def dataset_uuid_option(
         ),
         required=True,
     )(command)
+
+
+@beartype
+def _registry_file_path(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: Path | None,
+) -> Path:
+    """Use the default registry file path if none is given."""
+    # These are given by ``click``, and we do not use them.
+    del ctx
+    del param
+    if value is None:
+        return default_path(file_name="model-target-datasets.sqlite3")
+    return value
+
+
+@beartype
+def registry_file_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the local registry of Model Target
+    datasets.
+    """
+    return click.option(
+        "--registry-file",
+        "registry_file_path",
+        type=click.Path(
+            dir_okay=False,
+            path_type=Path,
+        ),
+        callback=_registry_file_path,
+        help=(
+            "The path to the local registry of the Model Target datasets "
+            "created on this machine. By default, the registry is kept in "
+            "the VWS CLI application directory."
+        ),
+        envvar="VWS_CLI_MODEL_TARGET_REGISTRY",
+        show_envvar=True,
+    )(command)
+
+
+@beartype
+def _cache_directory_path(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: Path | None,
+) -> Path:
+    """Use the default cache directory if none is given."""
+    # These are given by ``click``, and we do not use them.
+    del ctx
+    del param
+    if value is None:
+        return default_path(file_name="model-target-dataset-cache")
+    return value
+
+
+@beartype
+def cache_directory_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the cache of downloaded Model Target
+    datasets.
+    """
+    return click.option(
+        "--cache-directory",
+        "cache_directory_path",
+        type=click.Path(
+            file_okay=False,
+            path_type=Path,
+        ),
+        callback=_cache_directory_path,
+        help=(
+            "The directory to cache downloaded datasets in. Generated "
+            "datasets do not change, so a cached dataset is used rather "
+            "than downloading it again. By default, the cache is kept in "
+            "the VWS CLI application directory."
+        ),
+        envvar="VWS_CLI_MODEL_TARGET_CACHE_DIRECTORY",
+        show_envvar=True,
+    )(command)
+
+
+@beartype
+def max_cache_megabytes_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the size of the cache of downloaded Model
+    Target datasets.
+    """
+    return click.option(
+        "--max-cache-megabytes",
+        type=click.FloatRange(min=0),
+        default=1024,
+        help=(
+            "The maximum size of the cache of downloaded datasets. The least "
+            "recently used datasets are removed from the cache to keep it "
+            "within this size. Use 0 to not use the cache."
+        ),
+        show_default=True,
+        envvar="VWS_CLI_MODEL_TARGET_CACHE_MAX_MEGABYTES",
+        show_envvar=True,
+    )(command)
@@ -0,0 +1,87 @@
+"""``click`` options regarding profiling commands."""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+from beartype import beartype
+
+from vws_cli._profiling import (
+    DeterministicProfiler,
+    ProfileFormat,
+    SamplingProfiler,
+    start_profiling,
+)
+
+# Profiles are written as collapsed stacks to files with these suffixes.
+_COLLAPSED_SUFFIXES = frozenset({".collapsed", ".folded"})
+
+
+@beartype
+def _write_profile(
+    *,
+    profiler: DeterministicProfiler | SamplingProfiler,
+    profile_file_path: Path,
+) -> None:
+    """Stop profiling, and write the profile."""
+    profiler.stop()
+    profiler.write(profile_file_path=profile_file_path)
+
+
+@beartype
+def _start_profiling(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: Path | None,
+) -> Path | None:
+    """Start profiling the command if a profile file is given, and write the
+    profile when the command ends.
+    """
+    # This is given by ``click``, and we do not use it.
+    del param
+    if value is not None:
+        profile_format = (
+            ProfileFormat.COLLAPSED
+            if value.suffix in _COLLAPSED_SUFFIXES
+            else ProfileFormat.PSTATS
+        )
+        profiler = start_profiling(profile_format=profile_format)
+        ctx.call_on_close(
+            f=lambda: _write_profile(
+                profiler=profiler,
+                profile_file_path=value,
+            ),
+        )
+    return value
+
+
+@beartype
+def profile_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for writing a CPU profile of a command.
+
+    This option is hidden from ``--help``, as it is for working on VWS CLI
+    rather than for using it. It is described in the contributing guide.
+    """
+    return click.option(
+        "--profile",
+        type=click.Path(
+            dir_okay=False,
+            writable=True,
+            path_type=Path,
+        ),
+        default=None,
+        expose_value=False,
+        is_eager=True,
+        hidden=True,
+        callback=_start_profiling,
+        help=(
+            "Write a CPU profile of the command to this file. The profile "
+            "is written as collapsed stacks of every thread if the file name "
+            "ends with .collapsed or .folded, and otherwise as pstats data "
+            "for the main thread."
+        ),
+        envvar="VWS_CLI_PROFILE",
+    )(command)
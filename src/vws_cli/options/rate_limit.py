@@ -0,0 +1,71 @@
+"""``click`` options regarding the rate of requests."""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+from beartype import beartype
+
+from vws_cli._local_storage import default_path
+
+
+@beartype
+def max_requests_per_second_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the rate limit of requests."""
+    return click.option(
+        "--max-requests-per-second",
+        type=click.FloatRange(min=0, min_open=True),
+        default=None,
+        help=(
+            "The maximum number of requests per second to make with the "
+            "given credentials. This limit is shared with other VWS CLI "
+            "processes which use the same credentials, and up to a second of "
+            "requests can be made at once after a pause. By default, there "
+            "is no limit."
+        ),
+        envvar="VWS_CLI_MAX_REQUESTS_PER_SECOND",
+        show_envvar=True,
+    )(command)
+
+
+@beartype
+def _rate_limit_file_path(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: Path | None,
+) -> Path:
+    """Use the default rate limit file path if none is given."""
+    # These are given by ``click``, and we do not use them.
+    del ctx
+    del param
+    if value is None:
+        return default_path(file_name="rate-limits.sqlite3")
+    return value
+
+
+@beartype
+def rate_limit_file_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the file which rate limits are shared
+    through.
+    """
+    return click.option(
+        "--rate-limit-file",
+        "rate_limit_file_path",
+        type=click.Path(
+            dir_okay=False,
+            path_type=Path,
+        ),
+        callback=_rate_limit_file_path,
+        help=(
+            "The path to the file through which VWS CLI processes share "
+            "--max-requests-per-second. By default, this is in the VWS CLI "
+            "application directory."
+        ),
+        envvar="VWS_CLI_RATE_LIMIT_FILE",
+        show_envvar=True,
+    )(command)
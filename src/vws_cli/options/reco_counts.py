@@ -0,0 +1,192 @@
+"""``click`` options regarding recognition counts reports."""
+
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+from beartype import beartype
+
+from vws_cli._local_storage import default_path
+
+
+@beartype
+def _history_file_path(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: Path | None,
+) -> Path:
+    """Use the default history file path if none is given."""
+    # These are given by ``click``, and we do not use them.
+    del ctx
+    del param
+    if value is None:
+        return default_path(file_name="reco-counts-history.sqlite3")
+    return value
+
+
+@beartype
+def history_file_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the local history of recognition counts."""
+    return click.option(
+        "--history-file",
+        "history_file_path",
+        type=click.Path(
+            dir_okay=False,
+            path_type=Path,
+        ),
+        callback=_history_file_path,
+        help=(
+            "The path to the local history of monthly recognition counts. "
+            "By default, the history is kept in the VWS CLI application "
+            "directory."
+        ),
+        envvar="VWS_CLI_RECO_COUNTS_HISTORY",
+        show_envvar=True,
+    )(command)
+
+
+@beartype
+def report_output_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for where to write a recognition counts report."""
+    return click.option(
+        "--output",
+        "output_file_path",
+        type=click.Path(
+            dir_okay=False,
+            writable=True,
+            path_type=Path,
+        ),
+        required=False,
+        help=(
+            "The path to write the CSV report, or its summary, to. By "
+            "default, the report is written to stdout."
+        ),
+    )(command)
+
+
+@beartype
+def gzip_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for compressing a recognition counts report."""
+    return click.option(
+        "--gzip",
+        "compress",
+        is_flag=True,
+        default=False,
+        help="Compress the CSV report with gzip.",
+    )(command)
+
+
+@beartype
+def summary_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for summarizing a recognition counts report."""
+    return click.option(
+        "--summary",
+        is_flag=True,
+        default=False,
+        help=(
+            "Show a summary of the report rather than the report. The "
+            "summary has the number of targets, the total recognition "
+            "count, the most recognized targets and the IDs of the targets "
+            "in the database which were not recognized."
+        ),
+    )(command)
+
+
+@beartype
+def top_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the number of targets in a summary."""
+    return click.option(
+        "--top",
+        "top_count",
+        type=click.IntRange(min=0),
+        default=100,
+        help="The number of most recognized targets to show in a summary.",
+        show_default=True,
+    )(command)
+
+
+@beartype
+def enrich_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for joining a report with target records."""
+    return click.option(
+        "--enrich",
+        is_flag=True,
+        default=False,
+        help=(
+            "Join each row of the report with the name, active flag and "
+            "tracking rating of the target. Target records are requested "
+            "only for the targets in the report."
+        ),
+    )(command)
+
+
+@beartype
+def _target_record_cache_file_path(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: Path | None,
+) -> Path:
+    """Use the default target record cache file path if none is given."""
+    # These are given by ``click``, and we do not use them.
+    del ctx
+    del param
+    if value is None:
+        return default_path(file_name="target-record-cache.sqlite3")
+    return value
+
+
+@beartype
+def target_record_cache_file_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the local cache of target records."""
+    return click.option(
+        "--target-record-cache-file",
+        "target_record_cache_file_path",
+        type=click.Path(
+            dir_okay=False,
+            path_type=Path,
+        ),
+        callback=_target_record_cache_file_path,
+        help=(
+            "The path to the local cache of target records used by "
+            "--enrich. By default, the cache is kept in the VWS "
+            "CLI application directory."
+        ),
+        envvar="VWS_CLI_TARGET_RECORD_CACHE",
+        show_envvar=True,
+    )(command)
+
+
+@beartype
+def target_record_cache_max_age_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for how long cached target records are used."""
+    return click.option(
+        "--target-record-cache-max-age-seconds",
+        "target_record_cache_max_age_seconds",
+        type=click.FloatRange(min=0),
+        default=24 * 60 * 60,
+        help=(
+            "The maximum age of a cached target record which can be used "
+            "rather than requesting the record again. Set this to 0 to not "
+            "use the cache."
+        ),
+        envvar="VWS_CLI_TARGET_RECORD_CACHE_MAX_AGE_SECONDS",
+        show_envvar=True,
+        show_default=True,
+    )(command)
@@ -0,0 +1,59 @@
+"""``click`` options regarding trying requests again."""
+
+from collections.abc import Callable
+from typing import Any
+
+import click
+from beartype import beartype
+
+_MAX_ATTEMPTS_HELP = (
+    "The maximum number of attempts at each request. A request is tried "
+    "again after a request quota or rate limit error, a server error or a "
+    "network error, after a wait which grows exponentially, or for as long "
+    "as a Retry-After header asks. Requests which change something are "
+    "tried again only when Vuforia cannot have acted on them."
+)
+
+
+@beartype
+def _max_attempts_option(
+    command: Callable[..., Any],
+    *,
+    default: int,
+) -> Callable[..., Any]:
+    """An option decorator for the maximum number of attempts at each
+    request, with the given default.
+    """
+    return click.option(
+        "--max-attempts",
+        type=click.IntRange(min=1),
+        default=default,
+        help=_MAX_ATTEMPTS_HELP,
+        show_default=True,
+        envvar="VWS_CLI_MAX_ATTEMPTS",
+        show_envvar=True,
+    )(command)
+
+
+@beartype
+def read_max_attempts_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the maximum number of attempts at each
+    request, for commands which do not change anything.
+
+    Requests are tried again by default.
+    """
+    return _max_attempts_option(command, default=5)
+
+
+@beartype
+def write_max_attempts_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the maximum number of attempts at each
+    request, for commands which change something.
+
+    Requests are not tried again by default.
+    """
+    return _max_attempts_option(command, default=1)
@@ -0,0 +1,71 @@
+"""``click`` options regarding the form of tabular output."""
+
+import importlib.util
+from collections.abc import Callable
+from enum import Enum, unique
+from typing import Any
+
+import click
+from beartype import beartype
+
+
+@unique
+class TableFormatChoice(Enum):
+    """Choices for the form in which rows are written."""
+
+    CSV = "csv"
+    NDJSON = "ndjson"
+    PARQUET = "parquet"
+    ARROW = "arrow"
+
+
+# These forms are written with ``pyarrow``, which is an optional dependency.
+COLUMNAR_TABLE_FORMATS = frozenset(
+    {TableFormatChoice.PARQUET, TableFormatChoice.ARROW},
+)
+
+
+@beartype
+def _validate_table_format(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: TableFormatChoice,
+) -> TableFormatChoice:
+    """Check that ``pyarrow`` is installed if it is needed for the given
+    form.
+    """
+    # These are given by ``click``, and we do not use them.
+    del ctx
+    del param
+    if (
+        value in COLUMNAR_TABLE_FORMATS
+        and importlib.util.find_spec(name="pyarrow") is None
+    ):
+        message = (
+            f"The {value.value} form needs pyarrow. Install it with "
+            '"pip install vws-cli[arrow]".'
+        )
+        raise click.BadParameter(message=message)
+    return value
+
+
+@beartype
+def table_format_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for the form in which rows are written."""
+    return click.option(
+        "--format",
+        "table_format",
+        type=click.Choice(choices=TableFormatChoice, case_sensitive=False),
+        default=TableFormatChoice.CSV.value,
+        callback=_validate_table_format,
+        help=(
+            "The form in which to write the rows. "
+            "ndjson is newline-delimited JSON. "
+            "parquet and arrow (an Arrow IPC stream) are columnar forms "
+            "with a type for each column, and they need pyarrow, which is "
+            'installed with "pip install vws-cli[arrow]".'
+        ),
+        show_default=True,
+    )(command)
@@ -0,0 +1,52 @@
+"""``click`` options regarding the timings of commands."""
+
+from collections.abc import Callable
+from typing import Any
+
+import click
+from beartype import beartype
+
+from vws_cli._timings import start_timings, timings_yaml
+
+
+@beartype
+def _start_timings(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: bool,  # noqa: FBT001
+) -> bool:
+    """Start timing the command if timings are asked for, and show them when
+    the command ends.
+    """
+    # This is given by ``click``, and we do not use it.
+    del param
+    if value:
+        timings = start_timings(ctx=ctx)
+        ctx.call_on_close(
+            f=lambda: click.echo(
+                message=timings_yaml(timings=timings),
+                err=True,
+                nl=False,
+            ),
+        )
+    return value
+
+
+@beartype
+def timings_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for showing the timings of a command."""
+    return click.option(
+        "--timings",
+        is_flag=True,
+        default=False,
+        expose_value=False,
+        callback=_start_timings,
+        help=(
+            "Show, on stderr, how long the command took to import and each "
+            "part of the command took, including each HTTP request."
+        ),
+        envvar="VWS_CLI_TIMINGS",
+        show_envvar=True,
+    )(command)
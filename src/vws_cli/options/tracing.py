@@ -0,0 +1,114 @@
+"""``click`` options regarding tracing commands."""
+
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import click
+from beartype import beartype
+
+from vws_cli._tracing import (
+    TraceFormat,
+    Tracer,
+    add_span,
+    start_tracing,
+    stop_tracing,
+)
+
+
+@beartype
+def _write_trace(
+    *,
+    ctx: click.Context,
+    tracer: Tracer,
+    started_at: float,
+    trace_file_path: Path,
+) -> None:
+    """Record a span for the whole command, stop tracing and write the
+    trace, or warn if it cannot be written.
+
+    A command is not stopped because its trace cannot be written, for
+    example because the disk is full.
+    """
+    command_name = " ".join(
+        filter(None, [ctx.command_path, ctx.invoked_subcommand]),
+    )
+    add_span(
+        tracer=tracer,
+        name=command_name,
+        category="command",
+        started_at=started_at,
+        args={},
+    )
+    stop_tracing(tracer=tracer)
+    trace_format = (
+        TraceFormat.JSON_LINES
+        if trace_file_path.suffix == ".jsonl"
+        else TraceFormat.CHROME
+    )
+    try:
+        tracer.write(
+            trace_file_path=trace_file_path,
+            trace_format=trace_format,
+        )
+    except OSError as exc:
+        click.echo(
+            message=(
+                "Warning: The trace could not be written to "
+                f"{trace_file_path}: {exc}"
+            ),
+            err=True,
+        )
+
+
+@beartype
+def _start_tracing(
+    ctx: click.Context,
+    param: click.Parameter,
+    value: Path | None,
+) -> Path | None:
+    """Start tracing the command if a trace file is given, and write the
+    trace when the command ends.
+    """
+    # This is given by ``click``, and we do not use it.
+    del param
+    if value is not None:
+        started_at = time.perf_counter()
+        tracer = start_tracing()
+        ctx.call_on_close(
+            f=lambda: _write_trace(
+                ctx=ctx,
+                tracer=tracer,
+                started_at=started_at,
+                trace_file_path=value,
+            ),
+        )
+    return value
+
+
+@beartype
+def trace_file_option(
+    command: Callable[..., Any],
+) -> Callable[..., Any]:
+    """An option decorator for writing a trace of a command."""
+    return click.option(
+        "--trace-file",
+        type=click.Path(
+            dir_okay=False,
+            writable=True,
+            path_type=Path,
+        ),
+        default=None,
+        expose_value=False,
+        callback=_start_tracing,
+        help=(
+            "Write a trace of the command to this file, with a span for each "
+            "operation and each HTTP request, and the thread which it ran "
+            "in. The trace is written as JSON lines if the file name ends "
+            "with .jsonl, and otherwise in the Chrome trace event format, "
+            "which can be viewed in Perfetto."
+        ),
+        envvar="VWS_CLI_TRACE_FILE",
+        show_envvar=True,
+    )(command)
@@ -23,14 +23,27 @@ from vws.exceptions.custom_exceptions import (
 from vws.include_target_data import CloudRecoIncludeTargetData
 
 from vws_cli import __version__
+from vws_cli._timings import current_timings, timed
+from vws_cli._transport import api_transport
+from vws_cli.options.api_call_ledger import job_tag_option, ledger_file_option
 from vws_cli.options.credentials import (
     client_access_key_option,
     client_secret_key_option,
 )
+from vws_cli.options.memory import trace_memory_option
+from vws_cli.options.metrics import metrics_file_option
+from vws_cli.options.profiling import profile_option
+from vws_cli.options.rate_limit import (
+    max_requests_per_second_option,
+    rate_limit_file_option,
+)
+from vws_cli.options.retry import read_max_attempts_option
 from vws_cli.options.timeout import (
     connection_timeout_seconds_option,
     read_timeout_seconds_option,
 )
+from vws_cli.options.timings import timings_option
+from vws_cli.options.tracing import trace_file_option
 
 
 @beartype
@@ -122,6 +135,16 @@ _base_vwq_url_option = click.option(
 @_base_vwq_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
+@timings_option
+@trace_file_option
+@metrics_file_option
+@profile_option
+@trace_memory_option
+@ledger_file_option
+@job_tag_option
 @_handle_vwq_exceptions()
 # We set the ``version`` parameter because in PyInstaller binaries,
 # ``pkg_resources`` is not available.
@@ -139,17 +162,28 @@ def vuforia_cloud_reco(
     base_vwq_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Make a request to the Vuforia Cloud Recognition Service API."""
-    client = CloudRecoService(
-        client_access_key=client_access_key,
-        client_secret_key=client_secret_key,
-        base_vwq_url=base_vwq_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
-    )
+    timings = current_timings()
+    with timed(timings=timings, phase="client construction"):
+        client = CloudRecoService(
+            client_access_key=client_access_key,
+            client_secret_key=client_secret_key,
+            base_vwq_url=base_vwq_url,
+            request_timeout_seconds=(
+                connection_timeout_seconds,
+                read_timeout_seconds,
+            ),
+            transport=api_transport(
+                credential=client_access_key,
+                max_requests_per_second=max_requests_per_second,
+                rate_limit_file_path=rate_limit_file_path,
+                max_attempts=max_attempts,
+            ),
+        )
     query_result = client.query(
         image=io.BytesIO(initial_bytes=image.read_bytes()),
         max_num_results=max_num_results,
@@ -158,5 +192,7 @@ def vuforia_cloud_reco(
     query_result_dict_list = [
         dataclasses.asdict(obj=res) for res in query_result
     ]
-    yaml_list = yaml.dump(data=query_result_dict_list)
-    click.echo(message=yaml_list)
+    with timed(timings=timings, phase="serialisation"):
+        yaml_list = yaml.dump(data=query_result_dict_list)
+    with timed(timings=timings, phase="output"):
+        click.echo(message=yaml_list)
@@ -0,0 +1,56 @@
+"""``click`` commands for the API call ledger."""
+
+import datetime
+from pathlib import Path
+
+import click
+import yaml
+from beartype import beartype
+
+from vws_cli._api_call_ledger import get_api_call_usage
+from vws_cli.options.api_call_ledger import (
+    since_option,
+    usage_ledger_file_option,
+)
+
+# Latencies are shown in milliseconds, to this many decimal places.
+_MILLISECONDS_DECIMAL_PLACES = 1
+
+
+@click.command(name="usage")
+@usage_ledger_file_option
+@since_option
+@beartype
+def usage(
+    *,
+    ledger_file_path: Path,
+    since: datetime.date | None,
+) -> None:
+    """Show the HTTP requests recorded in an API call ledger.
+
+    Requests are counted by day (UTC), credentials, job tag, command and
+    endpoint. Credentials are shown as fingerprints. Requests are recorded
+    when the ledger file is given to the commands which make them.
+    """
+    api_call_usage = get_api_call_usage(
+        ledger_file_path=ledger_file_path,
+        since=since,
+    )
+    data = [
+        {
+            "day": usage_row.day.isoformat(),
+            "credential_fingerprint": usage_row.credential_fingerprint,
+            "job_tag": usage_row.job_tag,
+            "command": usage_row.command,
+            "endpoint": usage_row.endpoint,
+            "requests": usage_row.requests,
+            "errors": usage_row.errors,
+            "quota_errors": usage_row.quota_errors,
+            "mean_latency_ms": round(
+                usage_row.mean_latency_seconds * 1000,
+                _MILLISECONDS_DECIMAL_PLACES,
+            ),
+        }
+        for usage_row in api_call_usage
+    ]
+    click.echo(message=yaml.dump(data=data, sort_keys=False), nl=False)
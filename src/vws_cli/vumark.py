@@ -20,15 +20,28 @@ from vws.vumark_accept import VuMarkAccept
 
 from vws_cli import __version__
 from vws_cli._error_handling import get_error_message
+from vws_cli._timings import current_timings, timed
+from vws_cli._transport import api_transport
+from vws_cli.options.api_call_ledger import job_tag_option, ledger_file_option
 from vws_cli.options.credentials import (
     server_access_key_option,
     server_secret_key_option,
 )
+from vws_cli.options.memory import trace_memory_option
+from vws_cli.options.metrics import metrics_file_option
+from vws_cli.options.profiling import profile_option
+from vws_cli.options.rate_limit import (
+    max_requests_per_second_option,
+    rate_limit_file_option,
+)
+from vws_cli.options.retry import read_max_attempts_option
 from vws_cli.options.targets import target_id_option
 from vws_cli.options.timeout import (
     connection_timeout_seconds_option,
     read_timeout_seconds_option,
 )
+from vws_cli.options.timings import timings_option
+from vws_cli.options.tracing import trace_file_option
 from vws_cli.options.vws import base_vws_url_option
 
 
@@ -115,6 +128,16 @@ def _handle_vumark_exceptions() -> Generator[None]:
 @base_vws_url_option
 @connection_timeout_seconds_option
 @read_timeout_seconds_option
+@max_requests_per_second_option
+@rate_limit_file_option
+@read_max_attempts_option
+@timings_option
+@trace_file_option
+@metrics_file_option
+@profile_option
+@trace_memory_option
+@ledger_file_option
+@job_tag_option
 @click.version_option(version=__version__)
 @beartype
 def generate_vumark(
@@ -128,6 +151,9 @@ def generate_vumark(
     base_vws_url: str,
     connection_timeout_seconds: float,
     read_timeout_seconds: float,
+    max_requests_per_second: float | None,
+    rate_limit_file_path: Path,
+    max_attempts: int,
 ) -> None:
     """Generate a VuMark instance.
 
@@ -135,15 +161,23 @@ def generate_vumark(
     See
     https://developer.vuforia.com/library/vuforia-engine/web-api/vumark-generation-web-api/
     """
-    vumark_client = VuMarkService(
-        server_access_key=server_access_key,
-        server_secret_key=server_secret_key,
-        base_vws_url=base_vws_url,
-        request_timeout_seconds=(
-            connection_timeout_seconds,
-            read_timeout_seconds,
-        ),
-    )
+    timings = current_timings()
+    with timed(timings=timings, phase="client construction"):
+        vumark_client = VuMarkService(
+            server_access_key=server_access_key,
+            server_secret_key=server_secret_key,
+            base_vws_url=base_vws_url,
+            request_timeout_seconds=(
+                connection_timeout_seconds,
+                read_timeout_seconds,
+            ),
+            transport=api_transport(
+                credential=server_access_key,
+                max_requests_per_second=max_requests_per_second,
+                rate_limit_file_path=rate_limit_file_path,
+                max_attempts=max_attempts,
+            ),
+        )
 
     accept = _FORMAT_CHOICE_TO_ACCEPT[format_choice]
 
@@ -153,4 +187,5 @@ def generate_vumark(
         accept=accept,
     )
 
-    output_file_path.write_bytes(data=vumark_data)
+    with timed(timings=timings, phase="output"):
+        output_file_path.write_bytes(data=vumark_data)
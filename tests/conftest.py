@@ -1,7 +1,9 @@
 """``pytest`` fixtures."""
 
 from collections.abc import Iterator
+from pathlib import Path
 
+import click
 import pytest
 from mock_vws import MockVWS
 from mock_vws.database import CloudDatabase, VuMarkDatabase
@@ -9,6 +11,25 @@ from mock_vws.target import VuMarkTarget
 from vws import VWS, CloudRecoService
 
 
+@pytest.fixture(name="app_directory", autouse=True)
+def fixture_app_directory(
+    *,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Path:
+    """Keep the files which the CLI keeps between runs out of the user's
+    application directory.
+    """
+
+    def get_app_dir(*, app_name: str) -> str:
+        """Give the temporary directory as the application directory."""
+        del app_name
+        return str(object=tmp_path)
+
+    monkeypatch.setattr(target=click, name="get_app_dir", value=get_app_dir)
+    return tmp_path
+
+
 @pytest.fixture(name="mock_database")
 def fixture_mock_database() -> Iterator[CloudDatabase]:
     """Yield a mock ``CloudDatabase``."""
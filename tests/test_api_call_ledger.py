@@ -0,0 +1,196 @@
+"""Tests for the API call ledger."""
+
+import datetime
+import io
+import uuid
+from pathlib import Path
+
+import yaml
+from click.testing import CliRunner
+from mock_vws.database import CloudDatabase
+
+from vws_cli import vws_group
+from vws_cli._api_call_ledger import credential_fingerprint
+from vws_cli.query import vuforia_cloud_reco
+
+
+def test_usage(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+    high_quality_image: io.BytesIO,
+) -> None:
+    """Requests recorded in a ledger are counted by day, credentials, job
+    tag, command and endpoint.
+    """
+    ledger_file_path = tmp_path / "ledger.sqlite3"
+    runner = CliRunner()
+    summary_commands = [
+        "--ledger-file",
+        str(object=ledger_file_path),
+        "--job-tag",
+        "nightly",
+        "get-database-summary-report",
+        "--server-access-key",
+        mock_database.server_access_key,
+        "--server-secret-key",
+        mock_database.server_secret_key,
+    ]
+    num_summary_requests = 2
+    for _ in range(num_summary_requests):
+        result = runner.invoke(
+            cli=vws_group,
+            args=summary_commands,
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+
+    image_file = tmp_path / uuid.uuid4().hex
+    image_file.write_bytes(data=high_quality_image.getvalue())
+    result = runner.invoke(
+        cli=vuforia_cloud_reco,
+        args=[
+            str(object=image_file),
+            "--client-access-key",
+            mock_database.client_access_key,
+            "--client-secret-key",
+            mock_database.client_secret_key,
+        ],
+        env={"VWS_CLI_LEDGER_FILE": str(object=ledger_file_path)},
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+
+    result = runner.invoke(
+        cli=vws_group,
+        args=["usage", "--ledger-file", str(object=ledger_file_path)],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    today = datetime.datetime.now(tz=datetime.UTC).date().isoformat()
+    usage_rows = yaml.safe_load(stream=result.stdout)
+    for usage_row in usage_rows:
+        assert usage_row.pop("mean_latency_ms") >= 0
+    server_fingerprint = credential_fingerprint(
+        credential=mock_database.server_access_key,
+    )
+    client_fingerprint = credential_fingerprint(
+        credential=mock_database.client_access_key,
+    )
+    expected_usage_rows = [
+        {
+            "day": today,
+            "credential_fingerprint": server_fingerprint,
+            "job_tag": "nightly",
+            "command": "vws get-database-summary-report",
+            "endpoint": "/summary",
+            "requests": num_summary_requests,
+            "errors": 0,
+            "quota_errors": 0,
+        },
+        {
+            "day": today,
+            "credential_fingerprint": client_fingerprint,
+            "job_tag": None,
+            "command": "vuforia-cloud-reco",
+            "endpoint": "/v1/query",
+            "requests": 1,
+            "errors": 0,
+            "quota_errors": 0,
+        },
+    ]
+    assert sorted(
+        usage_rows,
+        key=lambda usage_row: usage_row["credential_fingerprint"],
+    ) == sorted(
+        expected_usage_rows,
+        key=lambda usage_row: usage_row["credential_fingerprint"],
+    )
+    # Credentials are not stored.
+    ledger_bytes = ledger_file_path.read_bytes()
+    assert mock_database.server_access_key.encode() not in ledger_bytes
+    assert mock_database.client_access_key.encode() not in ledger_bytes
+
+
+def test_since(*, mock_database: CloudDatabase, tmp_path: Path) -> None:
+    """Requests made before a given day are not counted."""
+    ledger_file_path = tmp_path / "ledger.sqlite3"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        env={"VWS_CLI_LEDGER_FILE": str(object=ledger_file_path)},
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+
+    tomorrow = datetime.datetime.now(tz=datetime.UTC).date() + (
+        datetime.timedelta(days=1)
+    )
+    result = runner.invoke(
+        cli=vws_group,
+        args=["usage", "--since", tomorrow.isoformat()],
+        env={"VWS_CLI_LEDGER_FILE": str(object=ledger_file_path)},
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert yaml.safe_load(stream=result.stdout) == []
+
+
+def test_no_ledger_by_default(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+) -> None:
+    """Requests are not recorded without a ledger file."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert not list(tmp_path.iterdir())
+
+
+def test_unwritable_ledger(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+) -> None:
+    """A warning is shown, and the command succeeds, if a request cannot be
+    recorded in the ledger.
+    """
+    ledger_file_path = tmp_path / "ledger.sqlite3"
+    ledger_file_path.write_text(data="This is not a SQLite database.")
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        env={"VWS_CLI_LEDGER_FILE": str(object=ledger_file_path)},
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    expected_warning = (
+        "Warning: A request could not be recorded in the API call ledger "
+        f"{ledger_file_path}:"
+    )
+    assert expected_warning in result.stderr
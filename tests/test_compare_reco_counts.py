@@ -0,0 +1,355 @@
+"""Tests for comparing recognition counts reports."""
+
+import datetime
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+from vws_cli import vws_group
+from vws_cli._reco_counts import (
+    RecoCountsDelta,
+    reco_counts_deltas,
+    summarize_reco_counts_deltas,
+)
+from vws_cli._reco_counts_history import store_month
+
+_BASE_REPORT = b"target_id,reco_count\r\nx,5\r\ny,10\r\nz,3\r\n"
+_REPORT = b"target_id,reco_count\r\ny,4\r\nx,9\r\nw,7\r\n"
+
+# The exit code which ``click`` uses for a usage error.
+_USAGE_ERROR_EXIT_CODE = 2
+
+
+@pytest.fixture(name="report_file_paths")
+def fixture_report_file_paths(*, tmp_path: Path) -> tuple[Path, Path]:
+    """Write a base report and a gzip compressed report to compare with
+    it, and give their paths.
+    """
+    base_report_file_path = tmp_path / "base.csv"
+    base_report_file_path.write_bytes(data=_BASE_REPORT)
+    report_file_path = tmp_path / "report.csv.gz"
+    report_file_path.write_bytes(data=gzip.compress(data=_REPORT))
+    return base_report_file_path, report_file_path
+
+
+def _report_args(*, report_file_paths: tuple[Path, Path]) -> list[str]:
+    """Get the arguments to compare the given reports."""
+    base_report_file_path, report_file_path = report_file_paths
+    return [
+        "compare-reco-counts",
+        "--base-report",
+        str(object=base_report_file_path),
+        "--report",
+        str(object=report_file_path),
+    ]
+
+
+def test_compare_reports(*, report_file_paths: tuple[Path, Path]) -> None:
+    """There is a row for each target in either report, in the order of
+    the report, followed by targets which are only in the base report.
+    """
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=_report_args(report_file_paths=report_file_paths),
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    assert result.stdout_bytes == (
+        b"target_id,base_reco_count,reco_count,delta\r\n"
+        b"y,10,4,-6\r\n"
+        b"x,5,9,4\r\n"
+        b"w,,7,7\r\n"
+        b"z,3,,-3\r\n"
+    )
+
+
+def test_ndjson(*, report_file_paths: tuple[Path, Path]) -> None:
+    """Changes can be written as newline-delimited JSON."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_report_args(report_file_paths=report_file_paths),
+            "--format",
+            "ndjson",
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    records = [json.loads(s=line) for line in result.stdout.splitlines()]
+    assert [
+        (
+            record["target_id"],
+            record["base_reco_count"],
+            record["reco_count"],
+            record["delta"],
+        )
+        for record in records
+    ] == [
+        ("y", 10, 4, -6),
+        ("x", 5, 9, 4),
+        ("w", None, 7, 7),
+        ("z", 3, None, -3),
+    ]
+
+
+def test_summary(*, report_file_paths: tuple[Path, Path]) -> None:
+    """A summary has totals and the biggest changes in each direction."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_report_args(report_file_paths=report_file_paths),
+            "--summary",
+            "--top",
+            "1",
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    assert yaml.safe_load(stream=result.stdout) == {
+        "base_target_count": 3,
+        "target_count": 3,
+        "new_target_count": 1,
+        "disappeared_target_count": 1,
+        "base_total_reco_count": 18,
+        "total_reco_count": 20,
+        "biggest_increases": [
+            {
+                "target_id": "w",
+                "base_reco_count": None,
+                "reco_count": 7,
+                "delta": 7,
+            },
+        ],
+        "biggest_decreases": [
+            {
+                "target_id": "y",
+                "base_reco_count": 10,
+                "reco_count": 4,
+                "delta": -6,
+            },
+        ],
+    }
+
+
+def test_compare_months(*, app_directory: Path) -> None:
+    """Months in the local history can be compared."""
+    database_id = "my_database_id"
+    for month, rows in (
+        (datetime.date(year=2026, month=1, day=1), [("x", 1), ("q", 2)]),
+        (datetime.date(year=2026, month=2, day=1), [("x", 4)]),
+    ):
+        store_month(
+            history_file_path=app_directory / "reco-counts-history.sqlite3",
+            database_id=database_id,
+            month=month,
+            rows=rows,
+            is_final=True,
+        )
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "compare-reco-counts",
+            "--base-month",
+            "2026-01",
+            "--month",
+            "2026-02",
+            "--database-id",
+            database_id,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    assert result.stdout_bytes == (
+        b"target_id,base_reco_count,reco_count,delta\r\nx,1,4,3\r\nq,2,,-2\r\n"
+    )
+
+
+def test_month_not_in_history(
+    *,
+    report_file_paths: tuple[Path, Path],
+) -> None:
+    """An error is shown when a month is not in the local history."""
+    base_report_file_path, _ = report_file_paths
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "compare-reco-counts",
+            "--base-report",
+            str(object=base_report_file_path),
+            "--month",
+            "2026-03",
+            "--database-id",
+            "my_database_id",
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 1
+    expected_stderr = (
+        "Error: 2026-03 is not in the local history. Use "
+        "update-reco-counts-history to add it.\n"
+    )
+    assert result.stderr == expected_stderr
+
+
+@pytest.mark.parametrize(
+    argnames=("args", "expected_error"),
+    argvalues=[
+        pytest.param(
+            ["--base-month", "2026-01"],
+            "Exactly one of --base-report and --base-month must be given.",
+            id="base report and base month",
+        ),
+        pytest.param(
+            ["--month", "2026-01"],
+            "Exactly one of --report and --month must be given.",
+            id="report and month",
+        ),
+        pytest.param(
+            ["--summary", "--format", "ndjson"],
+            "--format ndjson cannot be used with --summary.",
+            id="summary and format",
+        ),
+    ],
+)
+def test_option_conflicts(
+    *,
+    report_file_paths: tuple[Path, Path],
+    args: list[str],
+    expected_error: str,
+) -> None:
+    """Some options cannot be used together."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[*_report_args(report_file_paths=report_file_paths), *args],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    assert expected_error in result.stderr
+
+
+def test_missing_report() -> None:
+    """One of a report and a month must be given for each side."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=["compare-reco-counts", "--month", "2026-01"],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    expected_error = (
+        "Exactly one of --base-report and --base-month must be given."
+    )
+    assert expected_error in result.stderr
+
+
+def test_month_needs_database_id(
+    *,
+    report_file_paths: tuple[Path, Path],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A database ID must be given to compare a month in the history."""
+    monkeypatch.delenv(name="VUFORIA_DATABASE_ID", raising=False)
+    base_report_file_path, _ = report_file_paths
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "compare-reco-counts",
+            "--base-report",
+            str(object=base_report_file_path),
+            "--month",
+            "2026-01",
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    assert "--database-id must be given with --month." in result.stderr
+
+
+@pytest.mark.parametrize(
+    argnames="malformed_row",
+    argvalues=[
+        pytest.param(b"w,many", id="not-a-number"),
+        pytest.param(b"w,7,8", id="too-many-fields"),
+    ],
+)
+def test_malformed_report(
+    *,
+    report_file_paths: tuple[Path, Path],
+    tmp_path: Path,
+    malformed_row: bytes,
+) -> None:
+    """An error names the line of a report which cannot be read."""
+    base_report_file_path, _ = report_file_paths
+    report_file_path = tmp_path / "malformed.csv"
+    report_file_path.write_bytes(
+        data=b"target_id,reco_count\r\ny,4\r\n" + malformed_row + b"\r\n",
+    )
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "compare-reco-counts",
+            "--base-report",
+            str(object=base_report_file_path),
+            "--report",
+            str(object=report_file_path),
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 1
+    expected_stderr = (
+        "Error: Line 3 of the recognition counts report is not a target ID "
+        "and a recognition count.\n"
+    )
+    assert result.stderr == expected_stderr
+
+
+def test_biggest_changes_ties() -> None:
+    """Among changes of the same size, earlier rows come first, and
+    unchanged targets are neither increases nor decreases.
+    """
+    deltas = list(
+        reco_counts_deltas(
+            base_rows=[("a", 1), ("b", 1), ("c", 1), ("d", 5)],
+            rows=[("a", 3), ("b", 3), ("c", 1), ("d", 3)],
+        ),
+    )
+    summary = summarize_reco_counts_deltas(deltas=deltas, top_count=2)
+    assert summary.biggest_increases == [
+        RecoCountsDelta(
+            target_id=target_id,
+            base_reco_count=1,
+            reco_count=3,
+            delta=2,
+        )
+        for target_id in ("a", "b")
+    ]
+    assert summary.biggest_decreases == [
+        RecoCountsDelta(
+            target_id="d",
+            base_reco_count=5,
+            reco_count=3,
+            delta=-2,
+        ),
+    ]
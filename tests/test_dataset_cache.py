@@ -0,0 +1,285 @@
+"""Tests for the cache of downloaded Model Target datasets."""
+
+import hashlib
+import zipfile
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from mock_vws import MockVWS
+from vws.model_target_datasets import ModelTargetDatasetType
+
+from vws_cli import vws_group
+from vws_cli._dataset_cache import DatasetCache
+
+# The credentials which ``vws-python-mock`` accepts for the Model Target
+# Web API.
+_CLIENT_ID = "client-id"
+_CLIENT_SECRET = "client-secret"  # noqa: S105
+
+_CREDENTIAL_ARGS = [
+    "--client-id",
+    _CLIENT_ID,
+    "--client-secret",
+    _CLIENT_SECRET,
+]
+
+_BASE_VWS_URL = "https://vws.vuforia.com"
+
+
+def _download(*, dataset_uuid: str, output_file_path: Path) -> int:
+    """Download a dataset, and return the exit code."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "download-model-target-dataset",
+            "--dataset-uuid",
+            dataset_uuid,
+            "--output",
+            str(object=output_file_path),
+            *_CREDENTIAL_ARGS,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    return result.exit_code
+
+
+def _create_dataset() -> str:
+    """Create a dataset, and return the dataset UUID."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "create-model-target-dataset",
+            "--name",
+            "my-dataset",
+            "--target-sdk",
+            "10.29",
+            "--model-name",
+            "my-model",
+            "--cad-data-url",
+            "https://example.com/model.zip",
+            *_CREDENTIAL_ARGS,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0, result.output
+    return result.stdout.strip()
+
+
+def test_repeat_download_uses_cache(*, tmp_path: Path) -> None:
+    """A dataset which has been downloaded is served from the cache."""
+    first_output_file_path = tmp_path / "first.zip"
+    second_output_file_path = tmp_path / "second.zip"
+    with MockVWS(processing_time_seconds=0):
+        dataset_uuid = _create_dataset()
+        exit_code = _download(
+            dataset_uuid=dataset_uuid,
+            output_file_path=first_output_file_path,
+        )
+        assert exit_code == 0
+
+    # The new mock does not know about the dataset.
+    with MockVWS():
+        exit_code = _download(
+            dataset_uuid=dataset_uuid,
+            output_file_path=second_output_file_path,
+        )
+
+    assert exit_code == 0
+    assert second_output_file_path.read_bytes() == (
+        first_output_file_path.read_bytes()
+    )
+
+
+def test_corrupt_cached_dataset(
+    *,
+    tmp_path: Path,
+    app_directory: Path,
+) -> None:
+    """A cached dataset which does not match its checksum is not used."""
+    cache_directory = app_directory / "model-target-dataset-cache"
+    first_output_file_path = tmp_path / "first.zip"
+    second_output_file_path = tmp_path / "second.zip"
+    with MockVWS(processing_time_seconds=0):
+        dataset_uuid = _create_dataset()
+        _download(
+            dataset_uuid=dataset_uuid,
+            output_file_path=first_output_file_path,
+        )
+        (blob_path,) = (cache_directory / "blobs").iterdir()
+        blob_path.write_bytes(data=b"corrupt")
+        exit_code = _download(
+            dataset_uuid=dataset_uuid,
+            output_file_path=second_output_file_path,
+        )
+
+    assert exit_code == 0
+    assert second_output_file_path.read_bytes() == (
+        first_output_file_path.read_bytes()
+    )
+    assert blob_path.read_bytes() == first_output_file_path.read_bytes()
+
+
+def test_cache_disabled(*, tmp_path: Path) -> None:
+    """The cache is not used when its maximum size is 0."""
+    output_file_path = tmp_path / "dataset.zip"
+    with MockVWS(processing_time_seconds=0):
+        dataset_uuid = _create_dataset()
+        _download(dataset_uuid=dataset_uuid, output_file_path=output_file_path)
+
+    with MockVWS():
+        runner = CliRunner()
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                "download-model-target-dataset",
+                "--dataset-uuid",
+                dataset_uuid,
+                "--output",
+                str(object=output_file_path),
+                "--max-cache-megabytes",
+                "0",
+                *_CREDENTIAL_ARGS,
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+
+    assert result.exit_code == 1
+
+
+def test_cache_cannot_be_written(
+    *,
+    tmp_path: Path,
+    app_directory: Path,
+) -> None:
+    """A dataset is still written to its output file, with a warning, when
+    it cannot be added to the cache.
+    """
+    cache_directory = app_directory / "model-target-dataset-cache"
+    cache_directory.write_bytes(data=b"not a directory")
+    output_file_path = tmp_path / "dataset.zip"
+    with MockVWS(processing_time_seconds=0):
+        dataset_uuid = _create_dataset()
+        runner = CliRunner()
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                "download-model-target-dataset",
+                "--dataset-uuid",
+                dataset_uuid,
+                "--output",
+                str(object=output_file_path),
+                *_CREDENTIAL_ARGS,
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+
+    assert result.exit_code == 0
+    assert zipfile.is_zipfile(filename=output_file_path)
+    expected_warning = (
+        f"Warning: The dataset cache at {cache_directory} could not be "
+        "written to:"
+    )
+    assert result.stderr.startswith(expected_warning)
+
+
+@pytest.mark.parametrize(
+    argnames="dataset_type",
+    argvalues=list(ModelTargetDatasetType),
+)
+def test_keyed_by_dataset_type(
+    *,
+    tmp_path: Path,
+    dataset_type: ModelTargetDatasetType,
+) -> None:
+    """Datasets of different types with the same UUID are cached
+    separately.
+    """
+    cache = DatasetCache(directory_path=tmp_path, max_size_bytes=100)
+    cache.add(
+        base_vws_url=_BASE_VWS_URL,
+        dataset_type=ModelTargetDatasetType.STANDARD,
+        dataset_uuid="a",
+        dataset=b"standard",
+    )
+
+    cached = cache.get(
+        base_vws_url=_BASE_VWS_URL,
+        dataset_type=dataset_type,
+        dataset_uuid="a",
+    )
+
+    expected = (
+        b"standard"
+        if dataset_type == ModelTargetDatasetType.STANDARD
+        else None
+    )
+    assert cached == expected
+
+
+def test_least_recently_used_are_evicted(*, tmp_path: Path) -> None:
+    """The least recently used datasets are removed from a full cache."""
+    cache = DatasetCache(directory_path=tmp_path, max_size_bytes=10)
+    dataset_type = ModelTargetDatasetType.STANDARD
+    for dataset_uuid in ("a", "b"):
+        cache.add(
+            base_vws_url=_BASE_VWS_URL,
+            dataset_type=dataset_type,
+            dataset_uuid=dataset_uuid,
+            dataset=dataset_uuid.encode() * 4,
+        )
+    # Use "a" so that "b" is the least recently used dataset.
+    cache.get(
+        base_vws_url=_BASE_VWS_URL,
+        dataset_type=dataset_type,
+        dataset_uuid="a",
+    )
+    cache.add(
+        base_vws_url=_BASE_VWS_URL,
+        dataset_type=dataset_type,
+        dataset_uuid="c",
+        dataset=b"cccc",
+    )
+
+    cached = {
+        dataset_uuid: cache.get(
+            base_vws_url=_BASE_VWS_URL,
+            dataset_type=dataset_type,
+            dataset_uuid=dataset_uuid,
+        )
+        for dataset_uuid in ("a", "b", "c")
+    }
+    assert cached == {"a": b"aaaa", "b": None, "c": b"cccc"}
+    assert {path.name for path in (tmp_path / "blobs").iterdir()} == {
+        hashlib.sha256(b"aaaa").hexdigest(),
+        hashlib.sha256(b"cccc").hexdigest(),
+    }
+
+
+def test_identical_datasets_share_a_file(*, tmp_path: Path) -> None:
+    """Identical datasets are stored, and counted towards the size limit,
+    once.
+    """
+    cache = DatasetCache(directory_path=tmp_path, max_size_bytes=4)
+    for dataset_uuid in ("a", "b"):
+        cache.add(
+            base_vws_url=_BASE_VWS_URL,
+            dataset_type=ModelTargetDatasetType.STANDARD,
+            dataset_uuid=dataset_uuid,
+            dataset=b"same",
+        )
+
+    for dataset_uuid in ("a", "b"):
+        cached = cache.get(
+            base_vws_url=_BASE_VWS_URL,
+            dataset_type=ModelTargetDatasetType.STANDARD,
+            dataset_uuid=dataset_uuid,
+        )
+        assert cached == b"same"
+    assert len(list((tmp_path / "blobs").iterdir())) == 1
@@ -0,0 +1,219 @@
+"""Tests for exporting target records."""
+
+import csv
+import datetime
+import io
+import json
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet
+import pytest
+from click.testing import CliRunner
+from freezegun import freeze_time
+from mock_vws.database import CloudDatabase
+from vws import VWS
+
+from vws_cli import vws_group
+
+
+@pytest.fixture(name="target_ids")
+def fixture_target_ids(
+    *,
+    vws_client: VWS,
+    high_quality_image: io.BytesIO,
+) -> list[str]:
+    """Add targets to the database, and give their IDs."""
+    with freeze_time(time_to_freeze="2015-04-29"):
+        return [
+            vws_client.add_target(
+                name=name,
+                width=1.5,
+                image=high_quality_image,
+                active_flag=active_flag,
+                application_metadata=None,
+            )
+            for name, active_flag in (("a", True), ("b", False))
+        ]
+
+
+def _expected_records(
+    *,
+    vws_client: VWS,
+    target_ids: list[str],
+) -> list[dict[str, object]]:
+    """Get the records which are expected to be exported for the given
+    targets.
+    """
+    expected_records: list[dict[str, object]] = []
+    for target_id, name, active_flag in zip(
+        target_ids,
+        ("a", "b"),
+        (True, False),
+        strict=True,
+    ):
+        tracking_rating = vws_client.get_target_record(
+            target_id=target_id,
+        ).target_record.tracking_rating
+        expected_records.append(
+            {
+                "target_id": target_id,
+                "name": name,
+                "active_flag": active_flag,
+                "width": 1.5,
+                "tracking_rating": tracking_rating,
+                "reco_rating": "",
+                "status": "success",
+                "upload_date": datetime.date(year=2015, month=4, day=29),
+                "total_recos": 0,
+                "current_month_recos": 0,
+                "previous_month_recos": 0,
+            },
+        )
+    return sorted(
+        expected_records,
+        key=lambda record: str(object=record["target_id"]),
+    )
+
+
+def _export_commands(*, mock_database: CloudDatabase) -> list[str]:
+    """Get the commands to export the records of the targets in the given
+    database.
+    """
+    return [
+        "export-target-records",
+        "--server-access-key",
+        mock_database.server_access_key,
+        "--server-secret-key",
+        mock_database.server_secret_key,
+    ]
+
+
+def test_parquet(
+    *,
+    mock_database: CloudDatabase,
+    vws_client: VWS,
+    target_ids: list[str],
+    tmp_path: Path,
+) -> None:
+    """Target records can be exported as Parquet, with a type for each
+    column.
+    """
+    runner = CliRunner()
+    output_file_path = tmp_path / "targets.parquet"
+    commands = [
+        *_export_commands(mock_database=mock_database),
+        "--format",
+        "parquet",
+        "--output",
+        str(object=output_file_path),
+    ]
+    result = runner.invoke(
+        cli=vws_group,
+        args=commands,
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    assert not result.stdout
+    table = pyarrow.parquet.read_table(source=output_file_path)
+    assert table.schema.field("width").type == pa.float64()
+    assert table.schema.field("active_flag").type == pa.bool_()
+    assert table.schema.field("upload_date").type == pa.date32()
+    assert sorted(
+        table.to_pylist(),
+        key=lambda record: record["target_id"],
+    ) == _expected_records(vws_client=vws_client, target_ids=target_ids)
+
+
+def test_csv(
+    *,
+    mock_database: CloudDatabase,
+    vws_client: VWS,
+    target_ids: list[str],
+) -> None:
+    """Target records are exported as CSV to stdout by default."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=_export_commands(mock_database=mock_database),
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    rows = sorted(
+        csv.DictReader(f=io.StringIO(initial_value=result.stdout)),
+        key=lambda row: row["target_id"],
+    )
+    expected_rows = [
+        {
+            key: (
+                str(object=value).lower()
+                if isinstance(value, bool)
+                else str(object=value)
+            )
+            for key, value in record.items()
+        }
+        for record in _expected_records(
+            vws_client=vws_client,
+            target_ids=target_ids,
+        )
+    ]
+    assert rows == expected_rows
+
+
+def test_ndjson(
+    *,
+    mock_database: CloudDatabase,
+    vws_client: VWS,
+    target_ids: list[str],
+) -> None:
+    """Target records can be exported as newline-delimited JSON."""
+    runner = CliRunner()
+    commands = [
+        *_export_commands(mock_database=mock_database),
+        "--format",
+        "ndjson",
+    ]
+    result = runner.invoke(
+        cli=vws_group,
+        args=commands,
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    records = sorted(
+        (json.loads(s=line) for line in result.stdout.splitlines()),
+        key=lambda record: record["target_id"],
+    )
+    expected_records = [
+        {
+            **record,
+            "upload_date": "2015-04-29",
+        }
+        for record in _expected_records(
+            vws_client=vws_client,
+            target_ids=target_ids,
+        )
+    ]
+    assert records == expected_records
+
+
+def test_no_targets(
+    *,
+    mock_database: CloudDatabase,
+) -> None:
+    """Only a header is written if there are no targets."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=_export_commands(mock_database=mock_database),
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    assert result.stdout_bytes == (
+        b"target_id,name,active_flag,width,tracking_rating,reco_rating,"
+        b"status,upload_date,total_recos,current_month_recos,"
+        b"previous_month_recos\r\n"
+    )
@@ -0,0 +1,75 @@
+"""Tests for showing the memory which commands allocate."""
+
+import io
+import uuid
+from pathlib import Path
+
+import yaml
+from click.testing import CliRunner
+from mock_vws.database import CloudDatabase
+
+from vws_cli import vws_group
+from vws_cli.query import vuforia_cloud_reco
+
+
+def test_trace_memory(*, mock_database: CloudDatabase) -> None:
+    """The peak memory use of a command, and where memory was allocated,
+    are shown on stderr.
+    """
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "--trace-memory",
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    # The output is not changed.
+    assert "active_images" in yaml.safe_load(stream=result.stdout)
+
+    memory = yaml.safe_load(stream=result.stderr)["memory"]
+    assert memory["peak_bytes"] >= memory["sampled_peak_bytes"] > 0
+    assert memory["top_allocation_sites"]
+    for allocation_site in memory["top_allocation_sites"]:
+        filename, line_number = allocation_site["location"].rsplit(
+            sep=":",
+            maxsplit=1,
+        )
+        assert filename
+        assert int(line_number) > 0
+        assert allocation_site["size_bytes"] > 0
+        assert allocation_site["count"] > 0
+
+
+def test_trace_memory_env_var(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+    high_quality_image: io.BytesIO,
+) -> None:
+    """Memory tracing can be asked for with an environment variable."""
+    runner = CliRunner()
+    image_file = tmp_path / uuid.uuid4().hex
+    image_file.write_bytes(data=high_quality_image.getvalue())
+    result = runner.invoke(
+        cli=vuforia_cloud_reco,
+        args=[
+            str(object=image_file),
+            "--client-access-key",
+            mock_database.client_access_key,
+            "--client-secret-key",
+            mock_database.client_secret_key,
+        ],
+        env={"VWS_CLI_TRACE_MEMORY": "1"},
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    memory = yaml.safe_load(stream=result.stderr)["memory"]
+    # The image is read into memory.
+    assert memory["peak_bytes"] > len(high_quality_image.getvalue())
@@ -0,0 +1,204 @@
+"""Tests for writing metrics of commands."""
+
+import time
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+from mock_vws import MockVWS
+from mock_vws.database import CloudDatabase
+
+from vws_cli import vws_group
+from vws_cli._metrics import (
+    PeriodicMetricsWriter,
+    counted_operation,
+    endpoint,
+    start_metrics,
+    stop_metrics,
+    write_metrics,
+)
+
+
+def _samples(*, metrics_file_path: Path) -> dict[str, float]:
+    """Get the samples in a file in the Prometheus text format."""
+    samples: dict[str, float] = {}
+    for line in metrics_file_path.read_text().splitlines():
+        if line.startswith("#"):
+            continue
+        name, value = line.rsplit(sep=" ", maxsplit=1)
+        samples[name] = float(value)
+    return samples
+
+
+def test_metrics_file(*, mock_database: CloudDatabase, tmp_path: Path) -> None:
+    """Metrics of the requests of a command are written when it ends."""
+    metrics_file_path = tmp_path / "vws.prom"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "--metrics-file",
+            str(object=metrics_file_path),
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    samples = _samples(metrics_file_path=metrics_file_path)
+    labels = 'method="GET",endpoint="/summary"'
+    assert samples[f'vws_cli_requests_total{{{labels},status="200"}}'] == 1
+    assert samples[f"vws_cli_request_sent_bytes_total{{{labels}}}"] == 0
+    assert samples[f"vws_cli_response_received_bytes_total{{{labels}}}"] > 0
+    assert (
+        samples[
+            f'vws_cli_request_duration_seconds_bucket{{{labels},le="+Inf"}}'
+        ]
+        == 1
+    )
+    assert samples["vws_cli_command_running"] == 0
+    assert samples["vws_cli_command_duration_seconds"] > 0
+    assert [path.name for path in tmp_path.iterdir()] == ["vws.prom"]
+
+
+def test_quota_errors_and_retries(*, tmp_path: Path) -> None:
+    """Quota errors and retries are counted."""
+    database = CloudDatabase(request_quota=0)
+    metrics_file_path = tmp_path / "vws.prom"
+    max_attempts = 3
+    runner = CliRunner()
+    with MockVWS() as mock:
+        mock.add_cloud_database(cloud_database=database)
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                "get-database-summary-report",
+                "--server-access-key",
+                database.server_access_key,
+                "--server-secret-key",
+                database.server_secret_key,
+                "--max-attempts",
+                str(object=max_attempts),
+            ],
+            env={"VWS_CLI_METRICS_FILE": str(object=metrics_file_path)},
+            catch_exceptions=False,
+        )
+    assert result.exit_code == 1
+    samples = _samples(metrics_file_path=metrics_file_path)
+    labels = 'method="GET",endpoint="/summary"'
+    assert samples[f"vws_cli_quota_errors_total{{{labels}}}"] == max_attempts
+    assert (
+        samples[f"vws_cli_request_retries_total{{{labels}}}"]
+        == max_attempts - 1
+    )
+
+
+def test_periodic_writes(*, tmp_path: Path) -> None:
+    """Metrics are written while a command runs."""
+    metrics_file_path = tmp_path / "vws.prom"
+    metrics = start_metrics()
+    periodic_writer = PeriodicMetricsWriter(
+        metrics=metrics,
+        metrics_file_path=metrics_file_path,
+        interval_seconds=0.01,
+    )
+    periodic_writer.start()
+    while not metrics_file_path.exists():
+        time.sleep(0.01)
+    periodic_writer.stop()
+    stop_metrics(metrics=metrics)
+    samples = _samples(metrics_file_path=metrics_file_path)
+    assert samples["vws_cli_command_running"] == 1
+
+
+def test_unwritable_metrics_file(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+) -> None:
+    """A warning is shown, and the command succeeds, if the metrics cannot
+    be written.
+    """
+    metrics_file_path = tmp_path / "missing" / "vws.prom"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "--metrics-file",
+            str(object=metrics_file_path),
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    expected_warning = (
+        f"Warning: The metrics could not be written to {metrics_file_path}:"
+    )
+    assert expected_warning in result.stderr
+
+
+def test_failed_write_leaves_no_temporary_file(*, tmp_path: Path) -> None:
+    """The temporary file which metrics are written to first is removed if
+    the metrics file cannot be replaced.
+    """
+    metrics_file_path = tmp_path / "vws.prom"
+    metrics_file_path.mkdir()
+    metrics = start_metrics()
+    stop_metrics(metrics=metrics)
+    with pytest.raises(expected_exception=OSError, match=r"vws\.prom"):
+        metrics.write(metrics_file_path=metrics_file_path)
+    assert list(tmp_path.iterdir()) == [metrics_file_path]
+
+
+def test_counted_operations(*, tmp_path: Path) -> None:
+    """Items are counted by whether they were processed without an
+    error.
+    """
+    metrics_file_path = tmp_path / "vws.prom"
+    metrics = start_metrics()
+    with counted_operation(operation="get target record"):
+        pass
+    message = "Operation failed."
+    with (
+        pytest.raises(
+            expected_exception=ValueError,
+            match=r"^Operation failed\.$",
+        ),
+        counted_operation(operation="get target record"),
+    ):
+        raise ValueError(message)
+    stop_metrics(metrics=metrics)
+    write_metrics(metrics=metrics, metrics_file_path=metrics_file_path)
+    samples = _samples(metrics_file_path=metrics_file_path)
+    labels = 'operation="get target record"'
+    for outcome in ("success", "error"):
+        sample_name = (
+            f'vws_cli_operations_total{{{labels},outcome="{outcome}"}}'
+        )
+        assert samples[sample_name] == 1
+
+
+def test_endpoint() -> None:
+    """Target IDs and dataset UUIDs are replaced in endpoints."""
+    target_id = "0123456789abcdef0123456789abcdef"
+    dataset_uuid = "01234567-89ab-cdef-0123-456789abcdef"
+    assert (
+        endpoint(url=f"https://vws.vuforia.com/summary/{target_id}")
+        == "/summary/:id"
+    )
+    dataset_status_url = (
+        f"https://vws.vuforia.com/modeltargets/datasets/{dataset_uuid}/status"
+    )
+    assert endpoint(url=dataset_status_url) == (
+        "/modeltargets/datasets/:id/status"
+    )
+    assert endpoint(url="https://cloudreco.vuforia.com/v1/query") == (
+        "/v1/query"
+    )
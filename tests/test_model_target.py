@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Any
 
 import pytest
-from click.testing import CliRunner
+from click.testing import CliRunner, Result
 from mock_vws import (
     MockVWS,
     ModelTargetGenerationFailure,
@@ -616,6 +616,25 @@ _EMPTY_ARRAY: list[Any] = []
             "/models(0)/views(0)/states(0) must be a string.",
             id="state-not-a-string",
         ),
+        pytest.param(
+            [{"name": "my-model", "cadDataFile": 1}],
+            "/models(0)/cadDataFile must be a string.",
+            id="cad-data-file-not-a-string",
+        ),
+        pytest.param(
+            [
+                {
+                    "name": "my-model",
+                    "cadDataUrl": _CAD_DATA_URL,
+                    "cadDataFile": "model.obj",
+                },
+            ],
+            (
+                "/models(0)/cadDataFile cannot be used with cadDataBlob or "
+                "cadDataUrl."
+            ),
+            id="cad-data-file-with-cad-data-url",
+        ),
     ],
 )
 @pytest.mark.usefixtures("model_target_mock")
@@ -653,6 +672,75 @@ def test_invalid_models_file(
     assert expected_error in result.stderr
 
 
+@pytest.mark.usefixtures("model_target_mock")
+def test_models_file_with_cad_data_files(*, tmp_path: Path) -> None:
+    """CAD data files in a models file are relative to the models file."""
+    runner = CliRunner()
+    models_directory_path = tmp_path / "models"
+    models_directory_path.mkdir()
+    (models_directory_path / "first.obj").write_bytes(data=b"\x00first")
+    absolute_cad_data_file_path = tmp_path / "second.obj"
+    absolute_cad_data_file_path.write_bytes(data=b"\x00second")
+    models_file_path = _models_file(
+        tmp_path=models_directory_path,
+        models_json=[
+            {"name": "first-model", "cadDataFile": "first.obj"},
+            {
+                "name": "second-model",
+                "cadDataFile": str(object=absolute_cad_data_file_path),
+            },
+        ],
+    )
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "create-model-target-dataset",
+            "--name",
+            "my-dataset",
+            "--target-sdk",
+            "10.29",
+            "--models-file",
+            str(object=models_file_path),
+            *_CREDENTIAL_ARGS,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0, result.output
+    assert result.stdout.strip()
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_models_file_with_missing_cad_data_file(*, tmp_path: Path) -> None:
+    """An error is shown for a CAD data file which does not exist."""
+    runner = CliRunner()
+    models_file_path = _models_file(
+        tmp_path=tmp_path,
+        models_json=[{"name": "my-model", "cadDataFile": "missing.obj"}],
+    )
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "create-model-target-dataset",
+            "--name",
+            "my-dataset",
+            "--target-sdk",
+            "10.29",
+            "--models-file",
+            str(object=models_file_path),
+            *_CREDENTIAL_ARGS,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    expected_error = (
+        "Error: Invalid value for '--models-file': /models(0)/cadDataFile: "
+        f"{tmp_path / 'missing.obj'} is not a file."
+    )
+    assert expected_error in result.stderr
+
+
 @pytest.mark.usefixtures("model_target_mock")
 def test_models_file_without_models_key(*, tmp_path: Path) -> None:
     """An object models file must have a ``models`` array."""
@@ -984,3 +1072,351 @@ def test_unknown_dataset_uuid() -> None:
         "Error: No Model Target dataset of the given type matches the given "
         "UUID.\n"
     )
+
+
+def _datasets_file(*, tmp_path: Path, datasets_json: object) -> Path:
+    """Write a datasets file, and return its path."""
+    datasets_file_path = tmp_path / "datasets.json"
+    datasets_file_path.write_text(data=json.dumps(obj=datasets_json))
+    return datasets_file_path
+
+
+def _generate_datasets(
+    *,
+    runner: CliRunner,
+    datasets_file_path: Path,
+    output_directory_path: Path,
+    extra_args: list[str],
+) -> Result:
+    """Run the ``generate-model-target-datasets`` command."""
+    return runner.invoke(
+        cli=vws_group,
+        args=[
+            "generate-model-target-datasets",
+            "--datasets-file",
+            str(object=datasets_file_path),
+            "--output-directory",
+            str(object=output_directory_path),
+            *_CREDENTIAL_ARGS,
+            *extra_args,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+
+
+_VALID_MODELS: list[dict[str, Any]] = [
+    {"name": "my-model", "cadDataUrl": _CAD_DATA_URL},
+]
+
+
+@pytest.mark.parametrize(
+    argnames="wrap_in_object",
+    argvalues=[True, False],
+)
+@pytest.mark.usefixtures("model_target_mock")
+def test_generate_datasets(*, wrap_in_object: bool, tmp_path: Path) -> None:
+    """Multiple datasets can be created, waited for and downloaded with
+    one command.
+    """
+    runner = CliRunner()
+    datasets_json: list[dict[str, Any]] = [
+        {"name": "first", "targetSdk": "10.29", "models": _VALID_MODELS},
+        {
+            "name": "second",
+            "targetSdk": "10.29",
+            "datasetType": "advanced",
+            "models": [{"name": "my-model", "cadDataFile": "model.obj"}],
+        },
+    ]
+    (tmp_path / "model.obj").write_bytes(data=b"\x00cad-data")
+    datasets_file_path = _datasets_file(
+        tmp_path=tmp_path,
+        datasets_json=(
+            {"datasets": datasets_json} if wrap_in_object else datasets_json
+        ),
+    )
+    output_directory_path = tmp_path / "output"
+    output_directory_path.mkdir()
+    result = _generate_datasets(
+        runner=runner,
+        datasets_file_path=datasets_file_path,
+        output_directory_path=output_directory_path,
+        extra_args=["--max-workers", "2"],
+    )
+    assert result.exit_code == 0, result.output
+    assert not result.stderr
+    assert "status: done" in result.stdout
+    assert "dataset_type: advanced" in result.stdout
+    for name in ("first", "second"):
+        output_file_path = output_directory_path / f"{name}.zip"
+        assert f"output: {output_file_path}" in result.stdout
+        assert zipfile.is_zipfile(filename=output_file_path)
+
+
+def test_generate_failed_dataset(*, tmp_path: Path) -> None:
+    """A dataset which failed to generate gives a non-zero exit code."""
+    runner = CliRunner()
+    failure = ModelTargetGenerationFailure(message="Generation failed")
+    datasets_file_path = _datasets_file(
+        tmp_path=tmp_path,
+        datasets_json=[
+            {"name": "first", "targetSdk": "10.29", "models": _VALID_MODELS},
+        ],
+    )
+    with MockVWS(
+        processing_time_seconds=0,
+        model_target_generation_failure=failure,
+    ):
+        result = _generate_datasets(
+            runner=runner,
+            datasets_file_path=datasets_file_path,
+            output_directory_path=tmp_path,
+            extra_args=[],
+        )
+
+    assert result.exit_code == 1
+    assert "status: failed" in result.stdout
+    assert "output: null" in result.stdout
+    assert result.stderr == (
+        "Error: Vuforia failed to generate the datasets: first.\n"
+    )
+    assert not (tmp_path / "first.zip").exists()
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_generate_datasets_partly_created(*, tmp_path: Path) -> None:
+    """When a dataset cannot be created, the datasets which were created are
+    shown and registered, and no datasets are downloaded.
+    """
+    runner = CliRunner()
+    datasets_file_path = _datasets_file(
+        tmp_path=tmp_path,
+        datasets_json=[
+            {"name": "first", "targetSdk": "10.29", "models": _VALID_MODELS},
+            # Vuforia rejects a standard dataset without a model.
+            {"name": "second", "targetSdk": "10.29", "models": []},
+        ],
+    )
+    output_directory_path = tmp_path / "output"
+    output_directory_path.mkdir()
+    result = _generate_datasets(
+        runner=runner,
+        datasets_file_path=datasets_file_path,
+        output_directory_path=output_directory_path,
+        extra_args=[],
+    )
+    assert result.exit_code == 1
+    assert "name: first" in result.stdout
+    assert "name: second" not in result.stdout
+    assert "Not every dataset was created." in result.stderr
+    assert not list(output_directory_path.iterdir())
+
+    list_result = runner.invoke(
+        cli=vws_group,
+        args=["list-model-target-datasets", "--client-id", _CLIENT_ID],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert list_result.exit_code == 0
+    assert "name: first" in list_result.stdout
+    assert "name: second" not in list_result.stdout
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_generate_datasets_unreadable_cad_data_file(
+    *,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """When a CAD data file cannot be read, the datasets which were created
+    are shown, with an error for the dataset which was not created.
+    """
+    cad_data_file_path = tmp_path / "model.obj"
+    cad_data_file_path.write_bytes(data=b"\x00cad-data")
+    read_bytes = Path.read_bytes
+
+    def unreadable_cad_data_file(self: Path) -> bytes:
+        """Fail to read the CAD data file, and read other files."""
+        if self == cad_data_file_path:
+            raise PermissionError(self)
+        return read_bytes(self)
+
+    monkeypatch.setattr(
+        target=Path,
+        name="read_bytes",
+        value=unreadable_cad_data_file,
+    )
+    runner = CliRunner()
+    datasets_file_path = _datasets_file(
+        tmp_path=tmp_path,
+        datasets_json=[
+            {"name": "first", "targetSdk": "10.29", "models": _VALID_MODELS},
+            {
+                "name": "second",
+                "targetSdk": "10.29",
+                "models": [{"name": "my-model", "cadDataFile": "model.obj"}],
+            },
+        ],
+    )
+    output_directory_path = tmp_path / "output"
+    output_directory_path.mkdir()
+    result = _generate_datasets(
+        runner=runner,
+        datasets_file_path=datasets_file_path,
+        output_directory_path=output_directory_path,
+        extra_args=[],
+    )
+    assert result.exit_code == 1
+    assert "name: first" in result.stdout
+    assert "name: second" not in result.stdout
+    assert (
+        'Dataset "second": Error: A CAD data file could not be read:'
+        in result.stderr
+    )
+    assert "Not every dataset was created." in result.stderr
+    assert not list(output_directory_path.iterdir())
+
+
+def test_generate_datasets_timeout(*, tmp_path: Path) -> None:
+    """An error is shown when the datasets are not generated in time."""
+    runner = CliRunner()
+    datasets_file_path = _datasets_file(
+        tmp_path=tmp_path,
+        datasets_json=[
+            {"name": "first", "targetSdk": "10.29", "models": _VALID_MODELS},
+        ],
+    )
+    with MockVWS(processing_time_seconds=9999):
+        result = _generate_datasets(
+            runner=runner,
+            datasets_file_path=datasets_file_path,
+            output_directory_path=tmp_path,
+            extra_args=[
+                "--seconds-between-requests",
+                "0.05",
+                "--timeout-seconds",
+                "0.1",
+            ],
+        )
+
+    assert result.exit_code == 1
+    assert "status: processing" in result.stdout
+    assert result.stderr == "Timeout of 0.1 seconds reached.\n"
+
+
+@pytest.mark.parametrize(
+    argnames=("datasets_json", "expected_message"),
+    argvalues=[
+        pytest.param(
+            {"name": "first"},
+            "/datasets is required.",
+            id="object-without-datasets",
+        ),
+        pytest.param(
+            {"datasets": "first"},
+            "/datasets must be an array.",
+            id="datasets-not-an-array",
+        ),
+        pytest.param(
+            [{"name": "first", "targetSdk": "10.29"}],
+            "/datasets(0)/models is required.",
+            id="dataset-without-models",
+        ),
+        pytest.param(
+            [
+                {
+                    "name": "first",
+                    "targetSdk": "10.29",
+                    "datasetType": "basic",
+                    "models": _VALID_MODELS,
+                },
+            ],
+            "/datasets(0)/datasetType must be one of: advanced, standard.",
+            id="invalid-dataset-type",
+        ),
+        pytest.param(
+            [{"name": "first", "targetSdk": "10.29", "models": {}}],
+            "/datasets(0)/models must be an array.",
+            id="models-not-an-array",
+        ),
+        pytest.param(
+            [{"name": "first", "targetSdk": "10.29", "models": [{}]}],
+            "/datasets(0)/models(0)/name is required.",
+            id="invalid-model",
+        ),
+        pytest.param(
+            [
+                {
+                    "name": "nested/first",
+                    "targetSdk": "10.29",
+                    "models": _VALID_MODELS,
+                },
+            ],
+            "/datasets(0)/name must be usable as a file name.",
+            id="name-not-a-file-name",
+        ),
+        pytest.param(
+            [{"name": "..", "targetSdk": "10.29", "models": _VALID_MODELS}],
+            "/datasets(0)/name must be usable as a file name.",
+            id="name-parent-directory",
+        ),
+        pytest.param(
+            [{"name": "", "targetSdk": "10.29", "models": _VALID_MODELS}],
+            "/datasets(0)/name must be usable as a file name.",
+            id="name-empty",
+        ),
+        pytest.param(
+            [
+                {"name": "first", "targetSdk": "10.29", "models": []},
+                {"name": "first", "targetSdk": "10.29", "models": []},
+            ],
+            "/datasets(1)/name is the name of another dataset.",
+            id="duplicate-name",
+        ),
+    ],
+)
+@pytest.mark.usefixtures("model_target_mock")
+def test_invalid_datasets_file(
+    *,
+    datasets_json: object,
+    expected_message: str,
+    tmp_path: Path,
+) -> None:
+    """An error is shown for a datasets file which cannot be used."""
+    runner = CliRunner()
+    datasets_file_path = _datasets_file(
+        tmp_path=tmp_path,
+        datasets_json=datasets_json,
+    )
+    result = _generate_datasets(
+        runner=runner,
+        datasets_file_path=datasets_file_path,
+        output_directory_path=tmp_path,
+        extra_args=[],
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    expected_error = (
+        f"Error: Invalid value for '--datasets-file': {expected_message}"
+    )
+    assert expected_error in result.stderr
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_datasets_file_is_not_json(*, tmp_path: Path) -> None:
+    """An error is shown for a datasets file which is not JSON."""
+    runner = CliRunner()
+    datasets_file_path = tmp_path / "datasets.json"
+    datasets_file_path.write_text(data="not-json")
+    result = _generate_datasets(
+        runner=runner,
+        datasets_file_path=datasets_file_path,
+        output_directory_path=tmp_path,
+        extra_args=[],
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    expected_error = (
+        f"Error: Invalid value for '--datasets-file': {datasets_file_path} "
+        "is not valid JSON."
+    )
+    assert expected_error in result.stderr
@@ -0,0 +1,432 @@
+"""Tests for the local registry of Model Target datasets."""
+
+import dataclasses
+import datetime
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+import yaml
+from click.testing import CliRunner
+from mock_vws import MockVWS
+
+from vws_cli import vws_group
+from vws_cli._model_target_registry import add_dataset, get_datasets
+
+# The credentials which ``vws-python-mock`` accepts for the Model Target
+# Web API.
+_CLIENT_ID = "client-id"
+_CLIENT_SECRET = "client-secret"  # noqa: S105
+
+_CREDENTIAL_ARGS = [
+    "--client-id",
+    _CLIENT_ID,
+    "--client-secret",
+    _CLIENT_SECRET,
+]
+
+_BASE_VWS_URL = "https://vws.vuforia.com"
+
+
+@pytest.fixture(name="model_target_mock")
+def fixture_model_target_mock() -> Iterator[MockVWS]:
+    """Yield a mock which generates Model Target datasets immediately."""
+    with MockVWS(processing_time_seconds=0) as mock:
+        yield mock
+
+
+def _invoke(*, args: list[str]) -> object:
+    """Run a successful ``vws`` command and load its YAML output."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=args,
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0, result.output
+    return yaml.safe_load(stream=result.stdout)
+
+
+def _invoke_for_datasets(*, args: list[str]) -> list[dict[str, str]]:
+    """Run a successful ``vws`` command which shows datasets, and load
+    them.
+    """
+    datasets = _invoke(args=args)
+    assert isinstance(datasets, list)
+    return datasets
+
+
+def _create_dataset(*, name: str, extra_args: list[str]) -> str:
+    """Create a dataset from one model, and return the dataset UUID."""
+    dataset_uuid = _invoke(
+        args=[
+            "create-model-target-dataset",
+            "--name",
+            name,
+            "--target-sdk",
+            "10.29",
+            "--model-name",
+            "my-model",
+            "--cad-data-url",
+            "https://example.com/model.zip",
+            *_CREDENTIAL_ARGS,
+            *extra_args,
+        ],
+    )
+    assert isinstance(dataset_uuid, str)
+    return dataset_uuid
+
+
+def _list_datasets(*, client_id: str) -> list[dict[str, str]]:
+    """List the datasets in the registry."""
+    return _invoke_for_datasets(
+        args=["list-model-target-datasets", "--client-id", client_id],
+    )
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_created_datasets_are_registered() -> None:
+    """Datasets created with the CLI are in the registry, oldest first."""
+    first_uuid = _create_dataset(name="first", extra_args=[])
+    second_uuid = _create_dataset(
+        name="second",
+        extra_args=["--dataset-type", "advanced"],
+    )
+
+    datasets = _list_datasets(client_id=_CLIENT_ID)
+    assert [
+        (dataset["name"], dataset["dataset_uuid"], dataset["dataset_type"])
+        for dataset in datasets
+    ] == [
+        ("first", first_uuid, "standard"),
+        ("second", second_uuid, "advanced"),
+    ]
+    assert {dataset["status"] for dataset in datasets} == {"processing"}
+    assert not _list_datasets(client_id="other-client-id")
+
+
+def test_registry_file_option(*, tmp_path: Path) -> None:
+    """The registry file can be given as an option."""
+    registry_file_path = tmp_path / "other" / "registry.sqlite3"
+    with MockVWS(processing_time_seconds=0):
+        dataset_uuid = _create_dataset(
+            name="my-dataset",
+            extra_args=["--registry-file", str(object=registry_file_path)],
+        )
+
+    assert not _list_datasets(client_id=_CLIENT_ID)
+    datasets = _invoke_for_datasets(
+        args=[
+            "list-model-target-datasets",
+            "--client-id",
+            _CLIENT_ID,
+            "--registry-file",
+            str(object=registry_file_path),
+        ],
+    )
+    assert [dataset["dataset_uuid"] for dataset in datasets] == [
+        dataset_uuid,
+    ]
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_single_dataset_commands_update_registry() -> None:
+    """Getting the status of a dataset updates the registry, and deleting a
+    dataset removes it from the registry.
+    """
+    dataset_uuid = _create_dataset(name="my-dataset", extra_args=[])
+    dataset_args = ["--dataset-uuid", dataset_uuid, *_CREDENTIAL_ARGS]
+
+    _invoke(args=["get-model-target-dataset-status", *dataset_args])
+    datasets = _list_datasets(client_id=_CLIENT_ID)
+    assert [dataset["status"] for dataset in datasets] == ["done"]
+
+    _invoke(args=["delete-model-target-dataset", *dataset_args])
+    assert not _list_datasets(client_id=_CLIENT_ID)
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_status_does_not_create_registry(*, app_directory: Path) -> None:
+    """Commands which only update the registry do not create it."""
+    registry_file_path = app_directory / "model-target-datasets.sqlite3"
+    dataset_uuid = _create_dataset(name="my-dataset", extra_args=[])
+    registry_file_path.unlink()
+
+    _invoke(
+        args=[
+            "get-model-target-dataset-status",
+            "--dataset-uuid",
+            dataset_uuid,
+            *_CREDENTIAL_ARGS,
+        ],
+    )
+
+    assert not registry_file_path.exists()
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_refresh(*, tmp_path: Path) -> None:
+    """Refreshing the registry updates statuses and removes datasets which
+    Vuforia no longer knows about.
+    """
+    kept_uuid = _create_dataset(name="kept", extra_args=[])
+    deleted_uuid = _create_dataset(name="deleted", extra_args=[])
+    _invoke(
+        args=[
+            "delete-model-target-dataset",
+            "--dataset-uuid",
+            deleted_uuid,
+            *_CREDENTIAL_ARGS,
+            # Use another registry so that the dataset stays registered.
+            "--registry-file",
+            str(object=tmp_path / "other-registry.sqlite3"),
+        ],
+    )
+
+    refreshed = _invoke_for_datasets(
+        args=[
+            "refresh-model-target-datasets",
+            "--max-workers",
+            "1",
+            *_CREDENTIAL_ARGS,
+        ],
+    )
+
+    assert [
+        (dataset["dataset_uuid"], dataset["status"]) for dataset in refreshed
+    ] == [(kept_uuid, "done")]
+    assert _list_datasets(client_id=_CLIENT_ID) == refreshed
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_download(*, tmp_path: Path) -> None:
+    """Every generated dataset in the registry can be downloaded."""
+    first_uuid = _create_dataset(name="first", extra_args=[])
+    second_uuid = _create_dataset(
+        name="second",
+        extra_args=["--dataset-type", "advanced"],
+    )
+
+    summary = _invoke_for_datasets(
+        args=[
+            "download-model-target-datasets",
+            "--output-directory",
+            str(object=tmp_path),
+            *_CREDENTIAL_ARGS,
+        ],
+    )
+
+    assert summary == [
+        {
+            "name": "first",
+            "dataset_uuid": first_uuid,
+            "output": str(object=tmp_path / f"{first_uuid}.zip"),
+        },
+        {
+            "name": "second",
+            "dataset_uuid": second_uuid,
+            "output": str(object=tmp_path / f"{second_uuid}.zip"),
+        },
+    ]
+    for dataset_uuid in (first_uuid, second_uuid):
+        output_file_path = tmp_path / f"{dataset_uuid}.zip"
+        assert zipfile.is_zipfile(filename=output_file_path)
+    datasets = _list_datasets(client_id=_CLIENT_ID)
+    assert {dataset["status"] for dataset in datasets} == {"done"}
+
+
+def test_download_skips_datasets_being_generated(*, tmp_path: Path) -> None:
+    """Datasets which are still being generated are not downloaded."""
+    with MockVWS(processing_time_seconds=9999):
+        _create_dataset(name="my-dataset", extra_args=[])
+        summary = _invoke_for_datasets(
+            args=[
+                "download-model-target-datasets",
+                "--output-directory",
+                str(object=tmp_path),
+                *_CREDENTIAL_ARGS,
+            ],
+        )
+
+    assert summary == []
+    assert not list(tmp_path.glob(pattern="*.zip"))
+    datasets = _list_datasets(client_id=_CLIENT_ID)
+    assert [dataset["status"] for dataset in datasets] == ["processing"]
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_delete_older_than(*, app_directory: Path) -> None:
+    """Datasets created more than a given number of days ago can be
+    deleted.
+    """
+    registry_file_path = app_directory / "model-target-datasets.sqlite3"
+    old_uuid = _create_dataset(name="old", extra_args=[])
+    new_uuid = _create_dataset(name="new", extra_args=[])
+    old_dataset, _ = get_datasets(
+        registry_file_path=registry_file_path,
+        client_id=_CLIENT_ID,
+        base_vws_url=_BASE_VWS_URL,
+    )
+    add_dataset(
+        registry_file_path=registry_file_path,
+        client_id=_CLIENT_ID,
+        base_vws_url=_BASE_VWS_URL,
+        dataset=dataclasses.replace(
+            old_dataset,
+            created_at=old_dataset.created_at - datetime.timedelta(days=10),
+        ),
+    )
+
+    deleted = _invoke_for_datasets(
+        args=[
+            "delete-model-target-datasets",
+            "--older-than-days",
+            "7",
+            *_CREDENTIAL_ARGS,
+        ],
+    )
+
+    assert [dataset["dataset_uuid"] for dataset in deleted] == [old_uuid]
+    datasets = _list_datasets(client_id=_CLIENT_ID)
+    assert [dataset["dataset_uuid"] for dataset in datasets] == [new_uuid]
+    status_result = CliRunner().invoke(
+        cli=vws_group,
+        args=[
+            "get-model-target-dataset-status",
+            "--dataset-uuid",
+            old_uuid,
+            *_CREDENTIAL_ARGS,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert status_result.exit_code == 1
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_delete_datasets_already_deleted(*, tmp_path: Path) -> None:
+    """Datasets which Vuforia no longer knows about are removed from the
+    registry when deleting old datasets.
+    """
+    dataset_uuid = _create_dataset(name="my-dataset", extra_args=[])
+    _invoke(
+        args=[
+            "delete-model-target-dataset",
+            "--dataset-uuid",
+            dataset_uuid,
+            *_CREDENTIAL_ARGS,
+            "--registry-file",
+            str(object=tmp_path / "other-registry.sqlite3"),
+        ],
+    )
+
+    deleted = _invoke_for_datasets(
+        args=[
+            "delete-model-target-datasets",
+            "--older-than-days",
+            "0",
+            *_CREDENTIAL_ARGS,
+        ],
+    )
+
+    assert [dataset["dataset_uuid"] for dataset in deleted] == [dataset_uuid]
+    assert not _list_datasets(client_id=_CLIENT_ID)
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_registry_cannot_be_written(*, tmp_path: Path) -> None:
+    """A dataset is still shown when it cannot be added to the registry."""
+    registry_file_path = tmp_path / "registry.sqlite3"
+    registry_file_path.write_bytes(data=b"not a SQLite database")
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "create-model-target-dataset",
+            "--name",
+            "my-dataset",
+            "--target-sdk",
+            "10.29",
+            "--model-name",
+            "my-model",
+            "--cad-data-url",
+            "https://example.com/model.zip",
+            *_CREDENTIAL_ARGS,
+            "--registry-file",
+            str(object=registry_file_path),
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+
+    assert result.exit_code == 0
+    dataset_uuid = result.stdout.strip()
+    assert dataset_uuid
+    expected_warning = (
+        f'Warning: The dataset "my-dataset" ({dataset_uuid}) could not be '
+        f"added to the local registry at {registry_file_path}:"
+    )
+    assert result.stderr.startswith(expected_warning)
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_delete_dry_run() -> None:
+    """With ``--dry-run``, the datasets which would be deleted are shown,
+    and nothing is deleted.
+    """
+    dataset_uuid = _create_dataset(name="my-dataset", extra_args=[])
+
+    deleted = _invoke_for_datasets(
+        args=[
+            "delete-model-target-datasets",
+            "--older-than-days",
+            "0",
+            "--dry-run",
+            *_CREDENTIAL_ARGS,
+        ],
+    )
+
+    assert [dataset["dataset_uuid"] for dataset in deleted] == [dataset_uuid]
+    datasets = _list_datasets(client_id=_CLIENT_ID)
+    assert [dataset["dataset_uuid"] for dataset in datasets] == [dataset_uuid]
+    _invoke(
+        args=[
+            "get-model-target-dataset-status",
+            "--dataset-uuid",
+            dataset_uuid,
+            *_CREDENTIAL_ARGS,
+        ],
+    )
+
+
+@pytest.mark.usefixtures("model_target_mock")
+def test_delete_registry_cannot_be_written(*, tmp_path: Path) -> None:
+    """A dataset is still deleted, with a warning, when it cannot be removed
+    from the registry.
+    """
+    dataset_uuid = _create_dataset(name="my-dataset", extra_args=[])
+    registry_file_path = tmp_path / "registry.sqlite3"
+    registry_file_path.write_bytes(data=b"not a SQLite database")
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "delete-model-target-dataset",
+            "--dataset-uuid",
+            dataset_uuid,
+            *_CREDENTIAL_ARGS,
+            "--registry-file",
+            str(object=registry_file_path),
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+
+    assert result.exit_code == 0
+    expected_warning = (
+        f"Warning: The local registry at {registry_file_path} could not be "
+        "updated:"
+    )
+    assert result.stderr.startswith(expected_warning)
@@ -0,0 +1,63 @@
+"""Tests for writing CPU profiles of commands."""
+
+import pstats
+from pathlib import Path
+
+from click.testing import CliRunner
+from mock_vws.database import CloudDatabase
+
+from vws_cli import vws_group
+
+
+def test_pstats(*, mock_database: CloudDatabase, tmp_path: Path) -> None:
+    """By default, a profile is written as ``pstats`` data."""
+    profile_file_path = tmp_path / "vws.pstats"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "--profile",
+            str(object=profile_file_path),
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    stats = pstats.Stats(str(object=profile_file_path))
+    function_profiles = stats.get_stats_profile().func_profiles
+    assert "get_database_summary_report" in function_profiles
+
+
+def test_collapsed_stacks(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+) -> None:
+    """A profile is written as collapsed stacks of each thread if the
+    profile file name ends with ``.folded``.
+    """
+    profile_file_path = tmp_path / "vws.folded"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        env={"VWS_CLI_PROFILE": str(object=profile_file_path)},
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    for line in profile_file_path.read_text().splitlines():
+        stack, count = line.rsplit(sep=" ", maxsplit=1)
+        thread_name, *functions = stack.split(sep=";")
+        assert thread_name
+        assert all(":" in function for function in functions)
+        assert int(count) > 0
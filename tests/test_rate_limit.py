@@ -0,0 +1,146 @@
+"""Tests for limiting the rate of requests."""
+
+import functools
+import io
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from click.testing import CliRunner
+from freezegun import freeze_time
+from mock_vws.database import CloudDatabase
+from vws import VWS
+
+from vws_cli import vws_group
+from vws_cli._rate_limit import reserve_request
+
+
+def test_burst_then_wait(*, tmp_path: Path) -> None:
+    """Up to a second of requests can be made at once, and then each
+    request waits for its turn.
+    """
+    max_requests_per_second = 2.0
+    seconds_per_request = 1 / max_requests_per_second
+    reserve = functools.partial(
+        reserve_request,
+        rate_limit_file_path=tmp_path / "rate-limits.sqlite3",
+        credential="my_access_key",
+        max_requests_per_second=max_requests_per_second,
+    )
+    with freeze_time() as frozen_time:
+        assert [reserve() for _ in range(4)] == [0.0, 0.0, 0.5, 1.0]
+        frozen_time.tick(delta=1.0)
+        assert reserve() == seconds_per_request
+        frozen_time.tick(delta=10.0)
+        # The bucket does not hold more than a second of requests.
+        assert [reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+
+def test_credentials_are_separate(*, tmp_path: Path) -> None:
+    """Each credential has its own limit, and credentials are not stored."""
+    rate_limit_file_path = tmp_path / "rate-limits.sqlite3"
+    with freeze_time():
+        for credential in ("my_access_key", "my_other_access_key"):
+            waits = [
+                reserve_request(
+                    rate_limit_file_path=rate_limit_file_path,
+                    credential=credential,
+                    max_requests_per_second=1.0,
+                )
+                for _ in range(2)
+            ]
+            assert waits == [0.0, 1.0]
+
+    assert b"access_key" not in rate_limit_file_path.read_bytes()
+
+
+def test_shared_between_processes(*, tmp_path: Path) -> None:
+    """Processes which use the same credential at the same time each get
+    their own turn.
+    """
+    num_requests = 8
+    # With a slow rate, the time between the processes starting does not
+    # change which turn each request gets.
+    seconds_per_request = 1000.0
+    reserve = functools.partial(
+        reserve_request,
+        rate_limit_file_path=tmp_path / "rate-limits.sqlite3",
+        credential="my_access_key",
+        max_requests_per_second=1 / seconds_per_request,
+    )
+    with ProcessPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(reserve) for _ in range(num_requests)]
+        waits = [future.result() for future in futures]
+
+    turns = sorted(round(wait / seconds_per_request) for wait in waits)
+    assert turns == list(range(num_requests))
+
+
+def test_command_uses_rate_limit(
+    *,
+    mock_database: CloudDatabase,
+    vws_client: VWS,
+    high_quality_image: io.BytesIO,
+    app_directory: Path,
+) -> None:
+    """Requests made by commands are counted against the limit of the
+    credentials they use.
+    """
+    target_id = vws_client.add_target(
+        name="x",
+        width=1,
+        image=high_quality_image,
+        active_flag=True,
+        application_metadata=None,
+    )
+    max_requests_per_second = 5
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "get-target-record",
+            "--target-id",
+            target_id,
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+            "--max-requests-per-second",
+            str(object=max_requests_per_second),
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+
+    rate_limit_file_path = app_directory / "rate-limits.sqlite3"
+    with sqlite3.connect(database=rate_limit_file_path) as connection:
+        (tokens,) = connection.execute(
+            "SELECT tokens FROM token_buckets",
+        ).fetchone()
+    # One token was taken from a full bucket, which holds a second of
+    # requests.
+    assert tokens == max_requests_per_second - 1
+
+
+def test_no_limit_by_default(
+    *,
+    mock_database: CloudDatabase,
+    app_directory: Path,
+) -> None:
+    """No rate limit file is used if no limit is given."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "list-targets",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    assert not (app_directory / "rate-limits.sqlite3").exists()
@@ -0,0 +1,197 @@
+"""Tests for the local history of recognition counts."""
+
+import datetime
+import io
+from collections.abc import Iterator
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+import yaml
+from click.testing import CliRunner
+from freezegun import freeze_time
+from mock_vws import MockVWS
+from mock_vws.database import CloudDatabase
+from vws import VWS
+
+from vws_cli import vws_group
+from vws_cli._reco_counts_history import month_reco_counts, store_month
+
+
+@pytest.fixture(name="immediate_reports_database")
+def fixture_immediate_reports_database() -> Iterator[CloudDatabase]:
+    """Yield a mock ``CloudDatabase`` which generates reports immediately."""
+    database = CloudDatabase()
+    with MockVWS(processing_time_seconds=0) as mock:
+        mock.add_cloud_database(cloud_database=database)
+        yield database
+
+
+def _month_strings() -> tuple[str, str]:
+    """Return ``YYYY-mm`` strings for the previous month and this month."""
+    now = datetime.datetime.now(tz=ZoneInfo(key="UTC"))
+    current_month = now.date().replace(day=1)
+    previous_month = current_month - datetime.timedelta(days=1)
+    return previous_month.strftime("%Y-%m"), current_month.strftime("%Y-%m")
+
+
+def _update_history(*, database: CloudDatabase) -> object:
+    """Update the history, and return the YAML output."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "update-reco-counts-history",
+            "--server-access-key",
+            database.server_access_key,
+            "--server-secret-key",
+            database.server_secret_key,
+            "--database-id",
+            database.database_id,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0, result.output
+    return yaml.safe_load(stream=result.stdout)
+
+
+def _get_history(*, database_id: str, target_id: str) -> object:
+    """Get the history of a target, and return the YAML output."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "get-reco-counts-history",
+            "--target-id",
+            target_id,
+            "--database-id",
+            database_id,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0, result.output
+    return yaml.safe_load(stream=result.stdout)
+
+
+def test_final_months_are_skipped(
+    *,
+    immediate_reports_database: CloudDatabase,
+) -> None:
+    """The previous month is final once it has been stored after the grace
+    period, so it is not requested again.
+    """
+    with freeze_time(time_to_freeze="2026-03-15"):
+        previous_month, current_month = _month_strings()
+        first_update = _update_history(database=immediate_reports_database)
+        second_update = _update_history(database=immediate_reports_database)
+
+    assert first_update == [
+        {
+            "month": previous_month,
+            "skipped": False,
+            "targets": 0,
+            "final": True,
+        },
+        {
+            "month": current_month,
+            "skipped": False,
+            "targets": 0,
+            "final": False,
+        },
+    ]
+    assert second_update == [
+        {"month": previous_month, "skipped": True},
+        {
+            "month": current_month,
+            "skipped": False,
+            "targets": 0,
+            "final": False,
+        },
+    ]
+
+
+@pytest.mark.parametrize(argnames="day", argvalues=["01", "02"])
+def test_previous_month_in_grace_period(
+    *,
+    immediate_reports_database: CloudDatabase,
+    day: str,
+) -> None:
+    """The previous month is not final when it is stored soon after it
+    ended, as recognitions may still be counted, so it is requested again.
+    """
+    with freeze_time(time_to_freeze=f"2026-03-{day}"):
+        _update_history(database=immediate_reports_database)
+        second_update = _update_history(database=immediate_reports_database)
+
+    assert second_update == [
+        {
+            "month": "2026-02",
+            "skipped": False,
+            "targets": 0,
+            "final": False,
+        },
+        {
+            "month": "2026-03",
+            "skipped": False,
+            "targets": 0,
+            "final": False,
+        },
+    ]
+
+
+def test_store_month_replaces_counts(*, tmp_path: Path) -> None:
+    """Storing a month again replaces its counts, so targets which are no
+    longer in the report are removed.
+    """
+    history_file_path = tmp_path / "reco-counts-history.sqlite3"
+    month = datetime.date(year=2026, month=2, day=1)
+    for rows in ([("a", 1), ("b", 2)], [("b", 3), ("c", 4)]):
+        store_month(
+            history_file_path=history_file_path,
+            database_id="database-id",
+            month=month,
+            rows=rows,
+            is_final=False,
+        )
+
+    with month_reco_counts(
+        history_file_path=history_file_path,
+        database_id="database-id",
+        month=month,
+    ) as stored_rows:
+        assert stored_rows is not None
+        assert list(stored_rows) == [("b", 3), ("c", 4)]
+
+
+def test_target_history(
+    *,
+    immediate_reports_database: CloudDatabase,
+    high_quality_image: io.BytesIO,
+) -> None:
+    """The monthly counts of a target are shown from the history."""
+    vws_client = VWS(
+        server_access_key=immediate_reports_database.server_access_key,
+        server_secret_key=immediate_reports_database.server_secret_key,
+    )
+    target_id = vws_client.add_target(
+        name="x",
+        width=1,
+        image=high_quality_image,
+        active_flag=True,
+        application_metadata=None,
+    )
+    database_id = immediate_reports_database.database_id
+    assert _get_history(database_id=database_id, target_id=target_id) == {}
+
+    _update_history(database=immediate_reports_database)
+
+    previous_month, current_month = _month_strings()
+    history = _get_history(database_id=database_id, target_id=target_id)
+    assert history == {previous_month: 0, current_month: 0}
+    other_database_history = _get_history(
+        database_id="other-database-id",
+        target_id=target_id,
+    )
+    assert other_database_history == {}
@@ -1,18 +1,42 @@
-"""Tests for the ``get-database-reco-counts-report`` command."""
+"""Tests for the ``get-database-reco-counts-report`` and
+``fetch-reco-counts-report`` commands.
+"""
 
+import dataclasses
 import datetime
+import gzip
+import http.server
+import io
+import json
+import threading
 import uuid
+from collections.abc import Iterator, Mapping, Sequence
+from http import HTTPStatus
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet
 import pytest
+import yaml
 from click.testing import CliRunner
 from mock_vws import MockVWS
 from mock_vws.database import CloudDatabase
 from vws import VWS
 from vws.exceptions.custom_exceptions import RecoCountsReportNotReadyError
+from vws.reports import TargetRecord
 
 from vws_cli import vws_group
+from vws_cli._reco_counts import (
+    ENRICHED_RECO_COUNTS_COLUMNS,
+    EnrichedRecoCountsRow,
+    RecoCountsSummary,
+    enrich_reco_counts_rows,
+    reco_counts_rows,
+    summarize_reco_counts,
+)
+from vws_cli._tables import csv_chunks, ndjson_chunks
 
 _EXPECTED_CSV = b"target_id,reco_count\r\n"
 
@@ -124,6 +148,377 @@ def test_output_file(*, tmp_path: Path) -> None:
     assert output_file_path.read_bytes() == _EXPECTED_CSV
 
 
+@pytest.mark.parametrize(argnames="use_output_file", argvalues=[True, False])
+def test_gzip(*, tmp_path: Path, use_output_file: bool) -> None:
+    """The report can be compressed with gzip."""
+    runner = CliRunner()
+    mock_database = CloudDatabase()
+    output_file_path = tmp_path / "report.csv.gz"
+    output_args = (
+        ["--output", str(object=output_file_path)] if use_output_file else []
+    )
+    with MockVWS(processing_time_seconds=0) as mock:
+        mock.add_cloud_database(cloud_database=mock_database)
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                *_base_commands(mock_database=mock_database),
+                "--gzip",
+                *output_args,
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+
+    assert result.exit_code == 0
+    compressed = (
+        output_file_path.read_bytes()
+        if use_output_file
+        else result.stdout_bytes
+    )
+    assert gzip.decompress(data=compressed) == _EXPECTED_CSV
+
+
+def test_timeout_leaves_no_output_file(*, tmp_path: Path) -> None:
+    """No output file is written when the report is not generated in
+    time.
+    """
+    runner = CliRunner()
+    mock_database = CloudDatabase()
+    with MockVWS(processing_time_seconds=60) as mock:
+        mock.add_cloud_database(cloud_database=mock_database)
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                *_base_commands(mock_database=mock_database),
+                "--timeout-seconds",
+                "0.1",
+                "--seconds-between-requests",
+                "0.05",
+                "--output",
+                str(object=tmp_path / "report.csv"),
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+
+    assert result.exit_code == 1
+    assert not list(tmp_path.iterdir())
+
+
+def test_summary(
+    *,
+    mock_database: CloudDatabase,
+    vws_client: VWS,
+    high_quality_image: io.BytesIO,
+) -> None:
+    """A summary of the report can be shown.
+
+    Targets which have not been recognized are listed, whether or not they
+    are in the report.
+    """
+    target_ids = [
+        vws_client.add_target(
+            name=name,
+            width=1,
+            image=high_quality_image,
+            active_flag=True,
+            application_metadata=None,
+        )
+        for name in ("x1", "x2")
+    ]
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[*_base_commands(mock_database=mock_database), "--summary"],
+        catch_exceptions=False,
+        color=True,
+    )
+
+    assert result.exit_code == 0
+    summary = yaml.safe_load(stream=result.stdout)
+    assert summary["total_reco_count"] == 0
+    assert summary["top_targets"] == []
+    assert summary["zero_reco_count_target_ids"] == sorted(target_ids)
+
+
+def test_summarize_reco_counts() -> None:
+    """Recognition counts are summarized in one pass over a report which is
+    given in chunks.
+    """
+    report = (
+        b"target_id,reco_count\r\na,5\r\nb,0\r\nc,9\r\nd,5\r\ndeleted,1\r\n"
+    )
+    chunks = [report[index : index + 3] for index in range(0, len(report), 3)]
+
+    summary = summarize_reco_counts(
+        rows=reco_counts_rows(chunks=chunks),
+        top_count=3,
+        database_target_ids=["a", "b", "c", "d", "e"],
+    )
+
+    expected_summary = RecoCountsSummary(
+        target_count=5,
+        total_reco_count=20,
+        # Targets with the same count are in the order of the report.
+        top_targets=[("c", 9), ("a", 5), ("d", 5)],
+        zero_reco_count_target_ids=["b", "e"],
+    )
+    assert summary == expected_summary
+
+
+def test_enrich_reco_counts_rows() -> None:
+    """Rows are joined with the records of the targets which exist, and
+    records are looked up only for the targets in the report.
+    """
+    report = b"target_id,reco_count\r\na,5\r\ndeleted,1\r\n"
+    target_record = TargetRecord(
+        target_id="a",
+        active_flag=False,
+        name="my, target",
+        width=1.0,
+        tracking_rating=3,
+        reco_rating="",
+    )
+    looked_up_target_ids: list[str] = []
+
+    def get_target_records(
+        target_ids: Sequence[str],
+    ) -> Mapping[str, TargetRecord]:
+        """Give the record of target ``a``."""
+        looked_up_target_ids.extend(target_ids)
+        return {"a": target_record}
+
+    rows = list(
+        enrich_reco_counts_rows(
+            rows=reco_counts_rows(chunks=[report]),
+            get_target_records=get_target_records,
+        ),
+    )
+
+    assert looked_up_target_ids == ["a", "deleted"]
+    assert rows == [
+        EnrichedRecoCountsRow(
+            target_id="a",
+            name="my, target",
+            active_flag=False,
+            tracking_rating=3,
+            reco_count=5,
+        ),
+        EnrichedRecoCountsRow(
+            target_id="deleted",
+            name=None,
+            active_flag=None,
+            tracking_rating=None,
+            reco_count=1,
+        ),
+    ]
+
+    records = [dataclasses.asdict(obj=row) for row in rows]
+    csv_report = b"".join(
+        csv_chunks(records=records, columns=ENRICHED_RECO_COUNTS_COLUMNS),
+    )
+    assert csv_report == (
+        b"target_id,name,active_flag,tracking_rating,reco_count\r\n"
+        b'a,"my, target",false,3,5\r\n'
+        b"deleted,,,,1\r\n"
+    )
+
+    ndjson_report = b"".join(
+        ndjson_chunks(records=records, columns=ENRICHED_RECO_COUNTS_COLUMNS),
+    )
+    assert [json.loads(s=line) for line in ndjson_report.splitlines()] == [
+        {
+            "target_id": "a",
+            "name": "my, target",
+            "active_flag": False,
+            "tracking_rating": 3,
+            "reco_count": 5,
+        },
+        {
+            "target_id": "deleted",
+            "name": None,
+            "active_flag": None,
+            "tracking_rating": None,
+            "reco_count": 1,
+        },
+    ]
+
+
+@pytest.mark.parametrize(
+    argnames=("format_args", "expected_output"),
+    argvalues=[
+        (
+            [],
+            b"target_id,name,active_flag,tracking_rating,reco_count\r\n",
+        ),
+        (["--format", "ndjson"], b""),
+    ],
+)
+def test_enriched_report(
+    *,
+    mock_database: CloudDatabase,
+    format_args: list[str],
+    expected_output: bytes,
+) -> None:
+    """The report can be written joined with target records."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_base_commands(mock_database=mock_database),
+            "--enrich",
+            *format_args,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    assert result.stdout_bytes == expected_output
+
+
+@pytest.mark.parametrize(argnames="enrich", argvalues=[True, False])
+def test_columnar_report(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+    enrich: bool,
+) -> None:
+    """The report can be written as Parquet, with a type for each column."""
+    output_file_path = tmp_path / "report.parquet"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_base_commands(mock_database=mock_database),
+            "--format",
+            "parquet",
+            "--output",
+            str(object=output_file_path),
+            *(["--enrich"] if enrich else []),
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    table = pyarrow.parquet.read_table(source=output_file_path)
+    expected_schema = (
+        pa.schema(
+            fields=[
+                ("target_id", pa.string()),
+                ("name", pa.string()),
+                ("active_flag", pa.bool_()),
+                ("tracking_rating", pa.int64()),
+                ("reco_count", pa.int64()),
+            ],
+        )
+        if enrich
+        else pa.schema(
+            fields=[("target_id", pa.string()), ("reco_count", pa.int64())],
+        )
+    )
+    assert table.schema == expected_schema
+    assert not table.num_rows
+
+
+def test_arrow_report(*, mock_database: CloudDatabase) -> None:
+    """The report can be written to stdout as an Arrow IPC stream."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_base_commands(mock_database=mock_database),
+            "--format",
+            "arrow",
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == 0
+    table = pa.ipc.open_stream(source=result.stdout_bytes).read_all()
+    assert table.schema == pa.schema(
+        fields=[("target_id", pa.string()), ("reco_count", pa.int64())],
+    )
+
+
+def test_gzip_with_columnar_format(*, mock_database: CloudDatabase) -> None:
+    """``--gzip`` cannot be used with a columnar form."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_base_commands(mock_database=mock_database),
+            "--format",
+            "parquet",
+            "--gzip",
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    assert "--gzip cannot be used with --format parquet." in result.stderr
+
+
+@pytest.mark.parametrize(
+    argnames="option_args",
+    argvalues=[["--enrich"], ["--format", "ndjson"]],
+)
+def test_option_with_summary(
+    *,
+    mock_database: CloudDatabase,
+    option_args: list[str],
+) -> None:
+    """Options which change the form of the report cannot be used with
+    ``--summary``.
+    """
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_base_commands(mock_database=mock_database),
+            *option_args,
+            "--summary",
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    option = " ".join(option_args)
+    expected_message = f"{option} cannot be used with --summary."
+    assert expected_message in result.stderr
+
+
+@pytest.mark.parametrize(
+    argnames="option_args",
+    argvalues=[
+        ["--gzip"],
+        ["--summary"],
+        ["--enrich"],
+        ["--format", "ndjson"],
+    ],
+)
+def test_option_with_no_wait(
+    *,
+    mock_database: CloudDatabase,
+    option_args: list[str],
+) -> None:
+    """Options which change the report cannot be used with ``--no-wait``."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_base_commands(mock_database=mock_database),
+            "--no-wait",
+            *option_args,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    expected_message = f"{option_args[0]} cannot be used with --no-wait."
+    assert expected_message in result.stderr
+
+
 def test_no_wait() -> None:
     """``--no-wait`` shows the URL to download the report from."""
     runner = CliRunner()
@@ -194,6 +589,189 @@ def test_previous_month() -> None:
     assert result.stdout_bytes == _EXPECTED_CSV
 
 
+@pytest.mark.parametrize(
+    argnames="month_args",
+    argvalues=[
+        pytest.param(["--all-available"], id="all-available"),
+        pytest.param(
+            [
+                "--month",
+                _month_string(months_ago=1),
+                "--month",
+                _month_string(months_ago=0),
+            ],
+            id="months",
+        ),
+    ],
+)
+def test_multiple_months(*, tmp_path: Path, month_args: list[str]) -> None:
+    """Reports for more than one month are written to paths made from the
+    ``--output`` template.
+    """
+    runner = CliRunner()
+    mock_database = CloudDatabase()
+    with MockVWS(processing_time_seconds=1) as mock:
+        mock.add_cloud_database(cloud_database=mock_database)
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                *_base_commands(mock_database=mock_database),
+                *month_args,
+                "--output",
+                str(object=tmp_path / "report-{month}.csv"),
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+
+    assert result.exit_code == 0
+    assert not result.stdout
+    for months_ago in (0, 1):
+        month_string = _month_string(months_ago=months_ago)
+        output_file_path = tmp_path / f"report-{month_string}.csv"
+        assert output_file_path.read_bytes() == _EXPECTED_CSV
+
+
+def test_summary_for_multiple_months(
+    *,
+    mock_database: CloudDatabase,
+    vws_client: VWS,
+    high_quality_image: io.BytesIO,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """The targets in the database are listed once for the summaries of
+    every month, and the months can be waited for one at a time.
+    """
+    target_id = vws_client.add_target(
+        name="x",
+        width=1,
+        image=high_quality_image,
+        active_flag=True,
+        application_metadata=None,
+    )
+    list_targets_calls: list[VWS] = []
+    list_targets = VWS.list_targets
+
+    def counted_list_targets(self: VWS) -> list[str]:
+        """List the targets, counting the calls."""
+        list_targets_calls.append(self)
+        return list_targets(self)
+
+    monkeypatch.setattr(
+        target=VWS,
+        name="list_targets",
+        value=counted_list_targets,
+    )
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_base_commands(mock_database=mock_database),
+            "--all-available",
+            "--summary",
+            "--max-workers",
+            "1",
+            "--output",
+            str(object=tmp_path / "summary-{month}.yaml"),
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+
+    assert result.exit_code == 0
+    assert len(list_targets_calls) == 1
+    for months_ago in (0, 1):
+        month_string = _month_string(months_ago=months_ago)
+        summary = yaml.safe_load(
+            stream=(tmp_path / f"summary-{month_string}.yaml").read_text(),
+        )
+        assert summary["zero_reco_count_target_ids"] == [target_id]
+
+
+def test_multiple_months_no_wait() -> None:
+    """``--no-wait`` shows a URL for each month, in the order in which the
+    months are given.
+    """
+    runner = CliRunner()
+    mock_database = CloudDatabase()
+    with MockVWS(processing_time_seconds=0) as mock:
+        mock.add_cloud_database(cloud_database=mock_database)
+        vws_client = VWS(
+            server_access_key=mock_database.server_access_key,
+            server_secret_key=mock_database.server_secret_key,
+        )
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                *_base_commands(mock_database=mock_database),
+                "--all-available",
+                "--no-wait",
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+        assert result.exit_code == 0
+        reports = [
+            vws_client.download_reco_counts_report(presigned_url=url)
+            for url in result.stdout.splitlines()
+        ]
+
+    assert [report.raw_csv for report in reports] == [
+        _EXPECTED_CSV,
+        _EXPECTED_CSV,
+    ]
+
+
+@pytest.mark.parametrize(
+    argnames="output_args",
+    argvalues=[[], ["--output", "report.csv"]],
+)
+def test_multiple_months_without_month_placeholder(
+    *,
+    mock_database: CloudDatabase,
+    output_args: list[str],
+) -> None:
+    """An ``--output`` path with a ``{month}`` placeholder is needed for
+    more than one month.
+    """
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_base_commands(mock_database=mock_database),
+            "--all-available",
+            *output_args,
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    expected_message = (
+        "--output with a {month} placeholder must be given when getting "
+        "reports for more than one month."
+    )
+    assert expected_message in result.stderr
+
+
+def test_month_with_all_available(*, mock_database: CloudDatabase) -> None:
+    """``--month`` cannot be used with ``--all-available``."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_base_commands(mock_database=mock_database),
+            "--all-available",
+            "--month",
+            _month_string(months_ago=0),
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    assert "--month cannot be used with --all-available." in result.stderr
+
+
 def test_month_is_not_in_the_yyyy_mm_form(
     *,
     mock_database: CloudDatabase,
@@ -298,3 +876,233 @@ def test_timeout_reached() -> None:
     assert result.exit_code == 1
     assert result.stderr == f"Timeout of {timeout_seconds} seconds reached.\n"
     assert not result.stdout
+
+
+def _fetch_commands(
+    *,
+    mock_database: CloudDatabase,
+    presigned_url: str,
+) -> list[str]:
+    """Return the command and credential arguments for fetching a
+    report.
+    """
+    return [
+        "fetch-reco-counts-report",
+        "--url",
+        presigned_url,
+        "--server-access-key",
+        mock_database.server_access_key,
+        "--server-secret-key",
+        mock_database.server_secret_key,
+        "--database-id",
+        mock_database.database_id,
+    ]
+
+
+@pytest.mark.parametrize(argnames="use_output_file", argvalues=[True, False])
+def test_fetch(*, tmp_path: Path, use_output_file: bool) -> None:
+    """A report requested with ``--no-wait`` can be fetched later, once it
+    is ready.
+    """
+    runner = CliRunner()
+    mock_database = CloudDatabase()
+    output_file_path = tmp_path / uuid.uuid4().hex
+    output_args = ["--output", str(object=output_file_path)]
+    with MockVWS(processing_time_seconds=1) as mock:
+        mock.add_cloud_database(cloud_database=mock_database)
+        no_wait_result = runner.invoke(
+            cli=vws_group,
+            args=[*_base_commands(mock_database=mock_database), "--no-wait"],
+            catch_exceptions=False,
+            color=True,
+        )
+        assert no_wait_result.exit_code == 0
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                *_fetch_commands(
+                    mock_database=mock_database,
+                    presigned_url=no_wait_result.stdout.strip(),
+                ),
+                *(output_args if use_output_file else []),
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+
+    assert result.exit_code == 0
+    if use_output_file:
+        assert not result.stdout
+        assert output_file_path.read_bytes() == _EXPECTED_CSV
+    else:
+        assert result.stdout_bytes == _EXPECTED_CSV
+
+
+def test_fetch_gzip() -> None:
+    """A fetched report can be compressed with gzip."""
+    runner = CliRunner()
+    mock_database = CloudDatabase()
+    with MockVWS(processing_time_seconds=0) as mock:
+        mock.add_cloud_database(cloud_database=mock_database)
+        no_wait_result = runner.invoke(
+            cli=vws_group,
+            args=[*_base_commands(mock_database=mock_database), "--no-wait"],
+            catch_exceptions=False,
+            color=True,
+        )
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                *_fetch_commands(
+                    mock_database=mock_database,
+                    presigned_url=no_wait_result.stdout.strip(),
+                ),
+                "--gzip",
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+
+    assert result.exit_code == 0
+    assert gzip.decompress(data=result.stdout_bytes) == _EXPECTED_CSV
+
+
+def test_fetch_gzip_with_summary(*, mock_database: CloudDatabase) -> None:
+    """``--gzip`` cannot be used with ``--summary``."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_fetch_commands(
+                mock_database=mock_database,
+                presigned_url="https://example.com/report.csv",
+            ),
+            "--gzip",
+            "--summary",
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+    assert result.exit_code == _USAGE_ERROR_EXIT_CODE
+    assert "--gzip cannot be used with --summary." in result.stderr
+
+
+def test_fetch_timeout_reached(*, tmp_path: Path) -> None:
+    """An error is shown when a fetched report is not generated in time."""
+    runner = CliRunner()
+    mock_database = CloudDatabase()
+    output_file_path = tmp_path / uuid.uuid4().hex
+    timeout_seconds = 0.1
+    with MockVWS(processing_time_seconds=60) as mock:
+        mock.add_cloud_database(cloud_database=mock_database)
+        no_wait_result = runner.invoke(
+            cli=vws_group,
+            args=[*_base_commands(mock_database=mock_database), "--no-wait"],
+            catch_exceptions=False,
+            color=True,
+        )
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                *_fetch_commands(
+                    mock_database=mock_database,
+                    presigned_url=no_wait_result.stdout.strip(),
+                ),
+                "--output",
+                str(object=output_file_path),
+                "--timeout-seconds",
+                str(object=timeout_seconds),
+                "--seconds-between-requests",
+                "0.05",
+            ],
+            catch_exceptions=False,
+            color=True,
+        )
+
+    assert result.exit_code == 1
+    assert result.stderr == f"Timeout of {timeout_seconds} seconds reached.\n"
+    assert not output_file_path.exists()
+
+
+class _ForbiddenHandler(http.server.BaseHTTPRequestHandler):
+    """A handler which responds as a presigned URL which has expired."""
+
+    def do_GET(self) -> None:
+        """Respond with ``403 Forbidden``."""
+        body = b"Request has expired"
+        self.send_response(code=HTTPStatus.FORBIDDEN)
+        self.send_header(keyword="Content-Length", value=str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        """Do not log requests."""
+        del format
+        del args
+
+
+@pytest.fixture(name="expired_report_url")
+def fixture_expired_report_url() -> Iterator[str]:
+    """The URL of a report which cannot be downloaded."""
+    server = http.server.HTTPServer(
+        server_address=("127.0.0.1", 0),
+        RequestHandlerClass=_ForbiddenHandler,
+    )
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    host, port = server.server_address[:2]
+    yield f"http://{host!s}:{port}/report.csv"
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+
+def test_fetch_download_error(*, expired_report_url: str) -> None:
+    """An error is shown when the report's URL gives an error other than
+    that the report is not ready yet, without waiting for the timeout.
+    """
+    runner = CliRunner()
+    mock_database = CloudDatabase()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            *_fetch_commands(
+                mock_database=mock_database,
+                presigned_url=expired_report_url,
+            ),
+            "--timeout-seconds",
+            "60",
+        ],
+        catch_exceptions=False,
+        color=True,
+    )
+
+    assert result.exit_code == 1
+    expected_stderr = (
+        "Error: The recognition counts report could not be downloaded. "
+        "This may be because the report's URL has expired.\n"
+    )
+    assert result.stderr == expected_stderr
+    assert not result.stdout
+
+
+def test_fetch_connection_error(*, mock_database: CloudDatabase) -> None:
+    """An error is shown when the report's URL cannot be connected to."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=_fetch_commands(
+            mock_database=mock_database,
+            presigned_url="https://example.com/report.csv",
+        ),
+        catch_exceptions=False,
+        color=True,
+    )
+
+    assert result.exit_code == 1
+    expected_stderr = (
+        "Error: The recognition counts report could not be downloaded: "
+        "Connection refused by mock\n"
+    )
+    assert result.stderr == expected_stderr
+    assert not result.stdout
@@ -0,0 +1,362 @@
+"""Tests for trying requests again."""
+
+import email.utils
+import json
+import time
+from http import HTTPStatus
+
+import pytest
+import requests
+from click.testing import CliRunner
+from mock_vws import MockVWS
+from mock_vws.database import CloudDatabase
+from vws.response import Response
+
+from vws_cli import vws_group
+from vws_cli._retry import RetryingTransport, retry_after_seconds
+from vws_cli.commands import add_target, list_targets
+
+_TARGETS_URL = "https://vws.vuforia.com/targets"
+_QUERY_URL = "https://cloudreco.vuforia.com/v1/query"
+
+
+def _response(
+    *,
+    status_code: int,
+    result_code: str,
+    headers: dict[str, str],
+) -> Response:
+    """Return a response with the given status and VWS result code."""
+    text = json.dumps(obj={"result_code": result_code})
+    return Response(
+        text=text,
+        url=_TARGETS_URL,
+        status_code=status_code,
+        headers=headers,
+        request_body=None,
+        tell_position=0,
+        content=text.encode(encoding="utf-8"),
+    )
+
+
+class _ScriptedTransport:
+    """A transport which gives the given responses, or raises the given
+    exceptions, in turn.
+    """
+
+    def __init__(self, *, outcomes: list[Response | Exception]) -> None:
+        """Give the outcomes of requests in turn."""
+        self.outcomes = outcomes
+        self.num_requests = 0
+
+    def close(self) -> None:
+        """Do nothing."""
+
+    def __call__(
+        self,
+        *,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        data: bytes,
+        request_timeout: float | tuple[float, float],
+    ) -> Response:
+        """Give the next outcome."""
+        del method, url, headers, data, request_timeout
+        outcome = self.outcomes[self.num_requests]
+        self.num_requests += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def _request(
+    *,
+    outcomes: list[Response | Exception],
+    method: str,
+    url: str,
+    max_attempts: int,
+) -> tuple[Response, _ScriptedTransport, list[float]]:
+    """Make a request with retries, and return the response, the wrapped
+    transport and the waits.
+    """
+    transport = _ScriptedTransport(outcomes=outcomes)
+    waits: list[float] = []
+    retrying_transport = RetryingTransport(
+        transport=transport,
+        max_attempts=max_attempts,
+        sleep_fn=waits.append,
+    )
+    response = retrying_transport(
+        method=method,
+        url=url,
+        headers={},
+        data=b"",
+        request_timeout=30.0,
+    )
+    return response, transport, waits
+
+
+def test_rejected_requests() -> None:
+    """Requests which Vuforia rejects because of a quota or a rate limit are
+    tried again, even if they change something, with waits which grow.
+    """
+    success = _response(
+        status_code=HTTPStatus.CREATED,
+        result_code="Success",
+        headers={},
+    )
+    response, transport, waits = _request(
+        outcomes=[
+            _response(
+                status_code=HTTPStatus.TOO_MANY_REQUESTS,
+                result_code="TooManyRequests",
+                headers={},
+            ),
+            _response(
+                status_code=HTTPStatus.FORBIDDEN,
+                result_code="RequestQuotaReached",
+                headers={},
+            ),
+            success,
+        ],
+        method="POST",
+        url=_TARGETS_URL,
+        max_attempts=5,
+    )
+    assert response is success
+    assert transport.num_requests == len(waits) + 1
+    # The longest possible wait doubles after each attempt.
+    first_max_wait_seconds = 0.5
+    (first_wait_seconds, second_wait_seconds) = waits
+    assert 0 <= first_wait_seconds <= first_max_wait_seconds
+    assert 0 <= second_wait_seconds <= first_max_wait_seconds * 2
+
+
+def test_fatal_errors() -> None:
+    """Requests which fail for reasons which last are not tried again."""
+    failure = _response(
+        status_code=HTTPStatus.FORBIDDEN,
+        result_code="TargetNameExist",
+        headers={},
+    )
+    response, transport, waits = _request(
+        outcomes=[failure],
+        method="POST",
+        url=_TARGETS_URL,
+        max_attempts=5,
+    )
+    assert response is failure
+    assert transport.num_requests == 1
+    assert not waits
+
+
+@pytest.mark.parametrize(
+    argnames=("method", "url", "expected_num_requests"),
+    argvalues=[
+        ("GET", _TARGETS_URL, 2),
+        ("DELETE", _TARGETS_URL, 2),
+        ("POST", _TARGETS_URL, 1),
+        ("POST", _QUERY_URL, 2),
+    ],
+)
+def test_server_errors(
+    *,
+    method: str,
+    url: str,
+    expected_num_requests: int,
+) -> None:
+    """Vuforia may have acted on a request before a server error, so only
+    idempotent requests, including queries, are tried again.
+    """
+    outcomes = [
+        _response(
+            status_code=HTTPStatus.INTERNAL_SERVER_ERROR,
+            result_code="Success",
+            headers={},
+        ),
+        _response(
+            status_code=HTTPStatus.OK,
+            result_code="Success",
+            headers={},
+        ),
+    ]
+    response, transport, _ = _request(
+        outcomes=outcomes,
+        method=method,
+        url=url,
+        max_attempts=5,
+    )
+    assert response is outcomes[expected_num_requests - 1]
+    assert transport.num_requests == expected_num_requests
+
+
+def test_network_errors() -> None:
+    """A request which was never sent is always tried again, but others
+    are tried again only if they are idempotent.
+    """
+    success = _response(
+        status_code=HTTPStatus.OK,
+        result_code="Success",
+        headers={},
+    )
+    response, transport, _ = _request(
+        outcomes=[requests.exceptions.ConnectTimeout(), success],
+        method="POST",
+        url=_TARGETS_URL,
+        max_attempts=5,
+    )
+    assert response is success
+    assert transport.num_requests == len(transport.outcomes)
+
+    response, transport, _ = _request(
+        outcomes=[requests.exceptions.ReadTimeout(), success],
+        method="GET",
+        url=_TARGETS_URL,
+        max_attempts=5,
+    )
+    assert response is success
+
+    response, transport, _ = _request(
+        outcomes=[requests.exceptions.ReadTimeout(), success],
+        method="POST",
+        url=_QUERY_URL,
+        max_attempts=5,
+    )
+    assert response is success
+
+    with pytest.raises(expected_exception=requests.exceptions.ReadTimeout):
+        _request(
+            outcomes=[requests.exceptions.ReadTimeout(), success],
+            method="POST",
+            url=_TARGETS_URL,
+            max_attempts=5,
+        )
+
+
+def test_max_attempts() -> None:
+    """The last failure is given when every attempt fails."""
+    failures = [
+        _response(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            result_code="Success",
+            headers={},
+        )
+        for _ in range(3)
+    ]
+    response, transport, waits = _request(
+        outcomes=failures,
+        method="GET",
+        url=_TARGETS_URL,
+        max_attempts=len(failures),
+    )
+    assert response is failures[-1]
+    assert transport.num_requests == len(failures)
+    assert len(waits) == len(failures) - 1
+
+    with pytest.raises(expected_exception=requests.exceptions.ConnectTimeout):
+        _request(
+            outcomes=[requests.exceptions.ConnectTimeout()] * 2,
+            method="GET",
+            url=_TARGETS_URL,
+            max_attempts=2,
+        )
+
+
+def test_retry_after() -> None:
+    """A ``Retry-After`` header is honoured, unless it asks for too long a
+    wait.
+    """
+    success = _response(
+        status_code=HTTPStatus.OK,
+        result_code="Success",
+        headers={},
+    )
+    too_many_requests = _response(
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        result_code="TooManyRequests",
+        headers={"retry-after": "7"},
+    )
+    _, _, waits = _request(
+        outcomes=[too_many_requests, success],
+        method="POST",
+        url=_TARGETS_URL,
+        max_attempts=2,
+    )
+    assert waits == [7]
+
+    much_too_many_requests = _response(
+        status_code=HTTPStatus.TOO_MANY_REQUESTS,
+        result_code="TooManyRequests",
+        headers={"Retry-After": "3600"},
+    )
+    response, _, waits = _request(
+        outcomes=[much_too_many_requests, success],
+        method="POST",
+        url=_TARGETS_URL,
+        max_attempts=2,
+    )
+    assert response is much_too_many_requests
+    assert not waits
+
+
+def test_retry_after_date() -> None:
+    """A ``Retry-After`` header can be an HTTP date."""
+    wait_seconds = 10
+    retry_at = email.utils.formatdate(
+        timeval=time.time() + wait_seconds,
+        usegmt=True,
+    )
+    seconds = retry_after_seconds(headers={"Retry-After": retry_at})
+    assert seconds is not None
+    # HTTP dates are given to the second.
+    assert wait_seconds - 2 < seconds <= wait_seconds
+    past = email.utils.formatdate(
+        timeval=time.time() - wait_seconds,
+        usegmt=True,
+    )
+    assert retry_after_seconds(headers={"Retry-After": past}) == 0
+    assert retry_after_seconds(headers={"Retry-After": "soon"}) is None
+    assert retry_after_seconds(headers={}) is None
+
+
+def test_read_commands_retry_by_default() -> None:
+    """Commands which only read try requests again by default, and commands
+    which change something do not.
+    """
+    max_attempts_defaults = {
+        command: next(
+            param.default
+            for param in command.params
+            if param.name == "max_attempts"
+        )
+        for command in (list_targets, add_target)
+    }
+    assert max_attempts_defaults == {list_targets: 5, add_target: 1}
+
+
+def test_error_after_attempts() -> None:
+    """The usual error is shown when every attempt fails."""
+    database = CloudDatabase(request_quota=0)
+    runner = CliRunner()
+    with MockVWS() as mock:
+        mock.add_cloud_database(cloud_database=database)
+        result = runner.invoke(
+            cli=vws_group,
+            args=[
+                "get-database-summary-report",
+                "--server-access-key",
+                database.server_access_key,
+                "--server-secret-key",
+                database.server_secret_key,
+                "--max-attempts",
+                "2",
+            ],
+            catch_exceptions=False,
+        )
+    assert result.exit_code == 1
+    expected_stderr = (
+        "Error: The maximum number of API calls for this database has been "
+        "reached.\n"
+    )
+    assert result.stderr == expected_stderr
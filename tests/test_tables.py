@@ -0,0 +1,137 @@
+"""Tests for writing rows of records."""
+
+import datetime
+import json
+from collections.abc import Iterator
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.ipc
+import pyarrow.parquet
+import pytest
+
+from vws_cli._tables import (
+    Column,
+    ColumnarFormat,
+    ColumnType,
+    csv_chunks,
+    ndjson_chunks,
+    write_chunks,
+    write_columnar,
+)
+
+_COLUMNS = (
+    Column(name="name", column_type=ColumnType.STRING),
+    Column(name="count", column_type=ColumnType.INTEGER),
+    Column(name="width", column_type=ColumnType.FLOAT),
+    Column(name="active", column_type=ColumnType.BOOLEAN),
+    Column(name="day", column_type=ColumnType.DATE),
+)
+
+_RECORDS = [
+    {
+        "name": "a, b",
+        "count": 3,
+        "width": 1.5,
+        "active": True,
+        "day": datetime.date(year=2026, month=8, day=14),
+    },
+    {
+        "name": None,
+        "count": None,
+        "width": None,
+        "active": False,
+        "day": None,
+    },
+]
+
+
+def test_csv() -> None:
+    """Records are written as CSV, with booleans as ``true`` or ``false``,
+    ISO 8601 dates and empty missing values.
+    """
+    csv_output = b"".join(csv_chunks(records=_RECORDS, columns=_COLUMNS))
+    assert csv_output == (
+        b"name,count,width,active,day\r\n"
+        b'"a, b",3,1.5,true,2026-08-14\r\n'
+        b",,,false,\r\n"
+    )
+
+
+def test_ndjson() -> None:
+    """Records are written as newline-delimited JSON, with ISO 8601
+    dates.
+    """
+    ndjson_output = b"".join(
+        ndjson_chunks(records=_RECORDS, columns=_COLUMNS),
+    )
+    assert [json.loads(s=line) for line in ndjson_output.splitlines()] == [
+        {
+            "name": "a, b",
+            "count": 3,
+            "width": 1.5,
+            "active": True,
+            "day": "2026-08-14",
+        },
+        {
+            "name": None,
+            "count": None,
+            "width": None,
+            "active": False,
+            "day": None,
+        },
+    ]
+
+
+@pytest.mark.parametrize(argnames="columnar_format", argvalues=ColumnarFormat)
+def test_columnar(*, tmp_path: Path, columnar_format: ColumnarFormat) -> None:
+    """Records are written with a type for each column."""
+    output_file_path = tmp_path / "output"
+    write_columnar(
+        records=iter(_RECORDS),
+        columns=_COLUMNS,
+        columnar_format=columnar_format,
+        output_file_path=output_file_path,
+    )
+
+    readers = {
+        ColumnarFormat.PARQUET: pyarrow.parquet.read_table,
+        ColumnarFormat.ARROW: lambda source: pa.ipc.open_stream(
+            source=source,
+        ).read_all(),
+    }
+    table = readers[columnar_format](source=str(object=output_file_path))
+    assert table.schema == pa.schema(
+        fields=[
+            ("name", pa.string()),
+            ("count", pa.int64()),
+            ("width", pa.float64()),
+            ("active", pa.bool_()),
+            ("day", pa.date32()),
+        ],
+    )
+    assert table.to_pylist() == _RECORDS
+    assert list(tmp_path.iterdir()) == [output_file_path]
+
+
+def test_failed_write_leaves_no_file(*, tmp_path: Path) -> None:
+    """A file is not written if getting the chunks fails part way."""
+    output_file_path = tmp_path / "output"
+
+    def chunks() -> Iterator[bytes]:
+        """Give a chunk and then fail."""
+        yield b"a"
+        message = "Chunks failed."
+        raise ValueError(message)
+
+    with pytest.raises(
+        expected_exception=ValueError,
+        match=r"^Chunks failed\.$",
+    ):
+        write_chunks(
+            chunks=chunks(),
+            output_file_path=output_file_path,
+            compress=False,
+        )
+
+    assert not list(tmp_path.iterdir())
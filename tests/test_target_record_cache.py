@@ -0,0 +1,112 @@
+"""Tests for the local cache of target records."""
+
+import datetime
+from collections.abc import Mapping
+from pathlib import Path
+
+from freezegun import freeze_time
+from vws.reports import TargetRecord
+
+from vws_cli._target_record_cache import add_target_records, get_target_records
+
+_BASE_VWS_URL = "https://vws.vuforia.com"
+
+
+def _target_record(*, target_id: str, name: str) -> TargetRecord:
+    """Make a target record."""
+    return TargetRecord(
+        target_id=target_id,
+        active_flag=True,
+        name=name,
+        width=1.5,
+        tracking_rating=4,
+        reco_rating="",
+    )
+
+
+def test_missing_cache_file(*, tmp_path: Path) -> None:
+    """No records are given, and no file is created, when the cache file
+    does not exist.
+    """
+    cache_file_path = tmp_path / "cache.sqlite3"
+    records = get_target_records(
+        cache_file_path=cache_file_path,
+        base_vws_url=_BASE_VWS_URL,
+        database_id="my-database",
+        target_ids=["a"],
+        max_age_seconds=60.0,
+    )
+    assert not records
+    assert not cache_file_path.exists()
+
+
+def test_records_are_replaced(*, tmp_path: Path) -> None:
+    """Only records of the given targets in the given database are given,
+    and adding a record again replaces it.
+    """
+    cache_file_path = tmp_path / "cache.sqlite3"
+    first_record = _target_record(target_id="a", name="first")
+    second_record = _target_record(target_id="b", name="second")
+    renamed_record = _target_record(target_id="a", name="renamed")
+    add_target_records(
+        cache_file_path=cache_file_path,
+        base_vws_url=_BASE_VWS_URL,
+        database_id="my-database",
+        target_records=[first_record, second_record],
+    )
+    add_target_records(
+        cache_file_path=cache_file_path,
+        base_vws_url=_BASE_VWS_URL,
+        database_id="my-database",
+        target_records=[renamed_record],
+    )
+
+    records = get_target_records(
+        cache_file_path=cache_file_path,
+        base_vws_url=_BASE_VWS_URL,
+        database_id="my-database",
+        target_ids=["a", "c"],
+        max_age_seconds=60.0,
+    )
+    other_database_records = get_target_records(
+        cache_file_path=cache_file_path,
+        base_vws_url=_BASE_VWS_URL,
+        database_id="other-database",
+        target_ids=["a", "b"],
+        max_age_seconds=60.0,
+    )
+
+    assert records == {"a": renamed_record}
+    assert not other_database_records
+
+
+def test_old_records_are_not_given(*, tmp_path: Path) -> None:
+    """Records which were cached longer ago than the maximum age are not
+    given.
+    """
+    cache_file_path = tmp_path / "cache.sqlite3"
+    record = _target_record(target_id="a", name="my-target")
+    with freeze_time() as frozen_datetime:
+        add_target_records(
+            cache_file_path=cache_file_path,
+            base_vws_url=_BASE_VWS_URL,
+            database_id="my-database",
+            target_records=[record],
+        )
+        frozen_datetime.tick(delta=datetime.timedelta(seconds=61))
+
+        def cached_records(
+            *,
+            max_age_seconds: float,
+        ) -> Mapping[str, TargetRecord]:
+            """Get the cached records with the given maximum age."""
+            return get_target_records(
+                cache_file_path=cache_file_path,
+                base_vws_url=_BASE_VWS_URL,
+                database_id="my-database",
+                target_ids=["a"],
+                max_age_seconds=max_age_seconds,
+            )
+
+        assert cached_records(max_age_seconds=62.0) == {"a": record}
+        assert not cached_records(max_age_seconds=60.0)
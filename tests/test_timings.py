@@ -0,0 +1,153 @@
+"""Tests for showing the timings of commands."""
+
+import io
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from pathlib import Path
+
+import yaml
+from click.testing import CliRunner
+from mock_vws.database import CloudDatabase
+
+from vws_cli import vws_group
+from vws_cli._timings import Timings, timed
+from vws_cli.query import vuforia_cloud_reco
+
+
+def test_timings(*, mock_database: CloudDatabase) -> None:
+    """The timings of a command are shown on stderr."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "--timings",
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    # The output is not changed.
+    assert "active_images" in yaml.safe_load(stream=result.stdout)
+
+    timings = yaml.safe_load(stream=result.stderr)["timings"]
+    assert [phase["phase"] for phase in timings["phases"]] == [
+        "client construction",
+        "serialisation",
+        "output",
+    ]
+    (request,) = timings["requests"]
+    assert request["method"] == "GET"
+    assert request["path"] == "/summary"
+    assert request["status_code"] == HTTPStatus.OK
+    assert request["sent_bytes"] == 0
+    assert request["received_bytes"] > 0
+    # No connection is made to the mock.
+    assert request["connect_ms"] is None
+    assert request["total_ms"] >= 0
+    assert timings["import_ms"] > 0
+    assert timings["total_ms"] >= timings["import_ms"]
+
+
+def test_timings_env_var(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+    high_quality_image: io.BytesIO,
+) -> None:
+    """Timings can be asked for with an environment variable, for each entry
+    point.
+    """
+    runner = CliRunner()
+    image_file = tmp_path / uuid.uuid4().hex
+    image_file.write_bytes(data=high_quality_image.getvalue())
+    result = runner.invoke(
+        cli=vuforia_cloud_reco,
+        args=[
+            str(object=image_file),
+            "--client-access-key",
+            mock_database.client_access_key,
+            "--client-secret-key",
+            mock_database.client_secret_key,
+        ],
+        env={"VWS_CLI_TIMINGS": "1"},
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    timings = yaml.safe_load(stream=result.stderr)["timings"]
+    (request,) = timings["requests"]
+    assert request["method"] == "POST"
+    assert request["path"] == "/v1/query"
+    assert request["sent_bytes"] > len(high_quality_image.getvalue())
+
+
+def test_no_timings_by_default(*, mock_database: CloudDatabase) -> None:
+    """Nothing is shown on stderr without ``--timings``."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert not result.stderr
+
+
+def test_report_download_timings(*, mock_database: CloudDatabase) -> None:
+    """Downloads from the URL of a recognition counts report are timed, as
+    they are not made through the VWS client.
+    """
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "--timings",
+            "get-database-reco-counts-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+            "--database-id",
+            mock_database.database_id,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+
+    timings = yaml.safe_load(stream=result.stderr)["timings"]
+    download = timings["requests"][-1]
+    assert download["method"] == "GET"
+    assert download["path"].startswith("/reports/recoCounts/")
+    assert download["status_code"] == HTTPStatus.OK
+    assert download["sent_bytes"] == 0
+    assert download["received_bytes"] == len(result.stdout_bytes)
+    assert download["time_to_first_byte_ms"] <= download["total_ms"]
+
+
+def test_phases_in_other_threads() -> None:
+    """Parts of a command which run in other threads are timed in the
+    timings which they are given.
+    """
+    timings = Timings(import_seconds=0.0, started_at=time.perf_counter())
+    phases = ["first", "second"]
+
+    def time_phase(phase: str) -> None:
+        """Time a part of a command."""
+        with timed(timings=timings, phase=phase):
+            pass
+
+    with ThreadPoolExecutor(max_workers=len(phases)) as executor:
+        list(executor.map(time_phase, phases))
+
+    assert sorted(phase.phase for phase in timings.phases) == phases
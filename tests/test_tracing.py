@@ -0,0 +1,172 @@
+"""Tests for writing traces of commands."""
+
+import io
+import json
+from http import HTTPStatus
+from pathlib import Path
+
+from click.testing import CliRunner
+from mock_vws.database import CloudDatabase
+from vws import VWS
+
+from vws_cli import vws_group
+
+
+def test_chrome_trace(
+    *,
+    mock_database: CloudDatabase,
+    vws_client: VWS,
+    high_quality_image: io.BytesIO,
+    tmp_path: Path,
+) -> None:
+    """A trace in the Chrome trace event format has a span for each
+    operation and each HTTP request, in the thread which it ran in.
+    """
+    target_ids = [
+        vws_client.add_target(
+            name=name,
+            width=1.5,
+            image=high_quality_image,
+            active_flag=True,
+            application_metadata=None,
+        )
+        for name in ("a", "b")
+    ]
+    trace_file_path = tmp_path / "trace.json"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "--trace-file",
+            str(object=trace_file_path),
+            "export-target-records",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    trace = json.loads(s=trace_file_path.read_text())
+    events = trace["traceEvents"]
+    thread_names = {
+        event["tid"]: event["args"]["name"]
+        for event in events
+        if event["ph"] == "M"
+    }
+    spans = [event for event in events if event["ph"] == "X"]
+    assert {span["tid"] for span in spans} <= thread_names.keys()
+
+    (command_span,) = [span for span in spans if span["cat"] == "command"]
+    assert command_span["name"] == "vws export-target-records"
+    assert thread_names[command_span["tid"]] == "MainThread"
+
+    target_spans = [
+        span for span in spans if span["name"] == "get target details"
+    ]
+    assert sorted(span["args"]["target_id"] for span in target_spans) == (
+        sorted(target_ids)
+    )
+
+    (summary_span, *_) = [
+        span
+        for span in spans
+        if span["name"] == f"GET /summary/{target_ids[0]}"
+    ]
+    assert summary_span["cat"] == "http"
+    assert summary_span["args"]["status_code"] == HTTPStatus.OK
+    assert summary_span["args"]["received_bytes"] > 0
+    for span in spans:
+        assert span["ts"] >= command_span["ts"]
+        assert span["dur"] <= command_span["dur"]
+
+
+def test_json_lines(*, mock_database: CloudDatabase, tmp_path: Path) -> None:
+    """A trace is written as one JSON object per span if the trace file
+    name ends with ``.jsonl``.
+    """
+    trace_file_path = tmp_path / "trace.jsonl"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        env={"VWS_CLI_TRACE_FILE": str(object=trace_file_path)},
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    request_span, command_span = [
+        json.loads(s=line) for line in trace_file_path.read_text().splitlines()
+    ]
+    assert request_span["name"] == "GET /summary"
+    assert request_span["category"] == "http"
+    assert request_span["thread_name"] == "MainThread"
+    assert request_span["args"] == {
+        "method": "GET",
+        "path": "/summary",
+        "sent_bytes": 0,
+        "status_code": HTTPStatus.OK,
+        "received_bytes": request_span["args"]["received_bytes"],
+    }
+    assert command_span["name"] == "vws get-database-summary-report"
+    assert (
+        command_span["duration_seconds"] >= (request_span["duration_seconds"])
+    )
+
+
+def test_unwritable_trace_file(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+) -> None:
+    """A warning is shown, and the command succeeds, if the trace cannot be
+    written.
+    """
+    trace_file_path = tmp_path / "missing" / "trace.json"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "--trace-file",
+            str(object=trace_file_path),
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    expected_warning = (
+        f"Warning: The trace could not be written to {trace_file_path}:"
+    )
+    assert expected_warning in result.stderr
+
+
+def test_no_trace_by_default(
+    *,
+    mock_database: CloudDatabase,
+    tmp_path: Path,
+) -> None:
+    """Nothing is written without ``--trace-file``."""
+    runner = CliRunner()
+    result = runner.invoke(
+        cli=vws_group,
+        args=[
+            "get-database-summary-report",
+            "--server-access-key",
+            mock_database.server_access_key,
+            "--server-secret-key",
+            mock_database.server_secret_key,
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    assert not list(tmp_path.iterdir())